@@ -0,0 +1,184 @@
+"""Poll a dump1090/readsb ``aircraft.json`` and keep only the changed aircraft.
+
+Each changed aircraft becomes the SBS records its new values would have
+arrived as, so altitude correction, position fusion and motion freshness
+treat it exactly like the TCP feeds.
+"""
+
+import datetime
+import json
+import urllib.request
+from dataclasses import dataclass
+
+import pytz
+
+
+DEFAULT_POLL_SECONDS = 1.0
+HTTP_TIMEOUT_SECONDS = 2.0
+# dump1090 keeps showing a position for a minute after the last decode.
+MAX_POSITION_AGE_SECONDS = 10.0
+
+
+def read_aircraft_json(source, timeout=HTTP_TIMEOUT_SECONDS):
+    """Load the document from a file path or an http(s) URL."""
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source, timeout=timeout) as response:
+            return json.load(response)
+    with open(source, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@dataclass(frozen=True)
+class AircraftReport:
+    icao: str
+    seen_utc: datetime.datetime
+    flight: str = ""
+    altitude_ft: int | None = None
+    groundspeed_kt: float | None = None
+    track_deg: float | None = None
+    vertical_rate_fpm: int | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    position_utc: datetime.datetime | None = None
+    mlat: bool = False
+
+    def values(self):
+        """Everything but the ages; a new poll with the same values is no news."""
+        return (self.flight, self.altitude_ft, self.groundspeed_kt,
+                self.track_deg, self.vertical_rate_fpm, self.latitude,
+                self.longitude, self.mlat)
+
+
+def _number(aircraft, *names):
+    for name in names:
+        value = aircraft.get(name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def parse_aircraft(document, max_position_age=MAX_POSITION_AGE_SECONDS):
+    """Reports of ICAO-addressed aircraft; stale positions are left out."""
+    now = float(document["now"])
+    reports = []
+    for aircraft in document.get("aircraft", ()):
+        icao = str(aircraft.get("hex", "")).strip().upper()
+        if not icao or icao.startswith("~"):
+            continue
+        seen = _number(aircraft, "seen") or 0.0
+        seen_pos = _number(aircraft, "seen_pos")
+        latitude = _number(aircraft, "lat")
+        longitude = _number(aircraft, "lon")
+        if (latitude is None or longitude is None or seen_pos is None
+                or seen_pos > max_position_age):
+            latitude = longitude = position_utc = None
+        else:
+            position_utc = _utc(now - seen_pos)
+        altitude = _number(aircraft, "alt_baro", "altitude")
+        rate = _number(aircraft, "baro_rate", "geom_rate", "vert_rate")
+        reports.append(AircraftReport(
+            icao, _utc(now - seen),
+            flight=str(aircraft.get("flight", "")).strip(),
+            altitude_ft=int(round(altitude)) if altitude is not None else None,
+            groundspeed_kt=_number(aircraft, "gs", "speed"),
+            track_deg=_number(aircraft, "track"),
+            vertical_rate_fpm=int(round(rate)) if rate is not None else None,
+            latitude=latitude,
+            longitude=longitude,
+            position_utc=position_utc,
+            mlat="lat" in (aircraft.get("mlat") or ()),
+        ))
+    return reports
+
+
+def _utc(epoch):
+    return datetime.datetime.fromtimestamp(epoch, pytz.utc)
+
+
+def _text(value, pattern="{}"):
+    return "" if value is None else pattern.format(value)
+
+
+class AircraftJsonAdapter:
+    """Diff successive polls and emit ``(line, port)`` for changed aircraft.
+
+    ADS-B records carry local timestamps on ``adsb_port`` like dump1090's
+    SBS output; MLAT positions go to ``mlat_port`` in UTC.
+    """
+
+    def __init__(self, adsb_port, mlat_port, adsb_timestamp_timezone,
+                 max_position_age=MAX_POSITION_AGE_SECONDS):
+        self.adsb_port = adsb_port
+        self.mlat_port = mlat_port
+        self.adsb_timezone = pytz.timezone(adsb_timestamp_timezone)
+        self.max_position_age = max_position_age
+        self._previous = {}
+        self.polls = 0
+        self.aircraft = 0
+        self.changed = 0
+
+    def changed_reports(self, document):
+        reports = parse_aircraft(document, self.max_position_age)
+        previous, self._previous = self._previous, {
+            report.icao: report for report in reports}
+        self.polls += 1
+        self.aircraft = len(reports)
+        changed = [
+            (report, previous.get(report.icao)) for report in reports
+            if report.icao not in previous
+            or previous[report.icao].values() != report.values()]
+        self.changed = len(changed)
+        return changed
+
+    def poll(self, document):
+        """SBS records of the aircraft that changed since the last poll."""
+        records = []
+        for report, previous in self.changed_reports(document):
+            records.extend(self.records(report, previous))
+        return records
+
+    def records(self, report, previous=None):
+        records = []
+        if report.flight and (previous is None
+                              or previous.flight != report.flight):
+            records.append(self._line(
+                "MSG", "1", report, report.seen_utc, self.adsb_port,
+                {10: report.flight}))
+        velocity = {
+            12: _text(report.groundspeed_kt, "{:.0f}"),
+            13: _text(report.track_deg, "{:.1f}"),
+            16: _text(report.vertical_rate_fpm),
+        }
+        if report.latitude is not None and report.mlat:
+            velocity.update({
+                11: _text(report.altitude_ft),
+                14: "{:.5f}".format(report.latitude),
+                15: "{:.5f}".format(report.longitude),
+            })
+            records.append(self._line(
+                "MLAT", "3", report, report.position_utc, self.mlat_port,
+                velocity))
+            return records
+        # Velocity first, so the position record predicts with it.
+        if report.groundspeed_kt is not None or report.track_deg is not None:
+            records.append(self._line(
+                "MSG", "4", report, report.seen_utc, self.adsb_port,
+                velocity))
+        if report.latitude is not None:
+            records.append(self._line(
+                "MSG", "3", report, report.position_utc, self.adsb_port, {
+                    11: _text(report.altitude_ft),
+                    14: "{:.5f}".format(report.latitude),
+                    15: "{:.5f}".format(report.longitude),
+                }))
+        return records
+
+    def _line(self, kind, mtype, report, when, port, values):
+        if port == self.adsb_port:
+            when = when.astimezone(self.adsb_timezone)
+        date, time = when.strftime("%Y/%m/%d"), when.strftime("%H:%M:%S.%f")[:-3]
+        fields = [kind, mtype, "1", "1", report.icao, "1", date, time, date,
+                  time] + [""] * 12
+        for index, value in values.items():
+            fields[index] = value
+        return ",".join(fields), port
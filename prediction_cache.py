@@ -0,0 +1,143 @@
+"""Per-aircraft memo of moving-body solutions for unchanged motion inputs."""
+
+from dataclasses import dataclass
+from math import asin, atan2, cos, degrees, hypot, radians, sin
+
+
+EARTH_RADIUS_KM = 6371.0
+VALIDITY_SECONDS = 5.0
+POSITION_TOLERANCE_KM = 0.05
+TRACK_QUANTUM_DEG = 0.1
+ALTITUDE_QUANTUM_M = 1.0
+
+
+@dataclass(frozen=True)
+class PredictionInputs:
+    position: tuple
+    track_deg: float
+    velocity_kmh: float
+    altitude_m: float
+
+    def key(self):
+        return (
+            round(float(self.track_deg) / TRACK_QUANTUM_DEG),
+            int(self.velocity_kmh),
+            round(float(self.altitude_m) / ALTITUDE_QUANTUM_M),
+        )
+
+
+@dataclass(frozen=True)
+class CachedPrediction:
+    key: tuple
+    inputs: PredictionInputs
+    solved_at_utc: object
+    solution: object
+
+
+@dataclass
+class PredictionCacheStatistics:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        return (
+            "Transit prediction cache: {} hits / {} misses ({:.1%}), "
+            "{} invalidated".format(
+                self.hits, self.misses, self.hit_ratio, self.invalidations))
+
+
+def dead_reckon(position, track_deg, velocity_kmh, seconds):
+    """Move a position along its great circle at constant groundspeed."""
+    latitude, longitude = map(radians, position)
+    track = radians(float(track_deg))
+    angle = float(velocity_kmh) * seconds / 3600 / EARTH_RADIUS_KM
+    target_lat = asin(
+        sin(latitude) * cos(angle)
+        + cos(latitude) * sin(angle) * cos(track))
+    target_lon = longitude + atan2(
+        sin(track) * sin(angle) * cos(latitude),
+        cos(angle) - sin(latitude) * sin(target_lat))
+    return degrees(target_lat), (degrees(target_lon) + 540) % 360 - 180
+
+
+def _offset_km(first, second):
+    latitude = radians((first[0] + second[0]) / 2)
+    delta_lon = (second[1] - first[1] + 540) % 360 - 180
+    return EARTH_RADIUS_KM * hypot(
+        radians(second[0] - first[0]), radians(delta_lon) * cos(latitude))
+
+
+class TransitPredictionCache:
+    """Reuse a solution while the aircraft follows its dead-reckoned path.
+
+    A hit requires the same quantized track, groundspeed and altitude, a
+    caller context (solver, observer) that did not change, a position within
+    ``position_tolerance_km`` of the dead-reckoned one, and a solution younger
+    than ``validity_seconds``; the horizon also bounds how far the body may
+    move relative to the solve.
+    """
+
+    def __init__(self, validity_seconds=VALIDITY_SECONDS,
+                 position_tolerance_km=POSITION_TOLERANCE_KM):
+        self.validity_seconds = validity_seconds
+        self.position_tolerance_km = position_tolerance_km
+        self.statistics = PredictionCacheStatistics()
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, icao, body_name, inputs, now_utc, advance, context=()):
+        """Return ``advance(solution, elapsed_seconds)`` for a valid entry."""
+        entry_key = (icao, body_name)
+        entry = self._entries.get(entry_key)
+        result = None
+        if entry is not None:
+            result = self._advance(entry, inputs, now_utc, advance, context)
+            if result is None:
+                del self._entries[entry_key]
+                self.statistics.invalidations += 1
+        if result is None:
+            self.statistics.misses += 1
+        else:
+            self.statistics.hits += 1
+        return result
+
+    def _advance(self, entry, inputs, now_utc, advance, context):
+        try:
+            key = (inputs.key(), tuple(context))
+        except (TypeError, ValueError):
+            return None
+        if key != entry.key:
+            return None
+        elapsed = (now_utc - entry.solved_at_utc).total_seconds()
+        if elapsed < 0 or elapsed > self.validity_seconds:
+            return None
+        expected = dead_reckon(
+            entry.inputs.position, entry.inputs.track_deg,
+            entry.inputs.velocity_kmh, elapsed)
+        if _offset_km(expected, inputs.position) > self.position_tolerance_km:
+            return None
+        return advance(entry.solution, elapsed)
+
+    def store(self, icao, body_name, inputs, now_utc, solution, context=()):
+        try:
+            key = (inputs.key(), tuple(context))
+        except (TypeError, ValueError):
+            return False
+        self._entries[(icao, body_name)] = CachedPrediction(
+            key, inputs, now_utc, solution)
+        return True
+
+    def discard(self, icao):
+        for entry_key in [key for key in self._entries if key[0] == icao]:
+            del self._entries[entry_key]
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,109 @@
+"""Tiered re-evaluation schedule for the per-aircraft transit prediction."""
+
+import datetime
+import heapq
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class SchedulingTier:
+    name: str
+    interval_seconds: float
+
+
+CANDIDATE_TIER = SchedulingTier("CANDIDATE", 0.0)
+NEAR_TIER = SchedulingTier("NEAR", 2.0)
+FAR_TIER = SchedulingTier("FAR", 5.0)
+TIERS = (CANDIDATE_TIER, NEAR_TIER, FAR_TIER)
+
+CANDIDATE_TIME2X_SECONDS = 60.0
+NEAR_SEPARATION_DEG = 30.0
+
+
+def classify_prediction(separation_deg, time2x_seconds, distance_km,
+                        candidate_separation_deg, candidate_distance_km,
+                        near_distance_km):
+    """Return the tier of one aircraft from its last prediction."""
+    if ((separation_deg is not None
+            and separation_deg < candidate_separation_deg)
+            or (time2x_seconds is not None
+                and time2x_seconds <= CANDIDATE_TIME2X_SECONDS)
+            or (distance_km is not None
+                and distance_km <= candidate_distance_km)):
+        return CANDIDATE_TIER
+    if ((separation_deg is not None and separation_deg < NEAR_SEPARATION_DEG)
+            or (distance_km is not None and distance_km <= near_distance_km)):
+        return NEAR_TIER
+    return FAR_TIER
+
+
+@dataclass
+class SchedulerStatistics:
+    evaluated: Counter = field(default_factory=Counter)
+    deferred: int = 0
+    drained: int = 0
+
+    def summary(self):
+        evaluated = sum(self.evaluated.values())
+        return "Prediction scheduler: {} evaluated, {} deferred, {} drained{}".format(
+            evaluated, self.deferred, self.drained,
+            "".join(" {}={}".format(name, count)
+                    for name, count in sorted(self.evaluated.items())))
+
+
+class PredictionScheduler:
+    """Decide per message whether an aircraft's prediction is due.
+
+    Deferred aircraft wait in a due-time heap; ``pop_due`` returns them once
+    their tier interval has elapsed, so the staleness of every tier is
+    bounded by its interval plus the period at which ``pop_due`` is called.
+    """
+
+    def __init__(self):
+        self.statistics = SchedulerStatistics()
+        self._next_due = {}
+        self._tiers = {}
+        self._pending = {}
+        self._heap = []
+
+    def tier(self, icao):
+        return self._tiers.get(icao, CANDIDATE_TIER)
+
+    def should_evaluate(self, icao, now_utc):
+        due = self._next_due.get(icao)
+        if due is None or now_utc >= due:
+            return True
+        if icao not in self._pending:
+            self._pending[icao] = due
+            heapq.heappush(
+                self._heap, (due, TIERS.index(self.tier(icao)), icao))
+        self.statistics.deferred += 1
+        return False
+
+    def next_due(self, icao):
+        """When the last evaluation's interval ends; None before the first."""
+        return self._next_due.get(icao)
+
+    def record_evaluation(self, icao, now_utc, tier):
+        self._tiers[icao] = tier
+        self._next_due[icao] = now_utc + datetime.timedelta(
+            seconds=tier.interval_seconds)
+        self._pending.pop(icao, None)
+        self.statistics.evaluated[tier.name] += 1
+
+    def pop_due(self, now_utc):
+        """Return pending aircraft whose interval elapsed, earliest first."""
+        due = []
+        while self._heap and self._heap[0][0] <= now_utc:
+            entry_due, _, icao = heapq.heappop(self._heap)
+            if self._pending.get(icao) == entry_due:
+                del self._pending[icao]
+                due.append(icao)
+        self.statistics.drained += len(due)
+        return due
+
+    def discard(self, icao):
+        self._next_due.pop(icao, None)
+        self._tiers.pop(icao, None)
+        self._pending.pop(icao, None)
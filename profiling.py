@@ -0,0 +1,298 @@
+"""On-demand CPU sampling and tracemalloc snapshots for the diagnostics directory.
+
+Requests come from signal handlers or the status server and only record what
+was asked for; ``DiagnosticsProfiler.process`` starts captures and writes files
+from the main loop.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+DEFAULT_PROFILE_SECONDS = 30.0
+DEFAULT_SAMPLE_INTERVAL = 0.005
+MAX_PROFILE_SECONDS = 3600.0
+TOP_FUNCTIONS = 30
+TOP_ALLOCATORS = 25
+TRACEMALLOC_FRAMES = 1
+
+
+def frame_label(frame):
+    """``file.py:qualname`` without the separators of the collapsed format."""
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    label = "{}:{}".format(os.path.basename(code.co_filename), name)
+    return label.replace(";", ":").replace(" ", "_")
+
+
+def collapse_stack(frame, thread_name):
+    """One ``thread;outer;...;inner`` line key for a flame graph."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name.replace(";", ":").replace(" ", "_"))
+    return ";".join(reversed(labels))
+
+
+@dataclass
+class CpuProfile:
+    started_at_utc: object
+    seconds: float
+    interval: float
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+
+    def collapsed(self):
+        """Brendan Gregg's collapsed format: ``stack count`` per line."""
+        return "".join(
+            "{} {}\n".format(stack, count)
+            for stack, count in sorted(self.stacks.items()))
+
+    def function_counts(self):
+        """(own, total) samples per function; the thread frame is skipped."""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for label in set(frames):
+                total[label] += count
+        return own, total
+
+    def summary(self, limit=TOP_FUNCTIONS):
+        own, total = self.function_counts()
+        sampled = sum(self.stacks.values()) or 1
+        lines = [
+            "CPU profile started {} for {:.1f} s".format(
+                self.started_at_utc, self.seconds),
+            "Sampling rounds: {} every {:.1f} ms across all threads".format(
+                self.samples, self.interval * 1000.0),
+            "Blocked threads are sampled too, so socket reads and sleeps "
+            "show up as wall time.",
+        ]
+        for title, counts in (("Own samples", own), ("Total samples", total)):
+            lines.extend(("", title))
+            for label, count in counts.most_common(limit):
+                lines.append("{:>8} {:>6.1f}%  {}".format(
+                    count, 100.0 * count / sampled, label))
+        return "\n".join(lines) + "\n"
+
+
+class StackSampler:
+    """Sample every thread's Python stack from a daemon thread.
+
+    cProfile only sees the thread that enables it, while the feed work runs
+    in the reader threads, so the stacks come from ``sys._current_frames``.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._profile = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds, started_at_utc=None):
+        if self._thread is not None:
+            raise RuntimeError("a CPU profile is already running")
+        self._stop.clear()
+        self._profile = CpuProfile(started_at_utc, seconds, self.interval)
+        self._thread = threading.Thread(
+            target=self._run, args=(seconds,), name="cpu-profiler",
+            daemon=True)
+        self._thread.start()
+
+    def _run(self, seconds):
+        own = threading.get_ident()
+        profile = self._profile
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline and not self._stop.is_set():
+            names = {thread.ident: thread.name
+                     for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    profile.stacks[collapse_stack(
+                        frame, names.get(ident, str(ident)))] += 1
+            profile.samples += 1
+            self._stop.wait(self.interval)
+
+    def collect(self):
+        """The finished profile once, then None until the next start."""
+        if self._thread is None or self._thread.is_alive():
+            return None
+        self._thread.join()
+        self._thread = None
+        profile, self._profile = self._profile, None
+        return profile
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+
+class MemorySnapshots:
+    """tracemalloc snapshots with top allocators and growth since the last one.
+
+    Tracing starts with the first snapshot and then stays on; only the
+    allocations made after that show up.
+    """
+
+    def __init__(self, frames=TRACEMALLOC_FRAMES, limit=TOP_ALLOCATORS):
+        self.frames = frames
+        self.limit = limit
+        self.previous = None
+        self.started_tracing = False
+
+    def start_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+            self.previous = None
+
+    def take(self, taken_at_utc=None):
+        """Return the text report of a new snapshot."""
+        self.start_tracing()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            "Memory snapshot {}".format(taken_at_utc),
+            "Traced: {:.1f} KiB, peak {:.1f} KiB".format(
+                current / 1024.0, peak / 1024.0),
+            "",
+            "Top allocators",
+        ]
+        lines.extend(str(statistic) for statistic in
+                     snapshot.statistics("lineno")[:self.limit])
+        lines.extend(("", "Growth since the previous snapshot"))
+        if self.previous is None:
+            lines.append("(first snapshot since tracing started)")
+        else:
+            growth = [difference for difference in
+                      snapshot.compare_to(self.previous, "lineno")
+                      if difference.size_diff > 0]
+            growth.sort(key=lambda difference: difference.size_diff,
+                        reverse=True)
+            lines.extend(str(difference) for difference in growth[:self.limit])
+        self.previous = snapshot
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        if self.started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.started_tracing = False
+        self.previous = None
+
+
+def profile_seconds(value, default=DEFAULT_PROFILE_SECONDS):
+    """Validate a requested capture length; ValueError when out of range."""
+    seconds = default if value is None else float(value)
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise ValueError("profile length must be in (0, {:g}] seconds".format(
+            MAX_PROFILE_SECONDS))
+    return seconds
+
+
+class DiagnosticsProfiler:
+    """Queue profiling requests and serve them from the main loop."""
+
+    def __init__(self, default_seconds=DEFAULT_PROFILE_SECONDS,
+                 sampler=None, memory=None):
+        self.default_seconds = profile_seconds(default_seconds)
+        self.sampler = sampler or StackSampler()
+        self.memory = memory or MemorySnapshots()
+        self._lock = threading.Lock()
+        self._signal_requested = threading.Event()
+        self._cpu_seconds = None
+        self._memory_requested = False
+        self._memory_after_cpu = False
+
+    def request_cpu_profile(self, seconds=None, memory_snapshot=False):
+        """Ask for a capture; ``memory_snapshot`` also takes one when it ends."""
+        seconds = profile_seconds(seconds, self.default_seconds)
+        with self._lock:
+            self._cpu_seconds = seconds
+            self._memory_after_cpu = self._memory_after_cpu or memory_snapshot
+        return seconds
+
+    def request_memory_snapshot(self):
+        with self._lock:
+            self._memory_requested = True
+
+    def request_from_signal(self, signum=None, frame=None):
+        """Signal handler: a timed CPU profile followed by a memory snapshot.
+
+        It runs on the main thread, which may hold ``_lock`` in ``process``,
+        so it only sets an event that ``process`` picks up.
+        """
+        self._signal_requested.set()
+
+    def process(self, now_utc, directory):
+        """Start or finish requested captures; return [(kind, path)] written."""
+        signal_requested = self._signal_requested.is_set()
+        if signal_requested:
+            self._signal_requested.clear()
+        with self._lock:
+            if signal_requested:
+                self._cpu_seconds = self.default_seconds
+                self._memory_after_cpu = True
+            cpu_seconds, self._cpu_seconds = self._cpu_seconds, None
+            memory_requested, self._memory_requested = (
+                self._memory_requested, False)
+            memory_after_cpu = self._memory_after_cpu
+        written = []
+        profile = self.sampler.collect()
+        if profile is not None:
+            written.extend(self._write_cpu_profile(profile, directory))
+            if memory_after_cpu:
+                with self._lock:
+                    self._memory_after_cpu = False
+                memory_requested = True
+        if cpu_seconds is not None and not self.sampler.running:
+            if memory_after_cpu:
+                self.memory.start_tracing()
+            self.sampler.start(cpu_seconds, now_utc)
+        if memory_requested:
+            written.append(("Memory snapshot", self._write(
+                directory, now_utc, "memory_snapshot", ".txt",
+                self.memory.take(now_utc))))
+        return written
+
+    def _write_cpu_profile(self, profile, directory):
+        started = profile.started_at_utc
+        return [
+            ("CPU profile", self._write(
+                directory, started, "cpu_profile", ".txt", profile.summary())),
+            ("CPU stacks", self._write(
+                directory, started, "cpu_profile", ".collapsed",
+                profile.collapsed())),
+        ]
+
+    @staticmethod
+    def _write(directory, when, stem, extension, text):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / when.strftime(
+            "{}_%Y%m%d_%H%M%S_UTC{}".format(stem, extension))
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def close(self):
+        self.sampler.stop()
+        self.memory.close()
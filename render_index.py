@@ -0,0 +1,137 @@
+"""Terminal row priority kept up to date per aircraft instead of per frame.
+
+Candidates are held sorted by predicted transit instant, which orders them
+the same way as the remaining seconds shown in the table, so a frame only
+walks the rows it shows plus any rows tied with the last one.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+
+
+class RenderPriorityIndex:
+    """Ordered transit candidates and in-range aircraft of one observer.
+
+    ``update`` takes an aircraft's distance and its ``(body_priority,
+    predicted_utc, stored_time2x)`` candidates; a candidate without a
+    predicted instant keeps its stored time. Aircraft keep the order in
+    which they were first updated, like the plane dictionary they mirror.
+    """
+
+    def __init__(self, display_precision=3):
+        self.display_precision = display_precision
+        self.source_id = None
+        self._sequence = {}
+        self._next_sequence = 0
+        self._distance = {}
+        self._items = {}
+        self._timed = []
+        self._stored = []
+        self._maximum_distance = None
+        self._in_range = []
+
+    def __len__(self):
+        return len(self._sequence)
+
+    def __contains__(self, icao):
+        return icao in self._sequence
+
+    def clear(self):
+        self.__init__(self.display_precision)
+
+    def _is_in_range(self, icao):
+        return self._is_in_range_distance(self._distance[icao])
+
+    def _is_in_range_distance(self, distance):
+        return self._maximum_distance is None or (
+            distance is not None and distance <= self._maximum_distance)
+
+    def set_maximum_distance(self, maximum_distance):
+        if maximum_distance == self._maximum_distance:
+            return
+        self._maximum_distance = maximum_distance
+        self._in_range = sorted(
+            (sequence, icao) for icao, sequence in self._sequence.items()
+            if self._is_in_range(icao))
+
+    def update(self, icao, distance, candidates):
+        sequence = self._sequence.get(icao)
+        if sequence is None:
+            sequence = self._sequence[icao] = self._next_sequence
+            self._next_sequence += 1
+            was_in_range = False
+        else:
+            was_in_range = self._is_in_range(icao)
+        self._distance[icao] = distance
+        is_in_range = self._is_in_range(icao)
+        if was_in_range != is_in_range:
+            if is_in_range:
+                insort(self._in_range, (sequence, icao))
+            else:
+                _remove(self._in_range, (sequence, icao))
+        items = []
+        for priority, predicted_utc, stored_time2x in candidates:
+            if predicted_utc is not None:
+                items.append((True, (predicted_utc, priority, sequence, icao)))
+            elif stored_time2x > 0:
+                items.append((False, (stored_time2x, priority, sequence, icao)))
+        previous = self._items.get(icao, [])
+        if items == previous:
+            return
+        for timed, item in previous:
+            _remove(self._timed if timed else self._stored, item)
+        for timed, item in items:
+            insort(self._timed if timed else self._stored, item)
+        self._items[icao] = items
+
+    def discard(self, icao):
+        sequence = self._sequence.pop(icao, None)
+        if sequence is None:
+            return
+        for timed, item in self._items.pop(icao, ()):
+            _remove(self._timed if timed else self._stored, item)
+        if self._is_in_range_distance(self._distance.pop(icao)):
+            _remove(self._in_range, (sequence, icao))
+
+    def _candidates(self, now_utc):
+        """``(shown_time, body_priority, sequence, icao)`` by shown time."""
+        timed = (
+            (max(0, int((predicted_utc - now_utc).total_seconds())),
+             priority, sequence, icao)
+            for predicted_utc, priority, sequence, icao in self._timed)
+        stored = (
+            (round(time2x, self.display_precision), priority, sequence, icao)
+            for time2x, priority, sequence, icao in self._stored)
+        return heapq.merge(
+            (item for item in timed if item[0] > 0), stored,
+            key=lambda item: item[0])
+
+    def plan(self, row_limit, now_utc):
+        """The first ``row_limit`` in-range aircraft: candidates by nearest
+        shown time, then Sun before Moon, then the rest in arrival order."""
+        if row_limit <= 0:
+            return ()
+        best = {}
+        last_time = None
+        for shown_time, priority, sequence, icao in self._candidates(now_utc):
+            if not self._is_in_range(icao):
+                continue
+            if len(best) >= row_limit and shown_time > last_time:
+                break
+            key = (shown_time, priority, sequence)
+            if icao not in best or key < best[icao]:
+                best[icao] = key
+            last_time = shown_time
+        shown = sorted(best, key=best.get)[:row_limit]
+        for _, icao in self._in_range:
+            if len(shown) >= row_limit:
+                break
+            if icao not in best:
+                shown.append(icao)
+        return tuple(shown)
+
+
+def _remove(ordered, item):
+    index = bisect_left(ordered, item)
+    if index < len(ordered) and ordered[index] == item:
+        del ordered[index]
@@ -6,6 +6,7 @@ import argparse
 import socket
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +19,8 @@ from transit_time import port_timestamp_to_utc
 ADSB_PORT = 30003
 MLAT_PORT = 30106
 TIMESTAMP_FORMAT = "%Y/%m/%d %H:%M:%S.%f"
+DEFAULT_SEND_BUFFER_LINES = 65536
+SLOW_CLIENT_POLICIES = ("block", "disconnect")
 
 
 @dataclass(frozen=True)
@@ -183,8 +186,141 @@ def replay_lines(
     return count, pacer.backward_timestamps if pacer else 0
 
 
+class BufferedClient:
+    """One consumer with its own bounded send buffer and sender thread.
+
+    When the buffer is full, ``block`` holds the shared timeline until this
+    client catches up; ``disconnect`` drops the client instead.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        stop_event: threading.Event,
+        buffer_lines: int = DEFAULT_SEND_BUFFER_LINES,
+        slow_client: str = "block",
+    ) -> None:
+        if buffer_lines <= 0:
+            raise ValueError("buffer_lines must be positive")
+        if slow_client not in SLOW_CLIENT_POLICIES:
+            raise ValueError(f"unknown slow client policy: {slow_client}")
+        self.sock = sock
+        self.stop_event = stop_event
+        self.buffer_lines = buffer_lines
+        self.slow_client = slow_client
+        try:
+            host, port = sock.getpeername()[:2]
+            self.name = f"{host}:{port}"
+        except (OSError, TypeError, ValueError):
+            self.name = "client"
+        self.sent = 0
+        self.dropped: str | None = None
+        self._pending: deque[bytes] = deque()
+        self._finished = False
+        self._ready = threading.Condition()
+        self._thread = threading.Thread(target=self._send_loop, daemon=True)
+        self._thread.start()
+
+    def offer(self, payload: bytes) -> bool:
+        """Queue one line; False once the client is gone."""
+        with self._ready:
+            while (len(self._pending) >= self.buffer_lines
+                   and self.dropped is None):
+                if self.slow_client == "disconnect":
+                    self._drop("send buffer full")
+                elif self.stop_event.is_set():
+                    self._drop("stopped")
+                else:
+                    self._ready.wait(0.5)
+            if self.dropped is not None:
+                return False
+            self._pending.append(payload)
+            self._ready.notify_all()
+            return True
+
+    def close(self, timeout: float | None = None) -> None:
+        """Send what is buffered, then close the connection."""
+        with self._ready:
+            self._finished = True
+            self._ready.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            with self._ready:
+                self._drop("not drained before shutdown")
+            self._thread.join(timeout)
+
+    def summary(self) -> str:
+        state = f"dropped ({self.dropped})" if self.dropped else "complete"
+        return f"{self.name}: {self.sent} messages, {state}"
+
+    def _drop(self, reason: str) -> None:
+        # Called with the condition held.
+        if self.dropped is None:
+            self.dropped = reason
+            self._pending.clear()
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._ready.notify_all()
+
+    def _send_loop(self) -> None:
+        try:
+            while True:
+                with self._ready:
+                    while (not self._pending and not self._finished
+                           and self.dropped is None):
+                        self._ready.wait()
+                    if self.dropped is not None or not self._pending:
+                        return
+                    batch = list(self._pending)
+                    self._pending.clear()
+                    self._ready.notify_all()
+                try:
+                    self.sock.sendall(b"".join(batch))
+                except OSError as error:
+                    with self._ready:
+                        self._drop(f"disconnected: {error}")
+                    return
+                self.sent += len(batch)
+        finally:
+            self.sock.close()
+
+
+class ClientGroup:
+    """Broadcast one port's timeline to every consumer connected to it."""
+
+    def __init__(
+        self,
+        sockets: Iterable[socket.socket],
+        stop_event: threading.Event,
+        buffer_lines: int = DEFAULT_SEND_BUFFER_LINES,
+        slow_client: str = "block",
+    ) -> None:
+        self.members = [
+            BufferedClient(sock, stop_event, buffer_lines, slow_client)
+            for sock in sockets
+        ]
+
+    def sendall(self, payload: bytes) -> None:
+        live = [member.offer(payload) for member in self.members]
+        if not any(live):
+            raise BrokenPipeError("all replay clients disconnected")
+
+    def close(self, timeout: float | None = None) -> None:
+        for member in self.members:
+            member.close(timeout)
+
+    def summaries(self) -> list[str]:
+        return [member.summary() for member in self.members]
+
+
 class ReplayServer:
-    """Serve one recorded stream and keep Transit Warning's other port quiet."""
+    """Serve one recorded stream and keep Transit Warning's other port quiet.
+
+    Each run waits for ``clients`` consumers on the active port and
+    broadcasts the same paced timeline to all of them.
+    """
 
     def __init__(
         self,
@@ -192,11 +328,19 @@ class ReplayServer:
         source_path: Path,
         speed: float | None,
         host: str = "127.0.0.1",
+        clients: int = 1,
+        send_buffer_lines: int = DEFAULT_SEND_BUFFER_LINES,
+        slow_client: str = "block",
     ) -> None:
+        if clients <= 0:
+            raise ValueError("clients must be positive")
         self.scenario = scenario
         self.source_path = source_path
         self.speed = speed
         self.host = host
+        self.clients = clients
+        self.send_buffer_lines = send_buffer_lines
+        self.slow_client = slow_client
         self.stop_event = threading.Event()
         self._listeners: list[socket.socket] = []
         self._threads: list[threading.Thread] = []
@@ -205,7 +349,7 @@ class ReplayServer:
         listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         listener.bind((self.host, port))
-        listener.listen(1)
+        listener.listen(self.clients)
         listener.settimeout(0.5)
         self._listeners.append(listener)
         return listener
@@ -242,12 +386,19 @@ class ReplayServer:
 
     def _active_worker(self, listener: socket.socket) -> None:
         while not self.stop_event.is_set():
-            client = self._accept(listener)
-            if client is None:
-                return
+            sockets = []
+            while len(sockets) < self.clients:
+                client = self._accept(listener)
+                if client is None:
+                    for sock in sockets:
+                        sock.close()
+                    return
+                sockets.append(client)
+            group = ClientGroup(
+                sockets, self.stop_event, self.send_buffer_lines, self.slow_client)
             try:
-                with client, self.source_path.open("r", encoding="utf-8", newline="") as source:
-                    count, backwards = replay_lines(source, client, self.speed, self.stop_event)
+                with self.source_path.open("r", encoding="utf-8", newline="") as source:
+                    count, backwards = replay_lines(source, group, self.speed, self.stop_event)
                     print(f"Replay connection finished: {count} messages, "
                           f"{backwards} backward timestamps")
             except ValueError as error:
@@ -255,22 +406,31 @@ class ReplayServer:
             except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError, OSError) as error:
                 if not self.stop_event.is_set():
                     print(f"Replay client disconnected: {error}")
+            finally:
+                group.close(timeout=2 if self.stop_event.is_set() else None)
+                if self.clients > 1:
+                    for summary in group.summaries():
+                        print(f"  {summary}")
 
     def _silent_worker(self, listener: socket.socket) -> None:
         while not self.stop_event.is_set():
             client = self._accept(listener)
             if client is None:
                 return
-            with client:
-                client.settimeout(0.5)
-                while not self.stop_event.is_set():
-                    try:
-                        if not client.recv(1):
-                            break
-                    except socket.timeout:
-                        continue
-                    except (ConnectionResetError, ConnectionAbortedError, OSError):
+            threading.Thread(
+                target=self._hold_silent, args=(client,), daemon=True).start()
+
+    def _hold_silent(self, client: socket.socket) -> None:
+        with client:
+            client.settimeout(0.5)
+            while not self.stop_event.is_set():
+                try:
+                    if not client.recv(1):
                         break
+                except socket.timeout:
+                    continue
+                except (ConnectionResetError, ConnectionAbortedError, OSError):
+                    break
 
     def serve_forever(self) -> None:
         self.start()
@@ -278,6 +438,9 @@ class ReplayServer:
         print(f"Scenario {self.scenario.name}: {self.source_path}")
         print(f"Active {self.host}:{self.scenario.active_port} at {speed}; "
               f"silent {self.host}:{self.scenario.silent_port}")
+        if self.clients > 1:
+            print(f"Broadcasting to {self.clients} clients per run "
+                  f"(slow clients: {self.slow_client})")
         try:
             while not self.stop_event.wait(1):
                 pass
@@ -295,7 +458,10 @@ class ReplayServer:
 
 
 class DualReplayServer:
-    """Serve two files through one scheduler after both clients connect."""
+    """Serve two files through one scheduler after all clients connect.
+
+    Each run waits for ``clients`` consumers on both ports.
+    """
 
     def __init__(
         self,
@@ -304,10 +470,18 @@ class DualReplayServer:
         adsb_timestamp_timezone: str,
         host: str = "127.0.0.1",
         ports: tuple[int, int] = (ADSB_PORT, MLAT_PORT),
+        clients: int = 1,
+        send_buffer_lines: int = DEFAULT_SEND_BUFFER_LINES,
+        slow_client: str = "block",
     ) -> None:
+        if clients <= 0:
+            raise ValueError("clients must be positive")
         self.scenario = scenario
         self.speed = speed
         self.host = host
+        self.clients = clients
+        self.send_buffer_lines = send_buffer_lines
+        self.slow_client = slow_client
         self.adsb_port, self.mlat_port = ports
         self.adsb_timestamp_timezone = adsb_timestamp_timezone
         self.stop_event = threading.Event()
@@ -318,7 +492,7 @@ class DualReplayServer:
         listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         listener.bind((self.host, port))
-        listener.listen(1)
+        listener.listen(self.clients)
         listener.settimeout(0.5)
         return listener
 
@@ -353,13 +527,21 @@ class DualReplayServer:
 
     def _worker(self) -> None:
         while not self.stop_event.is_set():
-            clients: dict[int, socket.socket] = {}
+            sockets: dict[int, list[socket.socket]] = {ADSB_PORT: [], MLAT_PORT: []}
+            clients: dict[int, ClientGroup] = {}
             try:
                 for port in (ADSB_PORT, MLAT_PORT):
-                    client = self._accept(self._listeners[port])
-                    if client is None:
-                        return
-                    clients[port] = client
+                    while len(sockets[port]) < self.clients:
+                        client = self._accept(self._listeners[port])
+                        if client is None:
+                            return
+                        sockets[port].append(client)
+                clients = {
+                    port: ClientGroup(
+                        members, self.stop_event, self.send_buffer_lines,
+                        self.slow_client)
+                    for port, members in sockets.items()
+                }
                 with self.scenario.adsb_path.open("r", encoding="utf-8", newline="") as adsb_source, \
                      self.scenario.mlat_path.open("r", encoding="utf-8", newline="") as mlat_source:
                     count = replay_dual_streams(
@@ -373,8 +555,15 @@ class DualReplayServer:
                 if not self.stop_event.is_set():
                     print(f"Dual replay client disconnected; restarting both streams: {error}")
             finally:
-                for client in clients.values():
-                    client.close()
+                if not clients:
+                    for members in sockets.values():
+                        for sock in members:
+                            sock.close()
+                for port, group in clients.items():
+                    group.close(timeout=2 if self.stop_event.is_set() else None)
+                    if self.clients > 1:
+                        for summary in group.summaries():
+                            print(f"  port {port} {summary}")
 
     def serve_forever(self) -> None:
         self.start()
@@ -383,6 +572,9 @@ class DualReplayServer:
               f"MLAT {self.scenario.mlat_path}")
         print(f"Waiting for both {self.host}:{self.adsb_port} and "
               f"{self.host}:{self.mlat_port}; shared scheduler at {speed}")
+        if self.clients > 1:
+            print(f"Broadcasting to {self.clients} clients per port "
+                  f"(slow clients: {self.slow_client})")
         try:
             while not self.stop_event.wait(1):
                 pass
@@ -407,12 +599,26 @@ def parse_speed(value: str) -> float | None:
     return float(value)
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return number
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("scenario", choices=tuple(SCENARIOS) + tuple(DUAL_SCENARIOS))
     parser.add_argument("--speed", default="1", type=parse_speed, metavar="{1,10,100,max}")
     parser.add_argument("--file", type=Path, help="override the scenario's recording path")
     parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--clients", default=1, type=positive_int,
+                        help="consumers per port that share each replay run")
+    parser.add_argument("--send-buffer", default=DEFAULT_SEND_BUFFER_LINES,
+                        type=positive_int, metavar="LINES",
+                        help="per-client send buffer")
+    parser.add_argument("--slow-client", default="block", choices=SLOW_CLIENT_POLICIES,
+                        help="hold the timeline for a full buffer, or drop that client")
     return parser
 
 
@@ -427,10 +633,16 @@ def main() -> None:
             raise SystemExit(str(error))
         DualReplayServer(
             DUAL_SCENARIOS[args.scenario], args.speed, adsb_timestamp_timezone, args.host,
+            clients=args.clients, send_buffer_lines=args.send_buffer,
+            slow_client=args.slow_client,
         ).serve_forever()
         return
     scenario = SCENARIOS[args.scenario]
-    ReplayServer(scenario, args.file or scenario.default_path, args.speed, args.host).serve_forever()
+    ReplayServer(
+        scenario, args.file or scenario.default_path, args.speed, args.host,
+        clients=args.clients, send_buffer_lines=args.send_buffer,
+        slow_client=args.slow_client,
+    ).serve_forever()
 
 
 if __name__ == "__main__":
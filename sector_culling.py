@@ -0,0 +1,171 @@
+"""Cheap azimuth-sector pre-filter run before the moving-body solver."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from math import atan, atan2, cos, degrees, hypot, radians, sin
+
+
+SECTOR_WIDTH_DEG = 10
+SECTOR_COUNT = 360 // SECTOR_WIDTH_DEG
+HORIZON_SECONDS = 900.0
+# Covers the rounded, up to one tick old body state and the flat bearings.
+AZIMUTH_MARGIN_DEG = 5.0
+# Near the zenith the body azimuth is ill-conditioned; never cull by bearing.
+MAX_BEARING_CULL_BODY_ALTITUDE_DEG = 75.0
+
+
+class SectorCullReason(str, Enum):
+    HEADING_AWAY = "HEADING_AWAY"
+    BEARING_OUT_OF_REACH = "BEARING_OUT_OF_REACH"
+    ELEVATION_OUT_OF_REACH = "ELEVATION_OUT_OF_REACH"
+
+
+@dataclass
+class SectorCullDiagnostics:
+    evaluated: int = 0
+    culled: Counter = field(default_factory=Counter)
+
+    def record(self, body_name, reason):
+        self.evaluated += 1
+        if reason is not None:
+            self.culled[(body_name, reason)] += 1
+
+    @property
+    def culled_count(self):
+        return sum(self.culled.values())
+
+    @property
+    def skip_ratio(self):
+        return self.culled_count / self.evaluated if self.evaluated else 0.0
+
+    def summary(self):
+        reasons = Counter()
+        for (_, reason), count in self.culled.items():
+            reasons[reason.value] += count
+        return "Solver sector culling: {}/{} skipped ({:.1%}){}".format(
+            self.culled_count, self.evaluated, self.skip_ratio,
+            "".join(" {}={}".format(reason, count)
+                    for reason, count in sorted(reasons.items())))
+
+
+def sector_of(azimuth_deg):
+    return int(azimuth_deg % 360 // SECTOR_WIDTH_DEG) % SECTOR_COUNT
+
+
+def _wrap(angle_deg):
+    return (angle_deg + 180) % 360 - 180
+
+
+@lru_cache(maxsize=None)
+def reachable_sectors(aircraft_sector, heading_sector):
+    """Return observer sectors a straight track can sweep at any range.
+
+    Seen from the observer, the bearing of a straight track rotates
+    monotonically from its current bearing towards its heading without
+    reaching it; a track passing near the observer can sweep either side.
+    """
+    start = aircraft_sector * SECTOR_WIDTH_DEG
+    offset = _wrap((heading_sector - aircraft_sector) * SECTOR_WIDTH_DEG)
+    low_offset = offset - SECTOR_WIDTH_DEG
+    high_offset = offset + SECTOR_WIDTH_DEG
+    if low_offset <= -180 or high_offset >= 180:
+        return frozenset(range(SECTOR_COUNT))
+    first = start + min(0, low_offset)
+    last = start + SECTOR_WIDTH_DEG + max(0, high_offset)
+    return frozenset(
+        sector_of(angle)
+        for angle in range(
+            first - SECTOR_WIDTH_DEG, last + SECTOR_WIDTH_DEG,
+            SECTOR_WIDTH_DEG))
+
+
+def _arc_sectors(start_deg, sweep_deg, margin_deg):
+    low = min(start_deg, start_deg + sweep_deg) - margin_deg
+    high = max(start_deg, start_deg + sweep_deg) + margin_deg
+    first, last = sector_of(low), sector_of(high)
+    sectors = {first}
+    while first != last:
+        first = (first + 1) % SECTOR_COUNT
+        sectors.add(first)
+    return sectors
+
+
+def _arcs_overlap(start_a, sweep_a, start_b, sweep_b, margin_deg):
+    if sweep_a < 0:
+        start_a, sweep_a = start_a + sweep_a, -sweep_a
+    if sweep_b < 0:
+        start_b, sweep_b = start_b + sweep_b, -sweep_b
+    return (
+        (start_b - start_a + margin_deg) % 360 <= sweep_a + 2 * margin_deg
+        or (start_a - start_b + margin_deg) % 360 <= sweep_b + 2 * margin_deg)
+
+
+def sector_cull_reason(frame, plane_position, track_deg, velocity_kmh,
+                       altitude_m, body_altitude_deg, body_azimuth_deg,
+                       body_azimuth_sweep_deg=0.0,
+                       body_altitude_sweep_deg=0.0,
+                       separation_margin_deg=15.0,
+                       vertical_allowance_m=0.0,
+                       horizon_seconds=HORIZON_SECONDS):
+    """Return why the solver cannot find a transit, or None to run it.
+
+    The sweeps are the signed body motion over the horizon; the separation
+    margin and vertical allowance keep every prediction the solver could
+    still report.
+    """
+    try:
+        track_deg = float(track_deg)
+        path_km = float(velocity_kmh) * horizon_seconds / 3600
+        altitude_m = float(altitude_m)
+        body_altitude_deg = float(body_altitude_deg)
+        body_azimuth_deg = float(body_azimuth_deg)
+    except (TypeError, ValueError):
+        return None
+    if path_km <= 0:
+        return None
+
+    east, north = frame.local_offset_km(*plane_position)
+    distance_km = hypot(east, north)
+    direction_east, direction_north = (
+        sin(radians(track_deg)), cos(radians(track_deg)))
+    along = -(east * direction_east + north * direction_north)
+    closest = min(max(along, 0.0), path_km)
+    end_east = east + path_km * direction_east
+    end_north = north + path_km * direction_north
+    closest_km = hypot(east + closest * direction_east,
+                       north + closest * direction_north)
+
+    # Lateral offset of the solver's great circle from the straight track.
+    path_error_km = 0.5 + path_km ** 2 * (
+        1 + abs(frame.sin_lat / frame.cos_lat)) / (2 * frame.radius_km)
+    margin_deg = AZIMUTH_MARGIN_DEG + degrees(
+        atan2(path_error_km, closest_km))
+    if (body_altitude_deg <= MAX_BEARING_CULL_BODY_ALTITUDE_DEG
+            and margin_deg < 90):
+        aircraft_azimuth = degrees(atan2(east, north)) % 360
+        body_sectors = _arc_sectors(
+            body_azimuth_deg, body_azimuth_sweep_deg, margin_deg)
+        if body_sectors.isdisjoint(reachable_sectors(
+                sector_of(aircraft_azimuth), sector_of(track_deg))):
+            return SectorCullReason.HEADING_AWAY
+        aircraft_sweep = _wrap(
+            degrees(atan2(end_east, end_north)) - aircraft_azimuth)
+        if not _arcs_overlap(
+                aircraft_azimuth, aircraft_sweep, body_azimuth_deg,
+                body_azimuth_sweep_deg, margin_deg):
+            return SectorCullReason.BEARING_OUT_OF_REACH
+
+    height_m = altitude_m - frame.elevation_m
+    farthest_km = max(distance_km, hypot(end_east, end_north))
+    highest = degrees(atan(
+        (height_m + vertical_allowance_m) / (max(closest_km, 0.001) * 1000)))
+    lowest = degrees(atan(
+        (height_m - vertical_allowance_m) / (max(farthest_km, 0.001) * 1000)))
+    body_low = body_altitude_deg - abs(body_altitude_sweep_deg)
+    body_high = body_altitude_deg + abs(body_altitude_sweep_deg)
+    if (highest < body_low - separation_margin_deg
+            or lowest > body_high + separation_margin_deg):
+        return SectorCullReason.ELEVATION_OUT_OF_REACH
+    return None
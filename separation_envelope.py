@@ -0,0 +1,139 @@
+"""Sigma-point uncertainty envelope of a predicted transit separation.
+
+The frozen solver inputs are perturbed along each uncertain axis by
+``sqrt(n)`` standard deviations, which reproduces the mean and variance of
+a linear model exactly with 2n evaluations; the separation is then treated as
+normally distributed to give an interval and a transit probability.
+"""
+
+import math
+from dataclasses import dataclass, replace
+
+
+KM_PER_DEGREE = math.radians(1) * 6371.0
+# Coverage of the reported interval, in standard deviations.
+INTERVAL_SIGMAS = 2.0
+DEFAULT_BODY_DIAMETER_ARCSEC = 1900.0
+
+
+@dataclass(frozen=True)
+class EnvelopeUncertainty:
+    """One-sigma input errors; positions depend on the reporting source."""
+
+    position_adsb_km: float = 0.05
+    position_mlat_km: float = 0.3
+    groundspeed_kmh: float = 10.0
+    track_deg: float = 1.5
+    altitude_m: float = 25.0
+
+    def position_km(self, source):
+        return self.position_mlat_km if source == "mlat" else self.position_adsb_km
+
+
+@dataclass(frozen=True)
+class EnvelopeInputs:
+    latitude: float
+    longitude: float
+    track_deg: float
+    groundspeed_kmh: float
+    altitude_m: float
+
+
+@dataclass(frozen=True)
+class SeparationEnvelope:
+    separation_deg: float
+    low_deg: float
+    high_deg: float
+    sigma_deg: float | None
+    transit_probability: float | None
+    samples: int
+    solved: int
+
+    def as_dict(self):
+        return {
+            "separation_deg": self.separation_deg,
+            "interval_deg": [self.low_deg, self.high_deg],
+            "sigma_deg": self.sigma_deg,
+            "transit_probability": self.transit_probability,
+            "samples": self.samples,
+            "solved": self.solved,
+        }
+
+
+def sigma_points(inputs, position_sigma_km, groundspeed_sigma_kmh,
+                 track_sigma_deg, altitude_sigma_m):
+    """The 2n symmetric points around ``inputs``; zero sigmas are skipped."""
+    cos_lat = max(math.cos(math.radians(inputs.latitude)), 1e-6)
+    axes = [
+        ("latitude", position_sigma_km / KM_PER_DEGREE),
+        ("longitude", position_sigma_km / (KM_PER_DEGREE * cos_lat)),
+        ("groundspeed_kmh", groundspeed_sigma_kmh),
+        ("track_deg", track_sigma_deg),
+        ("altitude_m", altitude_sigma_m),
+    ]
+    axes = [(name, sigma) for name, sigma in axes if sigma > 0]
+    scale = math.sqrt(len(axes))
+    points = []
+    for name, sigma in axes:
+        for sign in (1.0, -1.0):
+            points.append(replace(
+                inputs, **{name: getattr(inputs, name) + sign * scale * sigma}))
+    return points
+
+
+def _normal_cdf(value):
+    return 0.5 * (1.0 + math.erf(value / math.sqrt(2.0)))
+
+
+def transit_probability(mean_deg, sigma_deg, radius_deg):
+    """P(|offset| < radius) for a normal signed offset."""
+    if sigma_deg <= 0:
+        return 1.0 if abs(mean_deg) < radius_deg else 0.0
+    return max(0.0, _normal_cdf((radius_deg - mean_deg) / sigma_deg)
+               - _normal_cdf((-radius_deg - mean_deg) / sigma_deg))
+
+
+def _magnitude_interval(low, high):
+    if low <= 0 <= high:
+        return 0.0, max(-low, high)
+    return min(abs(low), abs(high)), max(abs(low), abs(high))
+
+
+def separation_envelope(evaluate, inputs, points, reported_offset_deg,
+                        body_diameter_arcsec=None):
+    """Envelope around the reported signed offset, or None without a nominal.
+
+    ``evaluate(inputs)`` returns the signed aircraft-minus-body altitude
+    offset in degrees, or None when the perturbed track misses the body's
+    azimuth. Spreads are taken relative to the unperturbed evaluation, so
+    adjustments already in the reported value (vertical prediction) carry
+    over. With a missed point only the sampled range is reported.
+    """
+    nominal = evaluate(inputs)
+    if nominal is None:
+        return None
+    offsets = [evaluate(point) for point in points]
+    deltas = [offset - nominal for offset in offsets if offset is not None]
+    radius = (body_diameter_arcsec or DEFAULT_BODY_DIAMETER_ARCSEC) / 7200.0
+    sigma = probability = None
+    if deltas and len(deltas) == len(points):
+        shift = sum(deltas) / len(deltas)
+        sigma = math.sqrt(sum((delta - shift) ** 2 for delta in deltas)
+                          / len(deltas))
+        mean = reported_offset_deg + shift
+        low, high = _magnitude_interval(
+            mean - INTERVAL_SIGMAS * sigma, mean + INTERVAL_SIGMAS * sigma)
+        probability = transit_probability(mean, sigma, radius)
+    else:
+        low, high = _magnitude_interval(
+            reported_offset_deg + min(deltas, default=0.0),
+            reported_offset_deg + max(deltas, default=0.0))
+    return SeparationEnvelope(
+        separation_deg=abs(reported_offset_deg),
+        low_deg=min(low, abs(reported_offset_deg)),
+        high_deg=max(high, abs(reported_offset_deg)),
+        sigma_deg=sigma,
+        transit_probability=probability,
+        samples=len(points),
+        solved=len(deltas),
+    )
@@ -0,0 +1,223 @@
+"""SQLite catalog of finalized transit snapshot documents."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+CATALOG_FILENAME = "catalog.sqlite3"
+COLUMNS = (
+    "event_id", "body", "icao", "callsign", "reference_transit_utc",
+    "min_separation_deg", "solver_outcome", "vertical_mode", "complete",
+    "path",
+)
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS snapshot_events (
+        event_id TEXT PRIMARY KEY,
+        body TEXT NOT NULL,
+        icao TEXT NOT NULL,
+        callsign TEXT,
+        reference_transit_utc TEXT NOT NULL,
+        min_separation_deg REAL,
+        solver_outcome TEXT,
+        vertical_mode TEXT,
+        complete INTEGER NOT NULL,
+        path TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS snapshot_events_body_time "
+    "ON snapshot_events (body, reference_transit_utc)",
+    "CREATE INDEX IF NOT EXISTS snapshot_events_icao_time "
+    "ON snapshot_events (icao, reference_transit_utc)",
+    "CREATE INDEX IF NOT EXISTS snapshot_events_separation "
+    "ON snapshot_events (min_separation_deg)",
+    "CREATE INDEX IF NOT EXISTS snapshot_events_vertical_mode "
+    "ON snapshot_events (vertical_mode, reference_transit_utc)",
+)
+UPSERT = "INSERT INTO snapshot_events ({}) VALUES ({}) ON CONFLICT(event_id) DO UPDATE SET {}".format(
+    ", ".join(COLUMNS), ", ".join("?" * len(COLUMNS)),
+    ", ".join("{0} = excluded.{0}".format(column)
+              for column in COLUMNS if column != "event_id"))
+
+
+def summarize_document(document, path):
+    """Return one catalog row; outcome and mode come from the closest prediction."""
+    predictions = [document.get("trigger_prediction") or {}]
+    predictions.extend(document.get("prediction_updates") or ())
+    closest = min(
+        (prediction for prediction in predictions
+         if prediction.get("separation_deg") is not None),
+        key=lambda prediction: abs(prediction["separation_deg"]),
+        default={})
+    vertical = closest.get("vertical_prediction") or {}
+    return {
+        "event_id": document["event_id"],
+        "body": document["body"],
+        "icao": document["aircraft"]["icao"],
+        "callsign": document["aircraft"].get("callsign"),
+        "reference_transit_utc": document["final_reference_transit_utc"],
+        "min_separation_deg": (
+            abs(closest["separation_deg"]) if closest else None),
+        "solver_outcome": closest.get("solver_outcome"),
+        "vertical_mode": vertical.get("mode"),
+        "complete": bool(document.get("complete")),
+        "path": str(path),
+    }
+
+
+def summarize_file(path, base_dir):
+    """Read one snapshot file; None when it cannot be catalogued."""
+    path = Path(path)
+    try:
+        with path.open(encoding="utf-8") as source:
+            document = json.load(source)
+        return summarize_document(
+            document, path.relative_to(base_dir).as_posix())
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _summarize_task(task):
+    return summarize_file(*task)
+
+
+class SnapshotCatalog:
+    """Upsert and query summary rows; the database opens on first use."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self.path), check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+            self._connection = connection
+        return self._connection
+
+    def upsert(self, *rows):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(UPSERT, (
+                    tuple(row[column] for column in COLUMNS) for row in rows))
+
+    def replace_all(self, rows):
+        """Swap the whole table for ``rows`` in one transaction."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM snapshot_events")
+                connection.executemany(UPSERT, (
+                    tuple(row[column] for column in COLUMNS) for row in rows))
+
+    def events(self, body=None, icao=None, max_separation_deg=None,
+               vertical_mode=None, solver_outcome=None, since_utc=None,
+               until_utc=None):
+        """Rows matching every given filter, by reference time.
+
+        Times compare as the documents' ISO 8601 UTC text.
+        """
+        filters = []
+        values = []
+        for column, operator, value in (
+                ("body", "=", body.upper() if body else None),
+                ("icao", "=", icao),
+                ("min_separation_deg", "<=", max_separation_deg),
+                ("vertical_mode", "=", vertical_mode),
+                ("solver_outcome", "=", solver_outcome),
+                ("reference_transit_utc", ">=", since_utc),
+                ("reference_transit_utc", "<", until_utc)):
+            if value is not None:
+                filters.append("{} {} ?".format(column, operator))
+                values.append(value)
+        query = "SELECT {} FROM snapshot_events".format(", ".join(COLUMNS))
+        if filters:
+            query += " WHERE " + " AND ".join(filters)
+        query += " ORDER BY reference_transit_utc, event_id"
+        with self._lock:
+            rows = self._connect().execute(query, values).fetchall()
+        return [dict(row, complete=bool(row["complete"])) for row in rows]
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def snapshot_files(base_dir):
+    """Snapshot documents of one manager: ``YYYY-MM-DD/*.json``."""
+    return sorted(Path(base_dir).glob("????-??-??/*.json"))
+
+
+def rebuild_catalog(base_dir, workers=None, catalog=None):
+    """Re-read every snapshot file in parallel; return (catalogued, skipped)."""
+    base_dir = Path(base_dir)
+    catalog = catalog or SnapshotCatalog(base_dir / CATALOG_FILENAME)
+    tasks = [(path, base_dir) for path in snapshot_files(base_dir)]
+    if workers == 1 or len(tasks) < 2:
+        summaries = list(map(_summarize_task, tasks))
+    else:
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")) as executor:
+            summaries = list(executor.map(
+                _summarize_task, tasks, chunksize=64))
+    rows = [row for row in summaries if row is not None]
+    catalog.replace_all(rows)
+    return len(rows), len(summaries) - len(rows)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", type=Path, default=Path("transit_snapshots"),
+                        help="snapshot directory of one observer")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser("rebuild", help="backfill from existing files")
+    rebuild.add_argument("--workers", type=int, default=None)
+    query = commands.add_parser("query", help="list catalogued events")
+    query.add_argument("--body", choices=("sun", "moon"))
+    query.add_argument("--icao")
+    query.add_argument("--max-sep", type=float, metavar="DEG")
+    query.add_argument("--vertical-mode")
+    query.add_argument("--solver-outcome")
+    query.add_argument("--since", metavar="UTC", help="e.g. 2026-09-01")
+    query.add_argument("--until", metavar="UTC")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    catalog = SnapshotCatalog(args.dir / CATALOG_FILENAME)
+    try:
+        if args.command == "rebuild":
+            if args.workers is not None and args.workers <= 0:
+                raise SystemExit("--workers must be positive")
+            catalogued, skipped = rebuild_catalog(args.dir, args.workers, catalog)
+            print("Catalogued {} snapshots, skipped {} unreadable files into {}".format(
+                catalogued, skipped, catalog.path))
+            return
+        for row in catalog.events(
+                args.body, args.icao, args.max_sep, args.vertical_mode,
+                args.solver_outcome, args.since, args.until):
+            print("\t".join(
+                "" if row[column] is None else str(row[column])
+                for column in COLUMNS))
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""Compare the moving-body solvers on recorded SBS/BaseStation data.
+
+``--snapshots`` instead replays the exact inputs stored in transit snapshot
+documents and measures drift against the recorded predictions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from config import ConfigurationError, load_installation_config
+from replay_server import ADSB_PORT, logged_timestamp
+
+
+@dataclass(frozen=True)
+class SolverInput:
+    icao: str
+    timestamp_utc: datetime
+    position: tuple[float, float]
+    track_deg: float
+    velocity_kmh: int
+    elevation_m: float
+
+
+@dataclass
+class SolverStatistics:
+    calls: int = 0
+    seconds: float = 0.0
+    ephemeris_evaluations: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+
+    @property
+    def microseconds_per_call(self):
+        return self.seconds * 1e6 / self.calls if self.calls else 0.0
+
+
+@dataclass
+class SolverComparison:
+    statistics: dict[str, SolverStatistics]
+    outcome_matches: int = 0
+    compared: int = 0
+    time2x_differences: list[float] = field(default_factory=list)
+    separation_differences: list[float] = field(default_factory=list)
+
+
+def sbs_solver_inputs(
+    lines: Iterable[str],
+    port: int,
+    adsb_timestamp_timezone: str,
+    sample_seconds: float = 5.0,
+) -> Iterator[SolverInput]:
+    """Yield complete aircraft states at most once per sample period."""
+    states: dict[str, dict] = {}
+    last_sample: dict[str, datetime] = {}
+    for line in lines:
+        parts = line.rstrip("\r\n").split(",")
+        if len(parts) < 16 or parts[0] != "MSG":
+            continue
+        icao = parts[4].strip()
+        state = states.setdefault(icao, {})
+        try:
+            if parts[1] == "3":
+                if parts[11].strip():
+                    state["elevation_m"] = float(parts[11]) * 0.3048
+                if parts[14].strip() and parts[15].strip():
+                    state["position"] = (float(parts[14]), float(parts[15]))
+                else:
+                    continue
+            elif parts[1] == "4":
+                if parts[12].strip():
+                    state["velocity_kmh"] = round(int(parts[12]) * 1.852)
+                if parts[13].strip():
+                    state["track_deg"] = float(parts[13])
+                continue
+            else:
+                continue
+            timestamp = logged_timestamp(line, port, adsb_timestamp_timezone)
+        except ValueError:
+            continue
+        if len(state) < 4:
+            continue
+        previous = last_sample.get(icao)
+        if (previous is not None
+                and (timestamp - previous).total_seconds() < sample_seconds):
+            continue
+        last_sample[icao] = timestamp
+        yield SolverInput(icao, timestamp, **state)
+
+
+def compare_solvers(inputs, solvers, bodies=("sun", "moon")):
+    """Run every solver on every input and collect speed and agreement."""
+    import transit_warning as transit
+
+    comparison = SolverComparison(
+        {name: SolverStatistics() for name in solvers})
+    reference_name = solvers[0]
+    observer = transit.current_observer_frame().position
+    for solver_input in inputs:
+        for body in bodies:
+            solutions = {}
+            for name in solvers:
+                solver = transit.MOVING_BODY_SOLVER_FUNCTIONS[name]
+                started = time.perf_counter()
+                solution = solver(
+                    body, observer, solver_input.position,
+                    solver_input.track_deg, solver_input.velocity_kmh,
+                    solver_input.elevation_m, solver_input.timestamp_utc)
+                result = comparison.statistics[name]
+                result.seconds += time.perf_counter() - started
+                result.calls += 1
+                diagnostic = solution.diagnostic
+                result.outcomes[diagnostic.outcome.value] += 1
+                if diagnostic.initial_time2x is not None:
+                    result.ephemeris_evaluations += (
+                        diagnostic.correction_count + 1)
+                solutions[name] = diagnostic
+            reference = solutions[reference_name]
+            for name, diagnostic in solutions.items():
+                if name == reference_name:
+                    continue
+                comparison.compared += 1
+                if diagnostic.outcome == reference.outcome:
+                    comparison.outcome_matches += 1
+                if (diagnostic.final_time2x is None
+                        or reference.final_time2x is None):
+                    continue
+                comparison.time2x_differences.append(
+                    abs(diagnostic.final_time2x - reference.final_time2x))
+                comparison.separation_differences.append(
+                    abs(diagnostic.final_separation
+                        - reference.final_separation))
+    return comparison
+
+
+def format_report(comparison):
+    lines = []
+    for name, result in comparison.statistics.items():
+        lines.append(
+            "{}: {} calls, {:.1f} us/call, {} ephemeris evaluations".format(
+                name, result.calls, result.microseconds_per_call,
+                result.ephemeris_evaluations))
+        lines.append("  outcomes: {}".format(", ".join(
+            "{}={}".format(outcome, count)
+            for outcome, count in sorted(result.outcomes.items()))))
+    if comparison.compared:
+        lines.append("outcome agreement: {}/{}".format(
+            comparison.outcome_matches, comparison.compared))
+    for label, values, unit in (
+            ("time2x", comparison.time2x_differences, "s"),
+            ("separation", comparison.separation_differences, "deg")):
+        if values:
+            lines.append(
+                "{} difference: median {:.3f} {unit}, max {:.3f} {unit} "
+                "({} predictions)".format(
+                    label, statistics.median(values), max(values),
+                    len(values), unit=unit))
+    return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class SnapshotPrediction:
+    """One recorded prediction and the solver inputs it was made from."""
+
+    event_id: str
+    body: str
+    observer: tuple[float, float, float]
+    solver_input: SolverInput
+    recorded: dict
+
+
+@dataclass
+class SnapshotReplayStatistics:
+    latencies_us: list[float] = field(default_factory=list)
+    outcome_matches: int = 0
+    outcomes_compared: int = 0
+    drift: dict[str, list[float]] = field(default_factory=lambda: {
+        "time2x": [], "separation": [], "h2x": []})
+    # (separation drift, event id) of the largest drifts.
+    worst: list[tuple[float, str]] = field(default_factory=list)
+
+
+@dataclass
+class SnapshotReplay:
+    statistics: dict[str, SnapshotReplayStatistics]
+    predictions: int = 0
+    vertical_latencies_us: list[float] = field(default_factory=list)
+    vertical_mode_matches: int = 0
+    altitude_drift: list[float] = field(default_factory=list)
+
+
+def _parse_utc(text):
+    return datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+def snapshot_documents(paths):
+    """Yield documents from files or directories of snapshot files."""
+    for path in map(Path, paths):
+        files = sorted(path.rglob("*.json")) if path.is_dir() else [path]
+        for file in files:
+            with file.open(encoding="utf-8") as source:
+                yield json.load(source)
+
+
+def snapshot_predictions(documents):
+    """Yield every prediction update that stored its frozen inputs."""
+    for document in documents:
+        for recorded in document.get("prediction_updates") or ():
+            solver_input = recorded.get("solver_input")
+            if not solver_input or not recorded.get("frozen_prediction_state"):
+                continue
+            observer = recorded["observer"]
+            yield SnapshotPrediction(
+                document["event_id"], recorded["body"].lower(),
+                (observer["lat"], observer["lon"], observer["elevation_m"]),
+                SolverInput(
+                    recorded["icao"], _parse_utc(recorded["prediction_base_utc"]),
+                    (solver_input["aircraft_lat"], solver_input["aircraft_lon"]),
+                    solver_input["track"], solver_input["groundspeed"],
+                    solver_input["aircraft_altitude_m"]),
+                recorded)
+
+
+def frozen_vertical_inputs(vertical):
+    """Rebuild predict_vertical_state_at_time arguments from frozen JSON.
+
+    Returns (current altitude, motion state, intent state, evaluated at,
+    QNH, policy); the time to transit is supplied by the caller.
+    """
+    import transit_warning as transit
+
+    def parameter(data, value_key, kind=transit.MotionParameter):
+        if data is None or data[value_key] is None:
+            return None
+        return kind(data[value_key], _parse_utc(data["timestamp_utc"]),
+                    data["source"])
+
+    current = parameter(vertical["current_altitude"], "value_m")
+    history = [parameter(item, "value_fpm")
+               for item in vertical["vertical_rate_history"]]
+    motion = transit.AircraftMotionState(
+        altitude=current,
+        vertical_rate=parameter(vertical["latest_vertical_rate"], "value_fpm"),
+        vertical_rate_history=deque(
+            history, maxlen=transit.VERTICAL_RATE_HISTORY_MAXLEN))
+    intent = transit.AircraftIntentState(
+        selected_altitude=parameter(
+            vertical["selected_altitude"], "value_ft", transit.IntentParameter),
+        nav_qnh=parameter(
+            vertical["nav_qnh"], "value_hpa", transit.IntentParameter))
+    return (
+        vertical["current_altitude"]["value_m"], motion, intent,
+        _parse_utc(vertical["evaluated_at_utc"]),
+        vertical["application_qnh_hpa"],
+        transit.VerticalPredictionPolicy(**vertical["policy"]))
+
+
+def _replay_one(transit, replay, prediction, solvers, worst_count, frame):
+    recorded = prediction.recorded
+    solver_input = prediction.solver_input
+    vertical = frozen_vertical_inputs(
+        recorded["frozen_prediction_state"]["vertical"])
+    for name in solvers:
+        solver = transit.MOVING_BODY_SOLVER_FUNCTIONS[name]
+        started = time.perf_counter()
+        solution = solver(
+            prediction.body, frame.position, solver_input.position,
+            solver_input.track_deg, solver_input.velocity_kmh,
+            solver_input.elevation_m, solver_input.timestamp_utc,
+            observer_elevation_m=frame.elevation_m)
+        result = replay.statistics[name]
+        result.latencies_us.append((time.perf_counter() - started) * 1e6)
+        diagnostic = solution.diagnostic
+        if recorded.get("solver_outcome") is not None:
+            result.outcomes_compared += 1
+            if diagnostic.outcome.value == recorded["solver_outcome"]:
+                result.outcome_matches += 1
+        solved = solution.result
+        if not solved:
+            continue
+        altitude_m, motion, intent, evaluated_at, qnh, policy = vertical
+        state = transit.predict_vertical_state_at_time(
+            altitude_m, motion, intent, evaluated_at, solved[6], qnh, policy)
+        altitude_angle = solved[3]
+        if state.prediction.mode == transit.VerticalPredictionMode.DYNAMIC_VALID:
+            altitude_angle = frame.elevation_deg(
+                state.prediction.predicted_altitude_m, float(solved[4]) or 0.001)
+        separation = transit.vertical_transit_separation(
+            altitude_angle, solved[9])
+        drift = abs(separation - recorded["separation_deg"])
+        result.drift["separation"].append(drift)
+        result.drift["time2x"].append(
+            abs(float(solved[6]) - recorded["time2x_seconds"]))
+        result.drift["h2x"].append(abs(float(solved[4]) - recorded["h2x_km"]))
+        result.worst.append((drift, prediction.event_id))
+        result.worst.sort(reverse=True)
+        del result.worst[worst_count:]
+
+
+def replay_snapshot_predictions(predictions, solvers, worst_count=5):
+    """Re-run solvers and the vertical policy on recorded snapshot inputs."""
+    import transit_warning as transit
+
+    replay = SnapshotReplay(
+        {name: SnapshotReplayStatistics() for name in solvers})
+    for prediction in predictions:
+        replay.predictions += 1
+        latitude, longitude, elevation_m = prediction.observer
+        frame = transit.current_observer_frame(
+            (latitude, longitude), elevation_m)
+        _replay_one(
+            transit, replay, prediction, solvers, worst_count, frame)
+        _replay_vertical(transit, replay, prediction.recorded)
+    return replay
+
+
+def _replay_vertical(transit, replay, recorded):
+    """The recorded vertical decision against the recorded time to transit."""
+    frozen = recorded["frozen_prediction_state"]["vertical"]
+    altitude_m, motion, intent, evaluated_at, qnh, policy = (
+        frozen_vertical_inputs(frozen))
+    started = time.perf_counter()
+    state = transit.predict_vertical_state_at_time(
+        altitude_m, motion, intent, evaluated_at, recorded["time2x_seconds"],
+        qnh, policy)
+    replay.vertical_latencies_us.append((time.perf_counter() - started) * 1e6)
+    decision = frozen["decision"]
+    if state.prediction.mode.value == decision["mode"]:
+        replay.vertical_mode_matches += 1
+    if (state.prediction.predicted_altitude_m is not None
+            and decision["predicted_altitude_m"] is not None):
+        replay.altitude_drift.append(abs(
+            state.prediction.predicted_altitude_m
+            - decision["predicted_altitude_m"]))
+
+
+def latency_percentiles(values):
+    """(p50, p90, p99, max) by nearest rank; zeros without samples."""
+    if not values:
+        return 0.0, 0.0, 0.0, 0.0
+    ordered = sorted(values)
+
+    def rank(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return rank(0.5), rank(0.9), rank(0.99), ordered[-1]
+
+
+def format_snapshot_report(replay):
+    lines = ["{} recorded predictions".format(replay.predictions)]
+    latency = "p50 {:.1f} / p90 {:.1f} / p99 {:.1f} / max {:.1f} us"
+    for name, result in replay.statistics.items():
+        lines.append("{}: {} calls, {}".format(
+            name, len(result.latencies_us),
+            latency.format(*latency_percentiles(result.latencies_us))))
+        if result.outcomes_compared:
+            lines.append("  outcome agreement with recording: {}/{}".format(
+                result.outcome_matches, result.outcomes_compared))
+        for label, unit in (("time2x", "s"), ("separation", "deg"),
+                            ("h2x", "km")):
+            values = result.drift[label]
+            if values:
+                lines.append(
+                    "  {} drift: median {:.3g} {unit}, max {:.3g} {unit}".format(
+                        label, statistics.median(values), max(values),
+                        unit=unit))
+        if result.worst and result.worst[0][0] > 0:
+            lines.append("  largest separation drift: {}".format(", ".join(
+                "{} {:.3g} deg".format(event_id, drift)
+                for drift, event_id in result.worst)))
+    lines.append("vertical: {}, mode agreement {}/{}".format(
+        latency.format(*latency_percentiles(replay.vertical_latencies_us)),
+        replay.vertical_mode_matches, len(replay.vertical_latencies_us)))
+    if replay.altitude_drift:
+        lines.append("  predicted altitude drift: max {:.3g} m".format(
+            max(replay.altitude_drift)))
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("file", type=Path, nargs="?")
+    parser.add_argument("--snapshots", type=Path, action="append",
+                        metavar="PATH",
+                        help="snapshot file or directory to replay instead")
+    parser.add_argument("--port", type=int, default=ADSB_PORT,
+                        help="source port deciding the timestamp semantics")
+    parser.add_argument("--sample-seconds", type=float, default=5.0)
+    parser.add_argument("--body", choices=("sun", "moon"), action="append")
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.snapshots:
+        import transit_warning as transit
+
+        replay = replay_snapshot_predictions(
+            snapshot_predictions(snapshot_documents(args.snapshots)),
+            tuple(transit.MOVING_BODY_SOLVER_FUNCTIONS))
+        print(format_snapshot_report(replay))
+        return
+    if args.file is None:
+        parser.error("a recording file or --snapshots is required")
+    try:
+        configuration = load_installation_config()
+    except ConfigurationError as error:
+        raise SystemExit(str(error))
+    import transit_warning as transit
+
+    transit.apply_installation_config(configuration)
+    with args.file.open(encoding="utf-8", errors="replace") as source:
+        inputs = list(sbs_solver_inputs(
+            source, args.port, configuration.adsb_timestamp_timezone,
+            args.sample_seconds))
+    comparison = compare_solvers(
+        inputs, tuple(transit.MOVING_BODY_SOLVER_FUNCTIONS),
+        tuple(args.body or ("sun", "moon")))
+    print(format_report(comparison))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Optional process pool that solves batches of moving-body transits."""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+
+MIN_BATCH_SIZE = 8
+BATCH_TIMEOUT_SECONDS = 2.0
+RESTART_SECONDS = 30.0
+STARTUP_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class SolverTask:
+    """Picklable copy of the horizontal solver inputs of one body."""
+
+    body_name: str
+    obs2body: tuple
+    plane_position: tuple
+    track_deg: float
+    velocity_kmh: float
+    altitude_m: float
+    prediction_base_utc: object
+    fallback_body_position: object = None
+    observer_elevation_m: float = None
+
+
+@dataclass
+class SolverPoolStatistics:
+    batches: int = 0
+    pooled_tasks: int = 0
+    local_tasks: int = 0
+    failures: int = 0
+    last_error: str = None
+
+    def summary(self):
+        text = "Solver pool: {} batches, {} pooled / {} local tasks, {} failures".format(
+            self.batches, self.pooled_tasks, self.local_tasks, self.failures)
+        if self.last_error:
+            text += " (last: {})".format(self.last_error)
+        return text
+
+
+def _initialize_worker(configuration, solver_name):
+    import transit_warning
+    from transit_clock import ReplayClock
+
+    transit_warning.apply_installation_config(configuration)
+    transit_warning.configure_moving_body_solver(solver_name)
+    transit_warning.clock = ReplayClock()
+
+
+def _worker_ready(_):
+    return True
+
+
+def _solve_in_worker(task):
+    import transit_warning
+
+    transit_warning.clock.advance_to(task.prediction_base_utc)
+    return transit_warning.solve_moving_body_task(task)
+
+
+class SolverPool:
+    """Solve task batches in worker processes, in submission order.
+
+    ``worker_arguments`` returns the initializer arguments when the workers
+    start; ``solve_local`` solves one task in this process. Batches smaller
+    than ``min_batch_size`` are not worth the round trip and are solved
+    locally, as is every batch while the pool is unhealthy: a broken worker,
+    an exception or a batch slower than ``timeout_seconds`` shuts the pool
+    down for ``restart_seconds``.
+    """
+
+    def __init__(self, workers, worker_arguments, solve_local,
+                 min_batch_size=MIN_BATCH_SIZE,
+                 timeout_seconds=BATCH_TIMEOUT_SECONDS,
+                 restart_seconds=RESTART_SECONDS,
+                 monotonic=time.monotonic):
+        self.workers = workers
+        self.worker_arguments = worker_arguments
+        self.solve_local = solve_local
+        self.min_batch_size = min_batch_size
+        self.timeout_seconds = timeout_seconds
+        self.restart_seconds = restart_seconds
+        self.monotonic = monotonic
+        self.statistics = SolverPoolStatistics()
+        self._executor = None
+        self._unhealthy_until = None
+
+    @property
+    def healthy(self):
+        return (self._unhealthy_until is None
+                or self.monotonic() >= self._unhealthy_until)
+
+    def start(self):
+        """Spawn and import the workers so the first batch is not delayed."""
+        if self._executor is not None:
+            return True
+        try:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+                initargs=tuple(self.worker_arguments()))
+            list(self._executor.map(
+                _worker_ready, range(self.workers),
+                timeout=STARTUP_TIMEOUT_SECONDS))
+        except Exception as error:
+            self._fail(error)
+            return False
+        self._unhealthy_until = None
+        return True
+
+    def solve(self, tasks):
+        """Return one solution per task, in the order of ``tasks``."""
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        self.statistics.batches += 1
+        if (len(tasks) >= self.min_batch_size and self.healthy
+                and self.start()):
+            try:
+                chunksize = max(1, len(tasks) // (self.workers * 2))
+                solutions = list(self._executor.map(
+                    _solve_in_worker, tasks, timeout=self.timeout_seconds,
+                    chunksize=chunksize))
+            except Exception as error:
+                self._fail(error)
+            else:
+                self.statistics.pooled_tasks += len(tasks)
+                return solutions
+        self.statistics.local_tasks += len(tasks)
+        return [self.solve_local(task) for task in tasks]
+
+    def _fail(self, error):
+        self.statistics.failures += 1
+        self.statistics.last_error = type(error).__name__
+        self._unhealthy_until = self.monotonic() + self.restart_seconds
+        self.close(wait=False)
+
+    def close(self, wait=True):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,117 @@
+"""Per-aircraft ADS-B/MLAT position fusion ahead of transit prediction."""
+
+from dataclasses import dataclass
+from enum import Enum
+from math import cos, hypot, radians
+
+
+# Higher ranks win; a lower-ranked source only takes over once the selected
+# one has been silent for the hysteresis window.
+SOURCE_RANK = {"adsb": 2, "mlat": 1}
+MERGE_WINDOW_SECONDS = 0.5
+SWITCH_AFTER_SECONDS = 3.0
+MIN_MOVE_KM = 0.05
+KM_PER_DEGREE = 111.195
+
+
+class FusionDecision(str, Enum):
+    FORWARD = "forward"
+    MERGED = "merged"
+    DROPPED = "dropped"
+
+
+@dataclass
+class FusedPosition:
+    source: str
+    reported_epoch: float
+    forwarded_epoch: float
+    latitude: float
+    longitude: float
+
+
+@dataclass
+class SourceFusionCounters:
+    forwarded: int = 0
+    merged: int = 0
+    dropped: int = 0
+
+
+class PositionFusion:
+    """Choose one position source per aircraft and gate redundant reports.
+
+    ``observe`` returns FORWARD for a report that should update the position
+    and reach the solver, MERGED for a report from the selected source that
+    arrived within the merge window without moving the aircraft materially
+    (the position is still updated, the solve is skipped) and DROPPED for a
+    report from a non-selected source while the selected one is fresh.
+    """
+
+    def __init__(self, merge_window_seconds=MERGE_WINDOW_SECONDS,
+                 switch_after_seconds=SWITCH_AFTER_SECONDS,
+                 min_move_km=MIN_MOVE_KM, source_rank=None):
+        self.merge_window_seconds = merge_window_seconds
+        self.switch_after_seconds = switch_after_seconds
+        self.min_move_km = min_move_km
+        self.source_rank = dict(SOURCE_RANK if source_rank is None
+                                else source_rank)
+        self.counters = {}
+        self._aircraft = {}
+
+    def reset(self):
+        self.counters.clear()
+        self._aircraft.clear()
+
+    def selected_source(self, icao):
+        fused = self._aircraft.get(icao)
+        return fused.source if fused is not None else None
+
+    def observe(self, icao, source, reported_epoch, latitude, longitude):
+        fused = self._aircraft.get(icao)
+        if fused is None:
+            decision = FusionDecision.FORWARD
+        elif source != fused.source:
+            silent = reported_epoch - fused.reported_epoch
+            if (self._rank(source) > self._rank(fused.source)
+                    or silent > self.switch_after_seconds):
+                decision = FusionDecision.FORWARD
+            else:
+                decision = FusionDecision.DROPPED
+        elif (reported_epoch - fused.forwarded_epoch
+              < self.merge_window_seconds
+              and self._moved_km(fused, latitude, longitude)
+              < self.min_move_km):
+            decision = FusionDecision.MERGED
+        else:
+            decision = FusionDecision.FORWARD
+
+        counters = self.counters.setdefault(source, SourceFusionCounters())
+        if decision == FusionDecision.DROPPED:
+            counters.dropped += 1
+            return decision
+        if decision == FusionDecision.MERGED:
+            counters.merged += 1
+            fused.reported_epoch = max(fused.reported_epoch, reported_epoch)
+            return decision
+        counters.forwarded += 1
+        self._aircraft[icao] = FusedPosition(
+            source, reported_epoch, reported_epoch, latitude, longitude)
+        return decision
+
+    def discard(self, icao):
+        self._aircraft.pop(icao, None)
+
+    def summary(self):
+        return "Fusion " + "  ".join(
+            "{} fwd {} merged {} dropped {}".format(
+                source.upper(), counters.forwarded, counters.merged,
+                counters.dropped)
+            for source, counters in sorted(self.counters.items()))
+
+    def _rank(self, source):
+        return self.source_rank.get(source, 0)
+
+    @staticmethod
+    def _moved_km(fused, latitude, longitude):
+        return KM_PER_DEGREE * hypot(
+            latitude - fused.latitude,
+            (longitude - fused.longitude) * cos(radians(latitude)))
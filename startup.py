@@ -0,0 +1,60 @@
+"""Startup helpers: deferred module loading and a per-phase timing report."""
+
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+
+
+def lazy_import(name):
+    """Return ``name`` as a module that only executes on first attribute use.
+
+    Already imported modules are returned as they are; a missing module
+    raises ImportError here rather than at first use.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError("No module named {!r}".format(name), name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class StartupProfile:
+    """Wall-clock duration of each named startup phase, in call order."""
+
+    def __init__(self, started=None, monotonic=time.perf_counter):
+        self._monotonic = monotonic
+        self.started = monotonic() if started is None else started
+        self.phases = []
+
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name):
+        started = self._monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, self._monotonic() - started)
+
+    @property
+    def total_seconds(self):
+        return self._monotonic() - self.started
+
+    def report(self):
+        total = self.total_seconds
+        lines = ["Startup profile: {:.3f}s total".format(total)]
+        width = max([len(name) for name, _ in self.phases] + [0])
+        for name, seconds in self.phases:
+            lines.append("  {:<{}} {:8.3f}s {:5.1f}%".format(
+                name, width, seconds,
+                100.0 * seconds / total if total > 0 else 0.0))
+        return "\n".join(lines)
@@ -0,0 +1,155 @@
+"""Embedded localhost HTTP endpoint that serves the engine state as JSON."""
+
+import datetime
+import enum
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+DEFAULT_HOST = "127.0.0.1"
+STATUS_PATHS = ("/", "/status", "/status.json")
+
+
+def _json_default(value):
+    if isinstance(value, datetime.datetime):
+        return value.astimezone(datetime.timezone.utc).isoformat().replace(
+            "+00:00", "Z")
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError("not JSON serializable: {!r}".format(value))
+
+
+def encode_status_document(document):
+    return json.dumps(
+        document, sort_keys=True, separators=(",", ":"),
+        default=_json_default).encode("utf-8")
+
+
+class StatusSnapshotCache:
+    """Hold the encoded document of the last tick with its content ETag.
+
+    Publishing identical content keeps the previous ETag, so pollers that
+    send it back in If-None-Match receive 304 until the state changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._body = None
+        self._etag = None
+        self._published_at_utc = None
+        self.publications = 0
+
+    def publish(self, document, published_at_utc=None):
+        body = encode_status_document(document)
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest()[:20])
+        with self._lock:
+            if etag != self._etag:
+                self._body = body
+                self._etag = etag
+                self.publications += 1
+            self._published_at_utc = published_at_utc
+        return etag
+
+    def current(self):
+        with self._lock:
+            return self._body, self._etag, self._published_at_utc
+
+
+def _etag_matches(header, etag):
+    if not header or etag is None:
+        return False
+    candidates = [item.strip() for item in header.split(",")]
+    return "*" in candidates or etag in candidates or (
+        "W/" + etag) in candidates
+
+
+class StatusRequestHandler(BaseHTTPRequestHandler):
+    server_version = "TransitWarningStatus/1"
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in STATUS_PATHS:
+            self.send_error(404)
+            return
+        body, etag, published_at_utc = self.server.snapshot_cache.current()
+        if body is None:
+            self.send_error(503, "No snapshot published yet")
+            return
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("ETag", etag)
+        if published_at_utc is not None:
+            self.send_header(
+                "X-Snapshot-Published", _json_default(published_at_utc))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        target = urlsplit(self.path)
+        action = self.server.actions.get(target.path)
+        if action is None:
+            self.send_error(404)
+            return
+        query = {name: values[-1]
+                 for name, values in parse_qs(target.query).items()}
+        try:
+            document = action(query)
+        except ValueError as error:
+            self.send_error(400, str(error))
+            return
+        body = encode_status_document(document)
+        self.send_response(202)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StatusServer:
+    """Serve a StatusSnapshotCache from a daemon thread.
+
+    ``actions`` maps POST paths to callables taking the query parameters and
+    returning a JSON document; they run on the request thread, so they should
+    only record the request.
+    """
+
+    def __init__(self, snapshot_cache, host=DEFAULT_HOST, port=0,
+                 actions=None):
+        self.snapshot_cache = snapshot_cache
+        self._server = ThreadingHTTPServer((host, port), StatusRequestHandler)
+        self._server.daemon_threads = True
+        self._server.snapshot_cache = snapshot_cache
+        self._server.actions = dict(actions or {})
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="status-server",
+            daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._server.server_close()
@@ -0,0 +1,85 @@
+"""Differential terminal frames: rewrite only the rows that changed."""
+
+import re
+from dataclasses import dataclass
+
+
+TERMINAL_HOME_CLEAR = "\x1b[H\x1b[J"
+CLEAR_TO_LINE_END = "\x1b[K"
+CLEAR_TO_SCREEN_END = "\x1b[J"
+# Stray prints between frames are only repaired by a full redraw.
+FULL_REDRAW_FRAMES = 60
+ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+
+
+def move_cursor(row):
+    return "\x1b[{};1H".format(row + 1)
+
+
+def visible_width(line):
+    return len(ANSI_ESCAPE_RE.sub("", line))
+
+
+@dataclass
+class RendererStatistics:
+    frames: int = 0
+    full_redraws: int = 0
+    rows_written: int = 0
+    rows_unchanged: int = 0
+
+
+class DifferentialRenderer:
+    """Keep the previous frame and emit each new one in a single write.
+
+    Changed rows are cursor-addressed and cleared to the line end, rows past
+    the frame are cleared, and the cursor is parked below the frame. A full
+    redraw happens on the first frame, after a size change, when any row
+    would wrap (which breaks row addressing) and every ``full_redraw_frames``.
+    """
+
+    def __init__(self, full_redraw_frames=FULL_REDRAW_FRAMES):
+        self.full_redraw_frames = full_redraw_frames
+        self.statistics = RendererStatistics()
+        self._previous = None
+        self._size = None
+        self._frames_since_redraw = 0
+
+    def invalidate(self):
+        self._previous = None
+
+    def frame_text(self, lines, size=None):
+        """Return the escape sequence that turns the last frame into ``lines``."""
+        lines = list(lines)
+        columns = size[0] if size is not None else None
+        full = (
+            self._previous is None
+            or size != self._size
+            or self._frames_since_redraw >= self.full_redraw_frames
+            or (columns is not None
+                and any(visible_width(line) >= columns for line in lines)))
+        self.statistics.frames += 1
+        if full:
+            self.statistics.full_redraws += 1
+            self.statistics.rows_written += len(lines)
+            self._frames_since_redraw = 0
+            text = TERMINAL_HOME_CLEAR + "".join(
+                line + "\n" for line in lines)
+        else:
+            self._frames_since_redraw += 1
+            parts = []
+            for row, line in enumerate(lines):
+                if (row < len(self._previous)
+                        and self._previous[row] == line):
+                    self.statistics.rows_unchanged += 1
+                    continue
+                parts.append(move_cursor(row) + line + CLEAR_TO_LINE_END)
+            self.statistics.rows_written += len(parts)
+            parts.append(move_cursor(len(lines)) + CLEAR_TO_SCREEN_END)
+            text = "".join(parts)
+        self._previous = lines
+        self._size = size
+        return text
+
+    def render(self, lines, output, size=None):
+        output.write(self.frame_text(lines, size))
+        output.flush()
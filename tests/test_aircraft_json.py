@@ -0,0 +1,185 @@
+import datetime
+import json
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock
+
+import pytz
+
+import transit_warning as transit
+from aircraft_json import AircraftJsonAdapter, parse_aircraft, read_aircraft_json
+from config import InstallationConfig
+from prediction_cache import TransitPredictionCache
+from transit_clock import ReplayClock
+
+
+NOW = datetime.datetime(2026, 8, 19, 12, 0, 10, tzinfo=pytz.utc)
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def aircraft(hex_code="48ae01", **values):
+    item = {"hex": hex_code, "flight": "LOT3TR  ", "alt_baro": 33000,
+            "gs": 450.4, "track": 180.0, "baro_rate": -64,
+            "lat": 51.2, "lon": 21.2, "seen_pos": 0.5, "seen": 0.2,
+            "mlat": [], "tisb": []}
+    item.update(values)
+    return item
+
+
+def document(*aircraft_list, now=NOW):
+    return {"now": now.timestamp(), "messages": 1000,
+            "aircraft": list(aircraft_list)}
+
+
+class ParseTests(unittest.TestCase):
+    def test_non_icao_and_stale_positions_are_left_out(self):
+        reports = parse_aircraft(document(
+            aircraft(), aircraft("~2b0001"),
+            aircraft("48ae02", seen_pos=30.0, alt_baro="ground")))
+
+        self.assertEqual([report.icao for report in reports],
+                         ["48AE01", "48AE02"])
+        self.assertEqual(reports[0].position_utc,
+                         NOW - datetime.timedelta(seconds=0.5))
+        self.assertEqual(reports[0].flight, "LOT3TR")
+        self.assertIsNone(reports[1].latitude)
+        self.assertIsNone(reports[1].altitude_ft)
+
+    def test_file_and_local_http_sources(self):
+        with tempfile.TemporaryDirectory() as directory:
+            (Path(directory) / "aircraft.json").write_text(
+                json.dumps(document(aircraft())), encoding="utf-8")
+            server = ThreadingHTTPServer(("127.0.0.1", 0), partial(
+                QuietHandler, directory=directory))
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                from_file = read_aircraft_json(
+                    str(Path(directory) / "aircraft.json"))
+                from_http = read_aircraft_json(
+                    "http://127.0.0.1:{}/aircraft.json".format(
+                        server.server_address[1]))
+            finally:
+                server.shutdown()
+                server.server_close()
+
+        self.assertEqual(from_file, from_http)
+        self.assertEqual(from_file["aircraft"][0]["hex"], "48ae01")
+
+
+class AdapterTests(unittest.TestCase):
+    def setUp(self):
+        self.adapter = AircraftJsonAdapter(30003, 30106, "Europe/Warsaw")
+
+    def test_adsb_records_use_local_sbs_timestamps(self):
+        records = self.adapter.poll(document(aircraft()))
+
+        self.assertEqual([line.split(",")[:2] for line, _ in records],
+                         [["MSG", "1"], ["MSG", "4"], ["MSG", "3"]])
+        self.assertEqual({port for _, port in records}, {30003})
+        position = records[2][0].split(",")
+        self.assertEqual(position[6:10], [
+            "2026/08/19", "14:00:09.500", "2026/08/19", "14:00:09.500"])
+        self.assertEqual(position[11], "33000")
+        self.assertEqual(position[14:16], ["51.20000", "21.20000"])
+        velocity = records[1][0].split(",")
+        self.assertEqual((velocity[12], velocity[13], velocity[16]),
+                         ("450", "180.0", "-64"))
+        self.assertEqual(len(velocity), 22)
+
+    def test_only_changed_aircraft_are_emitted(self):
+        self.adapter.poll(document(aircraft(), aircraft("48ae02")))
+        later = NOW + datetime.timedelta(seconds=1)
+
+        unchanged = self.adapter.poll(document(
+            aircraft(seen=1.2, seen_pos=1.5), aircraft("48ae02"), now=later))
+        moved = self.adapter.poll(document(
+            aircraft(lat=51.19), aircraft("48ae02"), now=later))
+
+        self.assertEqual(unchanged, [])
+        self.assertEqual((self.adapter.changed, self.adapter.aircraft), (1, 2))
+        self.assertEqual([line.split(",")[:2] for line, _ in moved],
+                         [["MSG", "4"], ["MSG", "3"]])
+
+    def test_mlat_positions_go_to_the_mlat_port_in_utc(self):
+        records = self.adapter.poll(document(aircraft(
+            flight="", mlat=["lat", "lon", "gs", "track"])))
+
+        (line, port), = records
+        fields = line.split(",")
+        self.assertEqual((fields[0], fields[1], port), ("MLAT", "3", 30106))
+        self.assertEqual(fields[7], "12:00:09.500")
+        self.assertEqual((fields[11], fields[12], fields[14]),
+                         ("33000", "450", "51.20000"))
+
+
+class EngineBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.originals = {
+            name: getattr(transit, name) for name in (
+                "clock", "plane_dict", "altitude_sources",
+                "aircraft_motion_states", "aircraft_motion_freshness_status",
+                "pressure", "tabela", "moving_body_transit_pred", "gong",
+                "transit_prediction_cache", "observer_engines",
+                "replay_time_initialized", "aircraft_json_adapter")
+        }
+        transit.clock = ReplayClock()
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.replay_time_initialized = False
+        transit.plane_dict = {}
+        transit.altitude_sources = {}
+        transit.aircraft_motion_states = {}
+        transit.aircraft_motion_freshness_status = {}
+        transit.pressure = 1013.25
+        transit.tabela = Mock(return_value=(30.0, 120.0, 20.0, 90.0))
+        transit.gong = lambda now_utc=None: None
+        transit.transit_prediction_cache = TransitPredictionCache()
+        transit.moving_body_transit_pred = Mock(return_value=0)
+        transit.configure_observer_engines(TEST_CONFIG)
+        transit.aircraft_json_adapter = AircraftJsonAdapter(
+            30003, 30106, "Europe/Warsaw")
+
+    def tearDown(self):
+        for name, value in self.originals.items():
+            setattr(transit, name, value)
+        transit.transit_solver_diagnostics.clear()
+
+    def test_changed_aircraft_update_the_table_with_one_render(self):
+        applied = transit.process_aircraft_json(document(aircraft()))
+        repeated = transit.process_aircraft_json(document(aircraft()))
+        transit.tabela.reset_mock()
+        moved = transit.process_aircraft_json(document(
+            aircraft(lat=51.19), aircraft("48ae02", flight="")))
+
+        entry = transit.plane_dict["48AE01"]
+        self.assertEqual((applied, repeated, moved), (3, 0, 4))
+        self.assertEqual(entry[1], "LOT3TR")
+        self.assertEqual((entry[2], entry[3]), (51.19, 21.2))
+        self.assertEqual(entry[14], round(450 * 1.852))
+        self.assertEqual(transit.tabela.call_count, 1)
+        self.assertIn("48AE01", transit.aircraft_motion_states)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -63,7 +63,8 @@ class AircraftMotionStateTests(unittest.TestCase):
         transit.aircraft_motion_states = {}
         transit.aircraft_motion_freshness_status = {}
         transit.pressure = 1013.25
-        transit.tabela = lambda: (30.0, 120.0, 20.0, 90.0)
+        transit.tabela = (
+            lambda now_utc=None, engine=None: (30.0, 120.0, 20.0, 90.0))
         transit.transit_pred = lambda *args: 0
         transit.moving_body_transit_pred = lambda *args, **kwargs: 0
 
@@ -58,7 +58,7 @@ class AltitudeProvenanceTests(unittest.TestCase):
         transit.plane_dict = {}
         transit.altitude_sources = {}
         transit.pressure = 1000.5
-        transit.tabela = lambda: (0, 0, 0, 0)
+        transit.tabela = lambda now_utc=None, engine=None: (0, 0, 0, 0)
 
     def tearDown(self):
         transit.clock = self.original_clock
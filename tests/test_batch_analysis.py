@@ -0,0 +1,181 @@
+import datetime
+import json
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from batch_analysis import (
+    ShardResult,
+    build_report,
+    build_tasks,
+    environment_paths,
+    find_sessions,
+    load_session,
+    plan_shards,
+    run_batch,
+    write_report,
+)
+from config import InstallationConfig
+
+
+UTC = datetime.timezone.utc
+START = datetime.datetime(2026, 8, 19, 12, 0, tzinfo=UTC)
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+def sbs(prefix, message_type, at, **values):
+    text = at.strftime("%Y/%m/%d,%H:%M:%S.%f")[:-3]
+    return "{},{},1,1,48AE01,1,{},{},,{},{},{},{},{},,,,,,0\r\n".format(
+        prefix, message_type, text, text, values.get("altitude", ""),
+        values.get("speed", ""), values.get("track", ""),
+        values.get("latitude", ""), values.get("longitude", ""))
+
+
+def write_session(root, seconds=600, manifest=True, start_latitude=51.5):
+    """An aircraft heading south over the observer, one message a second."""
+    session = root / START.strftime("%Y%m%d_%H%M%S")
+    session.mkdir(parents=True)
+    local = datetime.timedelta(hours=2)
+    adsb = []
+    for second in range(seconds):
+        at = START + datetime.timedelta(seconds=second)
+        if second % 2:
+            adsb.append(sbs("MSG", 3, at + local, altitude="33000",
+                            latitude="{:.5f}".format(
+                                start_latitude - second * 0.0003),
+                            longitude="21.00000"))
+        else:
+            adsb.append(sbs("MSG", 4, at + local, speed="450", track="180"))
+    mlat = [sbs("MLAT", 3, START + datetime.timedelta(seconds=second + 0.5),
+                altitude="12000", speed="300", track="90",
+                latitude="50.8", longitude="{:.5f}".format(20.5 + second * 0.001))
+            for second in range(0, seconds, 10)]
+    with zipfile.ZipFile(session / "streams.zip", "w") as archive:
+        archive.writestr("adsb_30003.log", "".join(adsb))
+        archive.writestr("mlat_30106.log", "".join(mlat))
+    if manifest:
+        (session / "manifest.json").write_text(json.dumps({
+            "version": 1,
+            "session_id": session.name,
+            "session_start_utc": "2026-08-19T12:00:00Z",
+            "session_end_utc": "2026-08-19T12:{:02d}:00Z".format(seconds // 60),
+            "adsb": {"port": 30003, "timestamp_timezone": "Europe/Warsaw"},
+            "mlat": {"port": 30106},
+        }), encoding="utf-8")
+    return session
+
+
+class PlanningTests(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp.name)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_sessions_are_found_from_their_parent_directory(self):
+        session = write_session(self.root / "sessions", seconds=60)
+        (self.root / "sessions" / "empty").mkdir()
+
+        found = find_sessions([self.root / "sessions"])
+
+        self.assertEqual([item.path for item in found], [session])
+        self.assertEqual(found[0].start_utc, START)
+        self.assertEqual(found[0].adsb_timestamp_timezone, "Europe/Warsaw")
+
+    def test_shards_cover_the_session_with_open_outer_bounds(self):
+        session = load_session(write_session(self.root, seconds=600))
+        split = START + datetime.timedelta(minutes=4)
+
+        self.assertEqual(plan_shards(session), [(None, None)])
+        self.assertEqual(plan_shards(session, 240), [
+            (None, split),
+            (split, split + datetime.timedelta(minutes=4)),
+            (split + datetime.timedelta(minutes=4), None),
+        ])
+
+    def test_unknown_session_end_is_one_shard(self):
+        session = load_session(write_session(self.root, seconds=60, manifest=False))
+
+        self.assertEqual(plan_shards(session, 10), [(None, None)])
+
+    def test_environment_files_start_the_day_before(self):
+        for day in (17, 18, 19, 20, 21):
+            (self.root / "environment_202608{}.jsonl".format(day)).touch()
+
+        paths = environment_paths(
+            self.root, START, START + datetime.timedelta(days=1))
+
+        self.assertEqual([path.name for path in paths], [
+            "environment_20260818.jsonl", "environment_20260819.jsonl",
+            "environment_20260820.jsonl"])
+
+    def test_report_merges_events_and_counts_per_worker(self):
+        row = {"kind": "alert", "at_utc": "2026-08-19T12:01:00Z"}
+        results = [
+            ShardResult("s", "s_001", None, None, 11, 2.0, 100,
+                        solver_outcomes={"converged": 2},
+                        events=[dict(row, at_utc="2026-08-19T12:09:00Z")]),
+            ShardResult("s", "s_000", None, None, 11, 2.0, 300, 20,
+                        solver_outcomes={"converged": 1, "no_solution": 4},
+                        events=[row, dict(row, kind="final")]),
+        ]
+
+        report = build_report(results)
+        _, events_path = write_report(results, self.root / "out")
+
+        self.assertEqual((report["alerts"], report["final_transits"]), (2, 1))
+        self.assertEqual(report["solver_outcomes"],
+                         {"converged": 3, "no_solution": 4})
+        self.assertEqual(report["workers"][11]["messages"], 420)
+        self.assertEqual(report["workers"][11]["messages_per_second"], 105.0)
+        lines = events_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual([line.split("\t")[1] for line in lines[1:]],
+                         ["s_000", "s_000", "s_001"])
+
+
+class BatchRunTests(unittest.TestCase):
+    def test_shards_replay_in_workers_and_skip_warm_up_counts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            sessions = find_sessions([write_session(root / "sessions")])
+            tasks = build_tasks(
+                sessions, TEST_CONFIG, root / "out", shard_seconds=300,
+                warmup_seconds=60, environment_directory=root / "environment")
+
+            results = run_batch(tasks, workers=2)
+
+        self.assertEqual([result.error for result in results], [None, None])
+        self.assertEqual([result.messages for result in results], [330, 330])
+        self.assertEqual([result.warmup_messages for result in results], [0, 66])
+        self.assertTrue(all(result.solver_outcomes for result in results))
+
+    def test_aircraft_inside_alert_distance_replays_without_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            sessions = find_sessions([write_session(
+                root / "sessions", seconds=300, start_latitude=51.1)])
+            tasks = build_tasks(
+                sessions, TEST_CONFIG, root / "out",
+                environment_directory=root / "environment")
+
+            results = run_batch(tasks, workers=1)
+
+        self.assertEqual([result.error for result in results], [None])
+        self.assertEqual(results[0].messages, 330)
+
+
+if __name__ == "__main__":
+    unittest.main()
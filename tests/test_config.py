@@ -4,7 +4,12 @@ import tempfile
 import unittest
 from unittest.mock import patch
 
-from config import ConfigurationError, InstallationConfig, load_installation_config
+from config import (
+    ConfigurationError,
+    InstallationConfig,
+    ObserverProfile,
+    load_installation_config,
+)
 
 
 REQUIRED = {
@@ -119,6 +124,33 @@ class InstallationConfigTests(unittest.TestCase):
                 with self.assertRaisesRegex(ConfigurationError, expected):
                     self.load(values)
 
+    def test_parses_additional_observer_profiles(self):
+        result = self.load({
+            **REQUIRED,
+            "OBSERVER_PROFILES": "ridge:50.9,21.1,310; tower:51,-0.5,12",
+        })
+
+        self.assertEqual(result.observer_profiles, (
+            ObserverProfile("ridge", 50.9, 21.1, 310.0),
+            ObserverProfile("tower", 51.0, -0.5, 12.0),
+        ))
+        self.assertEqual(self.load(REQUIRED).observer_profiles, ())
+
+    def test_rejects_invalid_observer_profiles(self):
+        invalid_cases = (
+            ("ridge", "must be name:lat,lon,elevation_m"),
+            ("ridge:50,21", "must be name:lat,lon,elevation_m"),
+            ("bad name:50,21,1", "must be name:lat,lon,elevation_m"),
+            ("ridge:95,21,1", "ridge lat must be in the range -90..90"),
+            ("ridge:50,21,1;ridge:51,21,1", "must be unique"),
+            ("primary:50,21,1", "must be unique"),
+        )
+        for value, expected in invalid_cases:
+            with self.subTest(value=value):
+                values = {**REQUIRED, "OBSERVER_PROFILES": value}
+                with self.assertRaisesRegex(ConfigurationError, expected):
+                    self.load(values)
+
     def test_rejects_invalid_ports(self):
         for name in ("ADSB_PORT", "MLAT_PORT", "BEAST_PORT"):
             for value in ("not-a-port", "0", "65536"):
@@ -0,0 +1,147 @@
+import datetime
+import math
+import unittest
+from unittest.mock import patch
+
+import pytz
+
+import transit_warning as transit
+from config import ObserverProfile
+from ground_track import ObserverGrid, stand_summary, transit_centreline
+from observer_frame import ObserverFrame
+
+
+FRAME = ObserverFrame(51.0, 21.0, 0.0)
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+
+
+def south_at_45(seconds):
+    return 45.0, 180.0
+
+
+class TransitCentrelineTests(unittest.TestCase):
+    def test_offset_points_away_from_the_body(self):
+        centreline = transit_centreline(0.0, 0.0, 10000.0, 90.0, 360.0,
+                                        45.0, 180.0)
+
+        self.assertAlmostEqual(centreline.offset_km, 10.0)
+        self.assertAlmostEqual(centreline.east_km, 0.0)
+        self.assertAlmostEqual(centreline.north_km, 10.0)
+        self.assertAlmostEqual(centreline.east_rate_km_s, 0.1)
+        self.assertAlmostEqual(centreline.closest_time(5.0, 0.0, 300.0), 50.0)
+
+    def test_body_below_horizon_has_no_centreline(self):
+        self.assertIsNone(transit_centreline(
+            0.0, 0.0, 10000.0, 0.0, 720.0, -1.0, 180.0))
+
+
+class ObserverGridTests(unittest.TestCase):
+    def setUp(self):
+        self.grid = ObserverGrid(FRAME, radius_km=5.0, step_km=0.5)
+
+    def test_grid_is_a_disk(self):
+        self.assertEqual(len(self.grid), 317)
+        self.assertTrue(all(
+            math.hypot(east, north) <= 5.0 + 1e-9
+            for east, north in zip(self.grid.east_km, self.grid.north_km)))
+
+    def test_best_spot_on_the_centreline(self):
+        suggestion = self.grid.best_spot(
+            (0.0, -20.0), 10000.0, 0.0, 720.0, south_at_45)
+
+        self.assertAlmostEqual(suggestion.distance_km, 0.0)
+        self.assertAlmostEqual(suggestion.separation_deg, 0.0, places=5)
+        self.assertAlmostEqual(suggestion.time2x_seconds, 50.0)
+        self.assertEqual(
+            (suggestion.latitude_deg, suggestion.longitude_deg), (51.0, 21.0))
+
+    def test_shifted_track_moves_the_spot(self):
+        suggestion = self.grid.best_spot(
+            (3.0, -20.0), 10000.0, 0.0, 720.0, south_at_45)
+
+        self.assertAlmostEqual(suggestion.distance_km, 3.0)
+        self.assertAlmostEqual(suggestion.bearing_deg, 90.0)
+        self.assertGreater(suggestion.longitude_deg, 21.0)
+
+    def test_track_outside_the_grid_has_no_spot(self):
+        self.assertIsNone(self.grid.best_spot(
+            (30.0, -20.0), 10000.0, 0.0, 720.0, south_at_45))
+
+    def test_invalid_grid_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ObserverGrid(FRAME, radius_km=0.0)
+
+    def test_summary_line(self):
+        suggestion = self.grid.best_spot(
+            (3.0, -20.0), 10000.0, 0.0, 720.0, south_at_45)
+
+        self.assertEqual(
+            stand_summary("LOT123", "sun", suggestion),
+            "Stand LOT123    SUN   3.00 km  90.0 deg  sep 0.00 deg in 50 s")
+
+
+def body_position(body_name, when_utc):
+    altitude = 45.0 if body_name == "sun" else -10.0
+    return transit.BodyPosition(altitude, 180.0, None)
+
+
+class StandSuggestionIntegrationTests(unittest.TestCase):
+    def setUp(self):
+        self.entry = [""] * 32
+        self.entry[1:5] = ["LOT123", 50.82, 21.0, 10000.0]
+        self.entry[11], self.entry[14] = 0.0, 720.0
+        self.plane_dict = {"ABC123": self.entry}
+        for patcher in (
+                patch.object(transit, "plane_dict", self.plane_dict),
+                patch.object(transit, "stand_grid", ObserverGrid(FRAME)),
+                patch.object(transit, "stand_suggestions", {}),
+                patch.object(transit, "body_position_at_utc", body_position)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_update_keeps_reachable_aircraft_by_body(self):
+        suggestions = transit.update_stand_suggestions(UTC_BASE)
+        ranked = transit.ranked_stand_suggestions()
+
+        self.assertEqual(list(suggestions), [("ABC123", "sun")])
+        self.assertLess(suggestions[("ABC123", "sun")].distance_km, 0.5)
+        self.assertEqual(ranked[0][:2], ("ABC123", "sun"))
+
+    def test_every_tick_refreshes_and_searches_outside_the_lock(self):
+        transit.update_stand_suggestions(UTC_BASE)
+        self.entry[3] = 30.0
+        search = ObserverGrid.best_spot
+
+        def unlocked_search(grid, *args):
+            self.assertFalse(transit.plane_dict_lock._is_owned())
+            return search(grid, *args)
+
+        with patch.object(ObserverGrid, "best_spot", unlocked_search):
+            refreshed = transit.update_stand_suggestions(
+                UTC_BASE + datetime.timedelta(seconds=1))
+
+        self.assertEqual(refreshed, {})
+
+    def test_stand_lines_are_only_shown_for_the_primary_observer(self):
+        transit.update_stand_suggestions(UTC_BASE)
+        self.entry[0] = UTC_BASE
+        engine = transit.new_observer_engine(
+            ObserverProfile("ridge", 51.3, 21.4, 250.0))
+        engine.plane_dict["ABC123"] = list(self.entry)
+
+        with patch.multiple(transit, my_lat=51.0, my_lon=21.0,
+                            my_elevation_const=0.0, observer_frame=FRAME), \
+                patch.object(transit, "compute_body_positions",
+                             return_value=(30.0, 120.0, 20.0, 90.0)), \
+                patch.object(transit, "stand_summary",
+                             return_value="STAND") as summary:
+            transit.render_full_table_snapshot(engine=engine)
+            summary.assert_not_called()
+            primary = transit.render_full_table_snapshot()
+
+        summary.assert_called_once()
+        self.assertIn("STAND", primary)
+
+
+if __name__ == "__main__":
+    unittest.main()
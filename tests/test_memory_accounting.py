@@ -0,0 +1,138 @@
+import datetime
+import unittest
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from config import InstallationConfig
+from memory_accounting import (
+    FloatRing,
+    MemoryAccounting,
+    deep_sizeof,
+    format_memory_report,
+)
+from prediction_cache import TransitPredictionCache
+from transit_clock import ReplayClock
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+def mlat3(seconds):
+    value = UTC_BASE + datetime.timedelta(seconds=seconds)
+    return (
+        "MLAT,3,1,1,ABC123,1,{date},{time},{date},{time},,10000,"
+        "450,180,51.2,21.2,0".format(
+            date=value.strftime("%Y/%m/%d"),
+            time=value.strftime("%H:%M:%S.000")))
+
+
+class FloatRingTests(unittest.TestCase):
+    def test_ring_keeps_the_latest_values_in_order(self):
+        ring = FloatRing(3, [1.0, 2.0])
+        self.assertEqual(list(ring), [1.0, 2.0])
+
+        for value in (3.0, 4.0, 5.0):
+            ring.append(value)
+
+        self.assertEqual((len(ring), ring.capacity), (3, 3))
+        self.assertEqual(ring, [3.0, 4.0, 5.0])
+        with self.assertRaises(ValueError):
+            FloatRing(0)
+
+    def test_ring_size_does_not_grow_with_appends(self):
+        ring = FloatRing(100, range(150))
+        wrapped = deep_sizeof(ring)
+        for value in range(1000):
+            ring.append(value)
+
+        self.assertEqual(deep_sizeof(ring), wrapped)
+
+
+class MemoryAccountingTests(unittest.TestCase):
+    def test_shared_objects_are_counted_once(self):
+        payload = "x" * 10000
+        once = deep_sizeof({"a": payload})
+
+        self.assertLess(deep_sizeof({"a": payload, "b": payload}), once + 200)
+        self.assertGreater(once, 10000)
+
+    def test_peaks_survive_a_smaller_sample(self):
+        accounting = MemoryAccounting(interval_seconds=60.0)
+        self.assertTrue(accounting.due(0.0))
+        big = accounting.sample(
+            [("tracks", [[0.0] * 100 for _ in range(10)]),
+             ("points", (1, 2), 7), ("disabled", None)], 0.0)
+        small = accounting.sample([("tracks", [[0.0]]), ("points", (), 0)], 1.0)
+
+        self.assertFalse(accounting.due(30.0))
+        self.assertEqual([item.name for item in big], ["tracks", "points"])
+        self.assertEqual((small[0].entries, small[0].peak_entries), (1, 10))
+        self.assertEqual(small[0].peak_bytes, big[0].bytes)
+        self.assertEqual((small[1].entries, small[1].peak_entries), (0, 7))
+        self.assertIn("tracks", format_memory_report(small, UTC_BASE))
+
+
+class SkyTrackTests(unittest.TestCase):
+    def setUp(self):
+        self.originals = {
+            name: getattr(transit, name) for name in (
+                "clock", "plane_dict", "altitude_sources",
+                "aircraft_motion_states", "aircraft_motion_freshness_status",
+                "pressure", "tabela", "moving_body_transit_pred", "gong",
+                "transit_prediction_cache", "observer_engines",
+                "replay_time_initialized", "memory_accounting")
+        }
+        transit.clock = ReplayClock()
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.replay_time_initialized = False
+        transit.plane_dict = {}
+        transit.altitude_sources = {}
+        transit.aircraft_motion_states = {}
+        transit.aircraft_motion_freshness_status = {}
+        transit.pressure = 1013.25
+        transit.tabela = (
+            lambda now_utc=None, engine=None: (30.0, 120.0, 20.0, 90.0))
+        transit.gong = lambda now_utc=None: None
+        transit.transit_prediction_cache = TransitPredictionCache()
+        transit.moving_body_transit_pred = Mock(return_value=0)
+        transit.memory_accounting = MemoryAccounting()
+        transit.configure_observer_engines(TEST_CONFIG)
+
+    def tearDown(self):
+        for name, value in self.originals.items():
+            setattr(transit, name, value)
+        transit.transit_solver_diagnostics.clear()
+
+    def test_holding_aircraft_keeps_a_bounded_sky_track(self):
+        with patch.object(transit, "SKY_TRACK_POINTS", 4):
+            for step in range(12):
+                transit.process_line(mlat3(7.0 * step), 30106)
+
+        entry = transit.plane_dict["ABC123"]
+        footprints = {item.name: item
+                      for item in transit.sample_memory_accounting(force=True)}
+
+        self.assertEqual((len(entry[15]), len(entry[16])), (4, 4))
+        self.assertEqual(list(entry[15]), [entry[6]] * 4)
+        self.assertEqual(footprints["plane_dict"].entries, 1)
+        self.assertEqual(footprints["sky tracks"].entries, 8)
+        self.assertGreater(footprints["sky tracks"].bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
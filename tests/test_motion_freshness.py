@@ -81,6 +81,15 @@ class MotionFreshnessClassificationTests(unittest.TestCase):
                          transit.MotionFreshnessStatus.FRESH)
         self.assertEqual(result_with_vr.vertical_rate_age, 4.0)
 
+    def test_time_context_matches_datetime_assessment(self):
+        value = state(position_age=2.5, track_age=4)
+
+        result = transit.assess_motion_freshness(
+            value, transit.TimeContext.at(NOW))
+
+        self.assertEqual(result, self.assess(value))
+        self.assertEqual(result.assessed_at_utc, NOW)
+
     def test_position_age_boundaries(self):
         cases = [
             (3.000, transit.MotionFreshnessStatus.FRESH),
@@ -217,14 +226,15 @@ class MotionFreshnessIntegrationTests(unittest.TestCase):
         transit.pressure = 1013.25
         transit.sun_alt = 30.0
         transit.moon_alt = 20.0
-        transit.tabela = lambda: (30.0, 120.0, 20.0, 90.0)
+        transit.tabela = (
+            lambda now_utc=None, engine=None: (30.0, 120.0, 20.0, 90.0))
         transit.moving_body_transit_pred = (
             lambda body, observer, plane, track, velocity, elevation,
-            prediction_base_utc, fallback_body_position=None:
+            prediction_base_utc, fallback_body_position=None, engine=None:
             transit.transit_pred(
                 observer, plane, track, velocity, elevation,
                 fallback_body_position[0], fallback_body_position[1]))
-        transit.gong = lambda: None
+        transit.gong = lambda now_utc=None: None
 
     def tearDown(self):
         for name, value in self.originals.items():
@@ -274,6 +284,39 @@ class MotionFreshnessIntegrationTests(unittest.TestCase):
             transit.get_aircraft_motion_freshness_status("ABC123").status,
             transit.MotionFreshnessStatus.FRESH)
 
+    def test_one_message_reads_the_clock_once(self):
+        transit.moving_body_transit_pred = Mock(return_value=0)
+        self.process(self.mlat3("2026/08/19 12:00:00.000"))
+        clock = transit.clock
+        clock.now = Mock(wraps=clock.now)
+        clock.now_utc = Mock(wraps=clock.now_utc)
+
+        self.process(self.mlat3("2026/08/19 12:00:01.000"))
+
+        clock.now.assert_called_once_with()
+        clock.now_utc.assert_not_called()
+        self.assertEqual(
+            transit.plane_dict["ABC123"][0], transit.clock._snapshot().utc)
+
+    def test_transit_uses_the_message_instant(self):
+        self.process(self.mlat3("2026/08/19 12:00:00.000"))
+        transit.transit_pred = Mock(return_value=(
+            51.2, 21.2, 120.0, 37.8, 17.9, 33.7, 1, 0, 120.0, 37.9, None))
+        transit.tabela = Mock(return_value=(30.0, 120.0, 20.0, 90.0))
+        transit.gong = Mock()
+        clock = transit.clock
+        clock.now_utc = Mock(wraps=clock.now_utc)
+
+        self.process(self.mlat3("2026/08/19 12:00:01.000"))
+
+        clock.now_utc.assert_not_called()
+        instant = clock._snapshot().utc
+        self.assertEqual(transit.plane_dict["ABC123"][29], instant)
+        self.assertEqual(transit.plane_dict["ABC123"][30], instant)
+        transit.gong.assert_called_with(instant)
+        self.assertEqual(
+            transit.tabela.call_args.kwargs["now_utc"], instant)
+
     def test_degraded_state_still_calls_prediction(self):
         transit.transit_pred = Mock(return_value=0)
         self.process(self.msg4("2026/08/19 12:00:00.000"))
@@ -0,0 +1,170 @@
+import datetime
+import math
+import random
+import unittest
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from motion_tracker import AircraftTracker, MotionTrackers
+
+
+KM_PER_DEGREE = math.radians(1) * 6371.0
+SPEED_KMH = 720.0
+
+
+def northbound(tracker, seconds, noise_km=0.0, source="mlat", rng=None):
+    """Feed a 720 km/h northbound aircraft starting at 51N 21E."""
+    for second in range(seconds):
+        north_km = SPEED_KMH / 3600.0 * second
+        jitter = rng.gauss(0, noise_km) if rng is not None else 0.0
+        tracker.update_position(
+            float(second), 51.0 + (north_km + jitter) / KM_PER_DEGREE,
+            21.0, source)
+        tracker.update_velocity(float(second), SPEED_KMH, 0.0)
+
+
+class AircraftTrackerTests(unittest.TestCase):
+    def test_no_state_before_position_and_velocity(self):
+        tracker = AircraftTracker()
+        tracker.update_velocity(0.0, groundspeed_kmh=SPEED_KMH)
+        self.assertIsNone(tracker.state_at(0.0))
+
+        tracker.update_position(1.0, 51.0, 21.0, "adsb")
+        self.assertIsNone(tracker.state_at(1.0))
+
+        tracker.update_velocity(1.0, track_deg=90.0)
+        state = tracker.state_at(1.0)
+        self.assertAlmostEqual(state.groundspeed_kmh, SPEED_KMH, delta=1.0)
+        self.assertAlmostEqual(state.track_deg, 90.0, delta=0.5)
+
+    def test_groundspeed_and_track_of_one_message_update_velocity_once(self):
+        tracker = AircraftTracker()
+        tracker.update_position(0.0, 51.0, 21.0, "adsb")
+
+        with patch.object(tracker, "_update_velocity",
+                          wraps=tracker._update_velocity) as update:
+            tracker.update(1.0, groundspeed=SPEED_KMH, track=0.0)
+
+        update.assert_called_once_with(1.0)
+
+    def test_state_extrapolates_between_messages(self):
+        tracker = AircraftTracker()
+        northbound(tracker, 10, source="adsb")
+
+        now = tracker.state_at(9.0)
+        later = tracker.state_at(19.0)
+
+        self.assertAlmostEqual(
+            (later.latitude - now.latitude) * KM_PER_DEGREE, 2.0, places=2)
+        self.assertGreater(later.position_sigma_km, now.position_sigma_km)
+        self.assertEqual(tracker.state_at(19.0), later)
+
+    def test_noisy_mlat_fixes_are_smoothed(self):
+        tracker = AircraftTracker()
+        northbound(tracker, 60, noise_km=0.3, rng=random.Random(7))
+
+        state = tracker.state_at(59.0)
+        truth = 51.0 + SPEED_KMH / 3600.0 * 59 / KM_PER_DEGREE
+
+        self.assertLess(abs(state.latitude - truth) * KM_PER_DEGREE, 0.15)
+        self.assertLess(state.position_sigma_km, 0.1)
+
+    def test_vertical_rate_is_tracked_in_feet_per_minute(self):
+        tracker = AircraftTracker()
+        northbound(tracker, 2)
+        for second in range(10):
+            tracker.update_altitude(float(second), 3000.0 + 5.08 * second)
+            tracker.update_vertical_rate(float(second), 1000.0)
+
+        state = tracker.state_at(9.0)
+
+        self.assertAlmostEqual(state.vertical_rate_fpm, 1000.0, delta=20.0)
+        self.assertAlmostEqual(state.altitude_m, 3045.72, delta=2.0)
+
+
+class TrackerIntegrationTests(unittest.TestCase):
+    def test_solver_and_snapshot_use_filtered_state(self):
+        trackers = MotionTrackers()
+        northbound(trackers.tracker("ABC123"), 10, source="adsb")
+        entry = [""] * 32
+        entry[1:8] = ["LOT123", 51.5, 21.5, 10000.0, 20.0, 10.0, 25.0]
+        entry[11], entry[14] = "45", 800
+        base = datetime.datetime.fromtimestamp(12.0, pytz.utc)
+        solve = Mock(return_value=0)
+        build = Mock(return_value={})
+
+        with patch.object(transit, "motion_trackers", trackers), \
+                patch.object(transit, "plane_dict", {"ABC123": entry}), \
+                patch.object(transit, "moon_alt", -10.0), \
+                patch.object(transit, "sun_alt", -10.0), \
+                patch.object(transit, "cached_moving_body_transit_pred",
+                             solve), \
+                patch.object(transit, "transit_snapshot_manager", Mock()), \
+                patch.object(transit, "build_snapshot_solver_input", build):
+            transit.evaluate_transit_prediction("ABC123", base)
+
+        filtered = trackers.state_at("ABC123", 12.0)
+        _, _, _, plane_pos, track, velocity = solve.call_args.args[:6]
+        self.assertEqual(plane_pos, (filtered.latitude, filtered.longitude))
+        self.assertEqual((track, velocity),
+                         (filtered.track_deg, filtered.groundspeed_kmh))
+        self.assertEqual(build.call_args.args[9], filtered)
+        self.assertEqual(build.call_args.args[10]["aircraft_lat"], 51.5)
+
+    def test_msg4_feeds_the_tracker_once(self):
+        trackers = MotionTrackers()
+        line = ("MSG,4,1,1,ABC123,1,2026/08/19,14:00:00.000,"
+                "2026/08/19,14:00:00.000,,,450,90,,,-640,,,,,0")
+
+        with patch.object(transit, "motion_trackers", trackers), \
+                patch.object(transit, "adsb_port", 30003), \
+                patch.object(transit, "adsb_timestamp_timezone",
+                             "Europe/Warsaw"), \
+                patch.dict(transit.aircraft_motion_states, clear=True), \
+                patch.object(AircraftTracker, "update") as update:
+            transit.decode_sbs_message(line, 30003)
+
+        update.assert_called_once_with(
+            datetime.datetime(2026, 8, 19, 12, tzinfo=pytz.utc).timestamp(),
+            groundspeed=833.0, track=90.0, vertical_rate=-640.0)
+
+    def test_solver_altitude_follows_the_filtered_climb(self):
+        tracker = AircraftTracker()
+        northbound(tracker, 2)
+        for second in range(10):
+            tracker.update(float(second), altitude=3000.0 + 5.08 * second,
+                           vertical_rate=1000.0)
+        entry = [""] * 32
+        entry[2:5] = [51.5, 21.5, 3045.72]
+        trackers = MotionTrackers()
+        trackers._aircraft["ABC123"] = tracker
+        base = datetime.datetime.fromtimestamp(19.0, pytz.utc)
+
+        with patch.object(transit, "motion_trackers", trackers):
+            altitude = transit.solver_motion_inputs(
+                "ABC123", entry, base)[4]
+
+        self.assertAlmostEqual(altitude, 3096.5, delta=3.0)
+
+    def test_snapshot_input_records_filtered_and_raw_values(self):
+        tracker = AircraftTracker()
+        northbound(tracker, 3, source="adsb")
+        filtered = tracker.state_at(3.0)
+
+        with patch.dict(transit.aircraft_motion_states, clear=True), \
+                patch.dict(transit.aircraft_intent_states, clear=True):
+            solver_input = transit.build_snapshot_solver_input(
+                "ABC123", filtered.latitude, filtered.longitude, 10000.0,
+                20.0, 10.0, 25.0, filtered.groundspeed_kmh,
+                filtered.track_deg, filtered, {"aircraft_lat": 51.5})
+
+        self.assertEqual(
+            solver_input["filtered_state"]["groundspeed_kmh"],
+            filtered.groundspeed_kmh)
+        self.assertEqual(solver_input["raw_inputs"], {"aircraft_lat": 51.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
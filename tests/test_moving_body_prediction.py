@@ -1,4 +1,5 @@
 import datetime
+import random
 import unittest
 from unittest.mock import Mock, patch
 
@@ -203,6 +204,117 @@ class MovingBodyTransitSolverTests(unittest.TestCase):
             UTC_BASE + datetime.timedelta(seconds=100.0))
 
 
+class NewtonMovingBodySolverTests(unittest.TestCase):
+    def setUp(self):
+        transit.apply_installation_config(TEST_CONFIG)
+        self.original_solver = transit.moving_body_solver
+
+    def tearDown(self):
+        transit.configure_moving_body_solver(self.original_solver)
+
+    def run_newton(self, values, body_rate=0.005, aircraft_rate=0.05):
+        ephemeris = Mock(return_value=(20.0, 120.0))
+        with patch.object(transit, "body_position_at_utc", ephemeris), \
+                patch.object(transit, "transit_pred", side_effect=values), \
+                patch.object(
+                    transit, "body_azimuth_rate", return_value=body_rate), \
+                patch.object(
+                    transit, "aircraft_bearing_rate",
+                    return_value=aircraft_rate):
+            solution = transit.newton_moving_body_transit_pred(
+                "moon", (51.0, 21.0), (51.2, 21.2), 180.0, 800.0,
+                10000.0, UTC_BASE)
+        return solution, ephemeris
+
+    def test_first_correction_uses_rate_ratio(self):
+        solution, ephemeris = self.run_newton([
+            prediction(100.0), prediction(111.3)])
+
+        self.assertEqual(
+            solution.diagnostic.outcome,
+            transit.TransitSolverOutcome.CONVERGED)
+        self.assertEqual(solution.diagnostic.correction_count, 1)
+        self.assertEqual(solution.diagnostic.initial_time2x, 100.0)
+        evaluated = ephemeris.call_args_list[1].args[1] - UTC_BASE
+        self.assertAlmostEqual(evaluated.total_seconds(), 100.0 / 0.9, 5)
+
+    def test_undefined_aircraft_rate_falls_back_to_fixed_point_step(self):
+        solution, ephemeris = self.run_newton(
+            [prediction(100.0), prediction(100.2)], aircraft_rate=0.0)
+
+        self.assertEqual(solution.diagnostic.correction_count, 1)
+        self.assertEqual(
+            ephemeris.call_args_list[1].args[1],
+            UTC_BASE + datetime.timedelta(seconds=100.0))
+
+    def test_unconverged_steps_report_max_iterations(self):
+        values = [prediction(100.0 + 10 * index, separation=index)
+                  for index in range(transit.MOVING_BODY_NEWTON_MAX_STEPS + 1)]
+        solution, _ = self.run_newton(values, aircraft_rate=0.0)
+
+        self.assertEqual(
+            solution.diagnostic.outcome,
+            transit.TransitSolverOutcome.MAX_ITERATIONS)
+        self.assertEqual(
+            solution.diagnostic.correction_count,
+            transit.MOVING_BODY_NEWTON_MAX_STEPS)
+        self.assertAlmostEqual(
+            solution.diagnostic.final_separation,
+            transit.MOVING_BODY_NEWTON_MAX_STEPS)
+
+    def test_body_azimuth_rate_matches_ephemeris_difference(self):
+        for body in ("sun", "moon"):
+            base = UTC_BASE if body == "sun" else UTC_BASE.replace(hour=16)
+            first = transit.body_position_at_utc(body, base)
+            second = transit.body_position_at_utc(
+                body, base + datetime.timedelta(seconds=60))
+            measured = ((second.azimuth_deg - first.azimuth_deg + 180)
+                        % 360 - 180) / 60
+            self.assertAlmostEqual(
+                transit.body_azimuth_rate(body, first) / measured, 1.0,
+                delta=0.03)
+
+    def test_agrees_with_fixed_point_in_fewer_corrections(self):
+        generator = random.Random(27)
+        corrections = {"fixed-point": 0, "newton": 0}
+        differences = []
+        for _ in range(300):
+            arguments = (
+                "sun", (51.0, 21.0),
+                (51.0 + generator.uniform(-1, 1),
+                 21.0 + generator.uniform(-1.5, 1.5)),
+                generator.uniform(0, 360), generator.choice((300, 800)),
+                generator.uniform(2000, 12000), UTC_BASE)
+            solutions = {
+                name: solver(*arguments).diagnostic
+                for name, solver in
+                transit.MOVING_BODY_SOLVER_FUNCTIONS.items()}
+            if any(diagnostic.outcome != transit.TransitSolverOutcome.CONVERGED
+                   for diagnostic in solutions.values()):
+                continue
+            for name, diagnostic in solutions.items():
+                corrections[name] += diagnostic.correction_count
+            differences.append(abs(
+                solutions["newton"].final_time2x
+                - solutions["fixed-point"].final_time2x))
+
+        self.assertGreater(len(differences), 20)
+        self.assertLess(corrections["newton"], corrections["fixed-point"])
+        self.assertLess(sum(differences) / len(differences), 0.2)
+
+    def test_runtime_selection(self):
+        self.assertEqual(
+            transit.parse_runtime_args(["--solver", "newton"]).solver,
+            "newton")
+        transit.configure_moving_body_solver("newton")
+        with patch.dict(
+                transit.MOVING_BODY_SOLVER_FUNCTIONS,
+                {"newton": Mock(return_value="newton")}):
+            self.assertEqual(solve(), "newton")
+        with self.assertRaises(ValueError):
+            transit.configure_moving_body_solver("bisection")
+
+
 class MovingBodyTransitIntegrationTests(unittest.TestCase):
     def setUp(self):
         self.originals = {
@@ -223,8 +335,9 @@ class MovingBodyTransitIntegrationTests(unittest.TestCase):
         transit.sun_az = 120.0
         transit.moon_alt = 20.0
         transit.moon_az = 90.0
-        transit.tabela = lambda: (30.0, 120.0, 20.0, 90.0)
-        transit.gong = lambda: None
+        transit.tabela = (
+            lambda now_utc=None, engine=None: (30.0, 120.0, 20.0, 90.0))
+        transit.gong = lambda now_utc=None: None
         transit.sun_prediction_last_valid.clear()
         transit.moon_prediction_last_valid.clear()
         transit.sun_predicted_transit_utc.clear()
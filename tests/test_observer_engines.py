@@ -0,0 +1,165 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from config import InstallationConfig, ObserverProfile
+from prediction_cache import TransitPredictionCache
+from transit_clock import ReplayClock
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+RIDGE = ObserverProfile("ridge", 51.3, 21.4, 250.0)
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+    observer_profiles=(RIDGE,),
+)
+
+
+def later(seconds):
+    return UTC_BASE + datetime.timedelta(seconds=seconds)
+
+
+def mlat3(seconds):
+    value = later(seconds)
+    return (
+        "MLAT,3,1,1,ABC123,1,{date},{time},{date},{time},,10000,"
+        "450,180,51.2,21.2,0".format(
+            date=value.strftime("%Y/%m/%d"),
+            time=value.strftime("%H:%M:%S.000")))
+
+
+class ObserverEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.originals = {
+            name: getattr(transit, name) for name in (
+                "clock", "plane_dict", "altitude_sources",
+                "aircraft_motion_states", "aircraft_motion_freshness_status",
+                "pressure", "tabela", "moving_body_transit_pred", "gong",
+                "transit_prediction_cache", "observer_engines",
+                "replay_time_initialized")
+        }
+        transit.clock = ReplayClock()
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.replay_time_initialized = False
+        transit.plane_dict = {}
+        transit.altitude_sources = {}
+        transit.aircraft_motion_states = {}
+        transit.aircraft_motion_freshness_status = {}
+        transit.pressure = 1013.25
+        transit.tabela = (
+            lambda now_utc=None, engine=None: (30.0, 120.0, 20.0, 90.0))
+        transit.gong = lambda now_utc=None: None
+        transit.transit_prediction_cache = TransitPredictionCache()
+        transit.moving_body_transit_pred = Mock(return_value=0)
+        transit.configure_observer_engines(TEST_CONFIG)
+        self.engine = transit.observer_engines[0]
+
+    def tearDown(self):
+        for name, value in self.originals.items():
+            setattr(transit, name, value)
+        transit.transit_solver_diagnostics.clear()
+
+    def test_one_decode_updates_every_observer(self):
+        with patch.object(transit, "_update_motion_position",
+                          wraps=transit._update_motion_position) as update:
+            transit.process_line(mlat3(0.0), 30106)
+
+        update.assert_called_once()
+        primary = transit.plane_dict["ABC123"]
+        ridge = self.engine.plane_dict["ABC123"]
+        self.assertEqual(primary[2:5], ridge[2:5])
+        self.assertEqual(primary[11], ridge[11])
+        self.assertNotEqual(primary[5:8], ridge[5:8])
+        self.assertEqual(
+            ridge[5], round(transit.ObserverFrame(
+                51.3, 21.4, 250.0).distance_km(51.2, 21.2), 1))
+        self.assertEqual(list(transit.aircraft_motion_states), ["ABC123"])
+
+    def test_each_observer_solves_from_its_own_position(self):
+        transit.process_line(mlat3(0.0), 30106)
+
+        observers = [call.args[1] for call in
+                     transit.moving_body_transit_pred.call_args_list]
+        self.assertEqual(
+            observers, [(51.0, 21.0)] * 2 + [(51.3, 21.4)] * 2)
+
+    def test_secondary_processing_leaves_the_primary_globals_alone(self):
+        primary_dict = transit.plane_dict
+        seen = []
+
+        def record(*args, **kwargs):
+            seen.append((transit.observer_name, transit.plane_dict,
+                         transit.my_lat))
+            return 0
+
+        transit.moving_body_transit_pred.side_effect = record
+        transit.process_line(mlat3(0.0), 30106)
+
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(
+            seen, [("primary", primary_dict, 51.0)] * 4)
+        self.assertIsNot(self.engine.plane_dict, primary_dict)
+        self.assertEqual(self.engine.name, "ridge")
+        self.assertEqual(transit.primary_observer.name, "primary")
+
+    def test_secondary_engines_share_the_solver_pool(self):
+        pool = Mock()
+        pool.solve.side_effect = lambda tasks: [
+            transit.solve_moving_body_task(task) for task in tasks]
+        scheduler = transit.PredictionScheduler()
+        with patch.object(transit, "solver_pool", pool), \
+                patch.object(transit, "prediction_scheduler", scheduler), \
+                patch.object(transit, "sector_culled_moving_body_solution",
+                             return_value=None):
+            transit.configure_observer_engines(TEST_CONFIG)
+            engine = transit.observer_engines[0]
+            transit.process_line(mlat3(0.0), 30106)
+            transit.process_line(mlat3(0.5), 30106)
+            evaluated = transit.process_due_transit_predictions(
+                later(6.0), engine=engine)
+
+        self.assertEqual(evaluated, ["ABC123"])
+
+        tasks = [task for call in pool.solve.call_args_list
+                 for task in call.args[0]]
+        self.assertEqual(
+            {(task.obs2body, task.observer_elevation_m) for task in tasks},
+            {((51.3, 21.4), 250.0)})
+
+    def test_feed_events_and_table_snapshots_name_the_observer(self):
+        transit.process_line(mlat3(0.0), 30106)
+        feed = Mock()
+
+        with patch.object(transit, "transit_feed", feed), \
+                tempfile.TemporaryDirectory() as directory, \
+                patch.object(transit, "render_full_table_snapshot",
+                             return_value=""), \
+                patch("builtins.print"):
+            transit.publish_transit_feed_event(
+                {"event": "cleared"}, engine=self.engine)
+            transit.table_snapshot_requested.set()
+            transit.process_table_snapshot_request(directory)
+            names = sorted(path.name for path in Path(directory).iterdir())
+
+        self.assertEqual(feed.publish.call_args.args[0]["observer"], "ridge")
+        self.assertEqual(len(names), 2)
+        self.assertTrue(names[1].endswith("_UTC_ridge.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import math
+import random
+import unittest
+from unittest.mock import patch
+
+import transit_warning as transit
+from config import InstallationConfig
+from observer_frame import (
+    LOCAL_TANGENT_PLANE_ERROR_BOUNDS,
+    ObserverFrame,
+    crosstrack_km,
+)
+
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.1111,
+    observer_lon=21.1111,
+    observer_elevation_m=111.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+def legacy_azimuth(observer, target):
+    observer_lat, observer_lon = observer
+    target_lat, target_lon = target
+    azimuth = math.atan2(
+        math.sin(math.radians(target_lon - observer_lon))
+        * math.cos(math.radians(target_lat)),
+        math.cos(math.radians(observer_lat))
+        * math.sin(math.radians(target_lat))
+        - math.sin(math.radians(observer_lat))
+        * math.cos(math.radians(target_lat))
+        * math.cos(math.radians(target_lon - observer_lon)))
+    return (math.degrees(azimuth) + 360) % 360
+
+
+def destination(origin, distance_km, bearing_deg, radius=6371.0):
+    latitude, longitude = map(math.radians, origin)
+    bearing = math.radians(bearing_deg)
+    angle = distance_km / radius
+    target_lat = math.asin(
+        math.sin(latitude) * math.cos(angle)
+        + math.cos(latitude) * math.sin(angle) * math.cos(bearing))
+    target_lon = longitude + math.atan2(
+        math.sin(bearing) * math.sin(angle) * math.cos(latitude),
+        math.cos(angle) - math.sin(latitude) * math.sin(target_lat))
+    return (math.degrees(target_lat),
+            (math.degrees(target_lon) + 540) % 360 - 180)
+
+
+class ObserverFrameTests(unittest.TestCase):
+    def setUp(self):
+        self.frame = ObserverFrame(51.1111, 21.1111, 111.0)
+        self.random = random.Random(26)
+
+    def targets(self, count=500, maximum_km=300.0):
+        for _ in range(count):
+            yield destination(
+                self.frame.position,
+                self.random.uniform(0.5, maximum_km),
+                self.random.uniform(0, 360))
+
+    def test_exact_distance_and_azimuth_match_legacy_formulas(self):
+        for target in self.targets():
+            self.assertEqual(
+                self.frame.distance_km(*target),
+                transit.haversine(self.frame.position, target))
+            self.assertEqual(
+                self.frame.azimuth_deg(*target),
+                legacy_azimuth(self.frame.position, target))
+
+    def test_enu_direction_is_a_unit_vector_with_cosine_up_component(self):
+        for target in self.targets(50):
+            east, north, up = self.frame.enu_direction(*target)
+            self.assertAlmostEqual(east ** 2 + north ** 2 + up ** 2, 1.0)
+            central_angle = self.frame.distance_km(*target) / 6371.0
+            self.assertAlmostEqual(up, math.cos(central_angle))
+
+    def test_local_tangent_plane_stays_within_documented_bounds(self):
+        for maximum_km, distance_error, azimuth_error in (
+                LOCAL_TANGENT_PLANE_ERROR_BOUNDS):
+            for target in self.targets(300, maximum_km):
+                self.assertLessEqual(
+                    abs(self.frame.distance_km(*target, fast=True)
+                        - self.frame.distance_km(*target)),
+                    distance_error)
+                difference = (
+                    self.frame.azimuth_deg(*target, fast=True)
+                    - self.frame.azimuth_deg(*target) + 180) % 360 - 180
+                self.assertLessEqual(abs(difference), azimuth_error)
+
+    def test_angular_position_without_altitude_returns_azimuth_only(self):
+        position = self.frame.angular_position(51.2, 21.3)
+
+        self.assertIsNone(position.altitude_angle_deg)
+        self.assertEqual(
+            position.distance_km,
+            round(transit.haversine(self.frame.position, (51.2, 21.3)), 1))
+        self.assertEqual(
+            position.azimuth_deg,
+            round(legacy_azimuth(self.frame.position, (51.2, 21.3)), 1))
+
+    def test_elevation_uses_observer_elevation(self):
+        self.assertAlmostEqual(
+            self.frame.elevation_deg(1111.0, 1.0), 45.0)
+
+    def test_crosstrack_matches_existing_helper(self):
+        self.assertEqual(
+            self.frame.crosstrack_km(25.0, 210.0, 180.0),
+            transit.crosstrack(25.0, 210.0, 180.0))
+        self.assertEqual(crosstrack_km(25.0, 180.0, 180.0), 0.0)
+
+    def test_imperial_units_keep_the_statute_mile_radius(self):
+        with patch.object(transit, "metric_units", False):
+            self.assertEqual(
+                transit.crosstrack(25.0, 210.0, 180.0),
+                crosstrack_km(25.0, 210.0, 180.0, 3959))
+            self.assertAlmostEqual(
+                transit.display_distance(
+                    self.frame.distance_km(51.2, 21.3)),
+                transit.haversine(self.frame.position, (51.2, 21.3)))
+
+
+class CurrentObserverFrameTests(unittest.TestCase):
+    def setUp(self):
+        transit.apply_installation_config(TEST_CONFIG)
+
+    def test_configuration_builds_frame_once(self):
+        frame = transit.current_observer_frame()
+
+        self.assertIs(frame, transit.observer_frame)
+        self.assertEqual(frame.position, (51.1111, 21.1111))
+        self.assertIs(transit.current_observer_frame(), frame)
+        self.assertIs(
+            transit.current_observer_frame((51.1111, 21.1111), 111.0), frame)
+
+    def test_changed_observer_globals_rebuild_the_frame(self):
+        with patch.object(transit, "my_elevation_const", 100.0):
+            frame = transit.current_observer_frame()
+
+        self.assertEqual(frame.elevation_m, 100.0)
+
+    def test_other_observer_does_not_replace_configured_frame(self):
+        configured = transit.current_observer_frame()
+
+        other = transit.current_observer_frame((50.0, 20.0), 0.0)
+
+        self.assertEqual(other.position, (50.0, 20.0))
+        self.assertIs(transit.observer_frame, configured)
+
+    def test_intersection_uses_cached_observer_trigonometry(self):
+        with patch.object(transit, "radians", wraps=math.radians) as convert:
+            result = transit.solve_great_circle_intersection(
+                (51.1111, 21.1111), (50.30602, 22.24717), 192.0, 400,
+                10066.02, 150.5, 111.0)
+
+        self.assertIsNotNone(result)
+        converted = [call.args[0] for call in convert.call_args_list]
+        self.assertNotIn(51.1111, converted)
+        self.assertNotIn(21.1111, converted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import datetime
+import unittest
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from config import InstallationConfig
+from prediction_cache import (
+    PredictionInputs,
+    TransitPredictionCache,
+    dead_reckon,
+)
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+def later(seconds):
+    return UTC_BASE + datetime.timedelta(seconds=seconds)
+
+
+def inputs(position=(51.2, 21.2), track=180.0, velocity=800,
+           altitude=10000.0):
+    return PredictionInputs(position, track, velocity, altitude)
+
+
+def moved(seconds, track=180.0, velocity=800):
+    return dead_reckon((51.2, 21.2), track, velocity, seconds)
+
+
+class TransitPredictionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = TransitPredictionCache()
+        self.cache.store("ABC123", "sun", inputs(), UTC_BASE, "solution")
+
+    def lookup(self, value, seconds, context=()):
+        return self.cache.lookup(
+            "ABC123", "sun", value, later(seconds),
+            lambda solution, elapsed: (solution, elapsed), context)
+
+    def test_dead_reckoned_position_hits_with_elapsed_time(self):
+        self.assertEqual(
+            self.lookup(inputs(moved(2.0)), 2.0), ("solution", 2.0))
+        self.assertEqual(self.cache.statistics.hits, 1)
+
+    def test_position_off_the_dead_reckoned_path_invalidates(self):
+        self.assertIsNone(self.lookup(inputs(moved(2.0, track=200.0)), 2.0))
+        self.assertIsNone(self.lookup(inputs(moved(2.0)), 2.0))
+        self.assertEqual(self.cache.statistics.invalidations, 1)
+        self.assertEqual(self.cache.statistics.misses, 2)
+
+    def test_unchanged_position_after_elapsed_time_misses(self):
+        self.assertIsNone(self.lookup(inputs(), 2.0))
+
+    def test_changed_motion_inputs_miss(self):
+        for changed in (
+                inputs(moved(1.0), track=180.2),
+                inputs(moved(1.0), velocity=801),
+                inputs(moved(1.0), altitude=10008.0)):
+            self.cache.store("ABC123", "sun", inputs(), UTC_BASE, "solution")
+            self.assertIsNone(self.lookup(changed, 1.0))
+
+    def test_changed_context_and_expired_horizon_miss(self):
+        self.assertIsNone(self.lookup(inputs(moved(1.0)), 1.0, ("newton",)))
+        self.cache.store("ABC123", "sun", inputs(), UTC_BASE, "solution")
+        self.assertIsNone(self.lookup(inputs(moved(5.5)), 5.5))
+
+    def test_discard_removes_every_body_of_the_aircraft(self):
+        self.cache.store("ABC123", "moon", inputs(), UTC_BASE, "solution")
+        self.cache.store("DEF456", "moon", inputs(), UTC_BASE, "solution")
+
+        self.cache.discard("ABC123")
+
+        self.assertEqual(len(self.cache), 1)
+
+    def test_hit_ratio(self):
+        self.lookup(inputs(moved(1.0)), 1.0)
+        self.lookup(inputs(), 1.0)
+
+        self.assertEqual(self.cache.statistics.hit_ratio, 0.5)
+        self.assertIn("1 hits / 1 misses (50.0%)",
+                      self.cache.statistics.summary())
+
+
+class CachedMovingBodyPredictionTests(unittest.TestCase):
+    def setUp(self):
+        transit.apply_installation_config(TEST_CONFIG)
+        self.original_cache = transit.transit_prediction_cache
+        transit.transit_prediction_cache = TransitPredictionCache()
+
+    def tearDown(self):
+        transit.transit_prediction_cache = self.original_cache
+
+    @staticmethod
+    def solution(outcome=transit.TransitSolverOutcome.CONVERGED):
+        result = (51.0, 21.1, 120.0, 20.5, 17.9, 33.7, 150.0, 0, 120.0,
+                  20.0, UTC_BASE)
+        return transit.MovingBodyTransitSolution(
+            result=result,
+            diagnostic=transit.MovingBodyTransitDiagnostic(
+                body="sun", prediction_base_utc=UTC_BASE,
+                initial_time2x=148.0, final_time2x=150.0,
+                correction_count=2, convergence_residual=0.1,
+                outcome=outcome, final_separation=0.5))
+
+    def predict(self, seconds, position=(51.2, 21.2)):
+        return transit.cached_moving_body_transit_pred(
+            "ABC123", "sun", (51.0, 21.0), position, 180.0, 800, 10000.0,
+            later(seconds))
+
+    def test_hit_advances_time_and_aircraft_distance_without_solving(self):
+        solver = Mock(return_value=self.solution())
+        with patch.object(transit, "moving_body_transit_pred", solver):
+            self.predict(0.0)
+            solution = self.predict(2.0, moved(2.0))
+
+        solver.assert_called_once()
+        self.assertAlmostEqual(solution.result[6], 148.0)
+        self.assertEqual(solution.result[5], 33.3)
+        self.assertAlmostEqual(solution.diagnostic.final_time2x, 148.0)
+        self.assertEqual(solution.diagnostic.prediction_base_utc, later(2.0))
+        self.assertEqual(solution.result[10], later(2.0))
+        self.assertTrue(solution.diagnostic.cache_hit)
+
+    def test_changed_position_solves_again(self):
+        solver = Mock(return_value=self.solution())
+        with patch.object(transit, "moving_body_transit_pred", solver):
+            self.predict(0.0)
+            self.predict(2.0, (51.3, 21.2))
+
+        self.assertEqual(solver.call_count, 2)
+
+    def test_technical_fallback_is_not_cached(self):
+        solver = Mock(return_value=self.solution(
+            transit.TransitSolverOutcome.TECHNICAL_FALLBACK))
+        with patch.object(transit, "moving_body_transit_pred", solver):
+            self.predict(0.0)
+            self.predict(1.0, moved(1.0))
+
+        self.assertEqual(solver.call_count, 2)
+
+    def test_reached_transit_time_solves_again(self):
+        solution = self.solution()
+        solution = transit.MovingBodyTransitSolution(
+            result=solution.result[:6] + (1.0,) + solution.result[7:],
+            diagnostic=solution.diagnostic)
+        solver = Mock(return_value=solution)
+        with patch.object(transit, "moving_body_transit_pred", solver):
+            self.predict(0.0)
+            self.predict(1.5, moved(1.5))
+
+        self.assertEqual(solver.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import datetime
+import unittest
+from unittest.mock import Mock
+
+import pytz
+
+import transit_warning as transit
+from config import InstallationConfig
+from prediction_cache import TransitPredictionCache
+from prediction_scheduler import (
+    CANDIDATE_TIER,
+    FAR_TIER,
+    NEAR_TIER,
+    PredictionScheduler,
+    classify_prediction,
+)
+from transit_clock import ReplayClock
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+def later(seconds):
+    return UTC_BASE + datetime.timedelta(seconds=seconds)
+
+
+def classify(separation=None, time2x=None, distance=None):
+    return classify_prediction(separation, time2x, distance, 15, 15, 200)
+
+
+class ClassifyPredictionTests(unittest.TestCase):
+    def test_small_separation_short_time_or_alert_distance_is_candidate(self):
+        self.assertIs(classify(separation=3.0, distance=150), CANDIDATE_TIER)
+        self.assertIs(classify(separation=40.0, time2x=45.0), CANDIDATE_TIER)
+        self.assertIs(classify(distance=12.0), CANDIDATE_TIER)
+
+    def test_moderate_separation_or_warning_distance_is_near(self):
+        self.assertIs(classify(separation=20.0, time2x=400.0), NEAR_TIER)
+        self.assertIs(classify(distance=150.0), NEAR_TIER)
+
+    def test_everything_else_is_far(self):
+        self.assertIs(
+            classify(separation=60.0, time2x=600.0, distance=250.0),
+            FAR_TIER)
+        self.assertIs(classify(), FAR_TIER)
+
+
+class PredictionSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = PredictionScheduler()
+
+    def test_unknown_aircraft_is_evaluated_immediately(self):
+        self.assertTrue(self.scheduler.should_evaluate("ABC123", UTC_BASE))
+        self.assertIs(self.scheduler.tier("ABC123"), CANDIDATE_TIER)
+
+    def test_candidate_is_evaluated_on_every_message(self):
+        self.scheduler.record_evaluation("ABC123", UTC_BASE, CANDIDATE_TIER)
+
+        self.assertTrue(self.scheduler.should_evaluate("ABC123", later(0.1)))
+
+    def test_far_aircraft_is_deferred_until_its_interval_elapses(self):
+        self.scheduler.record_evaluation("ABC123", UTC_BASE, FAR_TIER)
+
+        self.assertFalse(self.scheduler.should_evaluate("ABC123", later(1.0)))
+        self.assertFalse(self.scheduler.should_evaluate("ABC123", later(2.0)))
+        self.assertEqual(self.scheduler.pop_due(later(4.9)), [])
+        self.assertEqual(self.scheduler.pop_due(later(5.0)), ["ABC123"])
+        self.assertEqual(self.scheduler.pop_due(later(6.0)), [])
+        self.assertEqual(self.scheduler.statistics.deferred, 2)
+
+    def test_due_aircraft_are_returned_earliest_first(self):
+        self.scheduler.record_evaluation("FAR001", UTC_BASE, FAR_TIER)
+        self.scheduler.record_evaluation("NEAR01", later(1.0), NEAR_TIER)
+        self.scheduler.should_evaluate("FAR001", later(1.5))
+        self.scheduler.should_evaluate("NEAR01", later(1.5))
+
+        self.assertEqual(
+            self.scheduler.pop_due(later(5.0)), ["NEAR01", "FAR001"])
+
+    def test_evaluated_or_discarded_aircraft_leave_the_queue(self):
+        self.scheduler.record_evaluation("ABC123", UTC_BASE, NEAR_TIER)
+        self.scheduler.record_evaluation("DEF456", UTC_BASE, NEAR_TIER)
+        self.scheduler.should_evaluate("ABC123", later(1.0))
+        self.scheduler.should_evaluate("DEF456", later(1.0))
+
+        self.scheduler.record_evaluation("ABC123", later(1.5), FAR_TIER)
+        self.scheduler.discard("DEF456")
+
+        self.assertEqual(self.scheduler.pop_due(later(3.0)), [])
+
+    def test_summary_counts_evaluations_per_tier(self):
+        self.scheduler.record_evaluation("ABC123", UTC_BASE, FAR_TIER)
+        self.scheduler.record_evaluation("DEF456", UTC_BASE, CANDIDATE_TIER)
+        self.scheduler.should_evaluate("ABC123", later(1.0))
+
+        self.assertEqual(
+            self.scheduler.statistics.summary(),
+            "Prediction scheduler: 2 evaluated, 1 deferred, 0 drained "
+            "CANDIDATE=1 FAR=1")
+
+
+class ScheduledTransitPredictionTests(unittest.TestCase):
+    def setUp(self):
+        self.originals = {
+            name: getattr(transit, name) for name in (
+                "clock", "plane_dict", "altitude_sources",
+                "aircraft_motion_states", "aircraft_motion_freshness_status",
+                "pressure", "tabela", "moving_body_transit_pred", "gong",
+                "prediction_scheduler", "transit_prediction_cache")
+        }
+        transit.clock = ReplayClock()
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.replay_time_initialized = False
+        transit.plane_dict = {}
+        transit.altitude_sources = {}
+        transit.aircraft_motion_states = {}
+        transit.aircraft_motion_freshness_status = {}
+        transit.pressure = 1013.25
+        transit.tabela = (
+            lambda now_utc=None, engine=None: (30.0, 120.0, 20.0, 90.0))
+        transit.gong = lambda now_utc=None: None
+        transit.prediction_scheduler = PredictionScheduler()
+        transit.transit_prediction_cache = TransitPredictionCache()
+        transit.transit_solver_diagnostics.clear()
+
+    def tearDown(self):
+        for name, value in self.originals.items():
+            setattr(transit, name, value)
+        transit.sun_prediction_last_valid.clear()
+        transit.moon_prediction_last_valid.clear()
+        transit.sun_predicted_transit_utc.clear()
+        transit.moon_predicted_transit_utc.clear()
+        transit.transit_solver_diagnostics.clear()
+
+    @staticmethod
+    def mlat3(seconds):
+        value = later(seconds)
+        return (
+            "MLAT,3,1,1,ABC123,1,{date},{time},{date},{time},,10000,"
+            "450,180,51.2,21.2,0".format(
+                date=value.strftime("%Y/%m/%d"),
+                time=value.strftime("%H:%M:%S.000")))
+
+    @staticmethod
+    def solution(body, base, separation):
+        result = (51.2, 21.2, 120.0, 20.0 + separation, 17.9, 33.7, 300.0,
+                  0, 120.0, 20.0, base)
+        return transit.MovingBodyTransitSolution(
+            result=result,
+            diagnostic=transit.MovingBodyTransitDiagnostic(
+                body=body, prediction_base_utc=base, initial_time2x=299.0,
+                final_time2x=300.0, correction_count=1,
+                convergence_residual=0.1,
+                outcome=transit.TransitSolverOutcome.CONVERGED,
+                final_separation=separation))
+
+    def solver(self, separation):
+        return Mock(side_effect=lambda body, *args, **kwargs: self.solution(
+            body, args[5], separation))
+
+    def test_near_aircraft_is_deferred_then_drained(self):
+        transit.moving_body_transit_pred = self.solver(25.0)
+        transit.process_line(self.mlat3(0.0), 30106)
+        self.assertEqual(transit.moving_body_transit_pred.call_count, 2)
+        self.assertIs(transit.prediction_scheduler.tier("ABC123"), NEAR_TIER)
+
+        transit.process_line(self.mlat3(1.0), 30106)
+        self.assertEqual(transit.moving_body_transit_pred.call_count, 2)
+
+        transit.clock.advance_to(later(2.0))
+        self.assertEqual(
+            transit.process_due_transit_predictions(), ["ABC123"])
+        self.assertEqual(transit.moving_body_transit_pred.call_count, 4)
+
+    def test_candidate_aircraft_is_evaluated_on_every_message(self):
+        transit.moving_body_transit_pred = self.solver(2.0)
+        transit.process_line(self.mlat3(0.0), 30106)
+        transit.process_line(self.mlat3(1.0), 30106)
+
+        self.assertIs(
+            transit.prediction_scheduler.tier("ABC123"), CANDIDATE_TIER)
+        self.assertEqual(transit.moving_body_transit_pred.call_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
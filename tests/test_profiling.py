@@ -0,0 +1,177 @@
+import datetime
+import http.client
+import json
+from pathlib import Path
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import transit_warning as transit
+from profiling import (
+    CpuProfile,
+    DiagnosticsProfiler,
+    MemorySnapshots,
+    StackSampler,
+    profile_seconds,
+)
+from status_server import StatusServer, StatusSnapshotCache
+
+
+UTC = datetime.timezone.utc
+BASE = datetime.datetime(2026, 10, 19, 21, 5, 0, tzinfo=UTC)
+
+
+def spin_until(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+
+class CpuProfileTests(unittest.TestCase):
+    def test_sampler_sees_other_threads(self):
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=spin_until, args=(stop,), name="adsb reader")
+        worker.start()
+        sampler = StackSampler(interval=0.001)
+        try:
+            sampler.start(0.2, BASE)
+            self.assertIsNone(sampler.collect())
+            while sampler.running:
+                time.sleep(0.01)
+        finally:
+            stop.set()
+            worker.join()
+
+        profile = sampler.collect()
+
+        self.assertGreater(profile.samples, 0)
+        self.assertTrue(any(
+            stack.startswith("adsb_reader;") and
+            "test_profiling.py:spin_until" in stack
+            for stack in profile.stacks))
+        self.assertFalse(any(
+            stack.startswith("cpu-profiler;") for stack in profile.stacks))
+        self.assertIsNone(sampler.collect())
+
+    def test_collapsed_stacks_and_function_counts(self):
+        profile = CpuProfile(BASE, 1.0, 0.005, samples=4)
+        profile.stacks.update({
+            "MainThread;a.py:main;a.py:tick": 3,
+            "reader;a.py:read;a.py:tick": 1,
+        })
+
+        own, total = profile.function_counts()
+
+        self.assertEqual(profile.collapsed(),
+                         "MainThread;a.py:main;a.py:tick 3\n"
+                         "reader;a.py:read;a.py:tick 1\n")
+        self.assertEqual(own, {"a.py:tick": 4})
+        self.assertEqual(total["a.py:main"], 3)
+        self.assertIn("100.0%  a.py:tick", profile.summary())
+
+
+class MemorySnapshotTests(unittest.TestCase):
+    def test_second_snapshot_reports_growth(self):
+        snapshots = MemorySnapshots()
+        try:
+            first = snapshots.take(BASE)
+            retained = [bytearray(4096) for _ in range(64)]
+            second = snapshots.take(BASE)
+        finally:
+            snapshots.close()
+
+        self.assertIn("(first snapshot since tracing started)", first)
+        growth = second.split("Growth since the previous snapshot")[1]
+        self.assertIn("test_profiling.py", growth)
+        self.assertEqual(len(retained), 64)
+
+
+class DiagnosticsProfilerTests(unittest.TestCase):
+    def test_capture_length_is_validated(self):
+        self.assertEqual(profile_seconds("2.5"), 2.5)
+        for value in ("0", "-1", "7200", "soon"):
+            with self.assertRaises(ValueError):
+                profile_seconds(value)
+
+    def test_signal_request_writes_files_only_from_process(self):
+        profiler = DiagnosticsProfiler(
+            0.05, sampler=StackSampler(interval=0.001))
+        with tempfile.TemporaryDirectory() as directory:
+            profiler.request_from_signal()
+            self.assertEqual(list(Path(directory).iterdir()), [])
+
+            self.assertEqual(profiler.process(BASE, directory), [])
+            try:
+                while profiler.sampler.running:
+                    time.sleep(0.01)
+                written = profiler.process(BASE, directory)
+            finally:
+                profiler.close()
+
+            self.assertEqual([kind for kind, _ in written],
+                             ["CPU profile", "CPU stacks", "Memory snapshot"])
+            names = sorted(path.name for path in Path(directory).iterdir())
+            self.assertEqual(names, [
+                "cpu_profile_20261019_210500_UTC.collapsed",
+                "cpu_profile_20261019_210500_UTC.txt",
+                "memory_snapshot_20261019_210500_UTC.txt",
+            ])
+            self.assertEqual(profiler.process(BASE, directory), [])
+
+    def test_signal_handler_does_not_wait_for_the_lock(self):
+        profiler = DiagnosticsProfiler(
+            0.05, sampler=StackSampler(interval=0.001))
+        with profiler._lock:
+            handler = threading.Thread(target=profiler.request_from_signal)
+            handler.start()
+            handler.join(1.0)
+            self.assertFalse(handler.is_alive())
+
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                profiler.process(BASE, directory)
+                self.assertTrue(profiler.sampler.running)
+            finally:
+                profiler.close()
+
+
+class ProfilingActionTests(unittest.TestCase):
+    def setUp(self):
+        self.server = StatusServer(
+            StatusSnapshotCache(), port=0,
+            actions=transit.PROFILING_ACTIONS).start()
+
+    def tearDown(self):
+        self.server.close()
+
+    def post(self, path):
+        connection = http.client.HTTPConnection(*self.server.address, timeout=5)
+        try:
+            connection.request("POST", path)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    def test_http_requests_are_queued_for_the_main_loop(self):
+        profiler = DiagnosticsProfiler()
+        with patch.object(transit, "diagnostics_profiler", profiler), \
+                patch.object(profiler, "process") as process:
+            status, body = self.post("/diagnostics/cpu-profile?seconds=5")
+            bad_status, _ = self.post("/diagnostics/cpu-profile?seconds=0")
+            memory_status, _ = self.post("/diagnostics/memory-snapshot")
+            missing_status, _ = self.post("/status")
+
+        self.assertEqual((status, json.loads(body)),
+                         (202, {"accepted": "cpu_profile", "seconds": 5.0}))
+        self.assertEqual((bad_status, memory_status, missing_status),
+                         (400, 202, 404))
+        self.assertEqual(profiler._cpu_seconds, 5.0)
+        self.assertTrue(profiler._memory_requested)
+        process.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import datetime
+import random
+import unittest
+from unittest.mock import patch
+
+import transit_warning as transit
+from render_index import RenderPriorityIndex
+
+
+NOW = datetime.datetime(2026, 8, 19, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def aircraft(distance=10, sun_time="", moon_time="", separation=1.0):
+    entry = [""] * 32
+    entry[5] = distance
+    if sun_time != "":
+        entry[18:23] = [30.0, 30.0 + separation, 10.0, 20.0, sun_time]
+    if moon_time != "":
+        entry[23:28] = [20.0, 20.0 + separation, 11.0, 21.0, moon_time]
+    return entry
+
+
+class RenderPriorityIndexTests(unittest.TestCase):
+    def test_rows_follow_shown_time_then_sun_then_arrival(self):
+        index = RenderPriorityIndex()
+        index.set_maximum_distance(200)
+        index.update("PLAIN", 10.0, [])
+        index.update("MOON", 10.0, [(1, NOW + datetime.timedelta(
+            seconds=5.9), 5)])
+        index.update("SUN", 10.0, [(0, NOW + datetime.timedelta(
+            seconds=5.2), 5)])
+        index.update("FAR", 250.0, [(0, NOW + datetime.timedelta(
+            seconds=1), 1)])
+        index.update("STORED", 10.0, [(1, None, 3.0)])
+
+        self.assertEqual(index.plan(10, NOW),
+                         ("STORED", "SUN", "MOON", "PLAIN"))
+        self.assertEqual(index.plan(2, NOW), ("STORED", "SUN"))
+
+        index.update("FAR", 20.0, [])
+        index.discard("SUN")
+
+        self.assertEqual(index.plan(10, NOW + datetime.timedelta(seconds=5)),
+                         ("STORED", "PLAIN", "MOON", "FAR"))
+        self.assertEqual(len(index), 4)
+
+
+class EnginePlanTests(unittest.TestCase):
+    def setUp(self):
+        self.originals = {
+            name: getattr(transit, name) for name in (
+                "plane_dict", "render_priority_index")
+        }
+        transit.render_priority_index = RenderPriorityIndex()
+        transit.sun_predicted_transit_utc.clear()
+        transit.moon_predicted_transit_utc.clear()
+
+    def tearDown(self):
+        for name, value in self.originals.items():
+            setattr(transit, name, value)
+        transit.sun_predicted_transit_utc.clear()
+        transit.moon_predicted_transit_utc.clear()
+
+    def random_entry(self, rng, icao):
+        times = {}
+        for body_name, predicted in (
+                ("sun", transit.sun_predicted_transit_utc),
+                ("moon", transit.moon_predicted_transit_utc)):
+            predicted.pop(icao, None)
+            if rng.random() < 0.4:
+                seconds = rng.choice([rng.uniform(-3, 60), rng.randint(1, 8)])
+                times[body_name] = round(seconds)
+                if rng.random() < 0.8:
+                    predicted[icao] = NOW + datetime.timedelta(seconds=seconds)
+        return aircraft(
+            rng.choice([10, 150, 250, ""]), times.get("sun", ""),
+            times.get("moon", ""), rng.choice([1.0, 20.0]))
+
+    def test_index_matches_the_full_scan_as_aircraft_change(self):
+        rng = random.Random(50)
+        transit.plane_dict = {
+            "A{:03d}".format(number): self.random_entry(
+                rng, "A{:03d}".format(number))
+            for number in range(120)}
+
+        for step in range(40):
+            for _ in range(5):
+                icao = rng.choice(list(transit.plane_dict))
+                transit.plane_dict[icao] = self.random_entry(rng, icao)
+                transit.update_render_priority(icao)
+            now = NOW + datetime.timedelta(seconds=rng.uniform(0, 4))
+            for row_limit in (0, 3, 29, 200):
+                with self.subTest(step=step, row_limit=row_limit):
+                    self.assertEqual(
+                        transit.render_priority_plan(row_limit, 200, now),
+                        transit.build_terminal_render_plan(
+                            transit.plane_dict, row_limit, 200, now))
+
+    def test_frames_do_not_revisit_unchanged_aircraft(self):
+        transit.plane_dict = {
+            "P{:03d}".format(number): aircraft() for number in range(300)}
+        transit.plane_dict["SUN"] = aircraft(sun_time=12)
+        transit.render_priority_plan(5, 200, NOW)
+
+        with patch.object(transit, "transit_candidate_values") as values:
+            plan = transit.render_priority_plan(5, 200, NOW)
+
+        values.assert_not_called()
+        self.assertEqual(plan.aircraft_ids,
+                         ("SUN", "P000", "P001", "P002", "P003"))
+        self.assertEqual(plan.total_count, 301)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
+import io
 import socket
 import tempfile
 import threading
 import time
 import unittest
+from contextlib import redirect_stdout
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch
@@ -12,6 +14,8 @@ import pytz
 from replay_server import (
     ADSB_PORT,
     MLAT_PORT,
+    BufferedClient,
+    ClientGroup,
     DualReplayServer,
     DualScenario,
     ReplayPacer,
@@ -182,6 +186,87 @@ class DualStreamTests(unittest.TestCase):
                     self.assertEqual(pacer_type.return_value.pace.call_count, 2)
 
 
+class BlockedSocket:
+    """A consumer whose first send never returns until it is shut down."""
+
+    def __init__(self):
+        self.released = threading.Event()
+
+    def getpeername(self):
+        return ("127.0.0.1", 1)
+
+    def sendall(self, payload):
+        self.released.wait(2)
+        raise BrokenPipeError("shut down")
+
+    def shutdown(self, how):
+        self.released.set()
+
+    def close(self):
+        pass
+
+
+class FanOutTests(unittest.TestCase):
+    def test_group_sends_identical_streams_to_every_member(self):
+        pairs = [socket.socketpair() for _ in range(3)]
+        group = ClientGroup([pair[0] for pair in pairs], threading.Event())
+        try:
+            self.assertEqual(replay_lines(iter(LINES), group, None, threading.Event()), (2, 0))
+            group.close(timeout=2)
+            expected = "".join(LINES).replace("\n", "\r\n").encode()
+            for _, receiver in pairs:
+                self.assertEqual(receive_all(receiver), expected)
+            self.assertEqual([member.sent for member in group.members], [2, 2, 2])
+        finally:
+            for _, receiver in pairs:
+                receiver.close()
+
+    def test_disconnect_policy_drops_only_the_slow_client(self):
+        sender, receiver = socket.socketpair()
+        slow = BlockedSocket()
+        group = ClientGroup([sender, slow], threading.Event(), buffer_lines=4,
+                            slow_client="disconnect")
+        try:
+            for index in range(10):
+                group.sendall(f"line {index}\r\n".encode())
+                time.sleep(0.01)
+            group.close(timeout=2)
+            self.assertEqual(receive_all(receiver).count(b"\r\n"), 10)
+            self.assertIsNone(group.members[0].dropped)
+            self.assertEqual(group.members[1].dropped, "send buffer full")
+            self.assertIn("dropped (send buffer full)", group.members[1].summary())
+        finally:
+            receiver.close()
+
+    def test_block_policy_waits_for_the_slow_client(self):
+        slow = BlockedSocket()
+        client = BufferedClient(slow, threading.Event(), buffer_lines=1)
+        self.assertTrue(client.offer(b"first\r\n"))
+        time.sleep(0.05)
+        self.assertTrue(client.offer(b"second\r\n"))
+
+        offered = []
+        worker = threading.Thread(target=lambda: offered.append(client.offer(b"third\r\n")))
+        worker.start()
+        worker.join(0.2)
+        self.assertTrue(worker.is_alive())
+
+        slow.shutdown(socket.SHUT_RDWR)
+        worker.join(2)
+        self.assertEqual(offered, [False])
+        self.assertTrue(client.dropped.startswith("disconnected"))
+
+    def test_group_fails_once_every_member_is_gone(self):
+        group = ClientGroup([BlockedSocket()], threading.Event(), buffer_lines=1,
+                            slow_client="disconnect")
+        group.sendall(b"first\r\n")
+        time.sleep(0.05)
+        group.sendall(b"second\r\n")
+        with self.assertRaises(BrokenPipeError):
+            group.sendall(b"third\r\n")
+        group.close(timeout=2)
+
+
 class ServerTests(unittest.TestCase):
     def setUp(self):
         self.temp = tempfile.TemporaryDirectory()
@@ -218,6 +303,35 @@ class ServerTests(unittest.TestCase):
                 self.assertEqual(active_file.readline(), expected_first)
 
 
+class FanOutServerTests(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp.name) / "recording.log"
+        self.path.write_text("".join(LINES), encoding="utf-8")
+        self.active_port = free_port()
+        self.server = ReplayServer(
+            Scenario("test", self.active_port, free_port(), self.path),
+            self.path, None, clients=2)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.temp.cleanup()
+
+    def test_one_run_is_broadcast_once_all_clients_connect(self):
+        first = socket.create_connection(("127.0.0.1", self.active_port), timeout=2)
+        first.settimeout(0.15)
+        with self.assertRaises(socket.timeout):
+            first.recv(1)
+        second = socket.create_connection(("127.0.0.1", self.active_port), timeout=2)
+        first.settimeout(2)
+        second.settimeout(2)
+        expected = "".join(LINES).replace("\n", "\r\n").encode()
+        with first, second, redirect_stdout(io.StringIO()):
+            self.assertEqual(receive_all(first), expected)
+            self.assertEqual(receive_all(second), expected)
+
+
 class DualServerTests(unittest.TestCase):
     def setUp(self):
         self.temp = tempfile.TemporaryDirectory()
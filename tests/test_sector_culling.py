@@ -0,0 +1,153 @@
+import datetime
+import random
+import unittest
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from config import InstallationConfig
+from observer_frame import ObserverFrame
+from sector_culling import (
+    SectorCullDiagnostics,
+    SectorCullReason,
+    reachable_sectors,
+    sector_cull_reason,
+)
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+class SectorCullReasonTests(unittest.TestCase):
+    def setUp(self):
+        self.frame = ObserverFrame(51.0, 21.0, 200.0)
+
+    def reason(self, position, track, body_alt=30.0, body_az=180.0,
+               altitude_m=10000.0, velocity=800):
+        return sector_cull_reason(
+            self.frame, position, track, velocity, altitude_m,
+            body_alt, body_az, separation_margin_deg=15.0)
+
+    def test_bearing_sweeps_from_position_towards_heading(self):
+        sectors = reachable_sectors(0, 9)
+
+        self.assertTrue({0, 5, 9}.issubset(sectors))
+        self.assertNotIn(18, sectors)
+        self.assertNotIn(27, sectors)
+        self.assertEqual(len(reachable_sectors(0, 18)), 36)
+
+    def test_aircraft_heading_away_from_body_sector_is_culled(self):
+        self.assertEqual(
+            self.reason((51.5, 21.0), 0.0),
+            SectorCullReason.HEADING_AWAY)
+
+    def test_bearing_outside_horizon_sweep_is_culled(self):
+        self.assertEqual(
+            self.reason((51.0, 23.14), 0.0, body_az=10.0),
+            SectorCullReason.BEARING_OUT_OF_REACH)
+
+    def test_unreachable_elevation_is_culled(self):
+        self.assertEqual(
+            self.reason((51.0, 23.5), 270.0, body_alt=70.0, body_az=90.0,
+                        altitude_m=1000.0, velocity=200),
+            SectorCullReason.ELEVATION_OUT_OF_REACH)
+
+    def test_crossing_track_is_kept(self):
+        self.assertIsNone(self.reason((50.8, 21.6), 270.0))
+
+    def test_invalid_inputs_are_left_to_the_solver(self):
+        self.assertIsNone(self.reason((51.5, 21.0), "", velocity=800))
+        self.assertIsNone(self.reason((51.5, 21.0), 0.0, velocity=0))
+
+
+class SectorCullDiagnosticsTests(unittest.TestCase):
+    def test_skip_ratio_and_summary(self):
+        diagnostics = SectorCullDiagnostics()
+        diagnostics.record("sun", SectorCullReason.HEADING_AWAY)
+        diagnostics.record("moon", SectorCullReason.HEADING_AWAY)
+        diagnostics.record("moon", None)
+        diagnostics.record("sun", None)
+
+        self.assertEqual(diagnostics.skip_ratio, 0.5)
+        self.assertEqual(
+            diagnostics.summary(),
+            "Solver sector culling: 2/4 skipped (50.0%) HEADING_AWAY=2")
+
+
+class MovingBodySectorCullingTests(unittest.TestCase):
+    def setUp(self):
+        transit.apply_installation_config(TEST_CONFIG)
+        self.original_diagnostics = transit.sector_cull_diagnostics
+        transit.sector_cull_diagnostics = SectorCullDiagnostics()
+
+    def tearDown(self):
+        transit.sector_cull_diagnostics = self.original_diagnostics
+
+    def test_culled_aircraft_skips_ephemeris_and_geometry(self):
+        ephemeris = Mock()
+        with patch.object(transit, "body_position_at_utc", ephemeris):
+            solution = transit.moving_body_transit_pred(
+                "sun", (51.0, 21.0), (51.5, 21.0), 0.0, 800, 10000.0,
+                UTC_BASE, fallback_body_position=transit.BodyPosition(
+                    30.0, 180.0, 1900.0, UTC_BASE))
+
+        ephemeris.assert_not_called()
+        self.assertIsNone(solution.result)
+        self.assertEqual(
+            solution.diagnostic.outcome,
+            transit.TransitSolverOutcome.SECTOR_CULLED)
+        self.assertEqual(transit.sector_cull_diagnostics.skip_ratio, 1.0)
+
+    def test_without_current_body_state_the_solver_always_runs(self):
+        with patch.object(
+                transit, "body_position_at_utc",
+                return_value=(30.0, 180.0)) as ephemeris:
+            transit.moving_body_transit_pred(
+                "sun", (51.0, 21.0), (51.5, 21.0), 0.0, 800, 10000.0,
+                UTC_BASE)
+
+        ephemeris.assert_called()
+        self.assertEqual(transit.sector_cull_diagnostics.evaluated, 0)
+
+    def test_culling_never_drops_a_reportable_prediction(self):
+        generator = random.Random(28)
+        body_position = transit.body_position_at_utc("sun", UTC_BASE)
+        culled = 0
+        for _ in range(1500):
+            position = (51.0 + generator.uniform(-3, 3),
+                        21.0 + generator.uniform(-4.5, 4.5))
+            track = generator.uniform(0, 360)
+            velocity = generator.choice((150, 450, 800, 950))
+            altitude = generator.uniform(300, 13000)
+            reason = transit.cull_moving_body_prediction(
+                "sun", position, track, velocity, altitude, body_position)
+            if reason is None:
+                continue
+            culled += 1
+            solution = transit.fixed_point_moving_body_transit_pred(
+                "sun", (51.0, 21.0), position, track, velocity, altitude,
+                UTC_BASE)
+            if solution.result:
+                self.assertGreaterEqual(
+                    solution.diagnostic.final_separation,
+                    transit.transit_separation_notignored)
+
+        self.assertGreater(culled, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import math
+import unittest
+from unittest.mock import Mock
+
+import transit_warning as transit
+from config import InstallationConfig
+from separation_envelope import (
+    EnvelopeInputs,
+    EnvelopeUncertainty,
+    separation_envelope,
+    sigma_points,
+    transit_probability,
+)
+from transit_clock import RealClock
+
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+INPUTS = EnvelopeInputs(51.0, 21.0, 90.0, 800.0, 10000.0)
+
+
+class SigmaPointTests(unittest.TestCase):
+    def test_points_recover_the_spread_of_a_linear_model(self):
+        points = sigma_points(INPUTS, 0.0, 10.0, 0.0, 30.0)
+
+        def evaluate(sample):
+            return (0.01 * (sample.groundspeed_kmh - 800.0)
+                    + 0.002 * (sample.altitude_m - 10000.0))
+
+        envelope = separation_envelope(evaluate, INPUTS, points, 0.2)
+
+        self.assertEqual(len(points), 4)
+        self.assertAlmostEqual(envelope.sigma_deg, math.hypot(0.1, 0.06))
+        self.assertAlmostEqual(envelope.low_deg, 0.0)
+        self.assertAlmostEqual(envelope.high_deg, 0.2 + 2 * envelope.sigma_deg)
+        self.assertEqual((envelope.samples, envelope.solved), (4, 4))
+
+    def test_missed_samples_give_the_sampled_range_only(self):
+        points = sigma_points(INPUTS, 0.0, 0.0, 2.0, 0.0)
+
+        def evaluate(sample):
+            if sample.track_deg >= 92.0:
+                return None
+            return 0.1 * (sample.track_deg - 90.0)
+
+        envelope = separation_envelope(evaluate, INPUTS, points, 1.0)
+
+        self.assertIsNone(envelope.transit_probability)
+        self.assertEqual(envelope.solved, 1)
+        self.assertAlmostEqual(envelope.low_deg, 1.0 - 0.1 * 2.0)
+        self.assertEqual(envelope.high_deg, 1.0)
+        self.assertIsNone(separation_envelope(lambda _: None, INPUTS, points, 1.0))
+
+    def test_probability_of_falling_inside_the_disc(self):
+        self.assertAlmostEqual(transit_probability(0.0, 0.25, 0.25),
+                               math.erf(1 / math.sqrt(2)))
+        self.assertLess(transit_probability(1.0, 0.25, 0.25), 0.002)
+        self.assertEqual(transit_probability(0.1, 0.0, 0.25), 1.0)
+        self.assertEqual(EnvelopeUncertainty().position_km("mlat"), 0.3)
+
+
+class EngineEnvelopeTests(unittest.TestCase):
+    def setUp(self):
+        self.originals = {
+            name: getattr(transit, name) for name in (
+                "clock", "separation_envelope_uncertainty",
+                "separation_envelopes", "aircraft_motion_states",
+                "transit_solver_diagnostics")
+        }
+        transit.clock = RealClock()
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.separation_envelope_uncertainty = EnvelopeUncertainty()
+        transit.separation_envelopes = {}
+        transit.aircraft_motion_states = {}
+        transit.transit_solver_diagnostics = {}
+        # About 17 km south and 5 km west, flying east under a body at
+        # 30 degrees altitude due south.
+        self.plane_pos = (51.0 - 17.0 / 111.19, 21.0 - 5.0 / 70.0)
+        self.result = transit.transit_pred(
+            (51.0, 21.0), self.plane_pos, 90.0, 800.0, 10000.0, 30.0, 180.0)
+
+    def tearDown(self):
+        for name, value in self.originals.items():
+            setattr(transit, name, value)
+
+    def update(self, result=None, uncertainty=None):
+        if uncertainty is not None:
+            transit.separation_envelope_uncertainty = uncertainty
+        return transit.update_separation_envelope(
+            "48AE01", "sun", result or self.result, self.plane_pos, 90.0,
+            800.0, 10000.0, None)
+
+    def test_candidate_gets_an_interval_around_its_separation(self):
+        envelope = self.update()
+        precise = self.update(uncertainty=EnvelopeUncertainty(
+            0.0, 0.0, 0.0, 0.0, 1.0))
+
+        separation = abs(self.result[3] - self.result[9])
+        self.assertLess(separation, 1.0)
+        self.assertEqual(envelope.samples, 10)
+        self.assertEqual(envelope.solved, 10)
+        self.assertAlmostEqual(envelope.separation_deg, separation)
+        self.assertLessEqual(envelope.low_deg, separation)
+        self.assertGreater(envelope.high_deg, separation)
+        self.assertGreater(envelope.sigma_deg, precise.sigma_deg)
+        self.assertGreater(precise.transit_probability,
+                           envelope.transit_probability)
+        self.assertIs(transit.separation_envelopes[("48AE01", "sun")], precise)
+
+    def test_ignored_or_disabled_candidates_have_no_envelope(self):
+        self.update()
+        far = list(self.result)
+        far[3] = far[9] + transit.transit_separation_notignored + 1
+
+        self.assertIsNone(self.update(tuple(far)))
+        self.assertEqual(transit.separation_envelopes, {})
+        transit.separation_envelope_uncertainty = None
+        self.assertIsNone(self.update())
+
+    def test_mlat_positions_use_the_wider_sigma(self):
+        transit.aircraft_motion_states["48AE01"] = Mock(
+            position=Mock(source="mlat"))
+
+        self.assertEqual(transit.envelope_sigmas("48AE01", None), (0.3, 10.0))
+        self.assertEqual(transit.envelope_sigmas("48AE02", None), (0.05, 10.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import datetime
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from snapshot_catalog import (
+    CATALOG_FILENAME,
+    SnapshotCatalog,
+    rebuild_catalog,
+    summarize_document,
+)
+from transit_snapshot import TransitSnapshotManager
+
+
+UTC = datetime.timezone.utc
+BASE = datetime.datetime(2026, 9, 14, 21, 5, 0, tzinfo=UTC)
+
+
+def prediction(separation, offset=-4, body="MOON", mode="DYNAMIC_VALID",
+               outcome="converged", icao="48AE01"):
+    recorded = BASE + datetime.timedelta(seconds=offset)
+    return {
+        "recorded_at_utc": recorded,
+        "predicted_transit_utc": BASE,
+        "icao": icao,
+        "callsign": "LOT3TR",
+        "body": body,
+        "observer": {"lat": 51.0, "lon": 21.0, "elevation_m": 200},
+        "time2x_seconds": -offset,
+        "separation_deg": separation,
+        "vertical_prediction": {"mode": mode},
+        "solver_outcome": outcome,
+    }
+
+
+def document(event_id, body="MOON", separations=(0.4, -0.15, 0.3),
+             day="2026-09-14", icao="48AE01"):
+    updates = [{"separation_deg": separation,
+                "vertical_prediction": {"mode": "DYNAMIC_VALID"},
+                "solver_outcome": "converged"} for separation in separations]
+    updates[-1]["vertical_prediction"]["mode"] = "LEVEL"
+    return {
+        "event_id": event_id,
+        "complete": True,
+        "aircraft": {"icao": icao, "callsign": None},
+        "body": body,
+        "final_reference_transit_utc": "{}T21:05:00Z".format(day),
+        "trigger_prediction": updates[0],
+        "prediction_updates": updates,
+    }
+
+
+class SummaryTests(unittest.TestCase):
+    def test_row_takes_the_closest_prediction(self):
+        row = summarize_document(document("e1"), "2026-09-14/e1.json")
+
+        self.assertEqual(row["min_separation_deg"], 0.15)
+        self.assertEqual(row["vertical_mode"], "DYNAMIC_VALID")
+        self.assertEqual(row["solver_outcome"], "converged")
+        self.assertEqual(row["path"], "2026-09-14/e1.json")
+
+    def test_queries_filter_on_indexed_columns(self):
+        with tempfile.TemporaryDirectory() as directory:
+            catalog = SnapshotCatalog(Path(directory) / CATALOG_FILENAME)
+            catalog.upsert(
+                summarize_document(document("e1"), "a.json"),
+                summarize_document(document("e2", separations=(0.4,)), "b.json"),
+                summarize_document(document("e3", body="SUN"), "c.json"),
+                summarize_document(
+                    document("e4", day="2026-08-30"), "d.json"))
+
+            rows = catalog.events(
+                body="moon", max_separation_deg=0.2,
+                vertical_mode="DYNAMIC_VALID", since_utc="2026-09-01",
+                until_utc="2026-10-01")
+            catalog.upsert(summarize_document(
+                document("e1", separations=(0.5,)), "a.json"))
+            updated = catalog.events(icao="48AE01", body="MOON")
+            catalog.close()
+
+        self.assertEqual([row["event_id"] for row in rows], ["e1"])
+        self.assertEqual([(row["event_id"], row["min_separation_deg"])
+                          for row in updated],
+                         [("e4", 0.15), ("e1", 0.5), ("e2", 0.4)])
+
+
+class ManagerCatalogTests(unittest.TestCase):
+    def test_finalized_and_shutdown_events_are_catalogued(self):
+        with tempfile.TemporaryDirectory() as directory:
+            manager = TransitSnapshotManager(directory, git_commit="abc")
+            manager.consider_prediction(prediction(0.3))
+            manager.consider_prediction(prediction(0.1, offset=-2))
+            manager.consider_prediction(prediction(0.2, body="SUN"))
+            manager.finalize_due(BASE + datetime.timedelta(seconds=7))
+            manager.close(BASE + datetime.timedelta(seconds=7))
+
+            rows = manager.catalog.events()
+            files = sorted(
+                path.relative_to(directory).as_posix()
+                for path in Path(directory).rglob("*.json"))
+
+        self.assertEqual(len(rows), 2)
+        by_body = {row["body"]: row for row in rows}
+        self.assertEqual(by_body["MOON"]["min_separation_deg"], 0.1)
+        self.assertEqual(by_body["MOON"]["solver_outcome"], "converged")
+        self.assertEqual(sorted(row["path"] for row in rows), files)
+
+    def test_catalog_can_be_disabled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            manager = TransitSnapshotManager(
+                directory, git_commit="abc", catalog_filename=None)
+            manager.consider_prediction(prediction(0.1))
+            manager.close(BASE)
+
+            self.assertFalse((Path(directory) / CATALOG_FILENAME).exists())
+
+
+class RebuildTests(unittest.TestCase):
+    def test_rebuild_backfills_files_in_parallel_and_skips_bad_ones(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            for day, event_id in (("2026-09-13", "e1"), ("2026-09-14", "e2"),
+                                  ("2026-09-14", "e3")):
+                (root / day).mkdir(exist_ok=True)
+                (root / day / (event_id + ".json")).write_text(
+                    json.dumps(document(event_id, day=day)), encoding="utf-8")
+            (root / "2026-09-14" / "broken.json").write_text(
+                "{", encoding="utf-8")
+            catalog = SnapshotCatalog(root / CATALOG_FILENAME)
+            catalog.upsert(summarize_document(document("stale"), "gone.json"))
+
+            counts = rebuild_catalog(root, workers=2, catalog=catalog)
+            rows = catalog.events()
+            catalog.close()
+
+        self.assertEqual(counts, (3, 1))
+        self.assertEqual([row["event_id"] for row in rows], ["e1", "e2", "e3"])
+        self.assertEqual(rows[0]["path"], "2026-09-13/e1.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import datetime
+import json
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import transit_warning as transit
+from config import InstallationConfig
+from solver_benchmark import (
+    compare_solvers,
+    format_report,
+    format_snapshot_report,
+    latency_percentiles,
+    replay_snapshot_predictions,
+    sbs_solver_inputs,
+    snapshot_documents,
+    snapshot_predictions,
+)
+
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+def sbs(message_type, logged, altitude="", speed="", track="",
+        latitude="", longitude="", icao="48AE01"):
+    date, value_time = logged.split()
+    return (
+        "MSG,{},1,1,{},1,{},{},{},{},,{},{},{},{},{},,,,,,0\r\n".format(
+            message_type, icao, date, value_time, date, value_time,
+            altitude, speed, track, latitude, longitude))
+
+
+class SbsSolverInputTests(unittest.TestCase):
+    def test_complete_states_are_sampled_per_aircraft(self):
+        lines = [
+            sbs(3, "2026/08/19 14:00:00.000", "33000", latitude="51.2",
+                longitude="21.2"),
+            sbs(4, "2026/08/19 14:00:00.500", speed="450", track="180"),
+            sbs(3, "2026/08/19 14:00:01.000", "33000", latitude="51.19",
+                longitude="21.2"),
+            sbs(3, "2026/08/19 14:00:03.000", "33000", latitude="51.18",
+                longitude="21.2"),
+            sbs(3, "2026/08/19 14:00:06.000", "33000", latitude="51.17",
+                longitude="21.2"),
+        ]
+
+        inputs = list(sbs_solver_inputs(lines, 30003, "Europe/Warsaw", 5.0))
+
+        self.assertEqual(
+            [value.position for value in inputs],
+            [(51.19, 21.2), (51.17, 21.2)])
+        first = inputs[0]
+        self.assertEqual(first.velocity_kmh, 833)
+        self.assertEqual(first.track_deg, 180.0)
+        self.assertAlmostEqual(first.elevation_m, 10058.4)
+        self.assertEqual(
+            first.timestamp_utc,
+            datetime.datetime(2026, 8, 19, 12, 0, 1,
+                              tzinfo=datetime.timezone.utc))
+
+    def test_malformed_lines_are_skipped(self):
+        lines = ["", "MSG,3,short\r\n",
+                 sbs(3, "2026/08/19 14:00:00.000", "abc", latitude="51.2",
+                     longitude="21.2")]
+
+        self.assertEqual(
+            list(sbs_solver_inputs(lines, 30003, "Europe/Warsaw")), [])
+
+
+class CompareSolversTests(unittest.TestCase):
+    def setUp(self):
+        transit.apply_installation_config(TEST_CONFIG)
+
+    def test_reports_speed_outcomes_and_agreement(self):
+        lines = [
+            sbs(4, "2026/08/19 14:00:00.000", speed="450", track="270"),
+            sbs(3, "2026/08/19 14:00:00.500", "36000", latitude="50.9",
+                longitude="21.4"),
+        ]
+        inputs = list(sbs_solver_inputs(lines, 30003, "Europe/Warsaw"))
+
+        comparison = compare_solvers(
+            inputs, tuple(transit.MOVING_BODY_SOLVER_FUNCTIONS), ("sun",))
+
+        self.assertEqual(comparison.compared, 1)
+        for result in comparison.statistics.values():
+            self.assertEqual(result.calls, 1)
+            self.assertEqual(sum(result.outcomes.values()), 1)
+        report = format_report(comparison)
+        self.assertIn("fixed-point: 1 calls", report)
+        self.assertIn("newton: 1 calls", report)
+        self.assertIn("outcome agreement:", report)
+
+
+def recorded_document(base):
+    """A snapshot prediction made by the production solver and 2E/2F path."""
+    motion = transit.AircraftMotionState(
+        altitude=transit.MotionParameter(10972.8, base, "adsb"))
+    with patch.dict(transit.aircraft_motion_states, {"48AE01": motion},
+                    clear=True), \
+            patch.dict(transit.aircraft_intent_states, clear=True), \
+            patch.dict(transit.vertical_transit_diagnostics, clear=True):
+        solver_input = transit.build_snapshot_solver_input(
+            "48AE01", 50.9, 21.4, 10972.8, 30.0, 110.0, 20.0, 833, 270.0)
+        solution = transit.fixed_point_moving_body_transit_pred(
+            "sun", (51.0, 21.0), (50.9, 21.4), 270.0, 833, 10972.8, base)
+        final = transit.apply_vertical_prediction_to_transit_result(
+            "48AE01", "sun", solution.result, 10972.8, base)
+        vertical = transit.vertical_transit_diagnostics[("48AE01", "sun")]
+        frozen = transit.build_frozen_prediction_state(
+            "48AE01", "sun", final, base, solver_input, vertical,
+            solution.diagnostic, 1013.25)
+    recorded = {
+        "icao": "48AE01",
+        "body": "SUN",
+        "observer": {"lat": 51.0, "lon": 21.0, "elevation_m": 200.0},
+        "prediction_base_utc": transit._snapshot_utc_text(base),
+        "time2x_seconds": float(final[6]),
+        "separation_deg": transit.vertical_transit_separation(
+            final[3], final[9]),
+        "h2x_km": float(final[4]),
+        "solver_input": solver_input,
+        "solver_outcome": solution.diagnostic.outcome.value,
+        "frozen_prediction_state": frozen,
+    }
+    return {"event_id": "event-1", "trigger_prediction": recorded,
+            "prediction_updates": [recorded, {"separation_deg": 0.3}]}
+
+
+class SnapshotReplayTests(unittest.TestCase):
+    def setUp(self):
+        transit.apply_installation_config(TEST_CONFIG)
+
+    def test_recorded_inputs_replay_without_drift(self):
+        base = datetime.datetime(2026, 8, 19, 12, 0, 0, 500000,
+                                 tzinfo=datetime.timezone.utc)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "2026-08-19" / "event.json"
+            path.parent.mkdir()
+            path.write_text(json.dumps(recorded_document(base)),
+                            encoding="utf-8")
+            predictions = list(snapshot_predictions(
+                snapshot_documents([directory])))
+
+        replay = replay_snapshot_predictions(
+            predictions, tuple(transit.MOVING_BODY_SOLVER_FUNCTIONS))
+
+        self.assertEqual(replay.predictions, 1)
+        self.assertEqual(predictions[0].solver_input.timestamp_utc, base)
+        fixed_point = replay.statistics["fixed-point"]
+        self.assertEqual(len(fixed_point.latencies_us), 1)
+        self.assertEqual(
+            (fixed_point.outcome_matches, fixed_point.outcomes_compared),
+            (1, 1))
+        self.assertEqual(fixed_point.drift["separation"], [0.0])
+        self.assertEqual(fixed_point.drift["time2x"], [0.0])
+        self.assertLess(
+            replay.statistics["newton"].drift["separation"][0], 0.01)
+        self.assertEqual(replay.vertical_mode_matches, 1)
+        self.assertEqual(replay.altitude_drift, [0.0])
+        report = format_snapshot_report(replay)
+        self.assertIn("1 recorded predictions", report)
+        self.assertIn("fixed-point: 1 calls, p50", report)
+        self.assertIn("vertical:", report)
+
+    def test_latency_percentiles_use_nearest_rank(self):
+        self.assertEqual(latency_percentiles(range(1, 101)),
+                         (51, 91, 100, 100))
+        self.assertEqual(latency_percentiles([]), (0.0, 0.0, 0.0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
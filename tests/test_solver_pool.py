@@ -0,0 +1,205 @@
+import datetime
+import random
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from config import InstallationConfig
+from prediction_cache import TransitPredictionCache
+from prediction_scheduler import PredictionScheduler
+from sector_culling import SectorCullDiagnostics
+from solver_pool import SolverPool, SolverTask
+from transit_clock import ReplayClock
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+class FakeMonotonic:
+    def __init__(self):
+        self.value = 100.0
+
+    def __call__(self):
+        return self.value
+
+
+def random_tasks(count, seed=31):
+    generator = random.Random(seed)
+    tasks = []
+    for _ in range(count):
+        body_name = generator.choice(("sun", "moon"))
+        tasks.append(SolverTask(
+            body_name, (51.0, 21.0),
+            (51.0 + generator.uniform(-1, 1), 21.0 + generator.uniform(-1.5, 1.5)),
+            generator.uniform(0, 360), generator.choice((450.0, 800.0)),
+            generator.uniform(3000, 12000), UTC_BASE,
+            transit.body_position_at_utc(body_name, UTC_BASE)))
+    return tasks
+
+
+class SolverPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.original_clock = transit.clock
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.clock = ReplayClock()
+        transit.clock.advance_to(UTC_BASE)
+
+    def tearDown(self):
+        transit.clock = self.original_clock
+
+    def test_worker_results_match_in_process_results_in_order(self):
+        tasks = random_tasks(24)
+        pool = SolverPool(
+            2, lambda: (TEST_CONFIG, "fixed-point"),
+            transit.solve_moving_body_task, min_batch_size=1,
+            timeout_seconds=30.0)
+        try:
+            pooled = pool.solve(tasks)
+        finally:
+            pool.close()
+
+        self.assertEqual(pool.statistics.pooled_tasks, 24)
+        self.assertEqual(
+            pooled, [transit.solve_moving_body_task(task) for task in tasks])
+
+    def test_small_batches_are_solved_in_process(self):
+        solve_local = Mock(side_effect=lambda task: task.body_name)
+        pool = SolverPool(2, Mock(), solve_local, min_batch_size=8)
+        tasks = random_tasks(3)
+
+        self.assertEqual(pool.solve(tasks), [t.body_name for t in tasks])
+        self.assertEqual(pool.statistics.local_tasks, 3)
+        pool.worker_arguments.assert_not_called()
+
+    def test_broken_workers_fall_back_in_process_until_restart(self):
+        monotonic = FakeMonotonic()
+        solve_local = Mock(side_effect=lambda task: task.body_name)
+        pool = SolverPool(
+            1, lambda: (None, "fixed-point"), solve_local, min_batch_size=1,
+            restart_seconds=30.0, monotonic=monotonic)
+        tasks = random_tasks(2)
+
+        self.assertEqual(pool.solve(tasks), [t.body_name for t in tasks])
+        self.assertEqual(pool.statistics.failures, 1)
+        self.assertFalse(pool.healthy)
+
+        pool.solve(tasks)
+        self.assertEqual(pool.statistics.failures, 1)
+        self.assertEqual(pool.statistics.local_tasks, 4)
+
+        monotonic.value += 30.0
+        self.assertTrue(pool.healthy)
+        self.assertIn("1 failures (last: BrokenProcessPool)",
+                      pool.statistics.summary())
+
+
+class PooledTransitPredictionTests(unittest.TestCase):
+    def setUp(self):
+        self.originals = {
+            name: getattr(transit, name) for name in (
+                "clock", "plane_dict", "aircraft_motion_states",
+                "aircraft_motion_freshness_status", "gong",
+                "prediction_scheduler", "transit_prediction_cache",
+                "sector_cull_diagnostics", "solver_pool")
+        }
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.clock = ReplayClock()
+        transit.clock.advance_to(UTC_BASE)
+        transit.plane_dict = {}
+        transit.aircraft_motion_states = {}
+        transit.aircraft_motion_freshness_status = {}
+        transit.gong = lambda now_utc=None: None
+        transit.prediction_scheduler = PredictionScheduler()
+        transit.transit_prediction_cache = TransitPredictionCache()
+        transit.sector_cull_diagnostics = SectorCullDiagnostics()
+        transit.sun_alt, transit.sun_az = 30.0, 180.0
+        transit.moon_alt, transit.moon_az = 20.0, 90.0
+
+    def tearDown(self):
+        for name, value in self.originals.items():
+            setattr(transit, name, value)
+        transit.transit_solver_diagnostics.clear()
+
+    def add_aircraft(self, icao, position, track):
+        entry = [""] * 32
+        entry[2], entry[3] = position
+        entry[4], entry[5], entry[11], entry[14] = 10000.0, 30.0, track, 800
+        transit.plane_dict[icao] = entry
+        transit.prediction_scheduler.record_evaluation(
+            icao, UTC_BASE, transit.prediction_schedule_tier(entry))
+        transit.prediction_scheduler.should_evaluate(
+            icao, UTC_BASE + datetime.timedelta(seconds=1))
+
+    def test_due_aircraft_are_solved_as_one_ordered_batch(self):
+        self.add_aircraft("AAA001", (51.3, 21.0), 180.0)
+        self.add_aircraft("BBB002", (51.6, 21.0), 5.0)
+        solved = []
+
+        def solve_local(task):
+            solved.append((task.body_name, task.plane_position))
+            return transit._moving_body_solution(
+                task.body_name, task.prediction_base_utc, None, 0, 0, None,
+                transit.TransitSolverOutcome.NO_INTERSECTION)
+
+        transit.solver_pool = SolverPool(1, Mock(), solve_local)
+        fresh = Mock(status=transit.MotionFreshnessStatus.FRESH)
+        with patch.object(
+                transit, "assess_motion_freshness", return_value=fresh):
+            evaluated = transit.process_due_transit_predictions(
+                UTC_BASE + datetime.timedelta(seconds=2))
+
+        self.assertEqual(evaluated, ["AAA001", "BBB002"])
+        self.assertEqual(solved, [
+            ("moon", (51.3, 21.0)), ("sun", (51.3, 21.0))])
+        self.assertEqual(transit.solver_pool.statistics.batches, 1)
+        self.assertEqual(transit.sector_cull_diagnostics.culled_count, 2)
+        self.assertIn(("BBB002", "sun"), transit.transit_solver_diagnostics)
+
+    def test_pool_runs_without_the_lock_and_skips_dropped_aircraft(self):
+        self.add_aircraft("AAA001", (51.3, 21.0), 180.0)
+        self.add_aircraft("CCC003", (51.3, 21.1), 180.0)
+        lock_free = []
+
+        def solve_local(task):
+            probe = threading.Thread(target=lambda: lock_free.append(
+                transit.plane_dict_lock.acquire(timeout=1)
+                and transit.plane_dict_lock.release() is None))
+            probe.start()
+            probe.join()
+            transit.plane_dict.pop("CCC003", None)
+            return transit._moving_body_solution(
+                task.body_name, task.prediction_base_utc, None, 0, 0, None,
+                transit.TransitSolverOutcome.NO_INTERSECTION)
+
+        transit.solver_pool = SolverPool(1, Mock(), solve_local)
+        fresh = Mock(status=transit.MotionFreshnessStatus.FRESH)
+        with patch.object(
+                transit, "assess_motion_freshness", return_value=fresh):
+            evaluated = transit.process_due_transit_predictions(
+                UTC_BASE + datetime.timedelta(seconds=2))
+
+        self.assertEqual(evaluated, ["AAA001"])
+        self.assertTrue(lock_free)
+        self.assertTrue(all(lock_free))
+        self.assertNotIn(
+            ("CCC003", "moon"), transit.transit_solver_diagnostics)
+
+
+if __name__ == "__main__":
+    unittest.main()
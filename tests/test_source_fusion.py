@@ -0,0 +1,147 @@
+import unittest
+from unittest.mock import Mock
+
+import transit_warning as transit
+from config import InstallationConfig
+from source_fusion import FusionDecision, PositionFusion
+from transit_clock import ReplayClock
+
+
+FORWARD = FusionDecision.FORWARD
+MERGED = FusionDecision.MERGED
+DROPPED = FusionDecision.DROPPED
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="UTC",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+class PositionFusionTests(unittest.TestCase):
+    def setUp(self):
+        self.fusion = PositionFusion()
+
+    def observe(self, source, seconds, latitude=51.2, longitude=21.2):
+        return self.fusion.observe(
+            "ABC123", source, 1000.0 + seconds, latitude, longitude)
+
+    def test_near_simultaneous_duplicate_is_dropped(self):
+        self.assertEqual(self.observe("adsb", 0.0), FORWARD)
+        self.assertEqual(self.observe("mlat", 0.05), DROPPED)
+
+        self.assertEqual(self.fusion.selected_source("ABC123"), "adsb")
+        self.assertEqual(self.fusion.counters["mlat"].dropped, 1)
+
+    def test_same_source_burst_is_merged_unless_it_moves(self):
+        self.observe("adsb", 0.0)
+
+        self.assertEqual(self.observe("adsb", 0.2), MERGED)
+        self.assertEqual(self.observe("adsb", 0.3, latitude=51.21), FORWARD)
+        self.assertEqual(self.observe("adsb", 1.0, latitude=51.21), FORWARD)
+        self.assertEqual(
+            (self.fusion.counters["adsb"].forwarded,
+             self.fusion.counters["adsb"].merged), (3, 1))
+
+    def test_better_source_takes_over_at_once_worse_after_silence(self):
+        self.assertEqual(self.observe("mlat", 0.0), FORWARD)
+        self.assertEqual(self.observe("adsb", 1.0), FORWARD)
+        self.assertEqual(self.observe("mlat", 2.0), DROPPED)
+        self.assertEqual(self.observe("mlat", 4.5), FORWARD)
+
+        self.assertEqual(self.fusion.selected_source("ABC123"), "mlat")
+
+    def test_merged_reports_keep_the_selected_source_alive(self):
+        self.observe("adsb", 0.0)
+        self.observe("adsb", 0.4)
+        self.observe("adsb", 3.0)
+
+        self.assertEqual(self.observe("mlat", 5.0), DROPPED)
+
+    def test_summary_line(self):
+        self.observe("adsb", 0.0)
+        self.observe("mlat", 0.1)
+
+        self.assertEqual(
+            self.fusion.summary(),
+            "Fusion ADSB fwd 1 merged 0 dropped 0  "
+            "MLAT fwd 0 merged 0 dropped 1")
+
+
+class PositionFusionIntegrationTests(unittest.TestCase):
+    def setUp(self):
+        self.originals = {
+            name: getattr(transit, name) for name in (
+                "clock", "plane_dict", "altitude_sources",
+                "aircraft_motion_states", "aircraft_motion_freshness_status",
+                "pressure", "tabela", "moving_body_transit_pred", "gong",
+                "position_fusion", "replay_time_initialized")
+        }
+        transit.clock = ReplayClock()
+        transit.position_fusion = PositionFusion()
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.replay_time_initialized = False
+        transit.plane_dict = {}
+        transit.altitude_sources = {}
+        transit.aircraft_motion_states = {}
+        transit.aircraft_motion_freshness_status = {}
+        transit.pressure = 1013.25
+        transit.tabela = (
+            lambda now_utc=None, engine=None: (30.0, 120.0, 20.0, 90.0))
+        transit.gong = lambda now_utc=None: None
+        transit.moving_body_transit_pred = Mock(return_value=0)
+
+    def tearDown(self):
+        for name, value in self.originals.items():
+            setattr(transit, name, value)
+
+    @staticmethod
+    def line(prefix, time, latitude="51.2"):
+        return (
+            "{},3,1,1,ABC123,1,2026/08/19,{time},2026/08/19,{time},,10000,"
+            "450,180,{latitude},21.2,0".format(
+                prefix, time=time, latitude=latitude))
+
+    def velocity(self):
+        transit.process_line(
+            "MSG,4,1,1,ABC123,1,2026/08/19,11:59:59.900,2026/08/19,"
+            "11:59:59.900,,,450,180,,,0", 30003)
+
+    def test_mlat_copy_of_an_adsb_report_skips_the_solve(self):
+        self.velocity()
+        transit.process_line(self.line("MSG", "12:00:00.000"), 30003)
+        transit.process_line(self.line("MSG", "12:00:00.000"), 30003)
+        transit.process_line(self.line("MLAT", "12:00:00.050", "51.3"),
+                             30106)
+
+        self.assertEqual(transit.moving_body_transit_pred.call_count, 2)
+        self.assertEqual(transit.plane_dict["ABC123"][2], 51.2)
+        self.assertEqual(
+            transit.aircraft_motion_states["ABC123"].position.source, "adsb")
+        self.assertEqual(
+            transit.source_fusion_counters("mlat")["dropped"], 1)
+
+    def test_disabled_fusion_forwards_every_report(self):
+        transit.position_fusion = None
+        self.velocity()
+
+        transit.process_line(self.line("MSG", "12:00:00.000"), 30003)
+        transit.process_line(self.line("MLAT", "12:00:00.050"), 30106)
+
+        self.assertEqual(transit.moving_body_transit_pred.call_count, 4)
+
+    def test_fusion_is_opt_in(self):
+        self.assertFalse(transit.parse_runtime_args([]).position_fusion)
+        self.assertTrue(transit.parse_runtime_args(
+            ["--position-fusion"]).position_fusion)
+
+
+if __name__ == "__main__":
+    unittest.main()
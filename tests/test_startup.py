@@ -0,0 +1,75 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import transit_warning as transit
+from startup import StartupProfile, lazy_import
+
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+
+class FakeMonotonic:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StartupProfileTests(unittest.TestCase):
+    def test_phases_are_reported_in_order_with_their_share(self):
+        monotonic = FakeMonotonic()
+        profile = StartupProfile(monotonic=monotonic)
+        profile.record("imports", 1.0)
+        with profile.phase("installation config"):
+            monotonic.now = 3.0
+        monotonic.now = 4.0
+
+        self.assertEqual(profile.report().splitlines(), [
+            "Startup profile: 4.000s total",
+            "  imports                1.000s  25.0%",
+            "  installation config    3.000s  75.0%",
+        ])
+
+    def test_report_is_written_only_when_requested(self):
+        profile = StartupProfile()
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(transit, "startup_profile", None), \
+                patch("builtins.print"):
+            with patch.object(transit, "startup_profile_requested", False):
+                self.assertIsNone(
+                    transit.report_startup_profile(profile, directory))
+                self.assertIsNone(transit.startup_profile)
+            with patch.object(transit, "startup_profile_requested", True):
+                path = transit.report_startup_profile(profile, directory)
+                self.assertIs(transit.startup_profile, profile)
+            self.assertTrue(path.read_text(encoding="utf-8").startswith(
+                "Startup profile:"))
+
+
+class LazyImportTests(unittest.TestCase):
+    def test_loaded_module_is_returned_unchanged(self):
+        self.assertIs(lazy_import("json"), sys.modules["json"])
+
+    def test_missing_module_fails_immediately(self):
+        with self.assertRaises(ImportError):
+            lazy_import("transit_warning_missing_module")
+
+    def test_import_does_no_runtime_work(self):
+        script = (
+            "import sys, transit_warning\n"
+            "print(transit_warning.runtime_args is None,"
+            " 'tkinter' in sys.modules, 'requests.adapters' in sys.modules)\n")
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPOSITORY,
+            capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(output.split(), ["True", "False", "False"])
+
+
+if __name__ == "__main__":
+    unittest.main()
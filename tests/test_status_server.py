@@ -0,0 +1,145 @@
+import datetime
+import http.client
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from config import InstallationConfig
+from status_server import StatusServer, StatusSnapshotCache, encode_status_document
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+
+TEST_CONFIG = InstallationConfig(
+    observer_lat=51.0,
+    observer_lon=21.0,
+    observer_elevation_m=200.0,
+    transition_altitude_ft=6500,
+    adsb_host="127.0.0.1",
+    adsb_port=30003,
+    adsb_timestamp_timezone="Europe/Warsaw",
+    mlat_host="127.0.0.1",
+    mlat_port=30106,
+    metar_station="EPRA",
+)
+
+
+class StatusSnapshotCacheTests(unittest.TestCase):
+    def test_unchanged_document_keeps_its_etag(self):
+        cache = StatusSnapshotCache()
+
+        first = cache.publish({"aircraft": [], "qnh_hpa": 1013}, UTC_BASE)
+        second = cache.publish({"qnh_hpa": 1013, "aircraft": []}, UTC_BASE)
+        third = cache.publish({"aircraft": [], "qnh_hpa": 1012}, UTC_BASE)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+        self.assertEqual(cache.publications, 2)
+
+    def test_datetimes_and_enums_are_encoded(self):
+        body = encode_status_document({
+            "time": UTC_BASE,
+            "outcome": transit.TransitSolverOutcome.CONVERGED,
+        })
+
+        self.assertEqual(
+            json.loads(body),
+            {"time": "2026-08-19T12:00:00Z", "outcome": "CONVERGED"})
+
+
+class StatusServerTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = StatusSnapshotCache()
+        self.server = StatusServer(self.cache, port=0).start()
+
+    def tearDown(self):
+        self.server.close()
+
+    def get(self, path="/status", headers=None):
+        connection = http.client.HTTPConnection(*self.server.address, timeout=5)
+        try:
+            connection.request("GET", path, headers=headers or {})
+            response = connection.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            connection.close()
+
+    def test_server_binds_to_localhost(self):
+        self.assertEqual(self.server.address[0], "127.0.0.1")
+
+    def test_no_snapshot_yet_is_unavailable(self):
+        self.assertEqual(self.get()[0], 503)
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.cache.publish({"aircraft": []}, UTC_BASE)
+
+        status, headers, body = self.get()
+        self.assertEqual((status, headers["ETag"]), (200, etag))
+        self.assertEqual(json.loads(body), {"aircraft": []})
+        self.assertEqual(headers["X-Snapshot-Published"], "2026-08-19T12:00:00Z")
+
+        status, _, body = self.get(headers={"If-None-Match": etag})
+        self.assertEqual((status, body), (304, b""))
+
+        self.cache.publish({"aircraft": [{"icao": "ABC123"}]}, UTC_BASE)
+        self.assertEqual(self.get(headers={"If-None-Match": etag})[0], 200)
+
+    def test_unknown_path_is_not_found(self):
+        self.cache.publish({}, UTC_BASE)
+
+        self.assertEqual(self.get("/aircraft")[0], 404)
+
+
+class StatusDocumentTests(unittest.TestCase):
+    def setUp(self):
+        transit.apply_installation_config(TEST_CONFIG)
+        transit.sun_predicted_transit_utc.clear()
+        transit.moon_predicted_transit_utc.clear()
+
+    def tearDown(self):
+        transit.sun_predicted_transit_utc.clear()
+        transit.moon_predicted_transit_utc.clear()
+
+    def test_document_lists_aircraft_candidates_and_diagnostics(self):
+        entry = [""] * 32
+        entry[0] = UTC_BASE
+        entry[1] = "LOT123"
+        entry[2:8] = [51.2, 21.2, 10000.0, 25.0, 33.0, 20.5]
+        entry[11], entry[14] = 180.0, 800
+        entry[18:23] = [30.0, 31.0, 10.0, 20.0, 45]
+        diagnostic = transit.MovingBodyTransitDiagnostic(
+            body="sun", prediction_base_utc=UTC_BASE, initial_time2x=44.0,
+            final_time2x=45.0, correction_count=1, convergence_residual=0.1,
+            outcome=transit.TransitSolverOutcome.CONVERGED,
+            final_separation=1.0)
+        clock = Mock()
+        clock.now_utc.return_value = UTC_BASE
+
+        with patch.object(transit, "plane_dict", {"ABC123": entry}), \
+                patch.object(transit, "clock", clock), \
+                patch.dict(transit.transit_solver_diagnostics,
+                           {("ABC123", "sun"): diagnostic}, clear=True):
+            document = json.loads(encode_status_document(
+                transit.build_status_document()))
+
+        self.assertEqual(document["aircraft"][0]["flight"], "LOT123")
+        self.assertEqual(document["aircraft"][0]["distance_km"], 25.0)
+        self.assertEqual(
+            document["aircraft"][0]["last_message_utc"],
+            "2026-08-19T12:00:00Z")
+        self.assertEqual(
+            [(item["icao"], item["body"], item["time2x_seconds"])
+             for item in document["transit_candidates"]],
+            [("ABC123", "sun", 45.0)])
+        self.assertEqual(
+            document["solver_diagnostics"][0]["outcome"], "CONVERGED")
+        self.assertEqual(
+            [source["name"] for source in document["sources"]],
+            ["ADS-B", "MLAT"])
+
+
+if __name__ == "__main__":
+    unittest.main()
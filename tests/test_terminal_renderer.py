@@ -0,0 +1,72 @@
+import io
+import unittest
+
+from terminal_renderer import (
+    TERMINAL_HOME_CLEAR,
+    DifferentialRenderer,
+    visible_width,
+)
+
+
+class CountingOutput(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class DifferentialRendererTests(unittest.TestCase):
+    def setUp(self):
+        self.renderer = DifferentialRenderer()
+
+    def test_first_frame_clears_and_draws_every_row(self):
+        self.assertEqual(
+            self.renderer.frame_text(["a", "b"], (80, 24)),
+            TERMINAL_HOME_CLEAR + "a\nb\n")
+
+    def test_only_changed_rows_are_rewritten(self):
+        self.renderer.frame_text(["head", "row 1", "row 2"], (80, 24))
+
+        text = self.renderer.frame_text(["head", "row 1", "ROW 2"], (80, 24))
+
+        self.assertEqual(text, "\x1b[3;1HROW 2\x1b[K\x1b[4;1H\x1b[J")
+        self.assertEqual(self.renderer.statistics.rows_unchanged, 2)
+
+    def test_shorter_frame_clears_the_rows_below_it(self):
+        self.renderer.frame_text(["head", "row 1", "row 2"], (80, 24))
+
+        text = self.renderer.frame_text(["head"], (80, 24))
+
+        self.assertEqual(text, "\x1b[2;1H\x1b[J")
+
+    def test_resize_wrapping_or_period_forces_a_full_redraw(self):
+        self.renderer = DifferentialRenderer(full_redraw_frames=2)
+        self.renderer.frame_text(["a"], (80, 24))
+
+        self.assertTrue(self.renderer.frame_text(["a"], (100, 24)).startswith(
+            TERMINAL_HOME_CLEAR))
+        self.assertTrue(self.renderer.frame_text(
+            ["\x1b[33m" + "x" * 100 + "\x1b[0m"], (100, 24)).startswith(
+                TERMINAL_HOME_CLEAR))
+        self.renderer.frame_text(["a"], (120, 24))
+        self.renderer.frame_text(["a"], (120, 24))
+        self.renderer.frame_text(["a"], (120, 24))
+        self.assertEqual(self.renderer.statistics.full_redraws, 4)
+
+    def test_render_writes_one_buffer_per_frame(self):
+        output = CountingOutput()
+
+        self.renderer.render(["a", "b", "c"], output, (80, 24))
+        self.renderer.render(["a", "x", "y"], output, (80, 24))
+
+        self.assertEqual(output.writes, 2)
+
+    def test_visible_width_ignores_colour_escapes(self):
+        self.assertEqual(visible_width("\x1b[0;30;42m 12.5\x1b[0m"), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
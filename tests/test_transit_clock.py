@@ -1,12 +1,13 @@
 import datetime
 import threading
 import unittest
+from unittest.mock import MagicMock
 
 import ephem
 import pytz
 
 import transit_warning as transit
-from transit_clock import RealClock, ReplayClock, clock_from_args
+from transit_clock import RealClock, ReplayClock, TimeContext, clock_from_args
 
 
 class ClockSelectionTests(unittest.TestCase):
@@ -95,6 +96,17 @@ class ReplayClockTests(unittest.TestCase):
             thread.join()
         self.assertEqual(self.clock.now_utc(), timestamps[-1])
 
+    def test_reads_do_not_take_the_lock(self):
+        self.clock.advance_to(self.first)
+        self.clock._lock = MagicMock()
+
+        context = self.clock.now()
+
+        self.assertTrue(self.clock.is_ready())
+        self.assertEqual(self.clock.now_utc(), self.first)
+        self.assertEqual(context, TimeContext(self.first, self.first.timestamp()))
+        self.clock._lock.__enter__.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
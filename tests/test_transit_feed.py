@@ -0,0 +1,141 @@
+import datetime
+import json
+import socket
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from transit_feed import (
+    FeedClient,
+    TransitCandidateState,
+    TransitCandidateTracker,
+    TransitFeedServer,
+)
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 12, 0, 0, tzinfo=pytz.utc)
+
+
+def later(seconds):
+    return UTC_BASE + datetime.timedelta(seconds=seconds)
+
+
+def state(separation=5.0, p2x=20.0, h2x=10.0, seconds=60.0):
+    return TransitCandidateState(separation, p2x, h2x, seconds, later(seconds))
+
+
+class TransitCandidateTrackerTests(unittest.TestCase):
+    def setUp(self):
+        self.tracker = TransitCandidateTracker(alert_separation_deg=3)
+
+    def events(self, candidate, body="sun"):
+        return [event["event"] for event in self.tracker.update(
+            "ABC123", "LOT123", body, candidate, UTC_BASE)]
+
+    def test_candidate_lifecycle(self):
+        self.assertEqual(self.events(state()), ["appeared"])
+        self.assertEqual(self.events(state()), [])
+        self.assertEqual(self.events(state(separation=4.0)), ["updated"])
+        self.assertEqual(
+            self.events(state(separation=2.0)), ["updated", "alert"])
+        self.assertEqual(self.events(state(separation=1.5)), ["updated"])
+        self.assertEqual(self.events(None), ["cleared"])
+        self.assertEqual(self.events(None), [])
+
+    def test_alert_rearms_after_separation_rises_again(self):
+        self.events(state(separation=2.0))
+        self.events(state(separation=4.0))
+
+        self.assertEqual(
+            self.events(state(separation=2.5)), ["updated", "alert"])
+
+    def test_event_carries_prediction_fields(self):
+        event = self.tracker.update(
+            "ABC123", "LOT123", "moon", state(separation=2.0), UTC_BASE)[0]
+
+        self.assertEqual(event, {
+            "event": "appeared", "icao": "ABC123", "flight": "LOT123",
+            "body": "moon", "at_utc": "2026-08-19T12:00:00Z",
+            "predicted_transit_utc": "2026-08-19T12:01:00Z",
+            "separation_deg": 2.0, "p2x_km": 20.0, "h2x_km": 10.0,
+            "time2x_seconds": 60.0,
+        })
+
+    def test_discard_clears_every_body_with_the_last_flight(self):
+        self.events(state(), "sun")
+        self.events(state(), "moon")
+
+        events = self.tracker.discard("ABC123", UTC_BASE)
+
+        self.assertEqual(
+            [(event["event"], event["body"], event["flight"])
+             for event in events],
+            [("cleared", "sun", "LOT123"), ("cleared", "moon", "LOT123")])
+
+
+class FeedClientTests(unittest.TestCase):
+    def test_full_queue_drops_the_oldest_line(self):
+        client = FeedClient(Mock(), None, 2, lambda client: None)
+
+        for index in range(4):
+            client.enqueue(str(index).encode())
+
+        self.assertEqual(list(client._queue), [b"2", b"3"])
+        self.assertEqual(client.dropped, 2)
+
+
+class TransitFeedServerTests(unittest.TestCase):
+    def setUp(self):
+        self.server = TransitFeedServer(port=0).start()
+
+    def tearDown(self):
+        self.server.close()
+
+    def connect(self):
+        connection = socket.create_connection(self.server.address, timeout=5)
+        self.addCleanup(connection.close)
+        for _ in range(100):
+            if self.server.clients:
+                break
+            time.sleep(0.01)
+        return connection.makefile("rb")
+
+    def test_events_are_pushed_as_json_lines(self):
+        reader = self.connect()
+
+        self.server.publish({"event": "appeared", "icao": "ABC123"})
+        self.server.publish({"event": "cleared", "icao": "ABC123"})
+
+        self.assertEqual(json.loads(reader.readline())["event"], "appeared")
+        self.assertEqual(json.loads(reader.readline())["event"], "cleared")
+
+    def test_server_binds_to_localhost(self):
+        self.assertEqual(self.server.address[0], "127.0.0.1")
+
+
+class TransitFeedIntegrationTests(unittest.TestCase):
+    def test_evaluation_publishes_candidate_events(self):
+        entry = [""] * 32
+        entry[1] = "LOT123"
+        entry[18:23] = [30.0, 31.0, 10.0, 20.0, 45]
+        feed = Mock()
+
+        with patch.object(transit, "plane_dict", {"ABC123": entry}), \
+                patch.object(transit, "transit_feed", feed), \
+                patch.object(transit, "transit_candidate_tracker",
+                             TransitCandidateTracker(3)):
+            transit.publish_transit_feed_events("ABC123", UTC_BASE)
+            entry[18:23] = [""] * 5
+            transit.publish_transit_feed_events("ABC123", later(1))
+
+        self.assertEqual(
+            [(call.args[0]["event"], call.args[0]["body"])
+             for call in feed.publish.call_args_list],
+            [("appeared", "sun"), ("alert", "sun"), ("cleared", "sun")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytz
+
+import transit_warning as transit
+from transit_feed import TransitCandidateState, TransitCandidateTracker
+from transit_log import COLUMNS, TransitEventLog, read_transit_event_log
+
+
+UTC_BASE = datetime.datetime(2026, 8, 19, 23, 59, 0, tzinfo=pytz.utc)
+
+
+def later(seconds):
+    return UTC_BASE + datetime.timedelta(seconds=seconds)
+
+
+class TransitEventLogTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.log = TransitEventLog(self.directory.name, flush_seconds=60)
+        self.addCleanup(self.log.close)
+        self.tracker = TransitCandidateTracker(alert_separation_deg=3)
+
+    def feed(self, seconds, separation=None, predicted=90.0):
+        state = None
+        if separation is not None:
+            state = TransitCandidateState(
+                separation, 20.0, 10.0, predicted - seconds,
+                later(predicted))
+        for event in self.tracker.update(
+                "ABC123", "LOT123", "sun", state, later(seconds)):
+            event["observer"] = "primary"
+            self.log.record(event, "CONVERGED", "LEVEL")
+
+    def paths(self):
+        return sorted(Path(self.directory.name).iterdir())
+
+    def test_nothing_is_written_before_the_first_row(self):
+        self.feed(0, separation=5.0)
+        self.log.flush()
+
+        self.assertEqual(self.paths(), [])
+
+    def test_alert_and_final_rows_rotate_by_event_day(self):
+        self.feed(0, separation=5.0)
+        self.feed(30, separation=0.3)
+        self.feed(92)
+        self.log.flush()
+
+        paths = self.paths()
+        self.assertEqual([path.name for path in paths], [
+            "transit_events_20260819.tsv", "transit_events_20260820.tsv"])
+        self.assertEqual(
+            paths[0].read_text(encoding="utf-8").splitlines()[0],
+            "\t".join(COLUMNS))
+        columns = read_transit_event_log(*paths)
+        self.assertEqual(columns["kind"], ["alert", "final"])
+        self.assertEqual(columns["at_utc"], [
+            "2026-08-19T23:59:30Z", "2026-08-20T00:00:32Z"])
+        self.assertEqual(
+            columns["predicted_transit_utc"], ["2026-08-20T00:00:30Z"] * 2)
+        self.assertEqual(columns["separation_deg"], [0.3, 0.3])
+        self.assertEqual(columns["solver_outcome"], ["CONVERGED"] * 2)
+        self.assertEqual(columns["vertical_mode"], ["LEVEL"] * 2)
+
+    def test_candidate_cleared_early_is_not_a_transit(self):
+        self.feed(0, separation=1.0)
+        self.feed(30)
+        self.log.flush()
+
+        self.assertEqual(
+            read_transit_event_log(*self.paths())["kind"], ["alert"])
+
+    def test_near_miss_at_the_predicted_time_is_not_a_transit(self):
+        self.feed(0, separation=1.0)
+        self.feed(92)
+        self.log.flush()
+
+        self.assertEqual(
+            read_transit_event_log(*self.paths())["kind"], ["alert"])
+
+    def test_full_queue_drops_the_oldest_row(self):
+        log = TransitEventLog(self.directory.name, queue_rows=1)
+        log._thread = Mock()
+
+        log._enqueue({"at_utc": "2026-08-19T12:00:00Z"})
+        log._enqueue({"at_utc": "2026-08-19T12:00:01Z"})
+
+        self.assertEqual(log.dropped, 1)
+        self.assertEqual(list(log._rows)[0]["at_utc"], "2026-08-19T12:00:01Z")
+
+
+class TransitEventLogIntegrationTests(unittest.TestCase):
+    def test_log_is_opt_in(self):
+        self.assertFalse(transit.parse_runtime_args([]).transit_log)
+        self.assertTrue(
+            transit.parse_runtime_args(["--transit-log"]).transit_log)
+
+    def test_events_are_logged_without_a_feed(self):
+        log = Mock()
+        diagnostic = Mock()
+        diagnostic.outcome = transit.TransitSolverOutcome.CONVERGED
+
+        with patch.object(transit, "transit_feed", None), \
+                patch.object(transit, "transit_event_log", log), \
+                patch.dict(transit.transit_solver_diagnostics,
+                           {("ABC123", "sun"): diagnostic}), \
+                patch.dict(transit.vertical_transit_diagnostics, clear=True):
+            transit.publish_transit_feed_event(
+                {"event": "alert", "icao": "ABC123", "body": "sun"})
+
+        event, outcome, mode = log.record.call_args.args
+        self.assertEqual(event["observer"], "primary")
+        self.assertEqual((outcome, mode), ("CONVERGED", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
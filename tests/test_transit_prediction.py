@@ -1,3 +1,4 @@
+import datetime
 import unittest
 
 import transit_warning as transit
@@ -47,6 +48,17 @@ class TransitVelocityTests(unittest.TestCase):
         self.assertEqual(len(result), 11)
         self.assertAlmostEqual(result[6], (result[5] / 100) * 3600)
 
+    def test_result_is_stamped_with_the_prediction_base(self):
+        observer, plane, track, elevation, body_alt, body_az = TRANSIT_ARGS
+        base = datetime.datetime(
+            2026, 8, 19, 12, 0, tzinfo=datetime.timezone.utc)
+
+        result = transit.transit_pred(
+            observer, plane, track, 100, elevation, body_alt, body_az,
+            prediction_base_utc=base)
+
+        self.assertEqual(result[10], base)
+
 
 if __name__ == "__main__":
     unittest.main()
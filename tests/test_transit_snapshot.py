@@ -2,6 +2,7 @@ import datetime
 from collections import deque
 import io
 import json
+import math
 from pathlib import Path
 import tempfile
 import threading
@@ -16,6 +17,7 @@ from transit_snapshot import (
     RECENT_EVENT_TTL_SECONDS,
     SCHEMA_VERSION,
     TransitSnapshotManager,
+    read_git_commit,
     runtime_git_commit,
 )
 
@@ -331,8 +333,8 @@ class TransitSnapshotManagerTests(unittest.TestCase):
             self.assertTrue(document["complete"])
             self.assertEqual(document["finalization_reason"], "normal")
             self.assertIsNone(document["aircraft"]["callsign"])
-        with patch("transit_snapshot.subprocess.run", side_effect=OSError):
-            self.assertEqual(runtime_git_commit(), "unknown")
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(runtime_git_commit(directory), "unknown")
 
     def test_write_failure_is_silent_fail_open(self):
         with tempfile.TemporaryDirectory() as directory:
@@ -497,7 +499,7 @@ class TransitSnapshotSelfContainmentTests(unittest.TestCase):
                 transit.my_elevation_const = 200.0
                 vertical = transit.predict_vertical_state_at_time(
                     10000.0, motion, intent, BASE, 5.0, 1009.0)
-                final_angle = transit.degrees(transit.atan(
+                final_angle = math.degrees(math.atan(
                     (vertical.prediction.predicted_altitude_m - 200.0)
                     / 20000.0))
                 raw_result = (
@@ -625,5 +627,66 @@ class TransitSnapshotSelfContainmentTests(unittest.TestCase):
             decision["intent_clamped"])
 
 
+class GitRevisionTests(unittest.TestCase):
+    COMMIT = "0123456789abcdef0123456789abcdef01234567"
+
+    def repository(self, directory, head="ref: refs/heads/main\n"):
+        git_dir = Path(directory) / ".git"
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "HEAD").write_text(head, encoding="utf-8")
+        return git_dir
+
+    def test_branch_ref_loose_and_packed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            git_dir = self.repository(directory)
+            (git_dir / "packed-refs").write_text(
+                "# pack-refs with: peeled\n{} refs/heads/main\n".format(
+                    self.COMMIT), encoding="utf-8")
+            self.assertEqual(read_git_commit(directory), self.COMMIT)
+            other = "f" * 40
+            (git_dir / "refs" / "heads" / "main").write_text(
+                other + "\n", encoding="utf-8")
+            self.assertEqual(read_git_commit(directory), other)
+
+    def test_detached_head_from_a_subdirectory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.repository(directory, head=self.COMMIT + "\n")
+            subdirectory = Path(directory) / "transit_snapshots"
+            subdirectory.mkdir()
+            self.assertEqual(read_git_commit(subdirectory), self.COMMIT)
+
+    def test_worktree_gitdir_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            git_dir = self.repository(directory)
+            (git_dir / "refs" / "heads" / "main").write_text(
+                self.COMMIT, encoding="utf-8")
+            worktree_dir = git_dir / "worktrees" / "other"
+            worktree_dir.mkdir(parents=True)
+            (worktree_dir / "HEAD").write_text(
+                "ref: refs/heads/main\n", encoding="utf-8")
+            (worktree_dir / "commondir").write_text("../..", encoding="utf-8")
+            checkout = Path(directory) / "other"
+            checkout.mkdir()
+            (checkout / ".git").write_text(
+                "gitdir: {}\n".format(worktree_dir), encoding="utf-8")
+            self.assertEqual(read_git_commit(checkout), self.COMMIT)
+
+    def test_revision_is_read_once_without_a_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            git_dir = self.repository(directory, head=self.COMMIT)
+            self.assertEqual(runtime_git_commit(directory), self.COMMIT)
+            (git_dir / "HEAD").write_text("f" * 40, encoding="utf-8")
+            self.assertEqual(runtime_git_commit(directory), self.COMMIT)
+
+    def test_manager_defers_the_lookup_until_first_use(self):
+        with patch("transit_snapshot.runtime_git_commit",
+                   return_value="abc") as lookup:
+            manager = TransitSnapshotManager(base_dir="snapshots")
+            lookup.assert_not_called()
+            self.assertEqual(manager.git_commit, "abc")
+            self.assertEqual(manager.git_commit, "abc")
+        lookup.assert_called_once_with(Path("."))
+
+
 if __name__ == "__main__":
     unittest.main()
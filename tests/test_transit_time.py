@@ -106,7 +106,7 @@ class ProcessLineTimestampConversionTests(unittest.TestCase):
             transit.metar_t = transit.metar_attempt_t = transit.aktual_t = transit.last_t = None
             transit.gong_t = transit.last_update_time = None
             transit.plane_dict = {}
-            transit.tabela = lambda: (0, 0, 0, 0)
+            transit.tabela = lambda now_utc=None, engine=None: (0, 0, 0, 0)
             transit.adsb_timestamp_timezone = WARSAW
             transit.adsb_port = 30003
             transit.adsb_timestamp_validator = None
@@ -1,5 +1,6 @@
 import copy
 import datetime
+import importlib
 import math
 import unittest
 from unittest.mock import Mock, patch
@@ -122,10 +123,11 @@ class ProcessLineReplayClockTests(unittest.TestCase):
         transit.pressure = 1013
         transit.sun_alt = 30.0
         transit.moon_alt = 20.0
-        transit.tabela = lambda: (30.0, 120.0, 20.0, 90.0)
+        transit.tabela = (
+            lambda now_utc=None, engine=None: (30.0, 120.0, 20.0, 90.0))
         transit.moving_body_transit_pred = (
             lambda body, observer, plane, track, velocity, elevation,
-            prediction_base_utc, fallback_body_position=None:
+            prediction_base_utc, fallback_body_position=None, engine=None:
             transit.transit_pred(
                 observer, plane, track, velocity, elevation,
                 fallback_body_position[0], fallback_body_position[1]))
@@ -706,7 +708,7 @@ class ProcessLineReplayClockTests(unittest.TestCase):
         table_times = []
         prediction_states = []
 
-        def historical_table():
+        def historical_table(now_utc=None, engine=None):
             table_times.append(transit.clock.now_utc())
             return 31.5, 141.2, -17.4, 278.6
 
@@ -757,5 +759,30 @@ class RealClockIntegrationTests(unittest.TestCase):
             transit.clock = original_clock
 
 
+
+class ImportDefaultsTests(unittest.TestCase):
+    def setUp(self):
+        self.module_state = dict(vars(transit))
+        importlib.reload(transit)
+
+    def tearDown(self):
+        vars(transit).clear()
+        vars(transit).update(self.module_state)
+
+    def test_replay_clock_swapped_in_without_configuration_sets_timestamps(self):
+        self.assertIsNotNone(transit.gong_t)
+        logged_utc = utc("2024/05/18 12:00:00.000")
+        transit.clock = ReplayClock()
+
+        with patch.object(transit, "tabela",
+                          return_value=(30.0, 120.0, 20.0, 90.0)):
+            transit.advance_replay_time(logged_utc)
+
+        self.assertTrue(transit.replay_time_initialized)
+        self.assertEqual(transit.aktual_t, logged_utc)
+        self.assertEqual(transit.gong_t, logged_utc)
+        self.assertEqual(transit.last_update_time, logged_utc)
+
+
 if __name__ == "__main__":
     unittest.main()
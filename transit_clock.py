@@ -1,11 +1,29 @@
 import argparse
 import datetime
 import threading
+from dataclasses import dataclass
 
 import ephem
 import pytz
 
 
+@dataclass(frozen=True)
+class TimeContext:
+    """One clock reading as both an aware datetime and float epoch seconds."""
+
+    utc: datetime.datetime
+    epoch: float
+
+    @classmethod
+    def at(cls, timestamp_utc):
+        return cls(timestamp_utc, timestamp_utc.timestamp())
+
+    @classmethod
+    def of(cls, value):
+        """Accept a context or an aware datetime."""
+        return value if isinstance(value, cls) else cls.at(value)
+
+
 class Clock(object):
     def is_ready(self):
         raise NotImplementedError
@@ -13,6 +31,10 @@ class Clock(object):
     def now_utc(self):
         raise NotImplementedError
 
+    def now(self):
+        """Read the clock once for everything done with one message."""
+        return TimeContext.at(self.now_utc())
+
     def ephem_now(self):
         raise NotImplementedError
 
@@ -29,33 +51,43 @@ class RealClock(Clock):
 
 
 class ReplayClock(Clock):
+    """Replay time; only writers lock.
+
+    The current reading is one immutable TimeContext swapped in by
+    ``advance_to``, so readers take a single attribute load instead of the
+    lock on every call.
+    """
+
     def __init__(self):
         self._lock = threading.Lock()
-        self._current_utc = None
+        self._current = None
 
     def is_ready(self):
-        with self._lock:
-            return self._current_utc is not None
+        return self._current is not None
 
     def advance_to(self, timestamp_utc):
         if timestamp_utc.tzinfo is None or timestamp_utc.utcoffset() != datetime.timedelta(0):
             raise ValueError("ReplayClock requires a timezone-aware UTC timestamp")
         timestamp_utc = timestamp_utc.astimezone(pytz.utc)
         with self._lock:
-            if self._current_utc is None or timestamp_utc > self._current_utc:
-                self._current_utc = timestamp_utc
+            current = self._current
+            if current is None or timestamp_utc > current.utc:
+                self._current = TimeContext.at(timestamp_utc)
 
     def _snapshot(self):
-        with self._lock:
-            if self._current_utc is None:
-                raise RuntimeError("ReplayClock is not ready")
-            return self._current_utc
+        current = self._current
+        if current is None:
+            raise RuntimeError("ReplayClock is not ready")
+        return current
 
-    def now_utc(self):
+    def now(self):
         return self._snapshot()
 
+    def now_utc(self):
+        return self._snapshot().utc
+
     def ephem_now(self):
-        return ephem.Date(self._snapshot())
+        return ephem.Date(self._snapshot().utc)
 
 
 def clock_from_args(arguments):
@@ -0,0 +1,231 @@
+"""Localhost TCP JSON-lines push feed of transit candidate events."""
+
+import collections
+import datetime
+import json
+import socket
+import threading
+from dataclasses import dataclass
+from enum import Enum
+
+
+DEFAULT_HOST = "127.0.0.1"
+CLIENT_QUEUE_EVENTS = 256
+SEND_TIMEOUT_SECONDS = 5.0
+
+
+class TransitFeedEventType(str, Enum):
+    APPEARED = "appeared"
+    UPDATED = "updated"
+    ALERT = "alert"
+    CLEARED = "cleared"
+
+
+@dataclass(frozen=True)
+class TransitCandidateState:
+    separation_deg: float
+    p2x_km: float
+    h2x_km: float
+    time2x_seconds: float
+    predicted_transit_utc: object = None
+
+    def display_key(self):
+        """Values as rounded on the terminal; updates below this are noise."""
+        predicted = self.predicted_transit_utc
+        return (
+            round(self.separation_deg, 2), round(self.p2x_km, 1),
+            round(self.h2x_km, 1),
+            predicted.replace(microsecond=0) if predicted is not None
+            else round(self.time2x_seconds))
+
+
+def _utc_text(value):
+    if value is None:
+        return None
+    return value.astimezone(datetime.timezone.utc).isoformat().replace(
+        "+00:00", "Z")
+
+
+class TransitCandidateTracker:
+    """Turn successive candidate states into appear/update/alert/clear events."""
+
+    def __init__(self, alert_separation_deg):
+        self.alert_separation_deg = alert_separation_deg
+        self._states = {}
+
+    def update(self, icao, flight, body_name, state, now_utc):
+        key = (icao, body_name)
+        previous, previous_flight = self._states.get(key, (None, None))
+        if state is None:
+            if previous is None:
+                return []
+            del self._states[key]
+            return [self._event(
+                TransitFeedEventType.CLEARED, icao,
+                flight or previous_flight, body_name, None, now_utc)]
+        self._states[key] = (state, flight)
+        events = []
+        if previous is None:
+            events.append(self._event(
+                TransitFeedEventType.APPEARED, icao, flight, body_name,
+                state, now_utc))
+        elif previous.display_key() != state.display_key():
+            events.append(self._event(
+                TransitFeedEventType.UPDATED, icao, flight, body_name,
+                state, now_utc))
+        was_alert = (previous is not None
+                     and previous.separation_deg < self.alert_separation_deg)
+        if state.separation_deg < self.alert_separation_deg and not was_alert:
+            events.append(self._event(
+                TransitFeedEventType.ALERT, icao, flight, body_name,
+                state, now_utc))
+        return events
+
+    def discard(self, icao, now_utc):
+        events = []
+        for body_name in ("sun", "moon"):
+            events.extend(self.update(icao, None, body_name, None, now_utc))
+        return events
+
+    @staticmethod
+    def _event(event_type, icao, flight, body_name, state, now_utc):
+        event = {
+            "event": event_type.value,
+            "icao": icao,
+            "flight": flight or None,
+            "body": body_name,
+            "at_utc": _utc_text(now_utc),
+        }
+        if state is not None:
+            event.update({
+                "predicted_transit_utc": _utc_text(
+                    state.predicted_transit_utc),
+                "separation_deg": round(state.separation_deg, 3),
+                "p2x_km": round(state.p2x_km, 2),
+                "h2x_km": round(state.h2x_km, 2),
+                "time2x_seconds": round(state.time2x_seconds, 1),
+            })
+        return event
+
+
+class FeedClient:
+    """One consumer with a bounded queue drained by its own writer thread."""
+
+    def __init__(self, connection, address, queue_events, on_close):
+        self.connection = connection
+        self.address = address
+        self.dropped = 0
+        self._queue = collections.deque(maxlen=queue_events)
+        self._condition = threading.Condition()
+        self._closed = False
+        self._on_close = on_close
+        self._thread = threading.Thread(
+            target=self._write_loop, name="transit-feed-client", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def enqueue(self, line):
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(line)
+            self._condition.notify()
+
+    def _write_loop(self):
+        try:
+            while True:
+                with self._condition:
+                    while not self._queue and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        return
+                    line = self._queue.popleft()
+                self.connection.sendall(line)
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        try:
+            self.connection.close()
+        except OSError:
+            pass
+        self._on_close(self)
+
+
+class TransitFeedServer:
+    """Accept localhost consumers and fan every event out to all of them.
+
+    ``publish`` only encodes once and appends to each client queue, dropping
+    the oldest line when a queue is full, so it never waits on a socket.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=0,
+                 queue_events=CLIENT_QUEUE_EVENTS):
+        self.queue_events = queue_events
+        self.published = 0
+        self._clients = []
+        self._lock = threading.Lock()
+        self._socket = socket.create_server((host, port))
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._socket.getsockname()[:2]
+
+    @property
+    def clients(self):
+        with self._lock:
+            return list(self._clients)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._accept_loop, name="transit-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def _accept_loop(self):
+        while True:
+            try:
+                connection, address = self._socket.accept()
+            except OSError:
+                return
+            connection.settimeout(SEND_TIMEOUT_SECONDS)
+            client = FeedClient(
+                connection, address, self.queue_events, self._remove)
+            with self._lock:
+                self._clients.append(client)
+            client.start()
+
+    def _remove(self, client):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def publish(self, event):
+        line = (json.dumps(event, sort_keys=True, separators=(",", ":"))
+                + "\n").encode("utf-8")
+        self.published += 1
+        for client in self.clients:
+            client.enqueue(line)
+
+    def close(self):
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        for client in self.clients:
+            client.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
@@ -0,0 +1,195 @@
+"""Buffered, daily-rotating log of transit alerts and final transits."""
+
+import collections
+import csv
+import datetime
+import threading
+from pathlib import Path
+
+
+DEFAULT_DIRECTORY = "transit_events"
+FILE_PATTERN = "transit_events_%Y%m%d.tsv"
+FLUSH_SECONDS = 5.0
+QUEUE_ROWS = 4096
+# A candidate cleared this close to its predicted time has transited.
+FINAL_TOLERANCE_SECONDS = 5.0
+# ... if its last separation was inside the body; wider passes are misses.
+FINAL_SEPARATION_DEG = 0.5
+COLUMNS = (
+    "kind", "observer", "icao", "callsign", "body", "at_utc",
+    "predicted_transit_utc", "separation_deg", "h2x_km", "p2x_km",
+    "time2x_seconds", "solver_outcome", "vertical_mode",
+)
+FLOAT_COLUMNS = frozenset((
+    "separation_deg", "h2x_km", "p2x_km", "time2x_seconds"))
+
+
+def _parse_utc(text):
+    return datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+class TransitEventLog:
+    """Turn transit feed events into ``alert`` and ``final`` rows.
+
+    A ``final`` row is written when a candidate is cleared at its predicted
+    time with a last separation below ``final_separation_deg``.
+
+    ``record`` only appends to a bounded in-memory queue, dropping the oldest
+    row when it is full; a daemon thread writes the queue in batches to one
+    tab-separated file per UTC day of the event time, so replayed sessions
+    rotate on the replay clock. Nothing touches the disk before the first row.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY,
+                 flush_seconds=FLUSH_SECONDS, queue_rows=QUEUE_ROWS,
+                 final_separation_deg=FINAL_SEPARATION_DEG):
+        self.directory = Path(directory)
+        self.flush_seconds = flush_seconds
+        self.final_separation_deg = final_separation_deg
+        self.written = 0
+        self.dropped = 0
+        self.last_error = None
+        self._rows = collections.deque(maxlen=queue_rows)
+        self._candidates = {}
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread = None
+        self._file = None
+        self._writer = None
+        self._path = None
+
+    def record(self, event, solver_outcome=None, vertical_mode=None):
+        key = (event.get("observer"), event["icao"], event["body"])
+        if event["event"] == "cleared":
+            last = self._candidates.pop(key, None)
+            if last is not None and self._transited(
+                    last, event, self.final_separation_deg):
+                self._enqueue(dict(
+                    last, kind="final", at_utc=event["at_utc"],
+                    callsign=event.get("flight") or last["callsign"]))
+            return
+        row = {
+            "observer": event.get("observer"),
+            "icao": event["icao"],
+            "callsign": event.get("flight"),
+            "body": event["body"],
+            "at_utc": event["at_utc"],
+            "predicted_transit_utc": event.get("predicted_transit_utc"),
+            "separation_deg": event.get("separation_deg"),
+            "h2x_km": event.get("h2x_km"),
+            "p2x_km": event.get("p2x_km"),
+            "time2x_seconds": event.get("time2x_seconds"),
+            "solver_outcome": solver_outcome,
+            "vertical_mode": vertical_mode,
+        }
+        self._candidates[key] = row
+        if event["event"] == "alert":
+            self._enqueue(dict(row, kind="alert"))
+
+    @staticmethod
+    def _transited(last, cleared, final_separation_deg):
+        predicted = last["predicted_transit_utc"]
+        separation = last["separation_deg"]
+        if predicted is None or cleared["at_utc"] is None:
+            return False
+        if separation is None or separation >= final_separation_deg:
+            return False
+        return ((_parse_utc(predicted) - _parse_utc(cleared["at_utc"]))
+                .total_seconds() <= FINAL_TOLERANCE_SECONDS)
+
+    def _enqueue(self, row):
+        with self._condition:
+            if self._closed:
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._write_loop, name="transit-event-log",
+                    daemon=True)
+                self._thread.start()
+            if len(self._rows) == self._rows.maxlen:
+                self.dropped += 1
+            self._rows.append(row)
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                if not self._closed:
+                    self._condition.wait(self.flush_seconds)
+                rows = list(self._rows)
+                self._rows.clear()
+                closed = self._closed
+            self._write_rows(rows)
+            if closed:
+                return
+
+    def _write_rows(self, rows):
+        with self._write_lock:
+            try:
+                for row in rows:
+                    self._writer_for(row["at_utc"]).writerow(
+                        "" if row.get(column) is None else row[column]
+                        for column in COLUMNS)
+                    self.written += 1
+                if self._file is not None:
+                    self._file.flush()
+            except (OSError, ValueError) as error:
+                self.last_error = str(error)
+
+    def _writer_for(self, at_utc):
+        path = self.directory / _parse_utc(at_utc).strftime(FILE_PATTERN)
+        if path != self._path:
+            self._close_file()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            new_file = not path.exists() or path.stat().st_size == 0
+            self._file = path.open("a", encoding="utf-8", newline="")
+            self._writer = csv.writer(
+                self._file, delimiter="\t", lineterminator="\n")
+            self._path = path
+            if new_file:
+                self._writer.writerow(COLUMNS)
+        return self._writer
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = self._writer = self._path = None
+
+    def flush(self):
+        """Write every queued row now; used by tests and shutdown."""
+        with self._condition:
+            rows = list(self._rows)
+            self._rows.clear()
+        self._write_rows(rows)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=2.0)
+        self.flush()
+        with self._write_lock:
+            self._close_file()
+
+
+def read_transit_event_log(*paths):
+    """Load log files column-wise: ``{column: [values, ...]}``."""
+    columns = {column: [] for column in COLUMNS}
+    for path in paths:
+        with Path(path).open(encoding="utf-8", newline="") as file:
+            reader = csv.reader(file, delimiter="\t")
+            header = next(reader, None)
+            if header is None:
+                continue
+            for values in reader:
+                row = dict(zip(header, values))
+                for column in COLUMNS:
+                    value = row.get(column, "")
+                    if value == "":
+                        value = None
+                    elif column in FLOAT_COLUMNS:
+                        value = float(value)
+                    columns[column].append(value)
+    return columns
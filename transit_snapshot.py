@@ -7,10 +7,11 @@ import json
 import os
 from pathlib import Path
 import re
-import subprocess
 import threading
 import uuid
 
+from snapshot_catalog import CATALOG_FILENAME, SnapshotCatalog, summarize_document
+
 
 UTC = datetime.timezone.utc
 SCHEMA_VERSION = 3
@@ -31,15 +32,67 @@ def utc_text(value):
     return value.astimezone(UTC).isoformat().replace("+00:00", "Z")
 
 
+GIT_OBJECT_NAME_RE = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+_git_commit_cache = {}
+
+
+def _git_directory(project_dir):
+    for directory in (project_dir, *project_dir.parents):
+        candidate = directory / ".git"
+        if candidate.is_dir():
+            return candidate
+        if candidate.is_file():
+            text = candidate.read_text(encoding="utf-8").strip()
+            if text.startswith("gitdir:"):
+                return (directory / text[len("gitdir:"):].strip()).resolve()
+            return None
+    return None
+
+
+def _read_git_ref(git_dir, ref):
+    common_dir = git_dir
+    common_file = git_dir / "commondir"
+    if common_file.is_file():
+        common_dir = (git_dir / common_file.read_text(
+            encoding="utf-8").strip()).resolve()
+    for directory in (git_dir, common_dir):
+        ref_file = directory / ref
+        if ref_file.is_file():
+            return ref_file.read_text(encoding="utf-8").strip()
+    packed_refs = common_dir / "packed-refs"
+    if packed_refs.is_file():
+        for line in packed_refs.read_text(encoding="utf-8").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1] == ref:
+                return parts[0]
+    return None
+
+
+def read_git_commit(project_dir):
+    """Resolve HEAD from the .git files without running git."""
+    git_dir = _git_directory(Path(project_dir).resolve())
+    if git_dir is None:
+        return None
+    head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    for _ in range(5):
+        if not head.startswith("ref:"):
+            break
+        head = _read_git_ref(git_dir, head[len("ref:"):].strip())
+        if head is None:
+            return None
+    return head if GIT_OBJECT_NAME_RE.match(head) else None
+
+
 def runtime_git_commit(project_dir=None):
     """Read the revision once; installations without Git remain supported."""
-    try:
-        return subprocess.run(
-            ["git", "rev-parse", "HEAD"], cwd=project_dir,
-            capture_output=True, text=True, timeout=2, check=True,
-        ).stdout.strip() or "unknown"
-    except Exception:
-        return "unknown"
+    key = Path(project_dir or os.getcwd()).resolve()
+    if key not in _git_commit_cache:
+        try:
+            commit = read_git_commit(key)
+        except (OSError, UnicodeDecodeError):
+            commit = None
+        _git_commit_cache[key] = commit or "unknown"
+    return _git_commit_cache[key]
 
 
 def safe_filename_component(value, fallback):
@@ -53,14 +106,17 @@ class TransitSnapshotManager:
     def __init__(self, base_dir="transit_snapshots", sep_threshold_deg=0.5,
                  arm_seconds=DEFAULT_ARM_SECONDS,
                  finalize_grace_seconds=DEFAULT_FINALIZE_GRACE_SECONDS,
-                 git_commit=None, prediction_model="2E/2F"):
+                 git_commit=None, prediction_model="2E/2F",
+                 catalog_filename=CATALOG_FILENAME):
         self.base_dir = Path(base_dir)
         self.sep_threshold_deg = float(sep_threshold_deg)
         self.arm_seconds = float(arm_seconds)
         self.finalize_grace_seconds = float(finalize_grace_seconds)
-        self.git_commit = (runtime_git_commit(self.base_dir.parent)
-                           if git_commit is None else git_commit)
+        self._git_commit = git_commit
         self.prediction_model = prediction_model
+        # Summary rows of written documents; None disables the catalog.
+        self.catalog = (SnapshotCatalog(self.base_dir / catalog_filename)
+                        if catalog_filename is not None else None)
         self._buffers = {}
         self._buffer_last_seen = {}
         self._active = {}
@@ -69,11 +125,26 @@ class TransitSnapshotManager:
         self.last_error = None
         self.last_error_utc = None
 
+    @property
+    def git_commit(self):
+        # Resolved on first use so that a manager which never writes a
+        # snapshot never touches the repository.
+        if self._git_commit is None:
+            self._git_commit = runtime_git_commit(self.base_dir.parent)
+        return self._git_commit
+
     @property
     def active_events(self):
         with self._lock:
             return deepcopy(self._active)
 
+    def memory_structures(self):
+        """Internal containers by name, for memory accounting."""
+        with self._lock:
+            return (("observation buffers", self._buffers),
+                    ("active events", self._active),
+                    ("recent events", self._recent_events))
+
     def record_observation(self, observation):
         """Store every accepted pipeline observation; do not filter outliers."""
         try:
@@ -201,6 +272,8 @@ class TransitSnapshotManager:
                 path = self._write_document(payload, now_utc)
                 if path is not None:
                     completed.append(path)
+            if self.catalog is not None:
+                self.catalog.close()
             return completed
         except Exception as error:
             self._fail(error, now_utc)
@@ -347,6 +420,7 @@ class TransitSnapshotManager:
                         break
                     except FileExistsError:
                         suffix += 1
+                self._catalog_document(document, target, finalized_at)
                 return target
             finally:
                 try:
@@ -357,6 +431,15 @@ class TransitSnapshotManager:
             self._fail(error, finalized_at)
             return None
 
+    def _catalog_document(self, document, path, finalized_at):
+        if self.catalog is None:
+            return
+        try:
+            self.catalog.upsert(summarize_document(
+                document, path.relative_to(self.base_dir).as_posix()))
+        except Exception as error:
+            self._fail(error, finalized_at)
+
     def _fail(self, error, when=None):
         self.last_error = str(error)
         self.last_error_utc = when
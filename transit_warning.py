@@ -59,6 +59,8 @@ USA.
 
 # Importowanie niezbędnych bibliotek / Importing necessary libraries
 from __future__ import print_function
+import time
+STARTUP_STARTED = time.perf_counter()
 import argparse
 import io
 import os
@@ -67,18 +69,27 @@ import shutil
 import signal
 import sys
 import datetime
-import time
 import math
 import ephem
 import re
 import socket
 import threading
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from enum import Enum
 from functools import wraps
-from math import atan2, sin, cos, acos, radians, degrees, atan, asin, sqrt, isnan
+from math import atan2, sin, cos, acos, radians, degrees, asin, sqrt, isnan, tan
 import pytz  # Import pytz for timezone handling
-from config import ConfigurationError, InstallationConfig, load_installation_config
+from aircraft_json import (
+    DEFAULT_POLL_SECONDS,
+    AircraftJsonAdapter,
+    read_aircraft_json,
+)
+from config import (
+    PRIMARY_OBSERVER_NAME,
+    ConfigurationError,
+    InstallationConfig,
+    load_installation_config,
+)
 from beast_intent import BeastFrameParser, decode_tc29, modes_crc
 from environment import (
     DailyEnvironmentRecorder,
@@ -89,32 +100,71 @@ from environment import (
     EnvironmentReplay,
     iter_environment_events,
 )
+from ground_track import (
+    DEFAULT_RADIUS_KM as STAND_DEFAULT_RADIUS_KM,
+    DEFAULT_STEP_KM as STAND_DEFAULT_STEP_KM,
+    ObserverGrid,
+    stand_summary,
+)
+from memory_accounting import FloatRing, MemoryAccounting, format_memory_report
 from metar import fetch_awc_metar
+from motion_tracker import MotionTrackers
+from observer_frame import ObserverFrame, crosstrack_km
+from prediction_cache import PredictionInputs, TransitPredictionCache
+from prediction_scheduler import PredictionScheduler, classify_prediction
+from profiling import (
+    DEFAULT_PROFILE_SECONDS,
+    DiagnosticsProfiler,
+    profile_seconds,
+)
+from solver_pool import SolverPool, SolverTask
+from source_fusion import FusionDecision, PositionFusion
+from startup import StartupProfile
+from status_server import DEFAULT_HOST, StatusServer, StatusSnapshotCache
+from transit_feed import (
+    TransitCandidateState,
+    TransitCandidateTracker,
+    TransitFeedServer,
+)
+from transit_log import (
+    DEFAULT_DIRECTORY as TRANSIT_EVENT_LOG_DIRECTORY,
+    TransitEventLog,
+)
+from terminal_renderer import (
+    ANSI_ESCAPE_RE,
+    TERMINAL_HOME_CLEAR,
+    DifferentialRenderer,
+)
+from separation_envelope import (
+    EnvelopeInputs,
+    EnvelopeUncertainty,
+    separation_envelope,
+    sigma_points,
+)
+from sector_culling import (
+    HORIZON_SECONDS as SECTOR_CULL_HORIZON_SECONDS,
+    SectorCullDiagnostics,
+    sector_cull_reason,
+)
+from render_index import RenderPriorityIndex
 from recording import RecordingStatus, SessionRecorder, archive_session
-from transit_clock import ReplayClock, clock_from_args
+from transit_clock import RealClock, ReplayClock, TimeContext, clock_from_args
 from transit_time import AdsBTimestampOffsetValidator, port_timestamp_to_utc
 from transit_snapshot import TransitSnapshotManager, runtime_git_commit
 
-# Ustawienia GUI / GUI settings
-try:
-    import tkinter as tk
-    from tkinter import simpledialog
-except ImportError:
-    import Tkinter as tk
-    import tkSimpleDialog as simpledialog
-
 # Kompatybilność z Python 2 i 3 / Compatibility with Python 2 and 3
 try:
     input = raw_input
 except NameError:
     pass
 
-from collections import deque
+from collections import Counter, deque
 
 
 DIAGNOSTICS_DIRECTORY = Path("diagnostics")
-ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
 table_snapshot_requested = threading.Event()
+diagnostics_profiler = DiagnosticsProfiler()
+memory_accounting = MemoryAccounting()
 
 
 def parse_runtime_args(arguments):
@@ -123,7 +173,65 @@ def parse_runtime_args(arguments):
     parser.add_argument("--environment-replay")
     parser.add_argument("--environment-record")
     parser.add_argument("--record", action="store_true")
+    parser.add_argument(
+        "--solver", choices=("fixed-point", "newton"), default="fixed-point")
+    parser.add_argument("--prediction-scheduler", action="store_true")
+    parser.add_argument("--solver-workers", type=int, default=0)
+    parser.add_argument("--status-port", type=int)
+    parser.add_argument("--status-host", default=DEFAULT_HOST)
+    parser.add_argument("--feed-port", type=int)
+    parser.add_argument("--feed-host", default=DEFAULT_HOST)
+    parser.add_argument(
+        "--transit-log-dir", default=TRANSIT_EVENT_LOG_DIRECTORY)
+    parser.add_argument("--transit-log", action="store_true")
+    parser.add_argument("--position-fusion", action="store_true")
+    parser.add_argument("--aircraft-json", metavar="PATH_OR_URL")
+    parser.add_argument(
+        "--aircraft-json-interval", type=float, default=DEFAULT_POLL_SECONDS)
+    parser.add_argument("--no-sbs", action="store_true")
+    parser.add_argument("--motion-tracker", action="store_true")
+    parser.add_argument("--startup-profile", action="store_true")
+    parser.add_argument(
+        "--profile-seconds", type=float, default=DEFAULT_PROFILE_SECONDS)
+    parser.add_argument("--separation-envelope", action="store_true")
+    default_sigmas = EnvelopeUncertainty()
+    parser.add_argument(
+        "--sigma-position-adsb-km", type=float,
+        default=default_sigmas.position_adsb_km)
+    parser.add_argument(
+        "--sigma-position-mlat-km", type=float,
+        default=default_sigmas.position_mlat_km)
+    parser.add_argument(
+        "--sigma-groundspeed-kmh", type=float,
+        default=default_sigmas.groundspeed_kmh)
+    parser.add_argument(
+        "--sigma-track-deg", type=float, default=default_sigmas.track_deg)
+    parser.add_argument(
+        "--sigma-altitude-m", type=float, default=default_sigmas.altitude_m)
+    parser.add_argument("--where-to-stand", action="store_true")
+    parser.add_argument(
+        "--stand-radius-km", type=float, default=STAND_DEFAULT_RADIUS_KM)
+    parser.add_argument(
+        "--stand-step-km", type=float, default=STAND_DEFAULT_STEP_KM)
     args = parser.parse_args(arguments)
+    if args.solver_workers < 0:
+        parser.error("--solver-workers must not be negative")
+    try:
+        profile_seconds(args.profile_seconds)
+    except ValueError as error:
+        parser.error("--profile-seconds: {}".format(error))
+    if not (args.stand_radius_km > 0 and args.stand_step_km > 0):
+        parser.error("--stand-radius-km and --stand-step-km must be positive")
+    if min(args.sigma_position_adsb_km, args.sigma_position_mlat_km,
+           args.sigma_groundspeed_kmh, args.sigma_track_deg,
+           args.sigma_altitude_m) < 0:
+        parser.error("--sigma-* uncertainties must not be negative")
+    if not args.aircraft_json_interval > 0:
+        parser.error("--aircraft-json-interval must be positive")
+    if args.no_sbs and args.aircraft_json is None:
+        parser.error("--no-sbs requires --aircraft-json")
+    if args.aircraft_json is not None and args.clock != "real":
+        parser.error("--aircraft-json requires --clock real")
     if args.environment_replay is not None and args.environment_record is not None:
         parser.error("--environment-replay and --environment-record cannot be used together")
     if args.environment_replay is not None and args.clock != "replay":
@@ -135,10 +243,76 @@ def parse_runtime_args(arguments):
     return args
 
 
-runtime_args = parse_runtime_args(sys.argv[1:] if __name__ == "__main__" else [])
-clock = clock_from_args(["--clock", runtime_args.clock])
+def configure_runtime(args):
+    """Apply parsed command-line options to the module state."""
+    global runtime_args, clock, replay_time_initialized, moving_body_solver
+    global prediction_scheduler, solver_pool
+    global status_server_address, transit_feed_address
+    global transit_event_log_directory, position_fusion, motion_trackers
+    global startup_profile_requested, stand_grid_settings
+    global diagnostics_profiler, aircraft_json_source, aircraft_json_interval
+    global sbs_input_enabled, separation_envelope_uncertainty
+    runtime_args = args
+    clock = clock_from_args(["--clock", args.clock])
+    replay_time_initialized = not isinstance(clock, ReplayClock)
+    moving_body_solver = args.solver
+    # Pool batches come from scheduler drains, so workers imply the scheduler.
+    prediction_scheduler = (
+        PredictionScheduler()
+        if args.prediction_scheduler or args.solver_workers else None)
+    solver_pool = (
+        SolverPool(
+            args.solver_workers,
+            lambda: (installation_config, moving_body_solver),
+            solve_moving_body_task)
+        if args.solver_workers else None)
+    status_server_address = (
+        (args.status_host, args.status_port)
+        if args.status_port is not None else None)
+    transit_feed_address = (
+        (args.feed_host, args.feed_port)
+        if args.feed_port is not None else None)
+    transit_event_log_directory = (
+        args.transit_log_dir if args.transit_log else None)
+    position_fusion = PositionFusion() if args.position_fusion else None
+    aircraft_json_source = args.aircraft_json
+    aircraft_json_interval = args.aircraft_json_interval
+    sbs_input_enabled = not args.no_sbs
+    motion_trackers = MotionTrackers() if args.motion_tracker else None
+    separation_envelope_uncertainty = (
+        EnvelopeUncertainty(
+            args.sigma_position_adsb_km, args.sigma_position_mlat_km,
+            args.sigma_groundspeed_kmh, args.sigma_track_deg,
+            args.sigma_altitude_m)
+        if args.separation_envelope else None)
+    startup_profile_requested = args.startup_profile
+    diagnostics_profiler.close()
+    diagnostics_profiler = DiagnosticsProfiler(args.profile_seconds)
+    stand_grid_settings = (
+        (args.stand_radius_km, args.stand_step_km)
+        if args.where_to_stand else None)
+    reset_runtime_timestamps()
+    return args
+
+
+def reset_runtime_timestamps():
+    """Start the loop timestamps from the clock; a replay clock that has not
+    seen a message yet leaves them to ``advance_replay_time``."""
+    global aktual_t, last_t, gong_t, last_update_time
+    if clock.is_ready():
+        aktual_t = gong_t = last_update_time = clock.now_utc()
+        last_t = aktual_t - datetime.timedelta(seconds=10)
+    else:
+        aktual_t = last_t = gong_t = last_update_time = None
+
+
+# Defaults until configure_runtime applies the command line.
+runtime_args = None
+clock = RealClock()
 replay_time_lock = threading.Lock()
-replay_time_initialized = not isinstance(clock, ReplayClock)
+# Stays False until a replay clock has seen its first message, so a replay
+# clock swapped in without configure_runtime still gets its timestamps.
+replay_time_initialized = False
 environment_replay = None
 environment_recorder = None
 daily_environment_recorder = None
@@ -146,7 +320,30 @@ adsb_timestamp_validator = None
 session_recorder = None
 session_recording_requested = False
 transit_snapshot_manager = None
-transit_warning_git_commit = runtime_git_commit(Path(__file__).resolve().parent)
+moving_body_solver = "fixed-point"
+prediction_scheduler = None
+solver_pool = None
+installation_config = None
+status_snapshot_cache = StatusSnapshotCache()
+status_server_address = None
+status_server = None
+transit_feed_address = None
+transit_feed = None
+transit_candidate_tracker = None
+transit_event_log_directory = None
+transit_event_log = None
+position_fusion = None
+aircraft_json_source = None
+aircraft_json_interval = DEFAULT_POLL_SECONDS
+aircraft_json_adapter = None
+sbs_input_enabled = True
+motion_trackers = None
+separation_envelope_uncertainty = None
+startup_profile_requested = False
+startup_profile = None
+stand_grid_settings = None
+stand_grid = None
+stand_suggestions = {}
 stop_event = threading.Event()
 active_sockets = {}
 active_sockets_lock = threading.Lock()
@@ -154,16 +351,26 @@ shutdown_lock = threading.Lock()
 shutdown_complete = False
 
 # Global settings / Globalne ustawienia
+# Sky-track points per aircraft: one every six seconds, so about an hour.
+SKY_TRACK_POINTS = 600
 MAX_AGE_SECONDS = 60  # Maksymalny czas życia wpisu po ostatnim odbiorze sygnału (w sekundach) / Maximum entry lifetime after the last received signal (in seconds)
 TRANSIT_PREDICTION_GRACE_SECONDS = 3.0
 MOVING_BODY_CONVERGENCE_SECONDS = 0.5
 MOVING_BODY_MAX_CORRECTIONS = 6
 MOVING_BODY_CYCLE_TOLERANCE_SECONDS = 0.1
+MOVING_BODY_NEWTON_MAX_STEPS = 4
+MOVING_BODY_NEWTON_MIN_DENOMINATOR = 0.05
+# Mean apparent hour-angle rates; the Moon's orbital motion slows it ~0.5 deg/h.
+BODY_HOUR_ANGLE_RATE_DEG_PER_SECOND = {
+    "sun": 360.0 / 86400.0,
+    "moon": 360.0 / 89428.0,
+}
 MOTION_FRESH_POSITION_SECONDS = 3.0
 MOTION_FRESH_PARAMETER_SECONDS = 5.0
 MOTION_FRESH_DELTA_SECONDS = 3.0
 MOTION_STALE_SECONDS = 10.0
 MOTION_STALE_DELTA_SECONDS = 10.0
+TRANSIT_SNAPSHOT_DIRECTORY = Path("transit_snapshots")
 TRANSIT_SNAPSHOT_SEP_THRESHOLD_DEG = 0.5
 TRANSIT_SNAPSHOT_ARM_SECONDS = 15.0
 TRANSIT_SNAPSHOT_FINALIZE_GRACE_SECONDS = 2.0
@@ -204,7 +411,10 @@ moon_prediction_last_valid = {}
 sun_predicted_transit_utc = {}
 moon_predicted_transit_utc = {}
 transit_solver_diagnostics = {}
+# Every stored solver outcome across observers, for offline analysis.
+transit_solver_outcome_counts = Counter()
 vertical_transit_diagnostics = {}
+separation_envelopes = {}
 plane_dict_lock = threading.RLock()
 plane_deque = deque()
 
@@ -216,6 +426,9 @@ VERTICAL_RATE_STABILITY_SAMPLES = 3
 VERTICAL_RATE_MAX_SPREAD_FPM = 256.0
 VERTICAL_PREDICTION_MAX_SECONDS = 120.0
 VERTICAL_ALTITUDE_MAX_AGE_SECONDS = 10.0
+# Altitude change the vertical prediction can add: 6000 ft/min for 120 s.
+SECTOR_CULL_VERTICAL_ALLOWANCE_M = (
+    6000.0 / 60 * VERTICAL_PREDICTION_MAX_SECONDS * 0.3048)
 INTENT_FRESHNESS_SECONDS = 10.0
 INTENT_HISTORY_MAXLEN = 10
 QNH_CORRECTION_FT_PER_HPA = 26.0
@@ -246,6 +459,12 @@ class MotionParameter:
     value: float
     updated_at_utc: datetime.datetime
     source: str
+    updated_at_epoch: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Ages are float arithmetic; the datetime stays for output.
+        object.__setattr__(
+            self, "updated_at_epoch", self.updated_at_utc.timestamp())
 
 
 @dataclass(frozen=True)
@@ -254,6 +473,12 @@ class PositionParameter:
     longitude: float
     updated_at_utc: datetime.datetime
     source: str
+    updated_at_epoch: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Ages are float arithmetic; the datetime stays for output.
+        object.__setattr__(
+            self, "updated_at_epoch", self.updated_at_utc.timestamp())
 
 
 @dataclass
@@ -272,6 +497,12 @@ class IntentParameter:
     value: float
     updated_at_utc: datetime.datetime
     source: str
+    updated_at_epoch: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Ages are float arithmetic; the datetime stays for output.
+        object.__setattr__(
+            self, "updated_at_epoch", self.updated_at_utc.timestamp())
 
 
 @dataclass(frozen=True)
@@ -374,6 +605,8 @@ class BeastIntentDiagnostics:
 
 
 beast_intent_diagnostics = BeastIntentDiagnostics()
+sector_cull_diagnostics = SectorCullDiagnostics()
+transit_prediction_cache = TransitPredictionCache()
 
 
 class TransitSolverOutcome(str, Enum):
@@ -383,6 +616,7 @@ class TransitSolverOutcome(str, Enum):
     NO_INTERSECTION = "NO_INTERSECTION"
     OUT_OF_RANGE = "OUT_OF_RANGE"
     TECHNICAL_FALLBACK = "TECHNICAL_FALLBACK"
+    SECTOR_CULLED = "SECTOR_CULLED"
 
 
 @dataclass(frozen=True)
@@ -397,6 +631,7 @@ class MovingBodyTransitDiagnostic:
     final_separation: float | None
     body_angular_diameter_arcsec: float | None = None
     body_ephemeris_evaluated_at_utc: datetime.datetime | None = None
+    cache_hit: bool = False
 
 
 @dataclass(frozen=True)
@@ -414,13 +649,6 @@ class BodyPosition:
         return (self.altitude_deg, self.azimuth_deg)[index]
 
 
-@dataclass(frozen=True)
-class AngularPosition:
-    distance_km: float
-    azimuth_deg: float
-    altitude_angle_deg: float
-
-
 @dataclass(frozen=True)
 class GreatCircleIntersection:
     latitude_deg: float
@@ -480,9 +708,7 @@ def synchronized_plane_dict(function):
 metric_units = True
 
 # Inicjalizacja czasu z uwzględnieniem strefy czasowej / Initialize time with timezone
-aktual_t = clock.now_utc() if clock.is_ready() else None
-last_t = clock.now_utc() - datetime.timedelta(seconds=10) if clock.is_ready() else None
-gong_t = clock.now_utc() if clock.is_ready() else None
+reset_runtime_timestamps()
 
 # Ustawienie pożądanych limitów odległości i czasu / Set desired distance and time limits
 warning_distance = 200  # Odległość ostrzegawcza / Warning distance
@@ -502,8 +728,16 @@ my_elevation_const = None
 transition_altitude_ft = None
 near_airport_elevation = 100  # Wysokość najbliższego lotniska / Nearest airport elevation
 
+observer_name = PRIMARY_OBSERVER_NAME
+observer_engines = []
+
 # Ustawienia efemeryd / Ephemeris settings
 gatech = None
+observer_frame = None
+observer_frame_cache = {}
+OBSERVER_FRAME_CACHE_MAXLEN = 8
+sun_alt = sun_az = None
+moon_alt = moon_az = None
 sun_body_angular_diameter_arcsec = None
 moon_body_angular_diameter_arcsec = None
 sun_body_evaluated_at_utc = None
@@ -518,11 +752,74 @@ beast_host = None
 beast_port = None
 
 
+# State that belongs to one observer. The primary observer's state is these
+# module globals; every other profile keeps its own in an ObserverEngine, and
+# observer-dependent functions take the engine they work on.
+OBSERVER_STATE_NAMES = (
+    "observer_name", "my_lat", "my_lon", "my_elevation_const", "gatech",
+    "observer_frame", "sun_alt", "sun_az", "moon_alt", "moon_az",
+    "sun_body_angular_diameter_arcsec", "moon_body_angular_diameter_arcsec",
+    "sun_body_evaluated_at_utc", "moon_body_evaluated_at_utc",
+    "plane_dict", "sun_prediction_last_valid", "moon_prediction_last_valid",
+    "sun_predicted_transit_utc", "moon_predicted_transit_utc",
+    "transit_solver_diagnostics", "vertical_transit_diagnostics",
+    "separation_envelopes", "transit_prediction_cache",
+    "prediction_scheduler", "sector_cull_diagnostics",
+    "transit_snapshot_manager", "transit_candidate_tracker",
+    "render_priority_index",
+)
+
+
+class ObserverEngine:
+    """Observer-dependent state of one extra photo spot.
+
+    Decoded messages, aircraft motion/intent state, QNH, the clock and the
+    solver pool stay shared; only geometry, predictions and their outputs
+    are per observer, as attributes named like the primary's globals.
+    """
+
+    def __init__(self, profile, **state):
+        self.profile = profile
+        self.transit_snapshot_manager = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def name(self):
+        return self.profile.name
+
+
+class PrimaryObserverEngine(ObserverEngine):
+    """The configured observer; its state attributes are the module globals."""
+
+    def __init__(self):
+        self.profile = None
+
+    @property
+    def name(self):
+        return observer_name
+
+
+def _module_state(name):
+    return property(
+        lambda engine: globals()[name],
+        lambda engine, value: globals().__setitem__(name, value))
+
+
+for _name in OBSERVER_STATE_NAMES:
+    setattr(PrimaryObserverEngine, _name, _module_state(_name))
+del _name
+
+primary_observer = PrimaryObserverEngine()
+
+
 def apply_installation_config(configuration: InstallationConfig):
+    global installation_config
     global my_lat, my_lon, my_elevation_const, transition_altitude_ft
-    global metar_station, gatech
+    global metar_station, gatech, observer_frame
     global adsb_host, adsb_port, adsb_timestamp_timezone, adsb_timestamp_validator
     global mlat_host, mlat_port, beast_host, beast_port, port_status
+    installation_config = configuration
     my_lat = configuration.observer_lat
     my_lon = configuration.observer_lon
     my_elevation_const = configuration.observer_elevation_m
@@ -539,12 +836,98 @@ def apply_installation_config(configuration: InstallationConfig):
     mlat_port = configuration.mlat_port
     beast_host = configuration.beast_host
     beast_port = configuration.beast_port
+    observer_frame = ObserverFrame.from_config(configuration)
+    if position_fusion is not None:
+        position_fusion.reset()
     gatech = ephem.Observer()
     gatech.lat, gatech.lon = str(my_lat), str(my_lon)
     gatech.elevation = my_elevation_const
     port_status = {adsb_port: False, mlat_port: False}
 
 
+def current_observer_frame(position=None, elevation_m=None,
+                           engine=primary_observer):
+    """Return cached observer trigonometry, rebuilding only for a new observer."""
+    configured = (engine.my_lat, engine.my_lon)
+    position = configured if position is None else tuple(position)
+    if elevation_m is None:
+        elevation_m = engine.my_elevation_const
+    frame = engine.observer_frame
+    if frame is not None and frame.matches(position, elevation_m):
+        return frame
+    key = (position[0], position[1], elevation_m)
+    frame = observer_frame_cache.get(key)
+    if frame is None:
+        frame = ObserverFrame(
+            float(position[0]), float(position[1]), float(elevation_m))
+        if len(observer_frame_cache) >= OBSERVER_FRAME_CACHE_MAXLEN:
+            observer_frame_cache.clear()
+        observer_frame_cache[key] = frame
+    if (position == configured
+            and elevation_m == engine.my_elevation_const):
+        engine.observer_frame = frame
+    return frame
+
+
+def new_observer_engine(profile):
+    observer = ephem.Observer()
+    observer.lat = str(profile.observer_lat)
+    observer.lon = str(profile.observer_lon)
+    observer.elevation = profile.observer_elevation_m
+    return ObserverEngine(
+        profile,
+        observer_name=profile.name,
+        my_lat=profile.observer_lat,
+        my_lon=profile.observer_lon,
+        my_elevation_const=profile.observer_elevation_m,
+        gatech=observer,
+        observer_frame=ObserverFrame(
+            profile.observer_lat, profile.observer_lon,
+            profile.observer_elevation_m),
+        plane_dict={},
+        sun_prediction_last_valid={},
+        moon_prediction_last_valid={},
+        sun_predicted_transit_utc={},
+        moon_predicted_transit_utc={},
+        transit_solver_diagnostics={},
+        vertical_transit_diagnostics={},
+        separation_envelopes={},
+        transit_prediction_cache=TransitPredictionCache(),
+        prediction_scheduler=(
+            PredictionScheduler() if prediction_scheduler is not None
+            else None),
+        sector_cull_diagnostics=SectorCullDiagnostics(),
+        transit_candidate_tracker=(
+            TransitCandidateTracker(transit_separation_sound_alert)
+            if transit_candidate_tracker is not None else None),
+        render_priority_index=RenderPriorityIndex(
+            TRANSIT_TIME_DISPLAY_PRECISION),
+    )
+
+
+def configure_observer_engines(configuration):
+    global observer_engines
+    observer_engines = [
+        new_observer_engine(profile)
+        for profile in configuration.observer_profiles]
+    if clock.is_ready():
+        refresh_observer_engines()
+    return observer_engines
+
+
+def each_observer_engine(function, *args):
+    """Call ``function`` once per extra observer, passing its engine."""
+    return [function(*args, engine=engine) for engine in observer_engines]
+
+
+def refresh_observer_engines():
+    """Recompute the Sun/Moon positions of every extra observer."""
+    with plane_dict_lock:
+        for engine in observer_engines:
+            (engine.sun_alt, engine.sun_az, engine.moon_alt,
+             engine.moon_az) = compute_body_positions(engine=engine)
+
+
 def correct_pressure_altitude(pressure_altitude_ft, qnh_hpa):
     """Apply the existing linear QNH approximation to pressure altitude."""
     return (pressure_altitude_ft
@@ -624,7 +1007,8 @@ def _motion_state_for_update(icao):
     return aircraft_motion_states.setdefault(icao, AircraftMotionState())
 
 
-def _update_motion_parameter(icao, name, value, updated_at_utc, port):
+def _update_motion_parameter(
+        icao, name, value, updated_at_utc, port, measurements):
     source = _motion_source_for_port(port)
     if source is None:
         return
@@ -633,15 +1017,46 @@ def _update_motion_parameter(icao, name, value, updated_at_utc, port):
     setattr(state, name, parameter)
     if name == "vertical_rate":
         state.vertical_rate_history.append(parameter)
+    measurements[name] = parameter.value
 
 
 def _update_motion_position(
-        icao, latitude, longitude, updated_at_utc, port):
+        icao, latitude, longitude, updated_at_utc, port, measurements):
     source = _motion_source_for_port(port)
     if source is None:
         return
-    _motion_state_for_update(icao).position = PositionParameter(
+    position = PositionParameter(
         float(latitude), float(longitude), updated_at_utc, source)
+    _motion_state_for_update(icao).position = position
+    measurements["position"] = (position.latitude, position.longitude, source)
+
+
+def _update_motion_tracker(icao, updated_at_utc, measurements):
+    """Feed one message's measurements to the tracker in a single update."""
+    if motion_trackers is not None and measurements:
+        motion_trackers.tracker(icao).update(
+            updated_at_utc.timestamp(), **measurements)
+
+
+def solver_motion_inputs(icao, entry, prediction_base_utc):
+    """Return (lat, lon, track, groundspeed, altitude, filtered state) for
+    the solver.
+
+    With the tracker on, the state is extrapolated to the prediction
+    instant instead of taking the raw values of the last messages; the
+    altitude follows the filtered climb once a metric altitude is known.
+    """
+    filtered = (
+        motion_trackers.state_at(icao, prediction_base_utc.timestamp())
+        if motion_trackers is not None else None)
+    if filtered is None:
+        track = float(entry[11]) if is_float_try(entry[11]) else 0.0
+        return entry[2], entry[3], track, entry[14], entry[4], None
+    altitude = entry[4]
+    if filtered.altitude_m is not None and is_float_try(altitude):
+        altitude = filtered.altitude_m
+    return (filtered.latitude, filtered.longitude, filtered.track_deg,
+            filtered.groundspeed_kmh, altitude, filtered)
 
 
 def get_aircraft_motion_state(icao):
@@ -667,10 +1082,11 @@ def get_aircraft_motion_freshness(icao, now_utc=None):
     state = get_aircraft_motion_state(icao)
     if state is None:
         return None
-    now = clock.now_utc() if now_utc is None else now_utc
+    now = TimeContext.of(
+        clock.now_utc() if now_utc is None else now_utc).epoch
 
     def age(parameter):
-        return ((now - parameter.updated_at_utc).total_seconds()
+        return (now - parameter.updated_at_epoch
                 if parameter is not None else None)
 
     return AircraftMotionFreshness(
@@ -683,11 +1099,17 @@ def get_aircraft_motion_freshness(icao, now_utc=None):
 
 
 def assess_motion_freshness(motion_state, now_utc):
-    """Classify one timestamped motion state without consulting wall time."""
+    """Classify one timestamped motion state without consulting wall time.
+
+    ``now_utc`` may be an aware datetime or a TimeContext.
+    """
+    now = TimeContext.of(now_utc)
+    now_utc, now_epoch = now.utc, now.epoch
+
     def age(parameter):
         if parameter is None:
             return None
-        return max(0.0, (now_utc - parameter.updated_at_utc).total_seconds())
+        return max(0.0, now_epoch - parameter.updated_at_epoch)
 
     position_age = age(motion_state.position) if motion_state else None
     altitude_age = age(motion_state.altitude) if motion_state else None
@@ -789,7 +1211,6 @@ def get_aircraft_motion_freshness_status(icao):
     with plane_dict_lock:
         return aircraft_motion_freshness_status.get(icao)
 
-last_update_time = clock.now_utc() if clock.is_ready() else None  # Inicjalizacja zmiennej na początku skryptu / Initialize variable at the beginning of the script
 
 port_status = {}
 
@@ -834,12 +1255,18 @@ def source_status_lines():
     adsb_recorder_status, mlat_recorder_status = session_recorder_statuses()
     adsb_port_status = "Listening" if port_status.get(adsb_port, False) else "Not listening"
     mlat_port_status = "Listening" if port_status.get(mlat_port, False) else "Not listening"
-    return (
+    lines = (
         "ADS-B  Port {}: {}  |  Recorder: {}".format(
             adsb_port, adsb_port_status, adsb_recorder_status),
         "MLAT   Port {}: {}  |  Recorder: {}".format(
             mlat_port, mlat_port_status, mlat_recorder_status),
     )
+    if aircraft_json_adapter is None:
+        return lines
+    return lines + ("JSON   {}: {}  |  Changed: {}/{}".format(
+        aircraft_json_source,
+        "Polling" if port_status.get(aircraft_json_source) else "Not polling",
+        aircraft_json_adapter.changed, aircraft_json_adapter.aircraft),)
 
 
 def initialize_daily_environment(base_dir=None):
@@ -888,13 +1315,31 @@ def advance_replay_time(timestamp_utc):
             gong_t = current_time
             last_update_time = current_time
             sun_alt, sun_az, moon_alt, moon_az = tabela()
+            refresh_observer_engines()
             replay_time_initialized = True
 
 # Funkcja do czyszczenia ekranu / Function to clear the screen
-TERMINAL_HOME_CLEAR = "\x1b[H\x1b[J"
 TABLE_FIXED_OUTPUT_LINES = 9
 TERMINAL_SCROLL_GUARD_LINES = 1
 TRANSIT_TIME_DISPLAY_PRECISION = 3
+TABLE_HEADER_ROW = (
+    '{:9} {:>6} {:>7} {} {:>6} {} {:>8} {} {:>7} {} {:>6} {:>6} {:>5} {} '
+    '{:>7} {:>7} {:>7} {:>8} {} {:>7} {:>7} {:>7} {:>7} {} {:>5}').format
+TABLE_HEADER_LINES = (
+    TABLE_HEADER_ROW(
+        ' icao or', ' (m)', '(d)', '|', '(km)', '|', '(km)', '|', '(d)', '|',
+        '(d)', '(d)', '(l)', ' |', '(d)', '(km)', '(km)', '   (s)', '|',
+        '(d)', '(km)', '(km)', '   (s)', ' |', '(s)'),
+    TABLE_HEADER_ROW(
+        ' flight', 'elev', 'trck', '|', 'dist', '|', '[warn]', '|', '[Alt]',
+        '|', 'Alt', 'Azim', 'Azim', ' |', 'Sep', 'p2x', 'h2x', 'time2X', '|',
+        'Sep', 'p2x', 'h2x', 'time2X', ' |', 'age'),
+    "-------------------------|--------|--------- |---------|----------------------|----------------------------------|----------------------------------|------------------|",
+)
+TRANSIT_CELLS_ROW = '{}{:>7.2f}{} {:>7.1f} {:>7.1f} {:>8.1f}'.format
+TRANSIT_CELLS_EMPTY = '{:>7} {:>7} {:>7} {:>8}'.format('---', '---', '---', '---')
+terminal_renderer = DifferentialRenderer()
+render_priority_index = RenderPriorityIndex(TRANSIT_TIME_DISPLAY_PRECISION)
 
 
 @dataclass(frozen=True)
@@ -915,21 +1360,25 @@ def terminal_aircraft_row_limit(terminal_lines=None):
     """Return the aircraft rows that fit without scrolling the frame."""
     if terminal_lines is None:
         terminal_lines = shutil.get_terminal_size(fallback=(80, 24)).lines
+    fixed_lines = TABLE_FIXED_OUTPUT_LINES + (1 if stand_suggestions else 0)
     return max(
         0,
-        terminal_lines - TABLE_FIXED_OUTPUT_LINES - TERMINAL_SCROLL_GUARD_LINES,
+        terminal_lines - fixed_lines - TERMINAL_SCROLL_GUARD_LINES,
     )
 
 
-def _prediction_timestamps(celestial_body):
+def _prediction_timestamps(celestial_body, engine=primary_observer):
     if celestial_body == "sun":
-        return sun_prediction_last_valid, sun_predicted_transit_utc
-    return moon_prediction_last_valid, moon_predicted_transit_utc
+        return (engine.sun_prediction_last_valid,
+                engine.sun_predicted_transit_utc)
+    return (engine.moon_prediction_last_valid,
+            engine.moon_predicted_transit_utc)
 
 
-def predicted_transit_remaining_seconds(icao, celestial_body, now_utc=None):
+def predicted_transit_remaining_seconds(icao, celestial_body, now_utc=None,
+                                        engine=primary_observer):
     """Return whole future seconds remaining on the configured clock."""
-    predicted_times = _prediction_timestamps(celestial_body)[1]
+    predicted_times = _prediction_timestamps(celestial_body, engine=engine)[1]
     predicted_utc = predicted_times.get(icao)
     if predicted_utc is None:
         return None
@@ -937,8 +1386,9 @@ def predicted_transit_remaining_seconds(icao, celestial_body, now_utc=None):
     return max(0, int((predicted_utc - now_utc).total_seconds()))
 
 
-def visible_transit_candidate(entry, celestial_body, icao=None, now_utc=None):
-    """Return a numeric display block only for a visible transit candidate."""
+def transit_candidate_values(entry, celestial_body):
+    """Return the stored numeric block of a prediction under the ignore
+    threshold, whatever its time to transit."""
     indices = (
         (18, 19, 21, 20, 22)
         if celestial_body == "sun" else (23, 24, 27, 25, 26))
@@ -947,18 +1397,51 @@ def visible_transit_candidate(entry, celestial_body, icao=None, now_utc=None):
             float(entry[index]) for index in indices)
     except (IndexError, TypeError, ValueError):
         return None
+    separation = vertical_transit_separation(predicted_alt, body_alt)
+    if separation >= transit_separation_notignored:
+        return None
+    return separation, p2x, h2x, stored_time2x
+
+
+def visible_transit_candidate(entry, celestial_body, icao=None, now_utc=None,
+                              engine=primary_observer):
+    """Return a numeric display block only for a visible transit candidate."""
+    values = transit_candidate_values(entry, celestial_body)
+    if values is None:
+        return None
     dynamic_time2x = (
-        predicted_transit_remaining_seconds(icao, celestial_body, now_utc)
+        predicted_transit_remaining_seconds(icao, celestial_body, now_utc,
+                                            engine=engine)
         if icao is not None else None)
-    time2x = stored_time2x if dynamic_time2x is None else dynamic_time2x
-    separation = vertical_transit_separation(predicted_alt, body_alt)
-    if time2x <= 0 or separation >= transit_separation_notignored:
+    time2x = values[3] if dynamic_time2x is None else dynamic_time2x
+    if time2x <= 0:
         return None
-    return separation, p2x, h2x, time2x
+    return values[:3] + (time2x,)
+
+
+def update_render_priority(icao, engine=primary_observer):
+    """Re-index one aircraft after its distance or prediction changed."""
+    entry = engine.plane_dict.get(icao)
+    if entry is None:
+        engine.render_priority_index.discard(icao)
+        return
+    try:
+        distance = float(entry[5])
+    except (IndexError, TypeError, ValueError):
+        distance = None
+    candidates = []
+    for priority, body_name in enumerate(("sun", "moon")):
+        values = transit_candidate_values(entry, body_name)
+        if values is not None:
+            candidates.append((
+                priority, _prediction_timestamps(body_name,
+                                                 engine=engine)[1].get(icao),
+                values[3]))
+    engine.render_priority_index.update(icao, distance, candidates)
 
 
 def build_terminal_render_plan(planes, row_limit, maximum_distance,
-                               now_utc=None):
+                               now_utc=None, engine=primary_observer):
     """Prioritize a display-only copy without changing tracked aircraft order."""
     candidates = []
     remaining = []
@@ -966,9 +1449,9 @@ def build_terminal_render_plan(planes, row_limit, maximum_distance,
     for original_index, icao in enumerate(planes):
         entry = planes[icao]
         sun_candidate = visible_transit_candidate(
-            entry, "sun", icao, now_utc)
+            entry, "sun", icao, now_utc, engine=engine)
         moon_candidate = visible_transit_candidate(
-            entry, "moon", icao, now_utc)
+            entry, "moon", icao, now_utc, engine=engine)
         sun_time = sun_candidate[3] if sun_candidate is not None else None
         moon_time = moon_candidate[3] if moon_candidate is not None else None
 
@@ -1012,6 +1495,30 @@ def build_terminal_render_plan(planes, row_limit, maximum_distance,
     )
 
 
+def render_priority_plan(row_limit, maximum_distance, now_utc=None,
+                         engine=primary_observer):
+    """``build_terminal_render_plan`` of ``plane_dict`` from the index.
+
+    A replaced or resized dictionary is re-indexed first, so a dictionary
+    assigned wholesale renders the same as one built message by message.
+    """
+    plane_dict = engine.plane_dict
+    now_utc = clock.now_utc() if now_utc is None else now_utc
+    index = engine.render_priority_index
+    if index.source_id != id(plane_dict) or len(index) != len(plane_dict):
+        index.clear()
+        index.source_id = id(plane_dict)
+        for icao in plane_dict:
+            update_render_priority(icao, engine=engine)
+    index.set_maximum_distance(maximum_distance)
+    shown = index.plan(row_limit, now_utc)
+    return TerminalRenderPlan(
+        aircraft_ids=shown,
+        shown_count=len(shown),
+        total_count=len(plane_dict),
+    )
+
+
 def terminal_tracking_summary(observer_lat, observer_lon, render_plan):
     return (
         "LAT: {} LON: {} | Aircraft: {}/{} shown".format(
@@ -1042,11 +1549,12 @@ def predict_transit_altitude(current_altitude_m, motion_state, now_utc,
         list(motion_state.vertical_rate_history)[
             -policy.stability_sample_count:]
         if motion_state is not None else ())
+    now_epoch = TimeContext.of(now_utc).epoch
     altitude_age = (
-        max(0.0, (now_utc - altitude.updated_at_utc).total_seconds())
+        max(0.0, now_epoch - altitude.updated_at_epoch)
         if altitude is not None else None)
     vertical_rate_age = (
-        max(0.0, (now_utc - vertical_rate.updated_at_utc).total_seconds())
+        max(0.0, now_epoch - vertical_rate.updated_at_epoch)
         if vertical_rate is not None else None)
     last_vr = vertical_rate.value if vertical_rate is not None else None
     source = vertical_rate.source if vertical_rate is not None else None
@@ -1164,16 +1672,16 @@ def clamp_vertical_prediction_to_intent_state(
         details["intent_reason"] = "TC29_NO_DATA"
         return prediction, details
     selected = state.selected_altitude
+    now_epoch = TimeContext.of(now_utc).epoch
+    selected_age = max(0.0, now_epoch - selected.updated_at_epoch)
     details.update(selected_altitude_ft=selected.value,
                    selected_altitude_source=selected.source,
-                   selected_altitude_age_seconds=max(
-                       0.0, (now_utc - selected.updated_at_utc).total_seconds()))
+                   selected_altitude_age_seconds=selected_age)
     if state.nav_qnh is None:
         details["intent_reason"] = "TC29_NO_QNH"
         return prediction, details
     nav_qnh = state.nav_qnh
-    selected_age = max(0.0, (now_utc - selected.updated_at_utc).total_seconds())
-    qnh_age = max(0.0, (now_utc - nav_qnh.updated_at_utc).total_seconds())
+    qnh_age = max(0.0, now_epoch - nav_qnh.updated_at_epoch)
     details.update(nav_qnh_hpa=nav_qnh.value,
                    nav_qnh_age_seconds=qnh_age)
     if selected.source != "MCP/FCU":
@@ -1244,7 +1752,8 @@ def predict_vertical_state_at_time(
 
 
 def apply_vertical_prediction_to_transit_result(
-        icao, celestial_body, transit_result, current_altitude_m, now_utc):
+        icao, celestial_body, transit_result, current_altitude_m, now_utc,
+        engine=primary_observer):
     """Update only the final vertical angle of a solved 2D transit."""
     if not transit_result:
         return transit_result
@@ -1262,23 +1771,22 @@ def apply_vertical_prediction_to_transit_result(
     before = vertical_transit_separation(
         transit_result[3], transit_result[9])
     updated = list(transit_result)
+    frame = current_observer_frame(engine=engine)
     if prediction.mode == VerticalPredictionMode.DYNAMIC_VALID:
         h2x_km = float(transit_result[4])
         if h2x_km == 0:
             h2x_km = 0.001
-        updated[3] = degrees(atan(
-            (prediction.predicted_altitude_m - my_elevation_const)
-            / (h2x_km * 1000)))
+        updated[3] = frame.elevation_deg(
+            prediction.predicted_altitude_m, h2x_km)
     after = vertical_transit_separation(updated[3], updated[9])
     altitude_before_clamp = float(transit_result[3])
     if prediction_2e.mode == VerticalPredictionMode.DYNAMIC_VALID:
         h2x_km = float(transit_result[4]) or 0.001
-        altitude_before_clamp = degrees(atan(
-            (prediction_2e.predicted_altitude_m - my_elevation_const)
-            / (h2x_km * 1000)))
+        altitude_before_clamp = frame.elevation_deg(
+            prediction_2e.predicted_altitude_m, h2x_km)
     intent_details["separation_before_clamp"] = vertical_transit_separation(
         altitude_before_clamp, transit_result[9])
-    vertical_transit_diagnostics[(icao, celestial_body)] = (
+    engine.vertical_transit_diagnostics[(icao, celestial_body)] = (
         VerticalTransitDiagnostic(
             body=celestial_body,
             prediction=prediction,
@@ -1301,18 +1809,21 @@ def production_aircraft_state_at_transit(
     )
 
 
-def get_vertical_transit_diagnostic(icao, celestial_body):
+def get_vertical_transit_diagnostic(icao, celestial_body,
+                                    engine=primary_observer):
     """Return the latest immutable post-solver vertical diagnostic."""
     with plane_dict_lock:
-        return vertical_transit_diagnostics.get((icao, celestial_body))
+        return engine.vertical_transit_diagnostics.get((icao, celestial_body))
 
 
 def _capture_transit_prediction(icao, callsign, celestial_body,
-                                transit_result, now_utc, solver_input):
+                                transit_result, now_utc, solver_input,
+                                engine=primary_observer):
     """Pass an already solved prediction to the optional validation layer."""
-    if transit_snapshot_manager is None or not transit_result:
+    if engine.transit_snapshot_manager is None or not transit_result:
         return
-    diagnostic = vertical_transit_diagnostics.get((icao, celestial_body))
+    diagnostic = engine.vertical_transit_diagnostics.get(
+        (icao, celestial_body))
     vertical = None
     if diagnostic is not None:
         prediction = diagnostic.prediction
@@ -1329,21 +1840,24 @@ def _capture_transit_prediction(icao, callsign, celestial_body,
             "nav_qnh_hpa": diagnostic.nav_qnh_hpa,
             "target_altitude_m": diagnostic.target_altitude_m,
         }
-    solver_diagnostic = transit_solver_diagnostics.get(
+    solver_diagnostic = engine.transit_solver_diagnostics.get(
         (icao, celestial_body))
     body_size = (
         solver_diagnostic.body_angular_diameter_arcsec
         if solver_diagnostic is not None else None)
-    predicted_utc = _prediction_timestamps(celestial_body)[1].get(icao)
+    envelope = engine.separation_envelopes.get((icao, celestial_body))
+    predicted_utc = _prediction_timestamps(celestial_body,
+                                           engine=engine)[1].get(icao)
     if predicted_utc is None:
         return
     aircraft_altitude_m = (
         diagnostic.prediction.predicted_altitude_m
         if diagnostic is not None else solver_input["aircraft_altitude_m"])
+    frame = current_observer_frame(engine=engine)
     frozen_prediction_state = build_frozen_prediction_state(
         icao, celestial_body, transit_result, now_utc, solver_input,
         diagnostic, solver_diagnostic, pressure)
-    transit_snapshot_manager.consider_prediction({
+    engine.transit_snapshot_manager.consider_prediction({
         "recorded_at_utc": now_utc,
         "prediction_base_utc": _snapshot_utc_text(now_utc),
         "predicted_transit_utc": predicted_utc,
@@ -1351,8 +1865,8 @@ def _capture_transit_prediction(icao, callsign, celestial_body,
         "callsign": callsign or None,
         "body": celestial_body.upper(),
         "observer": {
-            "lat": my_lat, "lon": my_lon,
-            "elevation_m": my_elevation_const,
+            "lat": frame.latitude_deg, "lon": frame.longitude_deg,
+            "elevation_m": frame.elevation_m,
         },
         "time2x_seconds": float(transit_result[6]),
         "aircraft_altitude_m": aircraft_altitude_m,
@@ -1378,59 +1892,68 @@ def _capture_transit_prediction(icao, callsign, celestial_body,
                 float(transit_result[3]) - float(transit_result[9])),
         },
         "body_angular_diameter_arcsec": body_size,
+        "separation_envelope": (
+            envelope.as_dict() if envelope is not None else None),
+        "solver_outcome": (
+            solver_diagnostic.outcome.value
+            if solver_diagnostic is not None else None),
         "frozen_prediction_state": frozen_prediction_state,
     })
 
 
 def capture_transit_prediction(icao, callsign, celestial_body,
-                               transit_result, now_utc, solver_input):
+                               transit_result, now_utc, solver_input,
+                               engine=primary_observer):
     """Keep every TC29G failure outside the aircraft input path."""
     try:
         _capture_transit_prediction(
             icao, callsign, celestial_body, transit_result, now_utc,
-            solver_input)
+            solver_input, engine=engine)
     except Exception:
         pass
 
 
-def initialize_transit_snapshots():
+def initialize_transit_snapshots(engine=primary_observer):
     """Initialize the optional validation layer without affecting startup."""
-    global transit_snapshot_manager
+    base_dir = TRANSIT_SNAPSHOT_DIRECTORY
+    if engine.observer_name != PRIMARY_OBSERVER_NAME:
+        base_dir = base_dir / engine.observer_name
     try:
-        transit_snapshot_manager = TransitSnapshotManager(
+        engine.transit_snapshot_manager = TransitSnapshotManager(
+            base_dir=base_dir,
             sep_threshold_deg=TRANSIT_SNAPSHOT_SEP_THRESHOLD_DEG,
             arm_seconds=TRANSIT_SNAPSHOT_ARM_SECONDS,
             finalize_grace_seconds=(
                 TRANSIT_SNAPSHOT_FINALIZE_GRACE_SECONDS),
-            git_commit=transit_warning_git_commit)
+            git_commit=runtime_git_commit(Path(__file__).resolve().parent))
     except Exception:
-        transit_snapshot_manager = None
-    return transit_snapshot_manager
+        engine.transit_snapshot_manager = None
+    return engine.transit_snapshot_manager
 
 
-def finalize_transit_snapshots(now_utc):
-    if transit_snapshot_manager is None:
+def finalize_transit_snapshots(now_utc, engine=primary_observer):
+    if engine.transit_snapshot_manager is None:
         return []
     try:
-        return transit_snapshot_manager.finalize_due(now_utc)
+        return engine.transit_snapshot_manager.finalize_due(now_utc)
     except Exception:
         return []
 
 
-def close_transit_snapshots(now_utc):
-    if transit_snapshot_manager is None:
+def close_transit_snapshots(now_utc, engine=primary_observer):
+    if engine.transit_snapshot_manager is None:
         return []
     try:
-        return transit_snapshot_manager.close(now_utc)
+        return engine.transit_snapshot_manager.close(now_utc)
     except Exception:
         return []
 
 
-def drop_transit_snapshot_buffer(icao):
-    if transit_snapshot_manager is None:
+def drop_transit_snapshot_buffer(icao, engine=primary_observer):
+    if engine.transit_snapshot_manager is None:
         return False
     try:
-        return transit_snapshot_manager.drop_aircraft_buffer(icao)
+        return engine.transit_snapshot_manager.drop_aircraft_buffer(icao)
     except Exception:
         return False
 
@@ -1450,66 +1973,89 @@ def clear_transit_prediction(entry, start_index):
 
 
 def update_transit_prediction_timestamp(icao, celestial_body, now_utc,
-                                        time2x_seconds):
-    last_valid, predicted_times = _prediction_timestamps(celestial_body)
+                                        time2x_seconds,
+                                        engine=primary_observer):
+    last_valid, predicted_times = _prediction_timestamps(celestial_body,
+                                                         engine=engine)
     last_valid[icao] = now_utc
     predicted_times[icao] = now_utc + datetime.timedelta(
         seconds=time2x_seconds)
 
 
 def clear_transit_prediction_state(icao, entry, celestial_body,
-                                   start_index):
+                                   start_index, engine=primary_observer):
     clear_transit_prediction(entry, start_index)
-    last_valid, predicted_times = _prediction_timestamps(celestial_body)
+    last_valid, predicted_times = _prediction_timestamps(celestial_body,
+                                                         engine=engine)
     last_valid.pop(icao, None)
     predicted_times.pop(icao, None)
-    vertical_transit_diagnostics.pop((icao, celestial_body), None)
+    engine.vertical_transit_diagnostics.pop((icao, celestial_body), None)
 
 
-def _store_transit_solver_solution(icao, celestial_body, solution):
+def _store_transit_solver_solution(icao, celestial_body, solution,
+                                   engine=primary_observer):
     """Store production diagnostics while accepting simple test doubles."""
     if isinstance(solution, MovingBodyTransitSolution):
-        transit_solver_diagnostics[(icao, celestial_body)] = (
+        engine.transit_solver_diagnostics[(icao, celestial_body)] = (
             solution.diagnostic)
+        transit_solver_outcome_counts[solution.diagnostic.outcome.value] += 1
         return solution.result
     return solution
 
 
 def expire_transit_prediction_after_grace(icao, entry, celestial_body,
-                                          start_index, now_utc):
+                                          start_index, now_utc,
+                                          engine=primary_observer):
     """Keep one missing prediction briefly to absorb input-stream jitter."""
     timestamps = (
-        sun_prediction_last_valid
-        if celestial_body == "sun" else moon_prediction_last_valid)
+        engine.sun_prediction_last_valid
+        if celestial_body == "sun" else engine.moon_prediction_last_valid)
     last_valid = timestamps.get(icao)
     has_active_prediction = is_float_try(entry[start_index + 4])
     if (not has_active_prediction or last_valid is None
             or (now_utc - last_valid).total_seconds()
             >= TRANSIT_PREDICTION_GRACE_SECONDS):
         clear_transit_prediction_state(
-            icao, entry, celestial_body, start_index)
+            icao, entry, celestial_body, start_index, engine=engine)
 
 
 # Funkcja do czyszczenia słownika samolotów / Function to clean the plane dictionary
 @synchronized_plane_dict
-def clean_dict():
-    current_time = clock.now_utc()
-    to_delete = [icao for icao, entry in plane_dict.items() if (current_time - entry[0]).total_seconds() > MAX_AGE_SECONDS]
+def clean_dict(now_utc=None, engine=primary_observer):
+    current_time = clock.now_utc() if now_utc is None else now_utc
+    # One cutoff per sweep instead of a subtraction per aircraft.
+    cutoff = current_time - datetime.timedelta(seconds=MAX_AGE_SECONDS)
+    to_delete = [icao for icao, entry in engine.plane_dict.items()
+                 if entry[0] < cutoff]
     for icao in to_delete:
-        del plane_dict[icao]
+        del engine.plane_dict[icao]
         altitude_sources.pop(icao, None)
         aircraft_motion_states.pop(icao, None)
         aircraft_intent_states.pop(icao, None)
         aircraft_motion_freshness_status.pop(icao, None)
-        sun_prediction_last_valid.pop(icao, None)
-        moon_prediction_last_valid.pop(icao, None)
-        sun_predicted_transit_utc.pop(icao, None)
-        moon_predicted_transit_utc.pop(icao, None)
-        transit_solver_diagnostics.pop((icao, "sun"), None)
-        transit_solver_diagnostics.pop((icao, "moon"), None)
-        vertical_transit_diagnostics.pop((icao, "sun"), None)
-        vertical_transit_diagnostics.pop((icao, "moon"), None)
-        drop_transit_snapshot_buffer(icao)
+        engine.sun_prediction_last_valid.pop(icao, None)
+        engine.moon_prediction_last_valid.pop(icao, None)
+        engine.sun_predicted_transit_utc.pop(icao, None)
+        engine.moon_predicted_transit_utc.pop(icao, None)
+        engine.transit_solver_diagnostics.pop((icao, "sun"), None)
+        engine.transit_solver_diagnostics.pop((icao, "moon"), None)
+        engine.vertical_transit_diagnostics.pop((icao, "sun"), None)
+        engine.vertical_transit_diagnostics.pop((icao, "moon"), None)
+        engine.separation_envelopes.pop((icao, "sun"), None)
+        engine.separation_envelopes.pop((icao, "moon"), None)
+        engine.transit_prediction_cache.discard(icao)
+        if position_fusion is not None:
+            position_fusion.discard(icao)
+        if motion_trackers is not None:
+            motion_trackers.discard(icao)
+        if engine.prediction_scheduler is not None:
+            engine.prediction_scheduler.discard(icao)
+        if engine.transit_candidate_tracker is not None:
+            for event in engine.transit_candidate_tracker.discard(
+                    icao, current_time):
+                publish_transit_feed_event(event, engine=engine)
+        drop_transit_snapshot_buffer(icao, engine=engine)
+        engine.render_priority_index.discard(icao)
 
 # Funkcja do obliczania odległości między punktami (haversine) / Function to calculate distance between points (haversine)
 def haversine(origin, destination):
@@ -1525,47 +2071,39 @@ def haversine(origin, destination):
 def angular_position_from_observer(
         observer_position, observer_elevation_m, target_position,
         target_altitude_m, distance_km=None):
-    """Return the existing observer geometry without changing rounding."""
-    observer_lat, observer_lon = observer_position
+    """Return the existing observer geometry without changing rounding.
+
+    A ``target_altitude_m`` of ``None`` returns distance and azimuth only.
+    """
     target_lat, target_lon = target_position
-    if distance_km is None:
-        distance_km = round(haversine(observer_position, target_position), 1)
-    altitude_angle = degrees(atan(
-        (target_altitude_m - observer_elevation_m)
-        / (distance_km * 1000)))
-    azimuth = atan2(
-        sin(radians(target_lon - observer_lon)) * cos(radians(target_lat)),
-        cos(radians(observer_lat)) * sin(radians(target_lat))
-        - sin(radians(observer_lat)) * cos(radians(target_lat))
-        * cos(radians(target_lon - observer_lon)))
-    return AngularPosition(
-        distance_km=distance_km,
-        azimuth_deg=round(((degrees(azimuth) + 360) % 360), 1),
-        altitude_angle_deg=altitude_angle,
-    )
+    return current_observer_frame(
+        observer_position, observer_elevation_m).angular_position(
+            target_lat, target_lon, target_altitude_m, distance_km)
 
 
 def solve_great_circle_intersection(
         observer_position, plane_position, track, velocity, elevation,
         body_azimuth, observer_elevation_m):
     """Extract the original spherical intersection calculation unchanged."""
-    lat1, lon1 = observer_position
-    lat2, lon2 = plane_position
-    lat1, lat2, lon1, lon2 = map(radians, [lat1, lat2, lon1, lon2])
+    frame = current_observer_frame(observer_position, observer_elevation_m)
+    lat1, lon1 = frame.latitude_rad, frame.longitude_rad
+    sin_lat1, cos_lat1 = frame.sin_lat, frame.cos_lat
+    lat2, lon2 = map(radians, plane_position)
     body_azimuth = float(body_azimuth)
     track = float(track)
     theta_13, theta_23 = radians(body_azimuth), radians(track)
+    sin_lat2, cos_lat2 = sin(lat2), cos(lat2)
     delta_12 = 2 * asin(sqrt(
         sin((lat1 - lat2) / 2) ** 2
-        + cos(lat1) * cos(lat2) * sin((lon1 - lon2) / 2) ** 2))
+        + cos_lat1 * cos_lat2 * sin((lon1 - lon2) / 2) ** 2))
     if delta_12 == 0:
         return None
-    x = ((sin(lat2) - sin(lat1) * cos(delta_12))
-         / (sin(delta_12) * cos(lat1)))
+    x = ((sin_lat2 - sin_lat1 * cos(delta_12))
+         / (sin(delta_12) * cos_lat1))
     x = min(1, max(-1, x))
     theta_a = acos(x)
-    y = ((sin(lat1) - sin(lat2) * cos(delta_12))
-         / (sin(delta_12) * cos(lat2)))
+    y = ((sin_lat1 - sin_lat2 * cos(delta_12))
+         / (sin(delta_12) * cos_lat2))
     y = min(1, max(-1, y))
     theta_b = acos(y)
     theta_12 = (
@@ -1585,23 +2123,22 @@ def solve_great_circle_intersection(
         sin(delta_12) * sin(alfa_1) * sin(alfa_2),
         cos(alfa_2) + cos(alfa_1) * cos(alfa_3))
     lat3 = asin(
-        sin(lat1) * cos(delta_13)
-        + cos(lat1) * sin(delta_13) * cos(theta_13))
+        sin_lat1 * cos(delta_13)
+        + cos_lat1 * sin(delta_13) * cos(theta_13))
     dlon_13 = atan2(
-        sin(theta_13) * sin(delta_13) * cos(lat1),
-        cos(delta_13) - sin(lat1) * sin(lat3))
+        sin(theta_13) * sin(delta_13) * cos_lat1,
+        cos(delta_13) - sin_lat1 * sin(lat3))
     lon3 = lon1 + dlon_13
     lat3, lon3 = degrees(lat3), (degrees(lon3) + 540) % 360 - 180
-    dst_h2x = round(haversine(observer_position, (lat3, lon3)), 1)
+    dst_h2x = round(frame.distance_km(lat3, lon3), 1)
     if dst_h2x > 500:
         return None
     if dst_h2x == 0:
         dst_h2x = 0.001
     if not is_int_try(elevation):
         return None
-    angular_position = angular_position_from_observer(
-        observer_position, observer_elevation_m, (lat3, lon3), elevation,
-        distance_km=dst_h2x)
+    angular_position = frame.angular_position(
+        lat3, lon3, elevation, distance_km=dst_h2x)
     dst_p2x = round(haversine(plane_position, (lat3, lon3)), 1)
     velocity = int(velocity)
     if velocity <= 0:
@@ -1671,40 +2208,35 @@ def great_circle_forward_bearing_at_point(
         dot(forward_tangent, point_north))) + 360) % 360)
 
 
+def display_distance(distance_km):
+    """Convert a frame distance to the table unit, as ``haversine`` does."""
+    return distance_km if metric_units else distance_km * 3959 / 6371
+
+
 # Funkcja do obliczania odchylenia bocznego / Function to calculate cross-track deviation
 def crosstrack(distance, azimuth, track):
+    """Cross-track deviation in the table unit; miles without metric_units."""
     radius = 6371 if metric_units else 3959
-    azimuth = float(azimuth)
-    track = float(track)
-    return round(abs(asin(sin(distance / radius) * sin(radians(azimuth - track))) * radius), 1)
-
-# Funkcja do logowania tranzytów / Function to log transits
-def log_transits(icao, flight, transit_info, celestial_body):
-    filename = "transits_log.txt"
-    with open(filename, "a") as file:
-        date_time = clock.now_utc().strftime("%Y-%m-%d %H:%M:%S")
-        line = "{},{},{},{},{},{},{},{},{}\n".format(
-            date_time, icao, flight, transit_info['min_distance'],
-            transit_info['plane_az'], transit_info['plane_alt'],
-            transit_info['celestial_az'], transit_info['celestial_alt'],
-            celestial_body
-        )
-        file.write(line)
+    return crosstrack_km(distance, azimuth, track, radius)
 
 # Funkcja do przewidywania tranzytów / Function to predict transits
-def transit_pred(obs2moon, plane_pos, track, velocity, elevation, moon_alt, moon_az):
+def transit_pred(obs2moon, plane_pos, track, velocity, elevation, moon_alt, moon_az,
+                 observer_elevation_m=None, prediction_base_utc=None):
     if moon_alt < 0.1:
         return 0
     moon_az = float(moon_az)
+    if observer_elevation_m is None:
+        observer_elevation_m = my_elevation_const
     intersection = solve_great_circle_intersection(
         obs2moon, plane_pos, track, velocity, elevation, moon_az,
-        my_elevation_const)
+        observer_elevation_m)
     if intersection is None:
         return 0
+    obs_lat, obs_lon = obs2moon
     moon_alt_B = 90.00 - moon_alt
     ideal_dist = (sin(radians(moon_alt_B)) * elevation) / sin(radians(moon_alt)) / 1000
-    ideal_lat = asin(sin(radians(my_lat)) * cos(ideal_dist / earth_R) + cos(radians(my_lat)) * sin(ideal_dist / earth_R) * cos(radians(moon_az)))
-    ideal_lon = radians(my_lon) + atan2(sin(radians(moon_az)) * sin(ideal_dist / earth_R) * cos(radians(my_lat)), cos(ideal_dist / earth_R) - sin(radians(my_lat)) * sin(ideal_lat))
+    ideal_lat = asin(sin(radians(obs_lat)) * cos(ideal_dist / earth_R) + cos(radians(obs_lat)) * sin(ideal_dist / earth_R) * cos(radians(moon_az)))
+    ideal_lon = radians(obs_lon) + atan2(sin(radians(moon_az)) * sin(ideal_dist / earth_R) * cos(radians(obs_lat)), cos(ideal_dist / earth_R) - sin(radians(obs_lat)) * sin(ideal_lat))
     ideal_lat, ideal_lon = degrees(ideal_lat), degrees(ideal_lon)
     ideal_lon = (ideal_lon + 540) % 360 - 180
     return (intersection.latitude_deg, intersection.longitude_deg,
@@ -1713,18 +2245,24 @@ def transit_pred(obs2moon, plane_pos, track, velocity, elevation, moon_alt, moon
             intersection.observer_distance_km,
             intersection.aircraft_distance_km,
             intersection.time_seconds, 0, moon_az, moon_alt,
-            clock.now_utc())
+            clock.now_utc() if prediction_base_utc is None
+            else prediction_base_utc)
+
 
+def body_position_at_utc(body_name, when_utc, observer_frame=None):
+    """Return one shared PyEphem body state at an explicit UTC time.
 
-def body_position_at_utc(body_name, when_utc):
-    """Return one shared PyEphem body state at an explicit UTC time."""
+    ``observer_frame`` defaults to the configured observer.
+    """
     if (when_utc.tzinfo is None
             or when_utc.utcoffset() != datetime.timedelta(0)):
         raise ValueError("body ephemeris requires timezone-aware UTC")
+    if observer_frame is None:
+        observer_frame = current_observer_frame()
     observer = ephem.Observer()
-    observer.lat = str(my_lat)
-    observer.lon = str(my_lon)
-    observer.elevation = float(my_elevation_const)
+    observer.lat = str(observer_frame.latitude_deg)
+    observer.lon = str(observer_frame.longitude_deg)
+    observer.elevation = float(observer_frame.elevation_m)
     observer.date = ephem.Date(when_utc.astimezone(pytz.utc))
     if body_name == "sun":
         body = ephem.Sun(observer)
@@ -1942,8 +2480,13 @@ def build_frozen_prediction_state(
 
 def build_snapshot_solver_input(icao, plane_lat, plane_lon, elevation,
                                 distance, azimuth, altitude_angle,
-                                groundspeed, track):
-    """Copy the exact horizontal inputs and corresponding motion metadata."""
+                                groundspeed, track, filtered_state=None,
+                                raw_inputs=None):
+    """Copy the exact horizontal inputs and corresponding motion metadata.
+
+    Tracker runs also record the filtered state and the raw table values it
+    replaced.
+    """
     state = aircraft_motion_states.get(icao)
     position = state.position if state is not None else None
     altitude = state.altitude if state is not None else None
@@ -1952,7 +2495,7 @@ def build_snapshot_solver_input(icao, plane_lat, plane_lon, elevation,
     vertical_rate = state.vertical_rate if state is not None else None
     intent = aircraft_intent_states.get(icao)
     selected_altitude = intent.selected_altitude if intent is not None else None
-    return {
+    solver_input = {
         "aircraft_lat": float(plane_lat),
         "aircraft_lon": float(plane_lon),
         "aircraft_altitude_m": float(elevation),
@@ -1979,36 +2522,45 @@ def build_snapshot_solver_input(icao, plane_lat, plane_lon, elevation,
             groundspeed_parameter.updated_at_utc
             if groundspeed_parameter is not None else None),
     }
+    if filtered_state is not None:
+        solver_input["filtered_state"] = asdict(filtered_state)
+        solver_input["raw_inputs"] = dict(raw_inputs)
+    return solver_input
 
 
 def _capture_transit_observation(icao, timestamp_utc, message_source,
-                                 message_type):
+                                 message_type, engine=primary_observer):
     """Copy the earliest accepted per-message state into the small ring buffer."""
-    if transit_snapshot_manager is None:
+    if engine.transit_snapshot_manager is None:
         return
     state = aircraft_motion_states.get(icao)
     position = state.position if state is not None else None
-    altitude, altitude_source, altitude_time = _snapshot_parameter(state, "altitude")
-    groundspeed, groundspeed_source, groundspeed_time = _snapshot_parameter(state, "groundspeed")
-    track, track_source, track_time = _snapshot_parameter(state, "track")
-    vertical_rate, vertical_rate_source, vertical_rate_time = _snapshot_parameter(
+    altitude, altitude_source, _ = _snapshot_parameter(state, "altitude")
+    groundspeed, groundspeed_source, _ = _snapshot_parameter(state, "groundspeed")
+    track, track_source, _ = _snapshot_parameter(state, "track")
+    vertical_rate, vertical_rate_source, _ = _snapshot_parameter(
         state, "vertical_rate")
     intent = aircraft_intent_states.get(icao)
     selected = intent.selected_altitude if intent is not None else None
+    parameters = {
+        "position": position,
+        "altitude": getattr(state, "altitude", None),
+        "groundspeed": getattr(state, "groundspeed", None),
+        "track": getattr(state, "track", None),
+        "vertical_rate": getattr(state, "vertical_rate", None),
+        "selected_altitude": selected,
+    }
     source_timestamps = {
-        "position": position.updated_at_utc if position is not None else None,
-        "altitude": altitude_time,
-        "groundspeed": groundspeed_time,
-        "track": track_time,
-        "vertical_rate": vertical_rate_time,
-        "selected_altitude": selected.updated_at_utc if selected is not None else None,
+        name: parameter.updated_at_utc if parameter is not None else None
+        for name, parameter in parameters.items()
     }
+    timestamp_epoch = timestamp_utc.timestamp()
     parameter_ages = {
-        name: ((timestamp_utc - updated_at).total_seconds()
-               if updated_at is not None else None)
-        for name, updated_at in source_timestamps.items()
+        name: (timestamp_epoch - parameter.updated_at_epoch
+               if parameter is not None else None)
+        for name, parameter in parameters.items()
     }
-    transit_snapshot_manager.record_observation({
+    engine.transit_snapshot_manager.record_observation({
         "timestamp_utc": timestamp_utc,
         "icao": icao,
         "message_source": message_source,
@@ -2034,30 +2586,29 @@ def _capture_transit_observation(icao, timestamp_utc, message_source,
 
 
 def capture_transit_observation(icao, timestamp_utc, message_source,
-                                message_type):
+                                message_type, engine=primary_observer):
     """Keep every TC29G failure outside ADS-B, MLAT and Beast paths."""
     try:
         _capture_transit_observation(
-            icao, timestamp_utc, message_source, message_type)
+            icao, timestamp_utc, message_source, message_type, engine=engine)
     except Exception:
         pass
 
 
-def moving_body_transit_pred(body_name, obs2body, plane_pos, track,
-                             velocity, elevation, prediction_base_utc,
-                             fallback_body_position=None):
-    """Iteratively solve the existing geometry against a moving Sun/Moon."""
-    geometry_args = (obs2body, plane_pos, track, velocity, elevation)
+def _moving_body_initial_state(body_name, geometry_args, observer,
+                               prediction_base_utc, fallback_body_position):
+    """Return ``(solution, None)`` for an early exit or ``(None, state)``."""
     try:
-        body_position = body_position_at_utc(body_name, prediction_base_utc)
+        body_position = body_position_at_utc(
+            body_name, prediction_base_utc, observer)
         body_alt, body_az = body_position
-        body_size = _body_angular_diameter(body_position)
     except Exception:
         fallback_result = None
         if fallback_body_position is not None:
             fallback_alt, fallback_az = fallback_body_position
             fallback_result = transit_pred(
-                *geometry_args, fallback_alt, fallback_az)
+                *geometry_args, fallback_alt, fallback_az,
+                observer.elevation_m, prediction_base_utc)
             fallback_time = _moving_body_result_time(fallback_result)
             if (fallback_time is None or fallback_time <= 0
                     or fallback_time > 900):
@@ -2067,22 +2618,40 @@ def moving_body_transit_pred(body_name, obs2body, plane_pos, track,
             _moving_body_result_time(fallback_result), fallback_result,
             0, None, TransitSolverOutcome.TECHNICAL_FALLBACK,
             _body_angular_diameter(fallback_body_position),
-            _body_evaluated_at_utc(fallback_body_position))
+            _body_evaluated_at_utc(fallback_body_position)), None
 
-    initial_result = transit_pred(*geometry_args, body_alt, body_az)
+    initial_result = transit_pred(
+        *geometry_args, body_alt, body_az, observer.elevation_m,
+        prediction_base_utc)
     if not initial_result:
         return _moving_body_solution(
             body_name, prediction_base_utc, None, None, 0, None,
-            TransitSolverOutcome.NO_INTERSECTION)
+            TransitSolverOutcome.NO_INTERSECTION), None
     initial_time = _moving_body_result_time(initial_result)
     if initial_time is None or initial_time <= 0 or initial_time > 900:
         return _moving_body_solution(
             body_name, prediction_base_utc, initial_time, None, 0, None,
-            TransitSolverOutcome.OUT_OF_RANGE)
+            TransitSolverOutcome.OUT_OF_RANGE), None
+    return None, (body_position, initial_result, initial_time)
+
+
+def fixed_point_moving_body_transit_pred(
+        body_name, obs2body, plane_pos, track, velocity, elevation,
+        prediction_base_utc, fallback_body_position=None,
+        observer_elevation_m=None):
+    """Iteratively solve the existing geometry against a moving Sun/Moon."""
+    geometry_args = (obs2body, plane_pos, track, velocity, elevation)
+    observer = current_observer_frame(obs2body, observer_elevation_m)
+    solution, initial_state = _moving_body_initial_state(
+        body_name, geometry_args, observer, prediction_base_utc,
+        fallback_body_position)
+    if solution is not None:
+        return solution
+    body_position, initial_result, initial_time = initial_state
 
     results = [(
         initial_result,
-        body_size,
+        _body_angular_diameter(body_position),
         _body_evaluated_at_utc(body_position, prediction_base_utc),
     )]
     current_time = initial_time
@@ -2090,7 +2659,8 @@ def moving_body_transit_pred(body_name, obs2body, plane_pos, track,
         body_time = prediction_base_utc + datetime.timedelta(
             seconds=current_time)
         try:
-            body_position = body_position_at_utc(body_name, body_time)
+            body_position = body_position_at_utc(
+                body_name, body_time, observer)
             body_alt, body_az = body_position
             body_size = _body_angular_diameter(body_position)
         except Exception:
@@ -2100,7 +2670,9 @@ def moving_body_transit_pred(body_name, obs2body, plane_pos, track,
                 TransitSolverOutcome.TECHNICAL_FALLBACK,
                 results[0][1], results[0][2])
 
-        next_result = transit_pred(*geometry_args, body_alt, body_az)
+        next_result = transit_pred(
+            *geometry_args, body_alt, body_az, observer.elevation_m,
+            prediction_base_utc)
         if not next_result:
             return _moving_body_solution(
                 body_name, prediction_base_utc, initial_time, None,
@@ -2156,6 +2728,299 @@ def moving_body_transit_pred(body_name, obs2body, plane_pos, track,
         TransitSolverOutcome.MAX_ITERATIONS, final_body_size,
         final_body_time)
 
+
+def body_azimuth_rate(body_name, body_position, observer_latitude_deg=None):
+    """Return the body's azimuth rate in deg/s from its current alt/az."""
+    body_alt, body_az = body_position
+    if observer_latitude_deg is None:
+        observer_latitude_deg = my_lat
+    altitude, azimuth = radians(float(body_alt)), radians(float(body_az))
+    if cos(altitude) < 1e-6:
+        raise ValueError("body azimuth rate is undefined at the zenith")
+    latitude = radians(float(observer_latitude_deg))
+    return BODY_HOUR_ANGLE_RATE_DEG_PER_SECOND[body_name] * (
+        sin(latitude) - cos(latitude) * cos(azimuth) * tan(altitude))
+
+
+def body_altitude_rate(body_name, body_position, observer_latitude_deg=None):
+    """Return the body's altitude rate in deg/s from its current azimuth."""
+    _, body_az = body_position
+    if observer_latitude_deg is None:
+        observer_latitude_deg = my_lat
+    return (BODY_HOUR_ANGLE_RATE_DEG_PER_SECOND[body_name]
+            * cos(radians(float(observer_latitude_deg)))
+            * sin(radians(float(body_az))))
+
+
+def aircraft_bearing_rate(plane_pos, track, velocity, result):
+    """Return the observer bearing rate in deg/s of the aircraft at 2X."""
+    intersection = (float(result[0]), float(result[1]))
+    local_track = great_circle_forward_bearing_at_point(
+        plane_pos, track, intersection)
+    observer_distance = max(float(result[4]), 0.001)
+    return degrees(
+        float(velocity) / 3600
+        * sin(radians(local_track - float(result[2])))
+        / observer_distance)
+
+
+def _newton_moving_body_time(body_name, body_position, evaluated_time,
+                             result, plane_pos, track, velocity,
+                             observer_latitude_deg=None):
+    """Return the next time estimate, or the plain fixed-point step."""
+    predicted_time = _moving_body_result_time(result)
+    try:
+        slope = (body_azimuth_rate(
+                     body_name, body_position, observer_latitude_deg)
+                 / aircraft_bearing_rate(plane_pos, track, velocity, result))
+    except (ArithmeticError, KeyError, TypeError, ValueError):
+        return predicted_time
+    if (not math.isfinite(slope)
+            or abs(1 - slope) < MOVING_BODY_NEWTON_MIN_DENOMINATOR):
+        return predicted_time
+    next_time = (
+        evaluated_time + (predicted_time - evaluated_time) / (1 - slope))
+    if next_time <= 0 or next_time > 900:
+        return predicted_time
+    return next_time
+
+
+def newton_moving_body_transit_pred(
+        body_name, obs2body, plane_pos, track, velocity, elevation,
+        prediction_base_utc, fallback_body_position=None,
+        observer_elevation_m=None):
+    """Solve time2x = T(body_az(time2x)) with Newton steps.
+
+    The slope of T is the body azimuth rate divided by the aircraft bearing
+    rate seen from the observer; both come from the state already at hand,
+    so each step costs one ephemeris evaluation used to verify the estimate.
+    """
+    geometry_args = (obs2body, plane_pos, track, velocity, elevation)
+    observer = current_observer_frame(obs2body, observer_elevation_m)
+    solution, initial_state = _moving_body_initial_state(
+        body_name, geometry_args, observer, prediction_base_utc,
+        fallback_body_position)
+    if solution is not None:
+        return solution
+    body_position, initial_result, initial_time = initial_state
+
+    results = [(
+        initial_result,
+        _body_angular_diameter(body_position),
+        _body_evaluated_at_utc(body_position, prediction_base_utc),
+    )]
+    current_time, current_result = 0.0, initial_result
+    residual = None
+    for correction_count in range(1, MOVING_BODY_NEWTON_MAX_STEPS + 1):
+        estimate = _newton_moving_body_time(
+            body_name, body_position, current_time, current_result,
+            plane_pos, track, velocity, observer.latitude_deg)
+        body_time = prediction_base_utc + datetime.timedelta(seconds=estimate)
+        try:
+            body_position = body_position_at_utc(
+                body_name, body_time, observer)
+            body_alt, body_az = body_position
+            body_size = _body_angular_diameter(body_position)
+        except Exception:
+            return _moving_body_solution(
+                body_name, prediction_base_utc, initial_time,
+                initial_result, correction_count - 1, None,
+                TransitSolverOutcome.TECHNICAL_FALLBACK,
+                results[0][1], results[0][2])
+
+        next_result = transit_pred(
+            *geometry_args, body_alt, body_az, observer.elevation_m,
+            prediction_base_utc)
+        if not next_result:
+            return _moving_body_solution(
+                body_name, prediction_base_utc, initial_time, None,
+                correction_count, None,
+                TransitSolverOutcome.NO_INTERSECTION)
+        next_time = _moving_body_result_time(next_result)
+        if next_time is None or next_time <= 0 or next_time > 900:
+            return _moving_body_solution(
+                body_name, prediction_base_utc, initial_time, None,
+                correction_count, None,
+                TransitSolverOutcome.OUT_OF_RANGE)
+
+        residual = abs(next_time - estimate)
+        if residual < MOVING_BODY_CONVERGENCE_SECONDS:
+            return _moving_body_solution(
+                body_name, prediction_base_utc, initial_time, next_result,
+                correction_count, residual, TransitSolverOutcome.CONVERGED,
+                body_size, _body_evaluated_at_utc(body_position, body_time))
+
+        results.append((
+            next_result,
+            body_size,
+            _body_evaluated_at_utc(body_position, body_time),
+        ))
+        current_time, current_result = estimate, next_result
+
+    final_result, final_body_size, final_body_time = max(
+        results[-2:],
+        key=lambda pair: _moving_body_result_separation(pair[0]))
+    return _moving_body_solution(
+        body_name, prediction_base_utc, initial_time, final_result,
+        MOVING_BODY_NEWTON_MAX_STEPS, residual,
+        TransitSolverOutcome.MAX_ITERATIONS, final_body_size,
+        final_body_time)
+
+
+MOVING_BODY_SOLVER_FUNCTIONS = {
+    "fixed-point": fixed_point_moving_body_transit_pred,
+    "newton": newton_moving_body_transit_pred,
+}
+
+
+def configure_moving_body_solver(name):
+    global moving_body_solver
+    if name not in MOVING_BODY_SOLVER_FUNCTIONS:
+        raise ValueError("unsupported moving-body solver: {}".format(name))
+    moving_body_solver = name
+
+
+def cull_moving_body_prediction(body_name, plane_pos, track, velocity,
+                                elevation, body_position, observer=None):
+    """Return the sector-culling reason for one body, or None."""
+    if observer is None:
+        observer = current_observer_frame()
+    try:
+        body_alt, body_az = body_position
+        azimuth_sweep = (body_azimuth_rate(
+            body_name, body_position, observer.latitude_deg)
+            * SECTOR_CULL_HORIZON_SECONDS)
+        altitude_sweep = (body_altitude_rate(
+            body_name, body_position, observer.latitude_deg)
+            * SECTOR_CULL_HORIZON_SECONDS)
+    except (ArithmeticError, KeyError, TypeError, ValueError):
+        return None
+    return sector_cull_reason(
+        observer, plane_pos, track, velocity, elevation,
+        body_alt, body_az, azimuth_sweep, altitude_sweep,
+        transit_separation_notignored, SECTOR_CULL_VERTICAL_ALLOWANCE_M)
+
+
+def moving_body_transit_pred(body_name, obs2body, plane_pos, track,
+                             velocity, elevation, prediction_base_utc,
+                             fallback_body_position=None,
+                             engine=primary_observer):
+    """Solve the transit against a moving Sun/Moon with the selected solver.
+
+    The current table-tick body state, when given, first feeds the sector
+    pre-filter so that aircraft which cannot reach the body skip the solver.
+    """
+    if fallback_body_position is not None:
+        culled = sector_culled_moving_body_solution(
+            body_name, plane_pos, track, velocity, elevation,
+            prediction_base_utc, fallback_body_position,
+            engine=engine)
+        if culled is not None:
+            return culled
+    return MOVING_BODY_SOLVER_FUNCTIONS[moving_body_solver](
+        body_name, obs2body, plane_pos, track, velocity, elevation,
+        prediction_base_utc, fallback_body_position,
+        engine.my_elevation_const)
+
+
+def sector_culled_moving_body_solution(body_name, plane_pos, track, velocity,
+                                       elevation, prediction_base_utc,
+                                       body_position, engine=primary_observer):
+    """Record the sector pre-filter and return the culled solution, if any."""
+    reason = cull_moving_body_prediction(
+        body_name, plane_pos, track, velocity, elevation, body_position,
+        current_observer_frame(engine=engine))
+    engine.sector_cull_diagnostics.record(body_name, reason)
+    if reason is None:
+        return None
+    return _moving_body_solution(
+        body_name, prediction_base_utc, None, None, 0, None,
+        TransitSolverOutcome.SECTOR_CULLED)
+
+
+def solve_moving_body_task(task):
+    """Run the selected solver, without the pre-filter, for one SolverTask."""
+    return MOVING_BODY_SOLVER_FUNCTIONS[moving_body_solver](
+        task.body_name, task.obs2body, task.plane_position, task.track_deg,
+        task.velocity_kmh, task.altitude_m, task.prediction_base_utc,
+        task.fallback_body_position, task.observer_elevation_m)
+
+def advance_moving_body_solution(solution, motion_seconds, velocity,
+                                 prediction_base_utc):
+    """Move a cached solution along the unchanged track, or return None."""
+    diagnostic = solution.diagnostic
+    result = solution.result
+    if result:
+        time2x = float(result[6]) - motion_seconds
+        if time2x <= 0:
+            return None
+        result = list(result)
+        result[5] = round(
+            max(float(result[5]) - float(velocity) * motion_seconds / 3600,
+                0.0), 1)
+        result[6] = time2x
+        result[10] = prediction_base_utc
+        result = tuple(result)
+    return MovingBodyTransitSolution(
+        result=result,
+        diagnostic=replace(
+            diagnostic,
+            prediction_base_utc=prediction_base_utc,
+            initial_time2x=(
+                diagnostic.initial_time2x - motion_seconds
+                if diagnostic.initial_time2x is not None else None),
+            final_time2x=(
+                diagnostic.final_time2x - motion_seconds
+                if diagnostic.final_time2x is not None else None),
+            cache_hit=True,
+        ),
+    )
+
+
+def cached_moving_body_transit_pred(icao, body_name, obs2body, plane_pos,
+                                    track, velocity, elevation,
+                                    prediction_base_utc,
+                                    fallback_body_position=None,
+                                    engine=primary_observer):
+    """Reuse the aircraft's last solution while its motion is unchanged."""
+    solution, inputs, context = lookup_cached_moving_body_solution(
+        icao, body_name, obs2body, plane_pos, track, velocity, elevation,
+        prediction_base_utc, engine=engine)
+    if solution is not None:
+        return solution
+    solution = moving_body_transit_pred(
+        body_name, obs2body, plane_pos, track, velocity, elevation,
+        prediction_base_utc, fallback_body_position=fallback_body_position,
+        engine=engine)
+    store_moving_body_solution(
+        icao, body_name, inputs, prediction_base_utc, solution, context,
+        engine=engine)
+    return solution
+
+
+def lookup_cached_moving_body_solution(icao, body_name, obs2body, plane_pos,
+                                       track, velocity, elevation,
+                                       prediction_base_utc,
+                                       engine=primary_observer):
+    """Return the advanced cached solution or None, with its cache key."""
+    inputs = PredictionInputs(tuple(plane_pos), track, velocity, elevation)
+    context = (moving_body_solver, tuple(obs2body))
+    solution = engine.transit_prediction_cache.lookup(
+        icao, body_name, inputs, prediction_base_utc,
+        lambda cached, motion_seconds: advance_moving_body_solution(
+            cached, motion_seconds, velocity, prediction_base_utc),
+        context)
+    return solution, inputs, context
+
+
+def store_moving_body_solution(icao, body_name, inputs, prediction_base_utc,
+                               solution, context, engine=primary_observer):
+    if (isinstance(solution, MovingBodyTransitSolution)
+            and solution.diagnostic.outcome
+            != TransitSolverOutcome.TECHNICAL_FALLBACK):
+        engine.transit_prediction_cache.store(
+            icao, body_name, inputs, prediction_base_utc, solution, context)
+
 # Funkcje kolorowania odległości, wysokości, azymutu / Functions for coloring distance, altitude, azimuth
 def dist_col(distance):
     if distance <= 300 and distance > 100:
@@ -2231,9 +3096,9 @@ def wind_deg_to_str1(deg):
         return 'N'
 
 # Funkcja do generowania dźwięku ostrzegawczego / Function to generate a warning sound
-def gong():
+def gong(now_utc=None):
     global gong_t
-    aktual_gong_t = clock.now_utc()
+    aktual_gong_t = clock.now_utc() if now_utc is None else now_utc
     diff_gong_t = (aktual_gong_t - gong_t).total_seconds()
     if diff_gong_t > 2:
         gong_t = aktual_gong_t
@@ -2301,46 +3166,55 @@ def get_metar_press():
     return pressure
 
 # Funkcja do generowania tabeli wyjściowej / Function to generate output table
-@synchronized_plane_dict
-def tabela(output=None, full=False, force=False):
-    global last_t, sun_body_angular_diameter_arcsec
-    global moon_body_angular_diameter_arcsec
-    global sun_body_evaluated_at_utc, moon_body_evaluated_at_utc
-    output = sys.stdout if output is None else output
-    emit = lambda *args: print(*args, file=output)
-    gatech.date = clock.ephem_now()  # Aktualizuj datę w ephemeris / Update date in ephemeris
-    vm, vs = ephem.Moon(gatech), ephem.Sun(gatech)  # Pobierz dane o Księżycu i Słońcu / Get data about the Moon and the Sun
-    vm.compute(gatech)  # Oblicz pozycję Księżyca / Compute Moon position
-    vs.compute(gatech)  # Oblicz pozycję Słońca / Compute Sun position
+def compute_body_positions(engine=primary_observer):
+    """Recompute one observer's Sun/Moon for the current clock time.
+
+    Returns ``(sun_alt, sun_az, moon_alt, moon_az)`` rounded for display and
+    stores the angular diameters and evaluation time used by the solver.
+    """
+    engine.gatech.date = clock.ephem_now()  # Aktualizuj datę w ephemeris / Update date in ephemeris
+    vm, vs = ephem.Moon(engine.gatech), ephem.Sun(engine.gatech)  # Pobierz dane o Księżycu i Słońcu / Get data about the Moon and the Sun
+    vm.compute(engine.gatech)  # Oblicz pozycję Księżyca / Compute Moon position
+    vs.compute(engine.gatech)  # Oblicz pozycję Słońca / Compute Sun position
     try:
-        body_evaluated_at_utc = ephem.Date(gatech.date).datetime().replace(
-            tzinfo=pytz.utc)
+        body_evaluated_at_utc = ephem.Date(
+            engine.gatech.date).datetime().replace(tzinfo=pytz.utc)
     except (TypeError, ValueError):
         body_evaluated_at_utc = clock.now_utc()
-    moon_body_evaluated_at_utc = body_evaluated_at_utc
-    sun_body_evaluated_at_utc = body_evaluated_at_utc
-    moon_body_angular_diameter_arcsec = _ephem_angular_diameter(vm)
-    sun_body_angular_diameter_arcsec = _ephem_angular_diameter(vs)
+    engine.moon_body_evaluated_at_utc = body_evaluated_at_utc
+    engine.sun_body_evaluated_at_utc = body_evaluated_at_utc
+    engine.moon_body_angular_diameter_arcsec = _ephem_angular_diameter(vm)
+    engine.sun_body_angular_diameter_arcsec = _ephem_angular_diameter(vs)
     moon_alt, moon_az = round(math.degrees(vm.alt), 1), round(math.degrees(vm.az), 1)  # Wysokość i azymut Księżyca / Moon altitude and azimuth
     sun_alt, sun_az = round(math.degrees(vs.alt), 1), round(math.degrees(vs.az), 1)  # Wysokość i azymut Słońca / Sun altitude and azimuth
-    aktual_t = clock.now_utc()  # Aktualny czas w UTC / Current time in UTC
+    return sun_alt, sun_az, moon_alt, moon_az
+
+
+@synchronized_plane_dict
+def tabela(output=None, full=False, force=False, now_utc=None,
+           engine=primary_observer):
+    plane_dict = engine.plane_dict
+    global last_t
+    output = sys.stdout if output is None else output
+    lines = []
+    emit = lambda *args: lines.append(" ".join(map(str, args)))
+    frame = current_observer_frame(engine=engine)
+    sun_alt, sun_az, moon_alt, moon_az = compute_body_positions(engine=engine)
+    aktual_t = clock.now_utc() if now_utc is None else now_utc  # Aktualny czas w UTC / Current time in UTC
     diff_t = (aktual_t - last_t).total_seconds()  # Różnica czasu od ostatniego odświeżenia / Time difference from last refresh
     if force or diff_t > 1:
         if not force:
             last_t = aktual_t  # Ustaw ostatni czas odświeżenia / Set last refresh time
-            clear_screen(output)  # Wyczyść ekran / Clear the screen
         emit("Flight info |  Actual parameters  |-- Pred. closest  --|--- Current Az/Alt ---|----- Transits: Sun", sun_az, sun_alt,'  & Moon', moon_az, moon_alt )
-        emit('{:9} {:>6} {:>7} {} {:>6} {} {:>8} {} {:>7} {} {:>6} {:>6} {:>5} {} {:>7} {:>7} {:>7} {:>8} {} {:>7} {:>7} {:>7} {:>7} {} {:>5}'.format(\
-        ' icao or', ' (m)', '(d)', '|', '(km)', '|', '(km)', '|', '(d)', '|', '(d)', '(d)', '(l)', ' |', '(d)', '(km)', '(km)', '   (s)', '|', '(d)', '(km)', '(km)', '   (s)', ' |', '(s)'))
-        emit('{:9} {:>6} {:>7} {} {:>6} {} {:>8} {} {:>7} {} {:>6} {:>6} {:>5} {} {:>7} {:>7} {:>7} {:>8} {} {:>7} {:>7} {:>7} {:>7} {} {:>5}'.format(\
-        ' flight', 'elev', 'trck', '|', 'dist', '|', '[warn]','|', '[Alt]', '|', 'Alt', 'Azim', 'Azim', ' |', 'Sep', 'p2x', 'h2x', 'time2X', '|', 'Sep', 'p2x', 'h2x', 'time2X', ' |', 'age'))
-        emit("-------------------------|--------|--------- |---------|----------------------|----------------------------------|----------------------------------|------------------|")
-
-        render_plan = build_terminal_render_plan(
-            plane_dict,
-            len(plane_dict) if full else terminal_aircraft_row_limit(),
-            None if full else warning_distance,
-            aktual_t)
+        lines.extend(TABLE_HEADER_LINES)
+
+        if full:
+            render_plan = build_terminal_render_plan(
+                plane_dict, len(plane_dict), None, aktual_t, engine=engine)
+        else:
+            render_plan = render_priority_plan(
+                terminal_aircraft_row_limit(), warning_distance, aktual_t,
+                engine=engine)
         for pentry in render_plan.aircraft_ids:
             try:
                 distance = float(plane_dict[pentry][5])
@@ -2348,9 +3222,8 @@ def tabela(output=None, full=False, force=False):
                 distance = None
 
             if full or (distance is not None and distance <= warning_distance):
-                then = plane_dict[pentry][17] if plane_dict[pentry][17] else clock.now_utc()
-                diff_seconds = (clock.now_utc() - then).total_seconds()
-                diff_minutes = (clock.now_utc() - plane_dict[pentry][0]).total_seconds() / 60
+                then = plane_dict[pentry][17] if plane_dict[pentry][17] else aktual_t
+                diff_seconds = (aktual_t - then).total_seconds()
 
                 if plane_dict[pentry][1]:
                     wiersz = '{}{:<9}{}'.format(YELLOW, plane_dict[pentry][1], RESET)
@@ -2387,7 +3260,7 @@ def tabela(output=None, full=False, force=False):
                     wiersz += '[{}{:>7.1f}{}]'.format(PURPLE, warn_val, RESET)
 
                 if has_elevation and is_float_try(plane_dict[pentry][13]):
-                    altitudeX = round(degrees(atan((elevation - my_elevation_const) / (float(plane_dict[pentry][13]) * 1000))), 1) if plane_dict[pentry][13] else 0
+                    altitudeX = round(frame.elevation_deg(elevation, float(plane_dict[pentry][13])), 1) if plane_dict[pentry][13] else 0
                 else:
                     altitudeX = None
 
@@ -2422,43 +3295,14 @@ def tabela(output=None, full=False, force=False):
                 else:
                     wiersz += '{:>6} {:>6} | '.format('---', '---')
 
-                diff_secx = (clock.now_utc() - plane_dict[pentry][0]).total_seconds()
-                sun_values = visible_transit_candidate(
-                    plane_dict[pentry], "sun", pentry, aktual_t)
-
-                if (sun_values is not None
-                        and sun_values[0] < transit_separation_GREENALERT_FG):
-                    separation_deg = sun_values[0]
-                    wiersz += '{}{:>7.2f}{} {:>7.1f} {:>7.1f} {:>8.1f}'.format(GREENALERT, separation_deg, RESET, *sun_values[1:])
-                elif (sun_values is not None
-                      and sun_values[0] < transit_separation_REDALERT_FG):
-                    separation_deg = sun_values[0]
-                    wiersz += '{}{:>7.2f}{} {:>7.1f} {:>7.1f} {:>8.1f}'.format(REDALERT, separation_deg, RESET, *sun_values[1:])
-                elif sun_values is not None:
-                    separation_deg = sun_values[0]
-                    wiersz += '{}{:>7.2f}{} {:>7.1f} {:>7.1f} {:>8.1f}'.format(RED, separation_deg, RESET, *sun_values[1:])
-                else:
-                    wiersz += '{:>7} {:>7} {:>7} {:>8}'.format('---', '---', '---', '---')
-
+                diff_secx = (aktual_t - plane_dict[pentry][0]).total_seconds()
+                wiersz += transit_cells(visible_transit_candidate(
+                    plane_dict[pentry], "sun", pentry, aktual_t,
+                    engine=engine))
                 wiersz += ' | '
-
-                moon_values = visible_transit_candidate(
-                    plane_dict[pentry], "moon", pentry, aktual_t)
-
-                if (moon_values is not None
-                        and moon_values[0] < transit_separation_GREENALERT_FG):
-                    separation_deg2 = moon_values[0]
-                    wiersz += '{}{:>7.2f}{} {:>7.1f} {:>7.1f} {:>8.1f}'.format(GREENALERT, separation_deg2, RESET, *moon_values[1:])
-                elif (moon_values is not None
-                      and moon_values[0] < transit_separation_REDALERT_FG):
-                    separation_deg2 = moon_values[0]
-                    wiersz += '{}{:>7.2f}{} {:>7.1f} {:>7.1f} {:>8.1f}'.format(REDALERT, separation_deg2, RESET, *moon_values[1:])
-                elif moon_values is not None:
-                    separation_deg2 = moon_values[0]
-                    wiersz += '{}{:>7.2f}{} {:>7.1f} {:>7.1f} {:>8.1f}'.format(RED, separation_deg2, RESET, *moon_values[1:])
-                else:
-                    wiersz += '{:>7} {:>7} {:>7} {:>8}'.format('---', '---', '---', '---')
-
+                wiersz += transit_cells(visible_transit_candidate(
+                    plane_dict[pentry], "moon", pentry, aktual_t,
+                    engine=engine))
                 wiersz += ' | '
                 wiersz += '{:>5.1f}'.format(diff_secx)
                 wiersz += ' {} {} '.format(len(plane_dict[pentry][15]), len(plane_dict[pentry][16]))
@@ -2466,15 +3310,103 @@ def tabela(output=None, full=False, force=False):
                 emit(wiersz)
 
         emit(" ")
-        emit("{} (UTC) --- delay < {:.1f}s --- QNH {}hPa".format(clock.now_utc().time(), diff_t, pressure))
-        emit(terminal_tracking_summary(my_lat, my_lon, render_plan))
+        emit("{} (UTC) --- delay < {:.1f}s --- QNH {}hPa".format(aktual_t.time(), diff_t, pressure))
+        emit(terminal_tracking_summary(
+            engine.my_lat, engine.my_lon, render_plan))
+        # Stand suggestions are searched around the primary observer only.
+        stand_lines = (
+            ranked_stand_suggestions(None if full else 1)
+            if engine is primary_observer else ())
+        for icao, body_name, suggestion in stand_lines:
+            emit(stand_summary(
+                plane_dict[icao][1] if icao in plane_dict and plane_dict[icao][1]
+                else icao, body_name, suggestion))
+        if full:
+            emit(engine.sector_cull_diagnostics.summary())
+            emit(engine.transit_prediction_cache.statistics.summary())
+            if position_fusion is not None:
+                emit(position_fusion.summary())
+            if engine.prediction_scheduler is not None:
+                emit(engine.prediction_scheduler.statistics.summary())
+            if solver_pool is not None:
+                emit(solver_pool.statistics.summary())
+            if startup_profile is not None:
+                for profile_line in startup_profile.report().splitlines():
+                    emit(profile_line)
+            if engine.observer_name == PRIMARY_OBSERVER_NAME:
+                for memory_line in format_memory_report(
+                        sample_memory_accounting(force=True)).splitlines():
+                    emit(memory_line)
         # Print combined port and recorder statuses.
         for status_line in source_status_lines():
             emit(status_line)
+        if force:
+            output.write("".join(line + "\n" for line in lines))
+        else:
+            terminal_renderer.render(
+                lines, output, tuple(shutil.get_terminal_size(fallback=(80, 24))))
 
     return sun_alt, sun_az, moon_alt, moon_az
 
 
+def transit_cells(values):
+    """Format one Sun/Moon block, coloured by its vertical separation."""
+    if values is None:
+        return TRANSIT_CELLS_EMPTY
+    if values[0] < transit_separation_GREENALERT_FG:
+        colour = GREENALERT
+    elif values[0] < transit_separation_REDALERT_FG:
+        colour = REDALERT
+    else:
+        colour = RED
+    return TRANSIT_CELLS_ROW(colour, values[0], RESET, *values[1:])
+
+
+def memory_accounting_structures(engine=primary_observer):
+    """Long-lived state of one observer and the shared aircraft state."""
+    sky_tracks = tuple(
+        history for entry in engine.plane_dict.values()
+        for history in entry[15:17])
+    structures = [
+        ("plane_dict", engine.plane_dict),
+        ("sky tracks", sky_tracks,
+         sum(len(history) for history in sky_tracks)),
+        ("plane_deque", plane_deque),
+        ("altitude_sources", altitude_sources),
+        ("aircraft_motion_states", aircraft_motion_states),
+        ("aircraft_intent_states", aircraft_intent_states),
+        ("aircraft_motion_freshness_status",
+         aircraft_motion_freshness_status),
+        ("sun_prediction_last_valid", engine.sun_prediction_last_valid),
+        ("moon_prediction_last_valid", engine.moon_prediction_last_valid),
+        ("sun_predicted_transit_utc", engine.sun_predicted_transit_utc),
+        ("moon_predicted_transit_utc", engine.moon_predicted_transit_utc),
+        ("transit_solver_diagnostics", engine.transit_solver_diagnostics),
+        ("vertical_transit_diagnostics", engine.vertical_transit_diagnostics),
+        ("separation_envelopes", engine.separation_envelopes),
+        ("transit_prediction_cache", engine.transit_prediction_cache),
+        ("render_priority_index", engine.render_priority_index),
+        ("stand_suggestions", stand_suggestions),
+        ("position_fusion", position_fusion),
+        ("motion_trackers", motion_trackers),
+        ("prediction_scheduler", engine.prediction_scheduler),
+    ]
+    if engine.transit_snapshot_manager is not None:
+        structures.extend(
+            ("transit snapshot " + name, value) for name, value
+            in engine.transit_snapshot_manager.memory_structures())
+    return structures
+
+
+@synchronized_plane_dict
+def sample_memory_accounting(force=False):
+    """Re-size the engine state when due; return the latest footprints."""
+    now = time.monotonic()
+    if force or memory_accounting.due(now):
+        memory_accounting.sample(memory_accounting_structures(), now)
+    return memory_accounting.last_footprints
+
+
 def request_table_snapshot(signum=None, frame=None):
     """Signal handler: defer all rendering and I/O to the main loop."""
     table_snapshot_requested.set()
@@ -2487,19 +3419,23 @@ def install_table_snapshot_signal_handler():
     return True
 
 
-def render_full_table_snapshot():
+def render_full_table_snapshot(engine=primary_observer):
     output = io.StringIO()
-    tabela(output=output, full=True, force=True)
+    tabela(output=output, full=True, force=True, engine=engine)
     return ANSI_ESCAPE_RE.sub("", output.getvalue())
 
 
-def write_table_snapshot(directory=DIAGNOSTICS_DIRECTORY):
+def write_table_snapshot(directory=DIAGNOSTICS_DIRECTORY,
+                         engine=primary_observer):
     now = clock.now_utc()
     directory = Path(directory)
     directory.mkdir(parents=True, exist_ok=True)
+    suffix = ("" if engine.observer_name == PRIMARY_OBSERVER_NAME
+              else "_" + engine.observer_name)
     path = directory / now.strftime(
-        "table_snapshot_%Y%m%d_%H%M%S_UTC.txt")
-    path.write_text(render_full_table_snapshot(), encoding="utf-8")
+        "table_snapshot_%Y%m%d_%H%M%S_UTC{}.txt".format(suffix))
+    path.write_text(
+        render_full_table_snapshot(engine=engine), encoding="utf-8")
     return path
 
 
@@ -2509,33 +3445,91 @@ def process_table_snapshot_request(directory=DIAGNOSTICS_DIRECTORY):
     table_snapshot_requested.clear()
     try:
         path = write_table_snapshot(directory)
+        observer_paths = each_observer_engine(write_table_snapshot, directory)
     except Exception as error:
         print("Table snapshot: FAILED ({})".format(error))
         return None
-    print("Table snapshot: {}".format(path))
+    for written in [path] + observer_paths:
+        print("Table snapshot: {}".format(written))
     return path
 
 
+def request_profile(signum=None, frame=None):
+    """Signal handler: queue a CPU profile and a memory snapshot after it."""
+    diagnostics_profiler.request_from_signal()
+
+
+def install_profiling_signal_handler():
+    if not hasattr(signal, "SIGUSR2"):
+        return False
+    signal.signal(signal.SIGUSR2, request_profile)
+    return True
+
+
+def request_cpu_profile_action(query):
+    seconds = diagnostics_profiler.request_cpu_profile(query.get("seconds"))
+    return {"accepted": "cpu_profile", "seconds": seconds}
+
+
+def request_memory_snapshot_action(query):
+    diagnostics_profiler.request_memory_snapshot()
+    return {"accepted": "memory_snapshot"}
+
+
+PROFILING_ACTIONS = {
+    "/diagnostics/cpu-profile": request_cpu_profile_action,
+    "/diagnostics/memory-snapshot": request_memory_snapshot_action,
+}
+
+
+def process_profiling_requests(directory=DIAGNOSTICS_DIRECTORY):
+    # Wall-clock names: profiles measure this process, not replay time.
+    try:
+        written = diagnostics_profiler.process(
+            datetime.datetime.now(pytz.utc), directory)
+    except Exception as error:
+        print("Profiling: FAILED ({})".format(error))
+        return []
+    for kind, path in written:
+        print("{}: {}".format(kind, path))
+    return written
+
+
 # Funkcja do czyszczenia słownika tranzytów / Function to clean the transit dictionary
 @synchronized_plane_dict
-def clean_transit_dict():
-    current_time = clock.now_utc()
-    to_delete = [icao for icao, entry in plane_dict.items() if len(entry) > 31 and entry[31] and isinstance(entry[30], datetime.datetime) and (current_time - entry[30]).total_seconds() > 120]
+def clean_transit_dict(now_utc=None, engine=primary_observer):
+    current_time = clock.now_utc() if now_utc is None else now_utc
+    cutoff = current_time - datetime.timedelta(seconds=120)
+    to_delete = [icao for icao, entry in engine.plane_dict.items() if len(entry) > 31 and entry[31] and isinstance(entry[30], datetime.datetime) and entry[30] < cutoff]
     for icao in to_delete:
-        del plane_dict[icao]
+        del engine.plane_dict[icao]
         altitude_sources.pop(icao, None)
         aircraft_motion_states.pop(icao, None)
         aircraft_intent_states.pop(icao, None)
         aircraft_motion_freshness_status.pop(icao, None)
-        sun_prediction_last_valid.pop(icao, None)
-        moon_prediction_last_valid.pop(icao, None)
-        sun_predicted_transit_utc.pop(icao, None)
-        moon_predicted_transit_utc.pop(icao, None)
-        transit_solver_diagnostics.pop((icao, "sun"), None)
-        transit_solver_diagnostics.pop((icao, "moon"), None)
-        vertical_transit_diagnostics.pop((icao, "sun"), None)
-        vertical_transit_diagnostics.pop((icao, "moon"), None)
-        drop_transit_snapshot_buffer(icao)
+        engine.sun_prediction_last_valid.pop(icao, None)
+        engine.moon_prediction_last_valid.pop(icao, None)
+        engine.sun_predicted_transit_utc.pop(icao, None)
+        engine.moon_predicted_transit_utc.pop(icao, None)
+        engine.transit_solver_diagnostics.pop((icao, "sun"), None)
+        engine.transit_solver_diagnostics.pop((icao, "moon"), None)
+        engine.vertical_transit_diagnostics.pop((icao, "sun"), None)
+        engine.vertical_transit_diagnostics.pop((icao, "moon"), None)
+        engine.separation_envelopes.pop((icao, "sun"), None)
+        engine.separation_envelopes.pop((icao, "moon"), None)
+        engine.transit_prediction_cache.discard(icao)
+        if position_fusion is not None:
+            position_fusion.discard(icao)
+        if motion_trackers is not None:
+            motion_trackers.discard(icao)
+        if engine.prediction_scheduler is not None:
+            engine.prediction_scheduler.discard(icao)
+        if engine.transit_candidate_tracker is not None:
+            for event in engine.transit_candidate_tracker.discard(
+                    icao, current_time):
+                publish_transit_feed_event(event, engine=engine)
+        drop_transit_snapshot_buffer(icao, engine=engine)
+        engine.render_priority_index.discard(icao)
 
 # Function to manage sockets blocked in readline() during controlled shutdown.
 def _register_active_socket(port, sock):
@@ -2581,6 +3575,16 @@ def shutdown_runtime(threads, recorder):
         except Exception:
             pass
     close_transit_snapshots(clock.now_utc())
+    each_observer_engine(close_transit_snapshots, clock.now_utc())
+    if solver_pool is not None:
+        solver_pool.close()
+    if status_server is not None:
+        status_server.close()
+    diagnostics_profiler.close()
+    if transit_feed is not None:
+        transit_feed.close()
+    if transit_event_log is not None:
+        transit_event_log.close()
     if recorder is not None:
         try:
             recorder.close(clock.now_utc())
@@ -2649,6 +3653,33 @@ def read_from_port(host, port, process_line, session_recorder=None):
     port_status[port] = False
 
 
+@synchronized_plane_dict
+def process_aircraft_json(document, render=True):
+    """Apply the aircraft that changed since the last poll as one batch."""
+    records = aircraft_json_adapter.poll(document)
+    for index, (line, port) in enumerate(records):
+        process_line(line, port, render=render and index == len(records) - 1)
+    return len(records)
+
+
+def poll_aircraft_json(source, interval):
+    """Read ``aircraft.json`` every ``interval`` seconds until stopped."""
+    while not stop_event.is_set():
+        started = time.monotonic()
+        try:
+            process_aircraft_json(read_aircraft_json(source))
+            port_status[source] = True
+        except Exception as error:
+            if stop_event.is_set():
+                break
+            if port_status.get(source, True):
+                print("Error polling {}: {}".format(source, error))
+            port_status[source] = False
+        if stop_event.wait(max(0.0, interval - (time.monotonic() - started))):
+            break
+    port_status[source] = False
+
+
 def read_beast_intent(host, port):
     """Consume live Beast data for TC29 enrichment; failures are fail-open."""
     while not stop_event.is_set():
@@ -2692,18 +3723,43 @@ def read_beast_intent(host, port):
 
 
 # Funkcja do przetwarzania linii danych / Function to process a line of data
+@dataclass(frozen=True)
+class SbsMessage:
+    """Observer-independent content of one decoded SBS line."""
+
+    a_m_type: str
+    mtype: str
+    icao: str
+    date_time_utc: datetime.datetime
+    flight: str = ""
+    elevation: object = None
+    velocity: object = None
+    track: str = ""
+    plane_lat: float = 0.0
+    plane_lon: float = 0.0
+    motion_freshness: MotionFreshnessResult | None = None
+    now: TimeContext | None = None
+    predict: bool = True
+
+
 @synchronized_plane_dict
-def process_line(line, port):
-    global last_update_time, moon_alt, moon_az, sun_alt, sun_az, gatech
-    global moon_body_angular_diameter_arcsec, sun_body_angular_diameter_arcsec
-    global moon_body_evaluated_at_utc, sun_body_evaluated_at_utc
+def process_line(line, port, render=True):
+    message = decode_sbs_message(line, port)
+    if message is None:
+        return
+    apply_message_to_observer(message, render)
+    for engine in observer_engines:
+        apply_message_to_observer(message, render=False, engine=engine)
+
 
+def decode_sbs_message(line, port):
+    """Parse one line and update the state every observer shares."""
     if not line:
-        return
+        return None
 
     parts = line.split(",")
     if len(parts) < 2:
-        return
+        return None
     a_m_type = parts[0].strip()
     mtype = parts[1].strip()
     icao = re.sub(r'\W+', '', parts[4].strip())  # Usunięcie znaków specjalnych z kodu icao / Remove special characters from icao code
@@ -2717,14 +3773,14 @@ def process_line(line, port):
         date_time = datetime.datetime.strptime(date + " " + time, '%Y/%m/%d %H:%M:%S.%f')
     except ValueError:
         print("Error parsing date and time: {} {}".format(date, time))
-        return
+        return None
 
     try:
         logged_date_time = datetime.datetime.strptime(logged_date + " " + logged_time, '%Y/%m/%d %H:%M:%S.%f')
     except ValueError:
         if isinstance(clock, ReplayClock):
             print("Error parsing logged date and time: {} {}".format(logged_date, logged_time))
-            return
+            return None
         logged_date_time = None
 
     date_time_utc = port_timestamp_to_utc(
@@ -2733,26 +3789,23 @@ def process_line(line, port):
         port_timestamp_to_utc(logged_date_time, port, adsb_timestamp_timezone, adsb_port)
         if logged_date_time else None
     )
-    if (port == adsb_port and adsb_timestamp_validator is not None
-            and not isinstance(clock, ReplayClock)):
-        adsb_timestamp_validator.observe(date_time, clock.now_utc())
-
     if logged_date_time_utc is not None:
         advance_replay_time(logged_date_time_utc)
-        if isinstance(clock, ReplayClock):
-            apply_replay_environment(clock.now_utc())
+    # The one clock read for this message; ages use its float epoch.
+    now = clock.now()
+    if (port == adsb_port and adsb_timestamp_validator is not None
+            and not isinstance(clock, ReplayClock)):
+        adsb_timestamp_validator.observe(date_time, now.utc)
+    if logged_date_time_utc is not None and isinstance(clock, ReplayClock):
+        apply_replay_environment(now.utc)
 
+    fields = {}
+    measurements = {}
     if mtype == "1":
-        flight = parts[10].strip()
-        if icao not in plane_dict:
-            plane_dict[icao] = [date_time_utc, flight, "", "", "", "", "", "", "", "", "", "", "", "", "", [], [], "", "", "", "", "", "", "", "", "", "", "", "", "", None, False]
-        else:
-            plane_dict[icao][0] = date_time_utc
-            plane_dict[icao][1] = flight
-            last_update_time = clock.now_utc()
+        fields["flight"] = parts[10].strip()
 
     if mtype == "5":
-        flight = parts[10].strip()
+        fields["flight"] = parts[10].strip()
         elevation = parts[11].strip()
         if is_int_try(elevation):
             altitude_baro_ft = int(elevation)
@@ -2765,19 +3818,12 @@ def process_line(line, port):
                 date_time_utc, mtype)
             _update_motion_parameter(
                 icao, "altitude", corrected_altitude_m,
-                date_time_utc, port)
+                date_time_utc, port, measurements)
             if metric_units:
                 elevation = corrected_altitude_m
             else:
                 elevation = ""
-        if icao not in plane_dict:
-            plane_dict[icao] = [date_time_utc, flight, "", "", elevation, "", "", "", "", "", "", "", "", "", "", [], [], "", "", "", "", "", "", "", "", "", "", "", "", "", None, False]
-        else:
-            plane_dict[icao][4] = elevation
-            plane_dict[icao][0] = date_time_utc
-            last_update_time = clock.now_utc()
-            if flight != '':
-                plane_dict[icao][1] = flight
+        fields["elevation"] = elevation
 
     if mtype == "4" or (mtype == "3" and a_m_type == "MLAT"):
         reported_velocity = parts[12].strip()
@@ -2786,30 +3832,25 @@ def process_line(line, port):
         if is_int_try(reported_velocity):
             velocity = round(int(reported_velocity) * 1.852)
             _update_motion_parameter(
-                icao, "groundspeed", velocity, date_time_utc, port)
+                icao, "groundspeed", velocity, date_time_utc, port,
+                measurements)
         else:
             velocity = 900
         if is_float_try(track):
             _update_motion_parameter(
-                icao, "track", track, date_time_utc, port)
+                icao, "track", track, date_time_utc, port,
+                measurements)
         if is_float_try(reported_vertical_rate):
             _update_motion_parameter(
                 icao, "vertical_rate", reported_vertical_rate,
-                date_time_utc, port)
-        if icao not in plane_dict:
-            plane_dict[icao] = [date_time_utc, "", "", "", "", "", "", "", "", "", "", track, "", "", velocity, [], [], "", "", "", "", "", "", "", "", "", "", "", "", "", None, False]
-        else:
-            plane_dict[icao][0] = date_time_utc
-            if track:  # Aktualizuj track tylko, jeśli nie jest pusty / Update track only if not empty
-                plane_dict[icao][11] = track
-            plane_dict[icao][14] = velocity
-            last_update_time = clock.now_utc()
+                date_time_utc, port, measurements)
+        fields["velocity"] = velocity
+        fields["track"] = track
 
     if mtype == "3":
         reported_elevation = parts[11].strip()
         track_index = 13 if a_m_type == "MLAT" else 12
-        track = parts[track_index].strip() if len(parts) > track_index else ''
-        elevation = None
+        fields["track"] = parts[track_index].strip() if len(parts) > track_index else ''
         if is_int_try(reported_elevation):
             altitude_baro_ft = int(reported_elevation)
             pressure = get_metar_press()
@@ -2821,11 +3862,9 @@ def process_line(line, port):
                 date_time_utc, mtype)
             _update_motion_parameter(
                 icao, "altitude", corrected_altitude_m,
-                date_time_utc, port)
+                date_time_utc, port, measurements)
             if metric_units:
-                elevation = corrected_altitude_m
-        elif icao in plane_dict and is_float_try(plane_dict[icao][4]):
-            elevation = float(plane_dict[icao][4])
+                fields["elevation"] = corrected_altitude_m
         try:
             plane_lat = float(parts[14])
         except ValueError:
@@ -2835,34 +3874,116 @@ def process_line(line, port):
         except ValueError:
             plane_lon = 0.0
         if plane_lat and plane_lon:
-            _update_motion_position(
-                icao, plane_lat, plane_lon, date_time_utc, port)
-            distance = round(haversine((my_lat, my_lon), (plane_lat, plane_lon)), 1)
+            fusion = fuse_position_report(
+                icao, port, date_time_utc, plane_lat, plane_lon)
+            if fusion == FusionDecision.DROPPED:
+                plane_lat = plane_lon = 0.0
+            else:
+                _update_motion_position(
+                    icao, plane_lat, plane_lon, date_time_utc, port,
+                    measurements)
+            fields["predict"] = fusion == FusionDecision.FORWARD
+        fields["plane_lat"] = plane_lat
+        fields["plane_lon"] = plane_lon
+
+    _update_motion_tracker(icao, date_time_utc, measurements)
+    motion_freshness = None
+    if mtype in ["3", "4"]:
+        motion_freshness = assess_motion_freshness(
+            aircraft_motion_states.get(icao), now)
+        aircraft_motion_freshness_status[icao] = motion_freshness
+
+    return SbsMessage(
+        a_m_type, mtype, icao, date_time_utc,
+        motion_freshness=motion_freshness, now=now, **fields)
+
+
+def fuse_position_report(icao, port, timestamp_utc, latitude, longitude):
+    """Keep one position source per aircraft; see source_fusion."""
+    source = _motion_source_for_port(port)
+    if position_fusion is None or source is None:
+        return FusionDecision.FORWARD
+    return position_fusion.observe(
+        icao, source, timestamp_utc.timestamp(), latitude, longitude)
+
+
+def apply_message_to_observer(message, render=True, engine=primary_observer):
+    """Update one observer's rows and predictions from one message.
+
+    ``render=False`` refreshes the observer's Sun/Moon positions without
+    drawing, for observers other than the one shown on the terminal.
+    """
+    plane_dict = engine.plane_dict
+    global last_update_time
+
+    a_m_type = message.a_m_type
+    mtype = message.mtype
+    icao = message.icao
+    date_time_utc = message.date_time_utc
+    now_utc = (message.now or clock.now()).utc
+
+    if mtype == "1":
+        flight = message.flight
+        if icao not in plane_dict:
+            plane_dict[icao] = [date_time_utc, flight, "", "", "", "", "", "", "", "", "", "", "", "", "", FloatRing(SKY_TRACK_POINTS), FloatRing(SKY_TRACK_POINTS), "", "", "", "", "", "", "", "", "", "", "", "", "", None, False]
+            engine.transit_prediction_cache.discard(icao)
+        else:
+            plane_dict[icao][0] = date_time_utc
+            plane_dict[icao][1] = flight
+            last_update_time = now_utc
+
+    if mtype == "5":
+        flight = message.flight
+        elevation = message.elevation
+        if icao not in plane_dict:
+            plane_dict[icao] = [date_time_utc, flight, "", "", elevation, "", "", "", "", "", "", "", "", "", "", FloatRing(SKY_TRACK_POINTS), FloatRing(SKY_TRACK_POINTS), "", "", "", "", "", "", "", "", "", "", "", "", "", None, False]
+            engine.transit_prediction_cache.discard(icao)
+        else:
+            plane_dict[icao][4] = elevation
+            plane_dict[icao][0] = date_time_utc
+            last_update_time = now_utc
+            if flight != '':
+                plane_dict[icao][1] = flight
+
+    if mtype == "4" or (mtype == "3" and a_m_type == "MLAT"):
+        velocity = message.velocity
+        track = message.track
+        if icao not in plane_dict:
+            plane_dict[icao] = [date_time_utc, "", "", "", "", "", "", "", "", "", "", track, "", "", velocity, FloatRing(SKY_TRACK_POINTS), FloatRing(SKY_TRACK_POINTS), "", "", "", "", "", "", "", "", "", "", "", "", "", None, False]
+            engine.transit_prediction_cache.discard(icao)
+        else:
+            plane_dict[icao][0] = date_time_utc
+            if track:  # Aktualizuj track tylko, jeśli nie jest pusty / Update track only if not empty
+                plane_dict[icao][11] = track
+            plane_dict[icao][14] = velocity
+            last_update_time = now_utc
+
+    if mtype == "3":
+        track = message.track
+        elevation = message.elevation
+        if elevation is None and icao in plane_dict and is_float_try(plane_dict[icao][4]):
+            elevation = float(plane_dict[icao][4])
+        plane_lat = message.plane_lat
+        plane_lon = message.plane_lon
+        if plane_lat and plane_lon:
+            frame = current_observer_frame(engine=engine)
+            distance = round(
+                display_distance(frame.distance_km(plane_lat, plane_lon)), 1)
             if distance == 0:
                 distance = 0.01
-            angular_position = (
-                angular_position_from_observer(
-                    (my_lat, my_lon), my_elevation_const,
-                    (plane_lat, plane_lon), elevation,
-                    distance_km=distance)
-                if elevation is not None else None)
-            if angular_position is None:
-                azimuth = angular_position_from_observer(
-                    (my_lat, my_lon), my_elevation_const,
-                    (plane_lat, plane_lon), my_elevation_const,
-                    distance_km=distance).azimuth_deg
-                altitude = ""
-            else:
-                azimuth = angular_position.azimuth_deg
-                altitude = round(angular_position.altitude_angle_deg, 1)
+            angular_position = frame.angular_position(
+                plane_lat, plane_lon, elevation, distance_km=distance)
+            azimuth = angular_position.azimuth_deg
+            altitude = (
+                round(angular_position.altitude_angle_deg, 1)
+                if angular_position.altitude_angle_deg is not None else "")
             if icao not in plane_dict:
-                plane_dict[icao] = [date_time_utc, "", plane_lat, plane_lon, elevation if elevation is not None else "", distance, azimuth, altitude, "", "", distance, track, "", "", "", [], [], "", "", "", "", "", "", "", "", "", "", "", "", "", None, False]
-                plane_dict[icao][15] = []
-                plane_dict[icao][16] = []
+                plane_dict[icao] = [date_time_utc, "", plane_lat, plane_lon, elevation if elevation is not None else "", distance, azimuth, altitude, "", "", distance, track, "", "", "", FloatRing(SKY_TRACK_POINTS), FloatRing(SKY_TRACK_POINTS), "", "", "", "", "", "", "", "", "", "", "", "", "", None, False]
+                engine.transit_prediction_cache.discard(icao)
                 if altitude != "":
                     plane_dict[icao][15].append(azimuth)
                     plane_dict[icao][16].append(altitude)
-                last_update_time = clock.now_utc()
+                last_update_time = now_utc
             else:
                 min_distance = plane_dict[icao][10]
                 try:
@@ -2887,198 +4008,767 @@ def process_line(line, port):
                     plane_dict[icao][7] = altitude
                 if track:  # Aktualizuj track tylko, jeśli nie jest pusty / Update track only if not empty
                     plane_dict[icao][11] = track
-                last_update_time = clock.now_utc()
+                last_update_time = now_utc
                 if not plane_dict[icao][17]:
                     plane_dict[icao][17] = date_time_utc
                 then = plane_dict[icao][17]
-                now = clock.now_utc()
-                diff_seconds = (now - then).total_seconds()
+                diff_seconds = (now_utc - then).total_seconds()
                 if diff_seconds > 6:
                     plane_dict[icao][17] = date_time_utc
-                    poz_az = str(plane_dict[icao][6])
-                    poz_alt = str(plane_dict[icao][7])
                     if altitude != "":
-                        plane_dict[icao][15].append(poz_az)
-                        plane_dict[icao][16].append(poz_alt)
+                        plane_dict[icao][15].append(plane_dict[icao][6])
+                        plane_dict[icao][16].append(plane_dict[icao][7])
 
     if icao:
         capture_transit_observation(
             icao, date_time_utc, a_m_type,
-            "{},{}".format(a_m_type, mtype))
-
-    motion_freshness = None
-    if mtype in ["3", "4"]:
-        motion_freshness = assess_motion_freshness(
-            aircraft_motion_states.get(icao), clock.now_utc())
-        aircraft_motion_freshness_status[icao] = motion_freshness
+            "{},{}".format(a_m_type, mtype), engine=engine)
+    if icao in plane_dict:
+        update_render_priority(icao, engine=engine)
 
+    motion_freshness = message.motion_freshness
     if (mtype in ["3", "4"] and (
             icao in plane_dict and plane_dict[icao][2]
             and plane_dict[icao][11] and is_float_try(plane_dict[icao][4]))):
-        flight = plane_dict[icao][1]
-        plane_lat = plane_dict[icao][2]
-        plane_lon = plane_dict[icao][3]
-        elevation = plane_dict[icao][4]
         distance = plane_dict[icao][5]
         azimuth = plane_dict[icao][6]
-        altitude = plane_dict[icao][7]
         track = float(plane_dict[icao][11]) if is_float_try(plane_dict[icao][11]) else 0.0
         warning = plane_dict[icao][12]
         direction = plane_dict[icao][9]
-        velocity = plane_dict[icao][14]
         xtd = crosstrack(distance, (180 + float(azimuth)) % 360, track)
         plane_dict[icao][13] = xtd
         if xtd <= xtd_tst and distance < warning_distance and warning == "" and direction != "RECEDING":
             plane_dict[icao][12] = "WARNING"
             plane_dict[icao][13] = xtd
-            gong()
+            gong(now_utc)
         if xtd > xtd_tst and distance < warning_distance and warning == "WARNING" and direction != "RECEDING":
             plane_dict[icao][12] = ""
             plane_dict[icao][13] = xtd
-            gong()
+            gong(now_utc)
         if not plane_dict[icao][8]:
             plane_dict[icao][8] = "LINKED!"
         if distance <= alert_distance and plane_dict[icao][8] != "ENTERING":
             plane_dict[icao][8] = "ENTERING"
-            gong()
+            gong(now_utc)
         if distance > alert_distance and plane_dict[icao][8] == "ENTERING":
             plane_dict[icao][8] = "LEAVING"
-        if motion_freshness.status == MotionFreshnessStatus.STALE:
-            sun_alt, sun_az, moon_alt, moon_az = tabela()
-            clean_dict()
-            clean_transit_dict()
+        if (motion_freshness.status == MotionFreshnessStatus.STALE
+                or not message.predict):
+            finish_observer_message(render, now_utc, engine=engine)
             return
-        snapshot_solver_input = None
-        if transit_snapshot_manager is not None:
-            try:
-                snapshot_solver_input = build_snapshot_solver_input(
-                    icao, plane_lat, plane_lon, elevation, distance, azimuth,
-                    altitude, velocity, track)
-            except Exception:
-                pass
-        prediction_base_utc = clock.now_utc()
-        moon_solution = moving_body_transit_pred(
-            "moon", (my_lat, my_lon), (plane_lat, plane_lon), track,
-            velocity, elevation, prediction_base_utc,
-            fallback_body_position=BodyPosition(
-                moon_alt, moon_az, moon_body_angular_diameter_arcsec,
-                moon_body_evaluated_at_utc))
-        sun_solution = moving_body_transit_pred(
-            "sun", (my_lat, my_lon), (plane_lat, plane_lon), track,
-            velocity, elevation, prediction_base_utc,
-            fallback_body_position=BodyPosition(
-                sun_alt, sun_az, sun_body_angular_diameter_arcsec,
-                sun_body_evaluated_at_utc))
-        tst_int1 = _store_transit_solver_solution(
-            icao, "moon", moon_solution)
-        tst_int2 = _store_transit_solver_solution(
-            icao, "sun", sun_solution)
-        prediction_now = prediction_base_utc
-        tst_int1 = apply_vertical_prediction_to_transit_result(
-            icao, "moon", tst_int1, elevation, prediction_now)
-        tst_int2 = apply_vertical_prediction_to_transit_result(
-            icao, "sun", tst_int2, elevation, prediction_now)
-        if tst_int1:
-            alt_a = round(tst_int1[3], 2)
-            dst_h2x = round(tst_int1[4], 2)
-            dst_p2x = round(tst_int1[5], 2)
-            final_time2x = float(tst_int1[6])
-            delta_time = int(final_time2x)
-            if 0 <= delta_time <= 900:  # Ignore past or excessively distant transits
-                plane_dict[icao][25] = dst_h2x
-                plane_dict[icao][23] = float(tst_int1[9])
-                plane_dict[icao][24] = alt_a
-                plane_dict[icao][26] = delta_time
-                plane_dict[icao][27] = dst_p2x
-                separation_deg = vertical_transit_separation(
-                    plane_dict[icao][24], plane_dict[icao][23])
-                if -transit_separation_sound_alert < separation_deg < transit_separation_sound_alert:
-                    gong()
-                if delta_time <= 2:  # Ustaw flagę tranzytu jeśli czas do tranzytu jest mniejszy lub równy 2 sekundy / Set transit flag if time to transit is less than or equal to 2 second
-                    plane_dict[icao][31] = True
-                    plane_dict[icao][30] = clock.now_utc()  # Ustaw czas rozpoczęcia tranzytu / Set transit start time
-                plane_dict[icao][29] = clock.now_utc()
-                update_transit_prediction_timestamp(
-                    icao, "moon", prediction_now, final_time2x)
-                capture_transit_prediction(
-                    icao, flight, "moon", tst_int1, prediction_now,
-                    snapshot_solver_input)
-            else:
-                clear_transit_prediction_state(
-                    icao, plane_dict[icao], "moon", 23)
+        prediction_base_utc = now_utc
+        if (engine.prediction_scheduler is None
+                or engine.prediction_scheduler.should_evaluate(
+                    icao, prediction_base_utc)):
+            evaluate_transit_prediction(icao, prediction_base_utc,
+                                        engine=engine)
+    finish_observer_message(render, now_utc, engine=engine)
+
+
+def finish_observer_message(render, now_utc=None, engine=primary_observer):
+    if render:
+        body_positions = tabela(now_utc=now_utc, engine=engine)
+    else:
+        body_positions = compute_body_positions(engine=engine)
+    (engine.sun_alt, engine.sun_az,
+     engine.moon_alt, engine.moon_az) = body_positions
+    clean_dict(now_utc, engine=engine)
+    clean_transit_dict(now_utc, engine=engine)
+
+
+@synchronized_plane_dict
+def evaluate_transit_prediction(icao, prediction_base_utc, solutions=None,
+                                engine=primary_observer):
+    """Solve and store the Sun/Moon predictions of one aircraft.
+
+    ``solutions`` holds the already solved (moon, sun) pair of a batch.
+    """
+    plane_dict = engine.plane_dict
+    entry = plane_dict[icao]
+    flight = entry[1]
+    plane_lat, plane_lon, track, velocity, elevation, filtered_state = (
+        solver_motion_inputs(icao, entry, prediction_base_utc))
+    distance = entry[5]
+    azimuth = entry[6]
+    altitude = entry[7]
+    snapshot_solver_input = None
+    if engine.transit_snapshot_manager is not None:
+        try:
+            snapshot_solver_input = build_snapshot_solver_input(
+                icao, plane_lat, plane_lon, elevation, distance, azimuth,
+                altitude, velocity, track, filtered_state, {
+                    "aircraft_lat": entry[2], "aircraft_lon": entry[3],
+                    "altitude_m": entry[4], "groundspeed": entry[14],
+                    "track": entry[11]})
+        except Exception:
+            pass
+    if solutions is None:
+        body_positions = current_body_positions(engine=engine)
+        solutions = [
+            cached_moving_body_transit_pred(
+                icao, body_name, (engine.my_lat, engine.my_lon),
+                (plane_lat, plane_lon), track, velocity, elevation,
+                prediction_base_utc,
+                fallback_body_position=body_positions[body_name],
+                engine=engine)
+            for body_name in ("moon", "sun")]
+    moon_solution, sun_solution = solutions
+    tst_int1 = _store_transit_solver_solution(
+        icao, "moon", moon_solution, engine=engine)
+    tst_int2 = _store_transit_solver_solution(
+        icao, "sun", sun_solution, engine=engine)
+    prediction_now = prediction_base_utc
+    tst_int1 = apply_vertical_prediction_to_transit_result(
+        icao, "moon", tst_int1, elevation, prediction_now, engine=engine)
+    tst_int2 = apply_vertical_prediction_to_transit_result(
+        icao, "sun", tst_int2, elevation, prediction_now, engine=engine)
+    for body_name, result in (("moon", tst_int1), ("sun", tst_int2)):
+        update_separation_envelope(
+            icao, body_name, result, (plane_lat, plane_lon), track, velocity,
+            elevation, filtered_state, engine=engine)
+    if tst_int1:
+        alt_a = round(tst_int1[3], 2)
+        dst_h2x = round(tst_int1[4], 2)
+        dst_p2x = round(tst_int1[5], 2)
+        final_time2x = float(tst_int1[6])
+        delta_time = int(final_time2x)
+        if 0 <= delta_time <= 900:  # Ignore past or excessively distant transits
+            plane_dict[icao][25] = dst_h2x
+            plane_dict[icao][23] = float(tst_int1[9])
+            plane_dict[icao][24] = alt_a
+            plane_dict[icao][26] = delta_time
+            plane_dict[icao][27] = dst_p2x
+            separation_deg = vertical_transit_separation(
+                plane_dict[icao][24], plane_dict[icao][23])
+            if -transit_separation_sound_alert < separation_deg < transit_separation_sound_alert:
+                gong(prediction_now)
+            if delta_time <= 2:  # Ustaw flagę tranzytu jeśli czas do tranzytu jest mniejszy lub równy 2 sekundy / Set transit flag if time to transit is less than or equal to 2 second
+                plane_dict[icao][31] = True
+                plane_dict[icao][30] = prediction_now  # Ustaw czas rozpoczęcia tranzytu / Set transit start time
+            plane_dict[icao][29] = prediction_now
+            update_transit_prediction_timestamp(
+                icao, "moon", prediction_now, final_time2x, engine=engine)
+            capture_transit_prediction(
+                icao, flight, "moon", tst_int1, prediction_now,
+                snapshot_solver_input, engine=engine)
         else:
-            if moon_alt < 0.1:
-                clear_transit_prediction_state(
-                    icao, plane_dict[icao], "moon", 23)
-            else:
-                expire_transit_prediction_after_grace(
-                    icao, plane_dict[icao], "moon", 23, prediction_now)
-        if tst_int2:
-            alt_a = round(tst_int2[3], 2)
-            dst_h2x = round(tst_int2[4], 2)
-            dst_p2x = round(tst_int2[5], 2)
-            final_time2x = float(tst_int2[6])
-            delta_time = int(final_time2x)
-            if 0 <= delta_time <= 900:  # Ignore past or excessively distant transits
-                plane_dict[icao][20] = dst_h2x
-                plane_dict[icao][18] = float(tst_int2[9])
-                plane_dict[icao][19] = alt_a
-                plane_dict[icao][22] = delta_time
-                plane_dict[icao][21] = dst_p2x
-                separation_deg2 = vertical_transit_separation(
-                    plane_dict[icao][19], plane_dict[icao][18])
-                if -transit_separation_sound_alert < separation_deg2 < transit_separation_sound_alert:
-                    gong()
-                if delta_time <= 2:  # Ustaw flagę tranzytu jeśli czas do tranzytu jest mniejszy lub równy 2 sekundy / Set transit flag if time to transit is less than or equal to 2 second
-                    plane_dict[icao][31] = True
-                    plane_dict[icao][30] = clock.now_utc()  # Ustaw czas rozpoczęcia tranzytu / Set transit start time
-                plane_dict[icao][30] = clock.now_utc()
-                update_transit_prediction_timestamp(
-                    icao, "sun", prediction_now, final_time2x)
-                capture_transit_prediction(
-                    icao, flight, "sun", tst_int2, prediction_now,
-                    snapshot_solver_input)
-            else:
-                clear_transit_prediction_state(
-                    icao, plane_dict[icao], "sun", 18)
+            clear_transit_prediction_state(
+                icao, plane_dict[icao], "moon", 23, engine=engine)
+    else:
+        if engine.moon_alt < 0.1:
+            clear_transit_prediction_state(
+                icao, plane_dict[icao], "moon", 23, engine=engine)
         else:
-            if sun_alt < 0.1:
-                clear_transit_prediction_state(
-                    icao, plane_dict[icao], "sun", 18)
-            else:
-                expire_transit_prediction_after_grace(
-                    icao, plane_dict[icao], "sun", 18, prediction_now)
-    sun_alt, sun_az, moon_alt, moon_az = tabela()
-    clean_dict()
-    clean_transit_dict()
+            expire_transit_prediction_after_grace(
+                icao, plane_dict[icao], "moon", 23, prediction_now,
+                engine=engine)
+    if tst_int2:
+        alt_a = round(tst_int2[3], 2)
+        dst_h2x = round(tst_int2[4], 2)
+        dst_p2x = round(tst_int2[5], 2)
+        final_time2x = float(tst_int2[6])
+        delta_time = int(final_time2x)
+        if 0 <= delta_time <= 900:  # Ignore past or excessively distant transits
+            plane_dict[icao][20] = dst_h2x
+            plane_dict[icao][18] = float(tst_int2[9])
+            plane_dict[icao][19] = alt_a
+            plane_dict[icao][22] = delta_time
+            plane_dict[icao][21] = dst_p2x
+            separation_deg2 = vertical_transit_separation(
+                plane_dict[icao][19], plane_dict[icao][18])
+            if -transit_separation_sound_alert < separation_deg2 < transit_separation_sound_alert:
+                gong(prediction_now)
+            if delta_time <= 2:  # Ustaw flagę tranzytu jeśli czas do tranzytu jest mniejszy lub równy 2 sekundy / Set transit flag if time to transit is less than or equal to 2 second
+                plane_dict[icao][31] = True
+                plane_dict[icao][30] = prediction_now  # Ustaw czas rozpoczęcia tranzytu / Set transit start time
+            plane_dict[icao][30] = prediction_now
+            update_transit_prediction_timestamp(
+                icao, "sun", prediction_now, final_time2x, engine=engine)
+            capture_transit_prediction(
+                icao, flight, "sun", tst_int2, prediction_now,
+                snapshot_solver_input, engine=engine)
+        else:
+            clear_transit_prediction_state(
+                icao, plane_dict[icao], "sun", 18, engine=engine)
+    else:
+        if engine.sun_alt < 0.1:
+            clear_transit_prediction_state(
+                icao, plane_dict[icao], "sun", 18, engine=engine)
+        else:
+            expire_transit_prediction_after_grace(
+                icao, plane_dict[icao], "sun", 18, prediction_now,
+                engine=engine)
+    update_render_priority(icao, engine=engine)
+    if engine.prediction_scheduler is not None:
+        engine.prediction_scheduler.record_evaluation(
+            icao, prediction_base_utc,
+            prediction_schedule_tier(plane_dict[icao]))
+    if engine.transit_candidate_tracker is not None:
+        publish_transit_feed_events(icao, prediction_base_utc, engine=engine)
+
+
+def envelope_sigmas(icao, filtered_state):
+    """Position and groundspeed sigmas: the tracker's own when it runs."""
+    uncertainty = separation_envelope_uncertainty
+    if filtered_state is not None:
+        return (filtered_state.position_sigma_km,
+                filtered_state.groundspeed_sigma_kmh)
+    state = aircraft_motion_states.get(icao)
+    source = (
+        state.position.source
+        if state is not None and state.position is not None else None)
+    return uncertainty.position_km(source), uncertainty.groundspeed_kmh
+
+
+def update_separation_envelope(icao, body_name, result, plane_pos, track,
+                               velocity, elevation, filtered_state,
+                               engine=primary_observer):
+    """Store the envelope of a candidate under the ignore threshold.
+
+    Samples re-run the pure intersection geometry against the solved body
+    position; the body altitude is moved along by its rate for each sample's
+    own time to 2X instead of asking the ephemeris again.
+    """
+    key = (icao, body_name)
+    engine.separation_envelopes.pop(key, None)
+    if (separation_envelope_uncertainty is None or not result
+            or not all(is_float_try(value) for value in (
+                plane_pos[0], plane_pos[1], track, velocity, elevation))
+            or not 0 <= float(result[6]) <= 900
+            or vertical_transit_separation(result[3], result[9])
+            >= transit_separation_notignored):
+        return None
+    body_alt, body_az = float(result[9]), float(result[8])
+    nominal_time = float(result[6])
+    altitude_rate = body_altitude_rate(
+        body_name, (body_alt, body_az), engine.my_lat)
+
+    def evaluate(sample):
+        solved = transit_pred(
+            (engine.my_lat, engine.my_lon),
+            (sample.latitude, sample.longitude), sample.track_deg,
+            sample.groundspeed_kmh, sample.altitude_m, body_alt, body_az,
+            engine.my_elevation_const)
+        if not solved:
+            return None
+        return float(solved[3]) - (
+            body_alt + altitude_rate * (float(solved[6]) - nominal_time))
+
+    inputs = EnvelopeInputs(
+        float(plane_pos[0]), float(plane_pos[1]), float(track),
+        float(velocity), float(elevation))
+    position_sigma, groundspeed_sigma = envelope_sigmas(icao, filtered_state)
+    points = sigma_points(
+        inputs, position_sigma, groundspeed_sigma,
+        separation_envelope_uncertainty.track_deg,
+        separation_envelope_uncertainty.altitude_m)
+    solver_diagnostic = engine.transit_solver_diagnostics.get(key)
+    envelope = separation_envelope(
+        evaluate, inputs, points, float(result[3]) - body_alt,
+        solver_diagnostic.body_angular_diameter_arcsec
+        if solver_diagnostic is not None else None)
+    if envelope is not None:
+        engine.separation_envelopes[key] = envelope
+    return envelope
+
+
+def publish_transit_feed_events(icao, now_utc, engine=primary_observer):
+    """Push candidate appear/update/alert/clear events of one aircraft."""
+    entry = engine.plane_dict[icao]
+    for body_name in ("sun", "moon"):
+        values = visible_transit_candidate(entry, body_name, icao, now_utc,
+                                           engine=engine)
+        state = None
+        if values is not None:
+            state = TransitCandidateState(
+                *values, _prediction_timestamps(body_name,
+                                                engine=engine)[1].get(icao))
+        for event in engine.transit_candidate_tracker.update(
+                icao, entry[1], body_name, state, now_utc):
+            publish_transit_feed_event(event, engine=engine)
+
+
+def publish_transit_feed_event(event, engine=primary_observer):
+    event["observer"] = engine.observer_name
+    if transit_feed is not None:
+        transit_feed.publish(event)
+    if transit_event_log is not None:
+        key = (event["icao"], event["body"])
+        solver = engine.transit_solver_diagnostics.get(key)
+        vertical = engine.vertical_transit_diagnostics.get(key)
+        transit_event_log.record(
+            event,
+            solver.outcome.value if solver is not None else None,
+            vertical.prediction.mode.value if vertical is not None else None)
+
+
+def current_body_positions(engine=primary_observer):
+    """Return the table-tick Sun/Moon states used as solver fallbacks."""
+    return {
+        "moon": BodyPosition(
+            engine.moon_alt, engine.moon_az,
+            engine.moon_body_angular_diameter_arcsec,
+            engine.moon_body_evaluated_at_utc),
+        "sun": BodyPosition(
+            engine.sun_alt, engine.sun_az,
+            engine.sun_body_angular_diameter_arcsec,
+            engine.sun_body_evaluated_at_utc),
+    }
+
+
+def prepare_transit_prediction_batch(icaos, prediction_base_utc,
+                                     engine=primary_observer):
+    """Split the Sun/Moon pairs of several aircraft into known solutions and
+    pool tasks.
+
+    Cache lookups and the sector pre-filter stay in this process; only the
+    remaining solves are farmed out. Runs with ``plane_dict_lock`` held, and
+    the returned inputs are copies, so the pool runs without the lock.
+    """
+    body_positions = current_body_positions(engine=engine)
+    solutions = {}
+    pending = []
+    for icao in icaos:
+        entry = engine.plane_dict[icao]
+        plane_lat, plane_lon, track, velocity, elevation, _ = (
+            solver_motion_inputs(icao, entry, prediction_base_utc))
+        plane_pos = (plane_lat, plane_lon)
+        observer = (engine.my_lat, engine.my_lon)
+        for body_name in ("moon", "sun"):
+            key = (icao, body_name)
+            solution, inputs, context = lookup_cached_moving_body_solution(
+                icao, body_name, observer, plane_pos, track, velocity,
+                elevation, prediction_base_utc, engine=engine)
+            if solution is None:
+                solution = sector_culled_moving_body_solution(
+                    body_name, plane_pos, track, velocity, elevation,
+                    prediction_base_utc, body_positions[body_name],
+                    engine=engine)
+                if solution is not None:
+                    store_moving_body_solution(
+                        icao, body_name, inputs, prediction_base_utc,
+                        solution, context, engine=engine)
+            if solution is None:
+                pending.append((key, inputs, context, SolverTask(
+                    body_name, observer, plane_pos, track,
+                    float(velocity), float(elevation), prediction_base_utc,
+                    body_positions[body_name], engine.my_elevation_const)))
+            solutions[key] = solution
+    return solutions, pending
+
+
+def apply_transit_prediction_batch(icaos, solutions, pending, solved,
+                                   prediction_base_utc,
+                                   engine=primary_observer):
+    """Map pool results back in submission order, as the in-process path
+    would have produced them; aircraft dropped meanwhile are skipped."""
+    kept = set(icaos)
+    for (key, inputs, context, _), solution in zip(pending, solved):
+        if key[0] not in kept:
+            continue
+        store_moving_body_solution(
+            key[0], key[1], inputs, prediction_base_utc, solution, context,
+            engine=engine)
+        solutions[key] = solution
+    return {
+        icao: (solutions[(icao, "moon")], solutions[(icao, "sun")])
+        for icao in icaos}
+
+
+def prediction_schedule_tier(entry):
+    """Classify one plane_dict entry from its stored Sun/Moon predictions."""
+    separations = []
+    times = []
+    for separation, _, _, time2x in terminal_transit_values(entry):
+        if is_float_try(time2x):
+            separations.append(separation)
+            times.append(float(time2x))
+    return classify_prediction(
+        min(separations, default=None), min(times, default=None),
+        float(entry[5]) if is_float_try(entry[5]) else None,
+        transit_separation_notignored, alert_distance, warning_distance)
+
+
+def process_due_transit_predictions(now_utc=None, engine=primary_observer):
+    """Evaluate deferred aircraft whose scheduling interval has elapsed.
+
+    ``plane_dict_lock`` is released while the solver pool works, so reader
+    threads are not held up by a slow batch. Aircraft removed, or evaluated
+    by a newer message, in the meantime keep their state.
+    """
+    if engine.prediction_scheduler is None:
+        return []
+    now_utc = clock.now_utc() if now_utc is None else now_utc
+    with plane_dict_lock:
+        evaluated = []
+        for icao in engine.prediction_scheduler.pop_due(now_utc):
+            entry = engine.plane_dict.get(icao)
+            if not (entry and entry[2] and entry[11]
+                    and is_float_try(entry[4])):
+                continue
+            freshness = assess_motion_freshness(
+                aircraft_motion_states.get(icao), now_utc)
+            aircraft_motion_freshness_status[icao] = freshness
+            if freshness.status == MotionFreshnessStatus.STALE:
+                continue
+            evaluated.append(icao)
+        if solver_pool is None or not evaluated:
+            for icao in evaluated:
+                evaluate_transit_prediction(icao, now_utc, engine=engine)
+            return evaluated
+        pool = solver_pool
+        scheduler = engine.prediction_scheduler
+        entries = {icao: engine.plane_dict[icao] for icao in evaluated}
+        next_due = {icao: scheduler.next_due(icao) for icao in evaluated}
+        solutions, pending = prepare_transit_prediction_batch(
+            evaluated, now_utc, engine=engine)
+    solved = pool.solve([task for _, _, _, task in pending])
+    with plane_dict_lock:
+        evaluated = [
+            icao for icao in evaluated
+            if engine.plane_dict.get(icao) is entries[icao]
+            and scheduler.next_due(icao) == next_due[icao]]
+        batch = apply_transit_prediction_batch(
+            evaluated, solutions, pending, solved, now_utc, engine=engine)
+        for icao in evaluated:
+            evaluate_transit_prediction(icao, now_utc, batch[icao],
+                                        engine=engine)
+    return evaluated
+
+
+def _status_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@synchronized_plane_dict
+def build_status_document(now_utc=None, engine=primary_observer):
+    """Collect aircraft, transit candidates and diagnostics as plain JSON data.
+
+    Ages are given as absolute timestamps so the document, and its ETag,
+    only change when the engine state does.
+    """
+    now_utc = clock.now_utc() if now_utc is None else now_utc
+    aircraft = []
+    candidates = []
+    for icao, entry in engine.plane_dict.items():
+        freshness = aircraft_motion_freshness_status.get(icao)
+        aircraft.append({
+            "icao": icao,
+            "flight": entry[1] or None,
+            "lat": _status_number(entry[2]),
+            "lon": _status_number(entry[3]),
+            "altitude_m": _status_number(entry[4]),
+            "distance_km": _status_number(entry[5]),
+            "azimuth_deg": _status_number(entry[6]),
+            "altitude_angle_deg": _status_number(entry[7]),
+            "track_deg": _status_number(entry[11]),
+            "groundspeed_kmh": _status_number(entry[14]),
+            "link": entry[8] or None,
+            "direction": entry[9] or None,
+            "warning": entry[12] == "WARNING",
+            "crosstrack_km": _status_number(entry[13]),
+            "last_message_utc": (
+                entry[0] if isinstance(entry[0], datetime.datetime)
+                else None),
+            "motion_freshness": (
+                freshness.status if freshness is not None else None),
+        })
+        for body_name in ("sun", "moon"):
+            values = visible_transit_candidate(
+                entry, body_name, icao, now_utc, engine=engine)
+            if values is None:
+                continue
+            envelope = engine.separation_envelopes.get((icao, body_name))
+            candidates.append({
+                "icao": icao,
+                "flight": entry[1] or None,
+                "body": body_name,
+                "separation_deg": values[0],
+                "p2x_km": values[1],
+                "h2x_km": values[2],
+                "time2x_seconds": values[3],
+                "predicted_transit_utc": (
+                    _prediction_timestamps(body_name,
+                                           engine=engine)[1].get(icao)),
+                "separation_interval_deg": (
+                    [envelope.low_deg, envelope.high_deg]
+                    if envelope is not None else None),
+                "transit_probability": (
+                    envelope.transit_probability
+                    if envelope is not None else None),
+            })
+    candidates.sort(key=lambda item: (
+        item["time2x_seconds"], item["body"] != "sun", item["icao"]))
+    adsb_recorder_status, mlat_recorder_status = session_recorder_statuses()
+    statistics = [
+        engine.sector_cull_diagnostics.summary(),
+        engine.transit_prediction_cache.statistics.summary(),
+    ]
+    if position_fusion is not None:
+        statistics.append(position_fusion.summary())
+    if engine.prediction_scheduler is not None:
+        statistics.append(engine.prediction_scheduler.statistics.summary())
+    if solver_pool is not None:
+        statistics.append(solver_pool.statistics.summary())
+    return {
+        "observer": {
+            "name": engine.observer_name, "lat": engine.my_lat,
+            "lon": engine.my_lon, "elevation_m": engine.my_elevation_const},
+        "qnh_hpa": pressure,
+        "bodies": {
+            "sun": {"altitude_deg": engine.sun_alt,
+                    "azimuth_deg": engine.sun_az},
+            "moon": {"altitude_deg": engine.moon_alt,
+                     "azimuth_deg": engine.moon_az},
+        },
+        "sources": [
+            {"name": "ADS-B", "port": adsb_port,
+             "listening": bool(port_status.get(adsb_port, False)),
+             "recorder": adsb_recorder_status,
+             "fusion": source_fusion_counters("adsb")},
+            {"name": "MLAT", "port": mlat_port,
+             "listening": bool(port_status.get(mlat_port, False)),
+             "recorder": mlat_recorder_status,
+             "fusion": source_fusion_counters("mlat")},
+        ],
+        "aircraft": aircraft,
+        "transit_candidates": candidates,
+        "solver_diagnostics": [
+            dict(asdict(diagnostic), icao=icao)
+            for (icao, _), diagnostic in sorted(
+                engine.transit_solver_diagnostics.items())],
+        "vertical_diagnostics": [
+            dict(asdict(diagnostic), icao=icao)
+            for (icao, _), diagnostic in sorted(
+                engine.vertical_transit_diagnostics.items())],
+        "stand_suggestions": [
+            dict(asdict(suggestion), icao=icao, body=body_name)
+            for icao, body_name, suggestion in ranked_stand_suggestions()],
+        "statistics": statistics,
+    }
+
+
+def source_fusion_counters(source):
+    if position_fusion is None or source not in position_fusion.counters:
+        return None
+    return asdict(position_fusion.counters[source])
+
+
+OBSERVER_STATUS_KEYS = (
+    "observer", "bodies", "aircraft", "transit_candidates",
+    "solver_diagnostics", "vertical_diagnostics", "statistics")
+
+
+def build_observer_status_document(now_utc, engine=primary_observer):
+    document = build_status_document(now_utc, engine=engine)
+    return {key: document[key] for key in OBSERVER_STATUS_KEYS}
+
+
+def configure_stand_grid():
+    global stand_grid
+    stand_grid = (
+        ObserverGrid(current_observer_frame(), *stand_grid_settings)
+        if stand_grid_settings is not None else None)
+    return stand_grid
+
+
+def update_stand_suggestions(now_utc=None):
+    """Find the best reachable spot of every aircraft whose transit
+    centreline crosses the observer grid.
+
+    Runs every main-loop tick; the grid search works on a copy of the
+    aircraft inputs so message handling is not held up.
+    """
+    global stand_suggestions
+    if stand_grid is None:
+        return {}
+    now_utc = clock.now_utc() if now_utc is None else now_utc
+    frame = stand_grid.frame
+    with plane_dict_lock:
+        aircraft = [
+            (icao, float(entry[2]), float(entry[3]), float(entry[4]),
+             float(entry[11]), float(entry[14]))
+            for icao, entry in plane_dict.items()
+            if entry[2] and entry[3] and is_float_try(entry[4])
+            and is_float_try(entry[11]) and is_float_try(entry[14])]
+    body_angles = {}
+
+    def body_at(body_name, seconds):
+        key = (body_name, round(seconds))
+        if key not in body_angles:
+            position = body_position_at_utc(
+                body_name, now_utc + datetime.timedelta(seconds=key[1]))
+            body_angles[key] = (position.altitude_deg, position.azimuth_deg)
+        return body_angles[key]
+
+    suggestions = {}
+    for icao, latitude, longitude, altitude_m, track, velocity in aircraft:
+        position = frame.local_offset_km(latitude, longitude)
+        height_m = altitude_m - frame.elevation_m
+        for body_name in ("sun", "moon"):
+            suggestion = stand_grid.best_spot(
+                position, height_m, track, velocity,
+                lambda seconds, body_name=body_name: body_at(
+                    body_name, seconds),
+                SECTOR_CULL_HORIZON_SECONDS)
+            if (suggestion is not None
+                    and suggestion.separation_deg
+                    < transit_separation_notignored):
+                suggestions[(icao, body_name)] = suggestion
+    with plane_dict_lock:
+        stand_suggestions = {
+            key: suggestion for key, suggestion in suggestions.items()
+            if key[0] in plane_dict}
+    return stand_suggestions
+
+
+def ranked_stand_suggestions(limit=None):
+    ranked = sorted(
+        ((icao, body_name, suggestion)
+         for (icao, body_name), suggestion in stand_suggestions.items()),
+        key=lambda item: (item[2].separation_deg, item[2].time2x_seconds))
+    return ranked if limit is None else ranked[:limit]
+
+
+def publish_status_snapshot():
+    now_utc = clock.now_utc()
+    document = build_status_document(now_utc)
+    document["observers"] = each_observer_engine(
+        build_observer_status_document, now_utc)
+    document["memory"] = [
+        footprint.as_dict() for footprint in memory_accounting.last_footprints]
+    return status_snapshot_cache.publish(document, now_utc)
+
+
+def observer_engine_tick(engine=primary_observer):
+    """Main-loop housekeeping of one extra observer."""
+    process_due_transit_predictions(engine=engine)
+    with plane_dict_lock:
+        (engine.sun_alt, engine.sun_az, engine.moon_alt,
+         engine.moon_az) = compute_body_positions(engine=engine)
+    clean_dict(engine=engine)
+    clean_transit_dict(engine=engine)
+
+
+def start_status_server(host, port):
+    global status_server
+    try:
+        status_server = StatusServer(
+            status_snapshot_cache, host, port, PROFILING_ACTIONS).start()
+    except OSError as error:
+        print("Status server on {}:{} failed: {}".format(host, port, error))
+        status_server = None
+    return status_server
+
+
+def start_transit_event_tracking():
+    """Track candidates for the feed and the event log; shared by both."""
+    global transit_candidate_tracker
+    if transit_candidate_tracker is not None:
+        return
+    transit_candidate_tracker = TransitCandidateTracker(
+        transit_separation_sound_alert)
+    for engine in observer_engines:
+        engine.transit_candidate_tracker = TransitCandidateTracker(
+            transit_separation_sound_alert)
+
 
+def start_transit_event_log(directory):
+    global transit_event_log
+    start_transit_event_tracking()
+    transit_event_log = TransitEventLog(
+        directory, final_separation_deg=TRANSIT_SNAPSHOT_SEP_THRESHOLD_DEG)
+    return transit_event_log
 
-def main():
+
+def start_transit_feed(host, port):
+    global transit_feed
+    start_transit_event_tracking()
+    try:
+        transit_feed = TransitFeedServer(host, port).start()
+    except OSError as error:
+        print("Transit feed on {}:{} failed: {}".format(host, port, error))
+        transit_feed = None
+    return transit_feed
+
+
+def write_startup_profile(profile, directory=DIAGNOSTICS_DIRECTORY):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Wall-clock name: a replay clock is not ready yet at startup.
+    path = directory / datetime.datetime.now(pytz.utc).strftime(
+        "startup_profile_%Y%m%d_%H%M%S_UTC.txt")
+    path.write_text(profile.report() + "\n", encoding="utf-8")
+    return path
+
+
+def report_startup_profile(profile, directory=DIAGNOSTICS_DIRECTORY):
+    global startup_profile
+    if not startup_profile_requested:
+        return None
+    startup_profile = profile
+    print(profile.report())
+    try:
+        path = write_startup_profile(profile, directory)
+    except Exception as error:
+        print("Startup profile: FAILED ({})".format(error))
+        return None
+    print("Startup profile: {}".format(path))
+    return path
+
+
+def main(arguments=None):
     global daily_environment_recorder, session_recorder, session_recording_requested
-    global transit_snapshot_manager
+    global transit_snapshot_manager, aircraft_json_adapter
     global shutdown_complete
-    try:
-        configuration = load_installation_config()
-    except ConfigurationError as error:
-        raise SystemExit(str(error))
-    apply_installation_config(configuration)
+    profile = StartupProfile(STARTUP_STARTED)
+    profile.record("imports", time.perf_counter() - STARTUP_STARTED)
+    if arguments is not None or runtime_args is None:
+        with profile.phase("arguments"):
+            configure_runtime(parse_runtime_args(arguments or []))
+    with profile.phase("installation config"):
+        try:
+            configuration = load_installation_config()
+        except ConfigurationError as error:
+            raise SystemExit(str(error))
+        apply_installation_config(configuration)
+        configure_observer_engines(configuration)
+        configure_stand_grid()
+    if solver_pool is not None:
+        with profile.phase("solver workers"):
+            solver_pool.start()
+    with profile.phase("local servers"):
+        if status_server_address is not None:
+            start_status_server(*status_server_address)
+        if transit_feed_address is not None:
+            start_transit_feed(*transit_feed_address)
+        if transit_event_log_directory is not None:
+            start_transit_event_log(transit_event_log_directory)
     install_table_snapshot_signal_handler()
+    install_profiling_signal_handler()
     stop_event.clear()
     with shutdown_lock:
         shutdown_complete = False
     session_recorder = None
     session_recording_requested = runtime_args.record
     try:
-        configure_environment_replay(runtime_args.environment_replay)
-        if isinstance(clock, ReplayClock):
-            daily_environment_recorder = None
-            transit_snapshot_manager = None
-            configure_environment_recording(None)
-        else:
-            initialize_transit_snapshots()
-            initialize_daily_environment()
-            configure_environment_recording(runtime_args.environment_record)
-            get_metar_press()
+        with profile.phase("environment"):
+            configure_environment_replay(runtime_args.environment_replay)
+            if isinstance(clock, ReplayClock):
+                daily_environment_recorder = None
+                transit_snapshot_manager = None
+                configure_environment_recording(None)
+            else:
+                initialize_transit_snapshots()
+                each_observer_engine(initialize_transit_snapshots)
+                initialize_daily_environment()
+                configure_environment_recording(runtime_args.environment_record)
+        if not isinstance(clock, ReplayClock):
+            with profile.phase("METAR"):
+                get_metar_press()
     except (OSError, EnvironmentFormatError, EnvironmentRecordError) as error:
         raise SystemExit("Invalid environment file: {}".format(error))
 
@@ -3099,29 +4789,46 @@ def main():
     ), threading.Thread(
         target=read_from_port,
         args=(mlat_host, mlat_port, process_line, session_recorder),
-    )]
+    )] if sbs_input_enabled else []
+    if aircraft_json_source is not None:
+        aircraft_json_adapter = AircraftJsonAdapter(
+            adsb_port, mlat_port, adsb_timestamp_timezone)
+        threads.append(threading.Thread(
+            target=poll_aircraft_json,
+            args=(aircraft_json_source, aircraft_json_interval),
+        ))
     if not isinstance(clock, ReplayClock):
         threads.append(threading.Thread(
             target=read_beast_intent,
             args=(beast_host, beast_port),
         ))
-    for thread in threads:
-        thread.start()
+    with profile.phase("reader threads"):
+        for thread in threads:
+            thread.start()
+    report_startup_profile(profile)
 
     # Pętla główna / Main loop
     try:
         while True:
             time.sleep(1)
             process_table_snapshot_request()
+            process_profiling_requests()
             if daily_environment_recorder is not None:
                 daily_environment_recorder.rotate_if_needed(clock.now_utc())
             if session_recorder is not None:
                 session_recorder.flush_if_due()
             finalize_transit_snapshots(clock.now_utc())
+            each_observer_engine(finalize_transit_snapshots, clock.now_utc())
+            sample_memory_accounting()
             if replay_time_initialized:
+                process_due_transit_predictions()
+                update_stand_suggestions()
                 sun_alt, sun_az, moon_alt, moon_az = tabela()
                 clean_dict()
                 clean_transit_dict()
+                each_observer_engine(observer_engine_tick)
+                if status_server is not None:
+                    publish_status_snapshot()
     except KeyboardInterrupt:
         pass
     finally:
@@ -3129,5 +4836,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
 